@@ -14,7 +14,9 @@ from typing import Mapping, Sequence
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from agents.templating import render_to
 from audit import log_handoff
+from pipelines.artifact_writer import open_artifact
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DESIGN_DIR = PROJECT_ROOT / "design"
@@ -53,10 +55,6 @@ class Designer:
         deliverables = _as_list(scenario.get("deliverables"))
         acceptance = _as_list(scenario.get("acceptance_criteria"))
 
-        focus_section = "\n".join(f"- {item}" for item in focus_areas) or "- Focus areas pending."
-        deliverable_section = "\n".join(f"- {item}" for item in deliverables) or "- Deliverables pending."
-        acceptance_section = "\n".join(f"- {item}" for item in acceptance) or "- Acceptance criteria pending."
-
         timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ")
         if brief_path:
             try:
@@ -67,45 +65,21 @@ class Designer:
         else:
             brief_line = "Source brief: internal scenario context."
 
-        content = "\n".join(
-            [
-                f"# Design Spec — {title}",
-                "",
-                "## Objective",
-                objective,
-                "",
-                "## Context",
-                context,
-                "",
-                "## Focus Areas",
-                focus_section,
-                "",
-                "## Proposed Components",
-                "- Concern ingestion service reading JSONL audit entries.",
-                "- Markdown synchronizer updating project detail summaries.",
-                "- Command router extension acknowledging concern lifecycle commands.",
-                "",
-                "## Deliverables",
-                deliverable_section,
-                "",
-                "## Acceptance Criteria",
-                acceptance_section,
-                "",
-                "## Interfaces & Data Contracts",
-                "| Component | Interface | Notes |",
-                "| --------- | --------- | ----- |",
-                "| Concern Logger | `audit.log_concern` | Append-only JSONL record for raised concerns. |",
-                "| Markdown Synchronizer | `sync_concerns(concerns.jsonl, docs/PROJECT_DETAIL.md)` | Mirrors open/resolved state into docs. |",
-                "| Interaction Stub | `/ack`, `/resolve`, `/assign` handlers | Extend CLI bridge with deterministic responses. |",
-                "",
-                "## Traceability",
-                brief_line,
-                "",
-                f"_Auto-generated by Designer.create_design_spec at {timestamp}._",
-            ]
-        )
-
-        target.write_text(content + "\n", encoding="utf-8")
+        with open_artifact(target) as handle:
+            render_to(
+                handle,
+                "designer/design_spec",
+                {
+                    "title": title,
+                    "objective": objective,
+                    "context": context,
+                    "focus_areas": focus_areas or ["Focus areas pending."],
+                    "deliverables": deliverables or ["Deliverables pending."],
+                    "acceptance_criteria": acceptance or ["Acceptance criteria pending."],
+                    "brief_line": brief_line,
+                    "timestamp": timestamp,
+                },
+            )
 
         log_handoff(
             phase=self.phase,
@@ -15,7 +15,9 @@ from typing import Mapping, Sequence
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from agents.templating import render_to
 from audit import log_handoff
+from pipelines.artifact_writer import open_artifact
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DOCS_DIR = PROJECT_ROOT / "docs"
@@ -57,9 +59,6 @@ class Implementer:
             "Instrument interaction stub with additional lifecycle commands.",
             "Integrate QA policy enforcement to block promotion on open concerns.",
         ]
-        focus_section = "\n".join(f"- {item}" for item in focus_areas) or "- Align focus areas with design output."
-        acceptance_section = "\n".join(f"- {item}" for item in acceptance) or "- Acceptance criteria to be detailed with Tester."
-        task_section = "\n".join(f"- [ ] {task}" for task in tasks)
 
         timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ")
         if design_path:
@@ -71,32 +70,19 @@ class Implementer:
         else:
             design_reference = "Design reference: pending."
 
-        content = "\n".join(
-            [
-                f"# Implementation Plan — {title}",
-                "",
-                "## Alignment",
-                focus_section,
-                "",
-                "## Task Checklist",
-                task_section,
-                "",
-                "## Acceptance Alignment",
-                acceptance_section,
-                "",
-                "## Dependencies",
-                "- Designer spec approval (Phase 1).",
-                "- Updated audit utilities for concern lifecycle.",
-                "- Tester-provided fixtures reflecting QA policy thresholds.",
-                "",
-                "## Notes",
-                design_reference,
-                "",
-                f"_Auto-generated by Implementer.create_execution_plan at {timestamp}._",
-            ]
-        )
-
-        target.write_text(content + "\n", encoding="utf-8")
+        with open_artifact(target) as handle:
+            render_to(
+                handle,
+                "implementer/execution_plan",
+                {
+                    "title": title,
+                    "focus_areas": focus_areas or ["Align focus areas with design output."],
+                    "tasks": tasks,
+                    "acceptance_criteria": acceptance or ["Acceptance criteria to be detailed with Tester."],
+                    "design_reference": design_reference,
+                    "timestamp": timestamp,
+                },
+            )
 
         log_handoff(
             phase=self.phase,
@@ -1,7 +1,8 @@
 """Phase 0 Project Manager skeleton.
 
 Responsibilities:
-- Load high-level requirements and distill them into short summaries.
+- Load high-level requirements from every requirement source (via the cached
+  requirements index) and distill them into short summaries.
 - Refresh executive (`PROJECT_OVERVIEW.md`) and detailed (`PROJECT_DETAIL.md`)
   documentation with the latest snapshot.
 - Emit an audit handoff entry to capture the update for downstream agents.
@@ -12,21 +13,22 @@ The implementation prefers deterministic output so Phase 0 demos can re-run safe
 from __future__ import annotations
 
 import datetime
-import textwrap
 from pathlib import Path
-from typing import Iterable, Mapping
+from typing import Iterable, Mapping, TextIO
 
 import sys
 
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from agents.requirements_index import RELATIVE_CACHE_PATH, RELATIVE_SOURCES, RequirementEntry, RequirementsIndex
+from agents.templating import render_to
 from audit import log_handoff
+from pipelines.artifact_writer import open_artifact
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DOCS_DIR = PROJECT_ROOT / "docs"
 
-REQUIREMENTS_PATH = DOCS_DIR / "REQUIREMENTS.md"
 OVERVIEW_PATH = DOCS_DIR / "PROJECT_OVERVIEW.md"
 DETAIL_PATH = DOCS_DIR / "PROJECT_DETAIL.md"
 
@@ -34,32 +36,19 @@ PHASE = "0"
 SCHEMA_VERSION = "0.1.0"
 
 
-def _load_requirement_rows() -> list[str]:
-    """Return table rows from REQUIREMENTS.md limited to the functional table."""
-    if not REQUIREMENTS_PATH.exists():
-        return []
+def _load_requirements() -> list[RequirementEntry]:
+    """Return one entry per FR id drawn from every requirement source."""
+    index = RequirementsIndex(
+        [PROJECT_ROOT / source for source in RELATIVE_SOURCES],
+        cache_path=PROJECT_ROOT / RELATIVE_CACHE_PATH,
+        root=PROJECT_ROOT,
+    )
+    return index.refresh().primary_entries()
 
-    rows: list[str] = []
-    in_table = False
-    for line in REQUIREMENTS_PATH.read_text(encoding="utf-8").splitlines():
-        if line.strip().startswith("| FR-"):
-            in_table = True
-            rows.append(line)
-        elif in_table and not line.strip():
-            break
-    return rows
 
-
-def _summarize(rows: Iterable[str]) -> list[str]:
-    """Convert requirement table rows into bullet-ready summaries."""
-    summaries: list[str] = []
-    for row in rows:
-        cells = [part.strip() for part in row.strip("|").split("|")]
-        if len(cells) < 3:
-            continue
-        req_id, requirement, notes = cells[:3]
-        summaries.append(f"{req_id}: {requirement} — {notes}")
-    return summaries
+def _summarize(entries: Iterable[RequirementEntry]) -> list[str]:
+    """Convert requirement entries into bullet-ready summaries."""
+    return [entry.summary() for entry in entries]
 
 
 class ProjectManager:
@@ -69,14 +58,12 @@ class ProjectManager:
         self.phase = phase
 
     def run(self) -> None:
-        rows = _load_requirement_rows()
-        requirement_summaries = _summarize(rows)
-
-        overview_content = self._render_overview(requirement_summaries)
-        detail_content = self._render_detail(requirement_summaries)
+        requirement_summaries = _summarize(_load_requirements())
 
-        OVERVIEW_PATH.write_text(overview_content, encoding="utf-8")
-        DETAIL_PATH.write_text(detail_content, encoding="utf-8")
+        with open_artifact(OVERVIEW_PATH) as handle:
+            self._render_overview(handle, requirement_summaries)
+        with open_artifact(DETAIL_PATH) as handle:
+            self._render_detail(handle, requirement_summaries)
 
         log_handoff(
             phase=self.phase,
@@ -88,40 +75,16 @@ class ProjectManager:
             metadata={"schema_version": SCHEMA_VERSION, "timestamp": datetime.datetime.utcnow().isoformat() + "Z"},
         )
 
-    def _render_overview(self, requirement_summaries: list[str]) -> str:
-        top_items = requirement_summaries[:3] or ["No functional requirements captured."]
-        highlights = "\n".join(f"- {item}" for item in top_items)
-        next_steps = "\n".join(
-            (
-                "- Socialize Phase 0 scaffolding with downstream agents.",
-                "- Prepare design briefs for core agent interfaces.",
-                "- Confirm audit trail schema with QA stakeholders.",
-            )
-        )
+    def _render_overview(self, handle: TextIO, requirement_summaries: list[str]) -> None:
         timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ")
-        lines = [
-            "# Project Overview",
-            "",
-            "## Mission",
-            "Build the Codexa.ai framework with auditable agent workflows and human governance checkpoints.",
-            "",
-            "## Current Phase Snapshot",
-            "- Phase: `0 — Foundation`",
-            "- Status: Phase 0 foundation demo-ready (`make demo`).",
-            "- Primary Contacts: Project Manager Agent",
-            "",
-            "## Highlights",
-            highlights,
-            "",
-            "## Next Steps",
-            next_steps,
-            "",
-            "## Approvals",
-            "- `✅ Approved by Human <date>`",
-            "",
-            f"_Auto-generated by ProjectManager.run at {timestamp}._",
-        ]
-        return "\n".join(lines) + "\n"
+        render_to(
+            handle,
+            "project_manager/overview",
+            {
+                "highlights": requirement_summaries[:3] or ["No functional requirements captured."],
+                "timestamp": timestamp,
+            },
+        )
 
     def create_phase_brief(self, scenario: Mapping[str, object], *, output_path: Path | None = None) -> Path:
         """Generate a concise brief for downstream agents and return the written path."""
@@ -133,36 +96,21 @@ class ProjectManager:
         deliverables = list(scenario.get("deliverables", []))
         success_metrics = list(scenario.get("success_metrics", []))
 
-        focus_lines = "\n".join(f"- {item}" for item in focus_areas) or "- Focus areas to be defined."
-        deliverable_lines = "\n".join(f"- {item}" for item in deliverables) or "- Deliverables to be defined."
-        metric_lines = "\n".join(f"- {item}" for item in success_metrics) or "- Metrics to be defined."
-
-        lines = [
-            f"# Phase {phase} Brief — {title}",
-            "",
-            "## Objective",
-            objective,
-            "",
-            "## Context",
-            context or "Context will be refined with designer input.",
-            "",
-            "## Focus Areas",
-            focus_lines,
-            "",
-            "## Deliverables",
-            deliverable_lines,
-            "",
-            "## Success Metrics",
-            metric_lines,
-            "",
-            "## Next Actions",
-            "- Designer: translate objective into architecture and interaction flow.",
-            "- Implementer: prepare execution plan aligned with design decisions.",
-            "- Tester: define validation scenarios tied to success metrics.",
-        ]
-
         brief_path = output_path or DOCS_DIR / f"PHASE{phase}_BRIEF.md"
-        brief_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        with open_artifact(brief_path) as handle:
+            render_to(
+                handle,
+                "project_manager/phase_brief",
+                {
+                    "phase": phase,
+                    "title": title,
+                    "objective": objective,
+                    "context": context or "Context will be refined with designer input.",
+                    "focus_areas": focus_areas or ["Focus areas to be defined."],
+                    "deliverables": deliverables or ["Deliverables to be defined."],
+                    "success_metrics": success_metrics or ["Metrics to be defined."],
+                },
+            )
 
         log_handoff(
             phase=phase,
@@ -176,39 +124,16 @@ class ProjectManager:
 
         return brief_path
 
-    def _render_detail(self, requirement_summaries: list[str]) -> str:
-        requirement_list = "\n".join(f"- {item}" for item in requirement_summaries) or "- Requirements document not found."
+    def _render_detail(self, handle: TextIO, requirement_summaries: list[str]) -> None:
         timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ")
-        lines = [
-            "# Project Detail",
-            "",
-            "## Scope & Boundaries",
-            "Phase 0 covers repository structure, audit primitives, interaction stub, and foundational documentation.",
-            "",
-            "## Deliverables",
-            "- Updated project overview and detail documents.",
-            "- Verified audit logger with sample entries and test coverage.",
-            "- Interaction stub supporting `/status` and `/clarify`.",
-            "- Demo automation via `make demo` and audit summary via `make audit`.",
-            "",
-            "## Implementation Notes",
-            "- Requirements digested from `REQUIREMENTS.md`:",
-            requirement_list,
-            "- Refresh documentation by running `python3 agents/project_manager.py` (idempotent).",
-            "- Demo workflow validated via `make demo`; outputs stored under `artifacts/phase0/demo`.",
-            "- Audit summary available with `make audit`.",
-            "",
-            "## Review Checklist",
-            "- Validation artifacts attached and verified.",
-            "- Outstanding concerns logged with resolution notes.",
-            "- Human approval recorded with timestamp.",
-            "",
-            "## Appendix",
-            "- Phase 0 audit evidence: `artifacts/phase0/`",
-            "",
-            f"_Auto-generated by ProjectManager.run at {timestamp}._",
-        ]
-        return "\n".join(lines) + "\n"
+        render_to(
+            handle,
+            "project_manager/detail",
+            {
+                "requirements": requirement_summaries or ["Requirements document not found."],
+                "timestamp": timestamp,
+            },
+        )
 
 
 def main() -> None:
@@ -0,0 +1,275 @@
+"""Cached, multi-source requirements index for the Project Manager agent.
+
+Requirements are spread across the current requirements table(s), per-FR
+elaboration documents, and archived revisions. The index parses every source
+file, keeps the parsed rows in a JSON cache keyed by path, ``st_mtime_ns`` and
+``st_size``, and only reparses files whose stat signature changed. Changed
+files are parsed in parallel.
+
+Sources are listed in priority order; ``primary(fr_id)`` returns the entry
+from the highest-priority source that mentions the requirement.
+
+CLI usage:
+
+    python3 agents/requirements_index.py FR-07 [FR-11 ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import write_artifact
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DOCS_DIR = PROJECT_ROOT / "docs"
+# Relative to a project root, so callers with their own root can build the same layout.
+RELATIVE_SOURCES = (
+    Path("docs") / "REQUIREMENTS.md",
+    Path("docs") / "REQUIREMENTS_1_2.md",
+    Path("docs") / "requirements" / "elaborations",
+    Path("docs") / "archive",
+)
+RELATIVE_CACHE_PATH = Path("artifacts") / "cache" / "requirements_index.json"
+DEFAULT_SOURCES = tuple(PROJECT_ROOT / source for source in RELATIVE_SOURCES)
+DEFAULT_CACHE_PATH = PROJECT_ROOT / RELATIVE_CACHE_PATH
+
+CACHE_VERSION = 1
+_FR_ID_PATTERN = re.compile(r"^(FR-\d+(?:\.\d+)?)\b\s*(.*)$")
+_FR_SORT_PATTERN = re.compile(r"\d+")
+
+
+@dataclass(frozen=True)
+class RequirementEntry:
+    """A single requirement mention extracted from a source document."""
+
+    fr_id: str
+    requirement: str
+    notes: str
+    source: str
+    line: int
+
+    def summary(self) -> str:
+        return f"{self.fr_id}: {self.requirement} — {self.notes}" if self.notes else f"{self.fr_id}: {self.requirement}"
+
+
+def _fr_sort_key(fr_id: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in _FR_SORT_PATTERN.findall(fr_id))
+
+
+def _parse_table_row(line: str, *, source: str, line_number: int) -> Optional[RequirementEntry]:
+    cells = [part.strip() for part in line.strip().strip("|").split("|")]
+    match = _FR_ID_PATTERN.match(cells[0])
+    if match is None or len(cells) < 2:
+        return None
+    fr_id, label = match.group(1), match.group(2).strip()
+    if label and not label.startswith("("):
+        requirement, notes = label, cells[1]
+    else:
+        requirement, notes = cells[1], cells[2] if len(cells) > 2 else ""
+    return RequirementEntry(fr_id=fr_id, requirement=requirement, notes=notes, source=source, line=line_number)
+
+
+def _parse_elaboration(lines: Sequence[str], *, source: str) -> Optional[RequirementEntry]:
+    """Extract the FR id from front matter and the first paragraph of ``## 1. Summary``."""
+    if not lines or lines[0].strip() != "---":
+        return None
+    fr_id = None
+    index = 1
+    while index < len(lines) and lines[index].strip() != "---":
+        key, _, value = lines[index].partition(":")
+        if key.strip() == "fr_id":
+            fr_id = value.strip()
+        index += 1
+    if not fr_id:
+        return None
+
+    summary_line = 0
+    summary: list[str] = []
+    for number, line in enumerate(lines[index:], start=index + 1):
+        stripped = line.strip()
+        if summary_line:
+            if stripped.startswith("#") or (not stripped and summary):
+                break
+            if stripped:
+                summary.append(stripped)
+        elif stripped.startswith("## ") and "summary" in stripped.lower():
+            summary_line = number
+    return RequirementEntry(
+        fr_id=fr_id,
+        requirement=" ".join(summary) or "Elaboration pending summary.",
+        notes="Elaboration",
+        source=source,
+        line=summary_line or 1,
+    )
+
+
+def parse_requirement_file(path: Path, *, root: Path = PROJECT_ROOT) -> list[RequirementEntry]:
+    """Return every requirement mention (table rows and elaboration summaries) in ``path``."""
+    try:
+        source = str(path.relative_to(root))
+    except ValueError:
+        source = str(path)
+    lines = path.read_text(encoding="utf-8").splitlines()
+
+    entries: list[RequirementEntry] = []
+    elaboration = _parse_elaboration(lines, source=source)
+    if elaboration is not None:
+        entries.append(elaboration)
+    for number, line in enumerate(lines, start=1):
+        if line.lstrip().startswith("| FR-"):
+            entry = _parse_table_row(line, source=source, line_number=number)
+            if entry is not None:
+                entries.append(entry)
+    return entries
+
+
+def _expand_sources(sources: Iterable[Path]) -> list[Path]:
+    files: list[Path] = []
+    for source in sources:
+        source = Path(source)
+        if source.is_dir():
+            files.extend(sorted(path for path in source.glob("*.md") if path.is_file()))
+        elif source.is_file():
+            files.append(source)
+    return files
+
+
+class RequirementsIndex:
+    """Index of requirement entries across sources, refreshed incrementally."""
+
+    def __init__(
+        self,
+        sources: Sequence[Path] = DEFAULT_SOURCES,
+        *,
+        cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+        root: Path = PROJECT_ROOT,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.sources = tuple(Path(source) for source in sources)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.root = Path(root)
+        self.max_workers = max_workers
+        self._files: dict[str, dict[str, Any]] = {}
+        self._by_id: dict[str, list[RequirementEntry]] = {}
+        self._order: list[str] = []
+        self._loaded_cache = False
+        self._built = False
+        self.last_reparsed: list[str] = []
+
+    def _load_cache(self) -> None:
+        self._loaded_cache = True
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        if data.get("version") == CACHE_VERSION:
+            self._files = dict(data.get("files", {}))
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        payload = {"version": CACHE_VERSION, "files": self._files}
+        write_artifact(self.cache_path, json.dumps(payload, sort_keys=True, separators=(",", ":")))
+
+    def refresh(self) -> "RequirementsIndex":
+        """Reparse sources whose stat signature changed and rebuild the lookup tables."""
+        if not self._loaded_cache:
+            self._load_cache()
+
+        files = _expand_sources(self.sources)
+        stale: list[tuple[str, Path, int, int]] = []
+        current: dict[str, dict[str, Any]] = {}
+        for path in files:
+            key = str(path)
+            stat = path.stat()
+            cached = self._files.get(key)
+            if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                current[key] = cached
+            else:
+                stale.append((key, path, stat.st_mtime_ns, stat.st_size))
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                parsed = executor.map(lambda item: parse_requirement_file(item[1], root=self.root), stale)
+                for (key, _, mtime_ns, size), entries in zip(stale, parsed):
+                    current[key] = {
+                        "mtime_ns": mtime_ns,
+                        "size": size,
+                        "entries": [asdict(entry) for entry in entries],
+                    }
+
+        ordered = [str(path) for path in files]
+        changed = bool(stale) or ordered != list(self._files)
+        self._files = current
+        self.last_reparsed = [key for key, *_ in stale]
+        if changed or not self._built:
+            self._rebuild(ordered)
+        if changed:
+            self._save_cache()
+        return self
+
+    def _rebuild(self, ordered_files: Sequence[str]) -> None:
+        by_id: dict[str, list[RequirementEntry]] = {}
+        for key in ordered_files:
+            for raw in self._files[key]["entries"]:
+                entry = RequirementEntry(**raw)
+                by_id.setdefault(entry.fr_id, []).append(entry)
+        self._by_id = by_id
+        self._order = sorted(by_id, key=_fr_sort_key)
+        self._built = True
+
+    def get(self, fr_id: str) -> list[RequirementEntry]:
+        """Return every mention of ``fr_id`` in source-priority order."""
+        return list(self._by_id.get(fr_id.upper(), ()))
+
+    def primary(self, fr_id: str) -> Optional[RequirementEntry]:
+        entries = self._by_id.get(fr_id.upper())
+        return entries[0] if entries else None
+
+    def ids(self) -> list[str]:
+        return list(self._order)
+
+    def primary_entries(self) -> list[RequirementEntry]:
+        """Return one entry per FR id (highest-priority source), ordered by FR number."""
+        return [self._by_id[fr_id][0] for fr_id in self._order]
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._by_id.values())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Look up requirements across all requirement sources.")
+    parser.add_argument("fr_ids", nargs="*", help="FR identifiers to look up (default: list primary entries).")
+    args = parser.parse_args(argv)
+
+    index = RequirementsIndex().refresh()
+    if not args.fr_ids:
+        for entry in index.primary_entries():
+            print(entry.summary())
+        return 0
+
+    status = 0
+    for fr_id in args.fr_ids:
+        entries = index.get(fr_id)
+        if not entries:
+            print(f"{fr_id}: not found", file=sys.stderr)
+            status = 1
+        for entry in entries:
+            print(json.dumps(asdict(entry), ensure_ascii=False, sort_keys=True))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
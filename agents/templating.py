@@ -0,0 +1,174 @@
+"""Shared Markdown template engine for agent documents.
+
+Templates live under ``agents/templates/<agent>/<name>.md`` and may be
+overridden per project by placing a file with the same relative path under
+``templates/`` at the repository root.
+
+Syntax is intentionally small:
+
+- ``{{ field }}`` inserts ``str(context["field"])``.
+- ``{{ field|bullets }}`` renders a sequence as ``- item`` lines.
+- ``{{ field|checklist }}`` renders a sequence as ``- [ ] item`` lines.
+
+Templates are parsed once into literal/field segments and cached by the
+engine; rendering either returns a string or streams segments straight into an
+open file handle.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Mapping, Sequence, TextIO
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+TEMPLATE_OVERRIDE_DIR = PROJECT_ROOT / "templates"
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)((?:\|[A-Za-z_]+)*)\s*\}\}")
+
+
+class TemplateError(Exception):
+    """Raised when a template cannot be located, parsed, or rendered."""
+
+
+def _as_items(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, (str, bytes)):
+        return [str(value)]
+    return [str(item) for item in value]
+
+
+def _bullets(value: Any) -> str:
+    return "\n".join(f"- {item}" for item in _as_items(value))
+
+
+def _checklist(value: Any) -> str:
+    return "\n".join(f"- [ ] {item}" for item in _as_items(value))
+
+
+FILTERS: Mapping[str, Callable[[Any], str]] = {
+    "bullets": _bullets,
+    "checklist": _checklist,
+}
+
+
+@dataclass(frozen=True)
+class _Field:
+    name: str
+    filters: tuple[Callable[[Any], str], ...]
+
+    def render(self, context: Mapping[str, Any], template_name: str) -> str:
+        try:
+            value = context[self.name]
+        except KeyError as exc:
+            raise TemplateError(f"Template '{template_name}' requires field '{self.name}'.") from exc
+        for apply in self.filters:
+            value = apply(value)
+        return str(value)
+
+
+class Template:
+    """Pre-parsed template made of literal strings and field placeholders."""
+
+    def __init__(self, name: str, source: str) -> None:
+        self.name = name
+        self.segments = self._compile(source)
+        self.fields = frozenset(segment.name for segment in self.segments if isinstance(segment, _Field))
+        self.sequence_fields = frozenset(
+            segment.name for segment in self.segments if isinstance(segment, _Field) and segment.filters
+        )
+
+    def _compile(self, source: str) -> tuple[str | _Field, ...]:
+        segments: list[str | _Field] = []
+        position = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(source):
+            if match.start() > position:
+                segments.append(source[position : match.start()])
+            filters: list[Callable[[Any], str]] = []
+            for filter_name in filter(None, match.group(2).split("|")):
+                if filter_name not in FILTERS:
+                    raise TemplateError(f"Template '{self.name}' uses unknown filter '{filter_name}'.")
+                filters.append(FILTERS[filter_name])
+            segments.append(_Field(match.group(1), tuple(filters)))
+            position = match.end()
+        if position < len(source):
+            segments.append(source[position:])
+        return tuple(segments)
+
+    def render_to(self, handle: TextIO, context: Mapping[str, Any]) -> None:
+        """Stream the rendered template into ``handle`` segment by segment."""
+        write = handle.write
+        for segment in self.segments:
+            write(segment if isinstance(segment, str) else segment.render(context, self.name))
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        buffer = io.StringIO()
+        self.render_to(buffer, context)
+        return buffer.getvalue()
+
+
+class TemplateEngine:
+    """Resolve, parse, and cache agent templates with on-disk overrides."""
+
+    def __init__(
+        self,
+        *,
+        template_dir: Path | str = DEFAULT_TEMPLATE_DIR,
+        override_dir: Path | str | None = TEMPLATE_OVERRIDE_DIR,
+    ) -> None:
+        self.template_dir = Path(template_dir)
+        self.override_dir = Path(override_dir) if override_dir is not None else None
+        self._cache: dict[str, Template] = {}
+
+    def resolve(self, name: str) -> Path:
+        """Return the file backing ``name`` (e.g. ``designer/design_spec``)."""
+        relative = Path(f"{name}.md")
+        if self.override_dir is not None:
+            candidate = self.override_dir / relative
+            if candidate.is_file():
+                return candidate
+        candidate = self.template_dir / relative
+        if candidate.is_file():
+            return candidate
+        raise TemplateError(f"Template '{name}' not found under {self.template_dir}.")
+
+    def get(self, name: str) -> Template:
+        template = self._cache.get(name)
+        if template is None:
+            source = self.resolve(name).read_text(encoding="utf-8")
+            template = self._cache[name] = Template(name, source)
+        return template
+
+    def render(self, name: str, context: Mapping[str, Any]) -> str:
+        return self.get(name).render(context)
+
+    def render_to(self, handle: TextIO, name: str, context: Mapping[str, Any]) -> None:
+        self.get(name).render_to(handle, context)
+
+    def clear(self) -> None:
+        """Drop cached templates so edited overrides are picked up."""
+        self._cache.clear()
+
+    def names(self) -> Sequence[str]:
+        """List template names available from the default directory."""
+        return sorted(
+            str(path.relative_to(self.template_dir).with_suffix(""))
+            for path in self.template_dir.glob("*/*.md")
+        )
+
+
+_DEFAULT_ENGINE = TemplateEngine()
+
+
+def render(name: str, context: Mapping[str, Any]) -> str:
+    """Convenience wrapper around the default engine."""
+    return _DEFAULT_ENGINE.render(name, context)
+
+
+def render_to(handle: TextIO, name: str, context: Mapping[str, Any]) -> None:
+    """Convenience wrapper around the default engine."""
+    _DEFAULT_ENGINE.render_to(handle, name, context)
@@ -1,3 +1,14 @@
-from .logger import AuditLogger, log_command, log_concern, log_handoff
+from .bus import HandoffBus, HandoffEvent, Subscription, subscribe_handoffs
+from .logger import AuditLogger, log_command, log_concern, log_handoff, log_retention
 
-__all__ = ["AuditLogger", "log_command", "log_concern", "log_handoff"]
+__all__ = [
+    "AuditLogger",
+    "HandoffBus",
+    "HandoffEvent",
+    "Subscription",
+    "log_command",
+    "log_concern",
+    "log_handoff",
+    "log_retention",
+    "subscribe_handoffs",
+]
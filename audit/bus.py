@@ -0,0 +1,210 @@
+"""In-process publish/subscribe bus for handoff events.
+
+``AuditLogger.log_handoff`` appends the JSONL record first (the durable source
+of truth) and then publishes a :class:`HandoffEvent` here. Subscribers register
+with optional ``to_agent`` / ``from_agent`` / ``phase`` filters and receive
+matching events on their own bounded queue. Publishing never blocks: when a
+subscriber's queue is full the event is dropped for that subscriber and
+counted in ``Subscription.dropped`` (it can be recovered from the JSONL log).
+
+Routing is a dictionary lookup per filter combination, so publish cost does
+not grow with the number of unrelated subscribers.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass, field
+from itertools import product
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, MutableMapping, Optional
+
+__all__ = ["HandoffBus", "HandoffEvent", "Subscription", "default_bus", "subscribe_handoffs"]
+
+_RouteKey = tuple[Optional[str], Optional[str], Optional[str]]
+
+DEFAULT_MAXSIZE = 1024
+
+
+@dataclass(frozen=True)
+class HandoffEvent:
+    """Immutable view of a logged handoff entry."""
+
+    timestamp: str
+    phase: str
+    from_agent: str
+    to_agent: str
+    summary: str
+    artifacts: tuple[str, ...] = ()
+    concerns: tuple[str, ...] = ()
+    metadata: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    schema_version: str = ""
+
+    @classmethod
+    def from_entry(cls, entry: Mapping[str, Any]) -> "HandoffEvent":
+        return cls(
+            timestamp=str(entry.get("timestamp", "")),
+            phase=str(entry.get("phase", "")),
+            from_agent=str(entry.get("from_agent", "")),
+            to_agent=str(entry.get("to_agent", "")),
+            summary=str(entry.get("summary", "")),
+            artifacts=tuple(entry.get("artifacts") or ()),
+            concerns=tuple(entry.get("concerns") or ()),
+            metadata=MappingProxyType(dict(entry.get("metadata") or {})),
+            schema_version=str(entry.get("schema_version", "")),
+        )
+
+    def to_entry(self) -> MutableMapping[str, Any]:
+        """Rebuild the JSONL entry this event was published from."""
+        entry: MutableMapping[str, Any] = {
+            "record_type": "handoff",
+            "schema_version": self.schema_version,
+            "timestamp": self.timestamp,
+            "phase": self.phase,
+            "from_agent": self.from_agent,
+            "to_agent": self.to_agent,
+            "summary": self.summary,
+            "artifacts": list(self.artifacts),
+            "concerns": list(self.concerns),
+        }
+        if self.metadata:
+            entry["metadata"] = dict(self.metadata)
+        return entry
+
+
+class Subscription:
+    """Bounded queue of events matching a subscriber's filters."""
+
+    def __init__(self, bus: "HandoffBus", key: _RouteKey, maxsize: int) -> None:
+        self._bus = bus
+        self.key = key
+        self._queue: queue.Queue[HandoffEvent] = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.closed = False
+
+    @property
+    def to_agent(self) -> Optional[str]:
+        return self.key[0]
+
+    @property
+    def from_agent(self) -> Optional[str]:
+        return self.key[1]
+
+    @property
+    def phase(self) -> Optional[str]:
+        return self.key[2]
+
+    def _offer(self, event: HandoffEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> HandoffEvent:
+        """Block until an event arrives; raises ``queue.Empty`` on timeout."""
+        return self._queue.get(timeout=timeout)
+
+    def get_nowait(self) -> HandoffEvent:
+        return self._queue.get_nowait()
+
+    def drain(self) -> list[HandoffEvent]:
+        """Return every queued event without blocking."""
+        events: list[HandoffEvent] = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        if not self.closed:
+            self._bus.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[HandoffEvent]:
+        return iter(self.drain())
+
+
+class HandoffBus:
+    """Route published handoff events to matching subscribers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Copy-on-write routing table so publish never takes the lock.
+        self._routes: Mapping[_RouteKey, tuple[Subscription, ...]] = {}
+
+    def subscribe(
+        self,
+        *,
+        to_agent: Optional[str] = None,
+        from_agent: Optional[str] = None,
+        phase: Optional[str] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> Subscription:
+        """Register a subscriber; ``None`` filters match any value."""
+        if maxsize < 1:
+            raise ValueError("Subscription maxsize must be at least 1.")
+        key: _RouteKey = (to_agent, from_agent, None if phase is None else str(phase))
+        subscription = Subscription(self, key, maxsize)
+        with self._lock:
+            routes = dict(self._routes)
+            routes[key] = routes.get(key, ()) + (subscription,)
+            self._routes = routes
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            routes = dict(self._routes)
+            remaining = tuple(item for item in routes.get(subscription.key, ()) if item is not subscription)
+            if remaining:
+                routes[subscription.key] = remaining
+            else:
+                routes.pop(subscription.key, None)
+            self._routes = routes
+        subscription.closed = True
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._routes)
+
+    def publish(self, event: HandoffEvent) -> int:
+        """Deliver ``event`` to every matching subscriber; return the delivery count."""
+        routes = self._routes
+        if not routes:
+            return 0
+        delivered = 0
+        for key in product((event.to_agent, None), (event.from_agent, None), (event.phase, None)):
+            for subscription in routes.get(key, ()):
+                if subscription._offer(event):
+                    delivered += 1
+        return delivered
+
+    def publish_entry(self, entry: Mapping[str, Any]) -> int:
+        """Publish a logged handoff entry, skipping event construction when nobody listens."""
+        if not self._routes:
+            return 0
+        return self.publish(HandoffEvent.from_entry(entry))
+
+
+_DEFAULT_BUS = HandoffBus()
+
+
+def default_bus() -> HandoffBus:
+    """Return the process-wide bus used by the default audit logger."""
+    return _DEFAULT_BUS
+
+
+def subscribe_handoffs(**kwargs: Any) -> Subscription:
+    """Convenience wrapper around the default bus."""
+    return _DEFAULT_BUS.subscribe(**kwargs)
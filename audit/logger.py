@@ -38,8 +38,23 @@
 #       "arguments": [],
 #       "metadata": {"notes": "Sample command log"}
 #   }
+# - Retention entry:
+#   {
+#       "record_type": "retention",
+#       "schema_version": "0.1.0",
+#       "timestamp": "2024-01-01T00:00:00.000Z",
+#       "phase": "1",
+#       "change_id": "CH-002",
+#       "action": "auto_purge",
+#       "artifacts_purged": ["artifacts/work/CH-002/run-01"],
+#       "artifacts_retained": ["artifacts/work/CH-002/run-02"],
+#       "retention_policy": "purge_successful_runs_after_48h_or_above_2gb",
+#       "metadata": {"bytes_freed": 1024}
+#   }
 #
 # Consumers should treat these structures as append-only JSON Lines documents.
+# Handoff entries are additionally published to the in-process ``HandoffBus``
+# (see ``audit/bus.py``) after the durable append succeeds.
 
 from __future__ import annotations
 
@@ -50,7 +65,9 @@ from pathlib import Path
 from typing import Any, Mapping, MutableMapping, Optional, Sequence
 from uuid import uuid4
 
-__all__ = ["AuditLogger", "log_handoff", "log_concern", "log_command"]
+from .bus import HandoffBus, default_bus
+
+__all__ = ["AuditLogger", "log_handoff", "log_concern", "log_command", "log_retention"]
 
 _ALLOWED_SEVERITIES = {"low", "medium", "high", "critical"}
 
@@ -166,8 +183,42 @@ class CommandPayload:
         return entry
 
 
+@dataclass
+class RetentionPayload:
+    """Structured payload for retention entries."""
+
+    phase: str
+    change_id: str
+    action: str
+    artifacts_purged: Sequence[str] = field(default_factory=tuple)
+    artifacts_retained: Sequence[str] = field(default_factory=tuple)
+    retention_policy: Optional[str] = None
+    notes: Optional[str] = None
+    metadata: Optional[Mapping[str, Any]] = None
+
+    def to_entry(self, *, schema_version: str, timestamp: Optional[str] = None) -> MutableMapping[str, Any]:
+        entry = {
+            "record_type": "retention",
+            "schema_version": schema_version,
+            "timestamp": timestamp or _utc_now(),
+            "phase": str(self.phase),
+            "change_id": self.change_id,
+            "action": self.action,
+            "artifacts_purged": _prepare_sequence(self.artifacts_purged),
+            "artifacts_retained": _prepare_sequence(self.artifacts_retained),
+        }
+        if self.retention_policy:
+            entry["retention_policy"] = self.retention_policy
+        if self.notes:
+            entry["notes"] = self.notes
+        metadata = _prepare_metadata(self.metadata)
+        if metadata:
+            entry["metadata"] = metadata
+        return entry
+
+
 class AuditLogger:
-    """Append-only JSON Lines audit logger for handoff, concern, and command tracking."""
+    """Append-only JSON Lines audit logger for handoff, concern, command, and retention tracking."""
 
     def __init__(
         self,
@@ -176,14 +227,18 @@ class AuditLogger:
         handoff_file: str = "handoff.jsonl",
         concern_file: str = "concerns.jsonl",
         command_file: str = "commands.jsonl",
+        retention_file: str = "retention.jsonl",
         schema_version: str = "0.1.0",
+        bus: Optional[HandoffBus] = None,
     ) -> None:
         self.root = Path(root)
         self.root.mkdir(parents=True, exist_ok=True)
         self.handoff_path = self.root / handoff_file
         self.concern_path = self.root / concern_file
         self.command_path = self.root / command_file
+        self.retention_path = self.root / retention_file
         self.schema_version = schema_version
+        self.bus = bus if bus is not None else default_bus()
 
     def _append(self, path: Path, entry: Mapping[str, Any]) -> Path:
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -215,6 +270,7 @@ class AuditLogger:
         )
         entry = payload.to_entry(schema_version=self.schema_version, timestamp=timestamp)
         self._append(self.handoff_path, entry)
+        self.bus.publish_entry(entry)
         return entry
 
     def log_concern(
@@ -263,6 +319,33 @@ class AuditLogger:
         self._append(self.command_path, entry)
         return entry
 
+    def log_retention(
+        self,
+        *,
+        phase: str,
+        change_id: str,
+        action: str,
+        artifacts_purged: Optional[Sequence[str]] = None,
+        artifacts_retained: Optional[Sequence[str]] = None,
+        retention_policy: Optional[str] = None,
+        notes: Optional[str] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+        timestamp: Optional[str] = None,
+    ) -> MutableMapping[str, Any]:
+        payload = RetentionPayload(
+            phase=phase,
+            change_id=change_id,
+            action=action,
+            artifacts_purged=artifacts_purged or (),
+            artifacts_retained=artifacts_retained or (),
+            retention_policy=retention_policy,
+            notes=notes,
+            metadata=metadata,
+        )
+        entry = payload.to_entry(schema_version=self.schema_version, timestamp=timestamp)
+        self._append(self.retention_path, entry)
+        return entry
+
 
 _DEFAULT_LOGGER = AuditLogger()
 
@@ -280,3 +363,8 @@ def log_concern(**kwargs: Any) -> MutableMapping[str, Any]:
 def log_command(**kwargs: Any) -> MutableMapping[str, Any]:
     """Convenience wrapper around the default logger."""
     return _DEFAULT_LOGGER.log_command(**kwargs)
+
+
+def log_retention(**kwargs: Any) -> MutableMapping[str, Any]:
+    """Convenience wrapper around the default logger."""
+    return _DEFAULT_LOGGER.log_retention(**kwargs)
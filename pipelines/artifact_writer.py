@@ -0,0 +1,182 @@
+"""Write-if-changed artifact writer shared by agents and pipelines.
+
+Generated documents carry volatile stamp lines (``_Auto-generated ... at
+<timestamp>._`` footers, top-level ``"timestamp": ...`` JSON fields as
+``json.dumps(..., indent=2)`` writes them; nested timestamps are content and
+still count as changes). The writer compares
+new content with what is already on disk while ignoring those lines, leaves the
+file untouched when nothing else changed, and otherwise replaces it atomically
+via a temporary file in the same directory followed by ``os.replace``.
+
+Usage:
+
+    from pipelines.artifact_writer import open_artifact, write_artifact
+
+    write_artifact(path, content)
+    with open_artifact(path) as handle:
+        template.render_to(handle, context)
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ContextManager, Iterator, Pattern, Sequence
+
+__all__ = [
+    "ArtifactWriter",
+    "VOLATILE_PATTERNS",
+    "WriteResult",
+    "WriteStats",
+    "atomic_write_bytes",
+    "default_stats",
+    "open_artifact",
+    "write_artifact",
+]
+
+VOLATILE_PATTERNS: tuple[Pattern[str], ...] = (
+    re.compile(r"^_Auto-generated\b.*\bat \d{4}-\d{2}-\d{2}[ T][0-9:.]+Z?\._$"),
+    re.compile(r'^ {2}"timestamp": "[^"]*",?$'),
+)
+
+_DEFAULT_FILE_MODE = 0o644
+
+
+@dataclass(frozen=True)
+class WriteResult:
+    """Outcome of a single artifact write."""
+
+    path: Path
+    written: bool
+    size: int
+
+
+@dataclass
+class WriteStats:
+    """Running totals for an :class:`ArtifactWriter`."""
+
+    written: int = 0
+    skipped: int = 0
+    bytes_written: int = 0
+    bytes_skipped: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "written": self.written,
+            "skipped": self.skipped,
+            "bytes_written": self.bytes_written,
+            "bytes_skipped": self.bytes_skipped,
+        }
+
+    def describe(self) -> str:
+        return (
+            f"{self.written} written ({self.bytes_written} bytes), "
+            f"{self.skipped} unchanged ({self.bytes_skipped} bytes skipped)"
+        )
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` via a sibling temp file and ``os.replace``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = _DEFAULT_FILE_MODE
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class ArtifactWriter:
+    """Skip writes whose content only differs in volatile lines."""
+
+    def __init__(self, *, volatile_patterns: Sequence[Pattern[str]] = VOLATILE_PATTERNS) -> None:
+        self.volatile_patterns = tuple(volatile_patterns)
+        self.stats = WriteStats()
+
+    def _stable_lines(self, content: str) -> list[str]:
+        return [
+            line
+            for line in content.splitlines()
+            if not any(pattern.match(line) for pattern in self.volatile_patterns)
+        ]
+
+    def is_unchanged(self, path: Path, data: bytes, *, encoding: str = "utf-8") -> bool:
+        """Return True when ``path`` already holds ``data`` modulo volatile lines."""
+        try:
+            existing = Path(path).read_bytes()
+        except FileNotFoundError:
+            return False
+        if existing == data:
+            return True
+        try:
+            existing_text = existing.decode(encoding)
+        except UnicodeDecodeError:
+            return False
+        return self._stable_lines(existing_text) == self._stable_lines(data.decode(encoding))
+
+    def write_text(self, path: Path | str, content: str, *, encoding: str = "utf-8") -> WriteResult:
+        path = Path(path)
+        data = content.encode(encoding)
+        if self.is_unchanged(path, data, encoding=encoding):
+            self.stats.skipped += 1
+            self.stats.bytes_skipped += len(data)
+            return WriteResult(path=path, written=False, size=len(data))
+
+        atomic_write_bytes(path, data)
+        self.stats.written += 1
+        self.stats.bytes_written += len(data)
+        return WriteResult(path=path, written=True, size=len(data))
+
+    @contextmanager
+    def open(self, path: Path | str, *, encoding: str = "utf-8") -> Iterator[io.StringIO]:
+        """Collect streamed text and write it on successful exit.
+
+        The text is buffered in memory on purpose. The write-if-changed check
+        needs the complete document before it can decide whether to touch the
+        file, and these artifacts are small rendered documents. Streaming into
+        the temp file would still re-read it for the comparison and would
+        create a temp file for every unchanged render. Write large binary
+        payloads with :func:`atomic_write_bytes` instead.
+        """
+        buffer = io.StringIO()
+        yield buffer
+        self.write_text(path, buffer.getvalue(), encoding=encoding)
+
+    def reset(self) -> WriteStats:
+        """Return the current totals and start counting from zero."""
+        stats, self.stats = self.stats, WriteStats()
+        return stats
+
+
+_DEFAULT_WRITER = ArtifactWriter()
+
+
+def write_artifact(path: Path | str, content: str, *, encoding: str = "utf-8") -> WriteResult:
+    """Convenience wrapper around the default writer."""
+    return _DEFAULT_WRITER.write_text(path, content, encoding=encoding)
+
+
+def open_artifact(path: Path | str, *, encoding: str = "utf-8") -> ContextManager[io.StringIO]:
+    """Convenience wrapper around the default writer."""
+    return _DEFAULT_WRITER.open(path, encoding=encoding)
+
+
+def default_stats() -> WriteStats:
+    """Return the running totals of the default writer."""
+    return _DEFAULT_WRITER.stats
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""Content-addressed blob store shared by Implementer run workspaces.
+
+Blobs are keyed by the sha256 of their content and sharded by the first two
+hex digits: ``artifacts/store/objects/ab/abcdef...``. Ingesting a run
+(``artifacts/work/CH-###/run-*``) hashes every file, stores each distinct
+content once and replaces the run's copy with a hard link to the blob, so N
+runs holding the same test plan cost one file on disk. Each ingested run gets
+a ``.blobs.json`` manifest mapping relative paths to digests.
+
+Blobs are made read-only. Writers in this repo replace files atomically
+(``atomic_write_bytes`` -> ``os.replace``), which swaps the link for a fresh
+inode instead of mutating the shared blob.
+
+When a hard link is impossible (store on another filesystem) the file is left
+in place and only recorded in the manifest. ``--pointer`` ingestion removes
+run files altogether, except the run's ``manifest.json`` which retention reads
+for the run status; :meth:`BlobStore.materialize` links them back.
+
+Garbage collection follows retention: a blob survives while a run that was
+not purged references it in its manifest, or while a hard link outside the
+purged runs still points at it. ``retention.py --store`` runs the collector
+right after enforcing the plan, passing only the runs it actually removed.
+
+Usage:
+
+    from pipelines.blob_store import BlobStore
+
+    store = BlobStore()
+    store.ingest_run(Path("artifacts/work/CH-002/run-01"))
+    store.snapshot_run(Path("artifacts/work/CH-002/run-01"), Path("/tmp/run-01-copy"))
+
+CLI:
+
+    python3 pipelines/blob_store.py ingest artifacts/work/CH-002/run-0*
+    python3 pipelines/blob_store.py snapshot SRC DST
+    python3 pipelines/blob_store.py materialize RUN
+    python3 pipelines/blob_store.py gc [--dry-run]
+    python3 pipelines/blob_store.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import atomic_write_bytes
+
+__all__ = [
+    "BLOB_MANIFEST",
+    "DEFAULT_STORE_ROOT",
+    "BlobStore",
+    "GcStats",
+    "IngestStats",
+    "file_digest",
+    "read_manifest",
+]
+
+DEFAULT_STORE_ROOT = Path("artifacts/store")
+DEFAULT_RUNS_ROOT = Path("artifacts/work")
+OBJECTS_DIR = "objects"
+BLOB_MANIFEST = ".blobs.json"
+RUN_MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+_CHUNK_SIZE = 1024 * 1024
+_BLOB_MODE = 0o444
+
+
+def file_digest(path: Path | str) -> str:
+    """Return the sha256 hex digest of ``path``, streamed in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(run_dir: Path | str) -> Dict[str, str]:
+    """Return ``{relative_path: digest}`` for an ingested run (empty if none)."""
+    try:
+        payload = json.loads((Path(run_dir) / BLOB_MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, Mapping) or payload.get("version") != MANIFEST_VERSION:
+        return {}
+    return dict(payload.get("files", {}))
+
+
+def _write_manifest(run_dir: Path, files: Mapping[str, str]) -> None:
+    payload = {"version": MANIFEST_VERSION, "files": dict(sorted(files.items()))}
+    atomic_write_bytes(run_dir / BLOB_MANIFEST, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def _run_files(run_dir: Path) -> Iterator[tuple[str, Path]]:
+    stack = [run_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False) and entry.name != BLOB_MANIFEST:
+                    path = Path(entry.path)
+                    yield path.relative_to(run_dir).as_posix(), path
+
+
+@dataclass
+class IngestStats:
+    files: int = 0
+    bytes: int = 0
+    new_blobs: int = 0
+    new_bytes: int = 0
+    linked: int = 0
+
+    @property
+    def deduplicated_bytes(self) -> int:
+        return self.bytes - self.new_bytes
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "new_blobs": self.new_blobs,
+            "new_bytes": self.new_bytes,
+            "deduplicated_bytes": self.deduplicated_bytes,
+            "linked": self.linked,
+        }
+
+
+@dataclass
+class GcStats:
+    scanned: int = 0
+    removed: int = 0
+    freed_bytes: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"scanned": self.scanned, "removed": self.removed, "freed_bytes": self.freed_bytes}
+
+
+class BlobStore:
+    """sha256-keyed blob store with hard-link references from run directories."""
+
+    def __init__(self, root: Path | str = DEFAULT_STORE_ROOT) -> None:
+        self.root = Path(root)
+        self.objects = self.root / OBJECTS_DIR
+
+    def path_for(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def has(self, digest: str) -> bool:
+        return self.path_for(digest).is_file()
+
+    def blobs(self) -> Iterator[tuple[str, Path]]:
+        if not self.objects.is_dir():
+            return
+        for shard in sorted(self.objects.iterdir()):
+            if not shard.is_dir():
+                continue
+            for blob in sorted(shard.iterdir()):
+                if not blob.name.startswith("."):
+                    yield shard.name + blob.name, blob
+
+    def put_bytes(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self.path_for(digest)
+        if not blob.exists():
+            atomic_write_bytes(blob, data)
+            os.chmod(blob, _BLOB_MODE)
+        return digest
+
+    def put_file(self, path: Path | str, *, digest: Optional[str] = None) -> tuple[str, bool]:
+        """Store ``path``'s content; return ``(digest, created)``.
+
+        A new blob is created by hard-linking ``path`` into the store (no byte
+        copy); a copy is made only when the store is on another filesystem.
+        """
+        path = Path(path)
+        digest = digest or file_digest(path)
+        blob = self.path_for(digest)
+        if blob.exists():
+            return digest, False
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            return digest, False
+        except OSError:
+            fd, tmp_name = tempfile.mkstemp(dir=blob.parent, prefix=f".{blob.name}.", suffix=".tmp")
+            os.close(fd)
+            try:
+                shutil.copyfile(path, tmp_name)
+                os.replace(tmp_name, blob)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        os.chmod(blob, _BLOB_MODE)
+        return digest, True
+
+    def _link_into(self, digest: str, target: Path) -> bool:
+        """Point ``target`` at the blob via an atomic link swap; False if impossible."""
+        blob = self.path_for(digest)
+        try:
+            if os.path.samefile(blob, target):
+                return True
+        except FileNotFoundError:
+            pass
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_name = target.parent / f".{target.name}.{os.getpid()}.link"
+        try:
+            os.link(blob, tmp_name)
+        except OSError:
+            return False
+        os.replace(tmp_name, target)
+        return True
+
+    def ingest_run(self, run_dir: Path | str, *, pointer: bool = False) -> IngestStats:
+        """Move a run's files into the store and reference them from the run."""
+        run_dir = Path(run_dir)
+        stats = IngestStats()
+        files = read_manifest(run_dir)
+        for relative, path in sorted(_run_files(run_dir)):
+            size = path.stat().st_size
+            digest, created = self.put_file(path)
+            stats.files += 1
+            stats.bytes += size
+            if created:
+                stats.new_blobs += 1
+                stats.new_bytes += size
+            files[relative] = digest
+            if pointer and relative != RUN_MANIFEST:
+                path.unlink()
+            elif self._link_into(digest, path):
+                stats.linked += 1
+        _write_manifest(run_dir, files)
+        return stats
+
+    def materialize(self, run_dir: Path | str) -> int:
+        """Recreate files recorded in ``run_dir``'s manifest; return the count restored."""
+        run_dir = Path(run_dir)
+        restored = 0
+        for relative, digest in read_manifest(run_dir).items():
+            target = run_dir / relative
+            if target.exists():
+                continue
+            if not self._link_into(digest, target):
+                shutil.copyfile(self.path_for(digest), target)
+            restored += 1
+        return restored
+
+    def snapshot_run(self, source: Path | str, destination: Path | str) -> int:
+        """Copy an ingested run as links to its blobs; return the number of files."""
+        source, destination = Path(source), Path(destination)
+        files = read_manifest(source)
+        if not files:
+            raise ValueError(f"{source} has no {BLOB_MANIFEST}; ingest it first")
+        destination.mkdir(parents=True, exist_ok=True)
+        for relative, digest in files.items():
+            target = destination / relative
+            if not self._link_into(digest, target):
+                shutil.copyfile(self.path_for(digest), target)
+        _write_manifest(destination, files)
+        return len(files)
+
+    def collect_garbage(
+        self,
+        *,
+        purged: Iterable[Path | str] = (),
+        runs_root: Path | str = DEFAULT_RUNS_ROOT,
+        dry_run: bool = False,
+    ) -> GcStats:
+        """Remove blobs no surviving run references.
+
+        Every run manifest under ``runs_root`` is live except those of the
+        ``purged`` runs (``RetentionResult.purged``); these do not count even
+        if they still exist, so a dry run reports what the real purge would
+        free. A run retention failed to remove is not in ``purged`` and keeps
+        its blobs. A blob is also kept while it has hard links the purged
+        runs do not account for.
+        """
+        gone: set[str] = set()
+        purged_refs: Counter[str] = Counter()
+        for run_dir in purged:
+            gone.add(os.path.abspath(run_dir))
+            purged_refs.update(read_manifest(run_dir).values())
+        live: set[str] = set()
+        runs_root = Path(runs_root)
+        for manifest in runs_root.glob(f"*/*/{BLOB_MANIFEST}") if runs_root.is_dir() else ():
+            if os.path.abspath(manifest.parent) not in gone:
+                live.update(read_manifest(manifest.parent).values())
+
+        stats = GcStats()
+        for digest, blob in list(self.blobs()):
+            stats.scanned += 1
+            if digest in live:
+                continue
+            info = blob.stat()
+            if info.st_nlink - 1 > purged_refs[digest]:
+                continue
+            stats.removed += 1
+            stats.freed_bytes += info.st_size
+            if not dry_run:
+                os.chmod(blob, stat.S_IWUSR | _BLOB_MODE)
+                blob.unlink()
+        return stats
+
+    def usage(self) -> Dict[str, int]:
+        blobs = 0
+        total = 0
+        for _, blob in self.blobs():
+            blobs += 1
+            total += blob.stat().st_size
+        return {"blobs": blobs, "bytes": total}
+
+
+def _print(payload: Mapping[str, object]) -> None:
+    print(json.dumps(payload, indent=2, sort_keys=True))
+
+
+def _run_dirs(paths: Iterable[Path]) -> List[Path]:
+    return [path for path in paths if path.is_dir()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Content-addressed storage for Implementer run artifacts.")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE_ROOT, help="Blob store root.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Deduplicate run directories into the store.")
+    ingest.add_argument("runs", nargs="+", type=Path)
+    ingest.add_argument("--pointer", action="store_true", help="Keep only the manifests in the run directory.")
+
+    snapshot = sub.add_parser("snapshot", help="Copy an ingested run as links to its blobs.")
+    snapshot.add_argument("source", type=Path)
+    snapshot.add_argument("destination", type=Path)
+
+    materialize = sub.add_parser("materialize", help="Restore files of a pointer-only run.")
+    materialize.add_argument("run", type=Path)
+
+    gc = sub.add_parser("gc", help="Remove blobs no retained run references.")
+    gc.add_argument("--runs-path", type=Path, default=DEFAULT_RUNS_ROOT)
+    gc.add_argument("--dry-run", action="store_true")
+
+    sub.add_parser("stats", help="Report store usage.")
+    args = parser.parse_args(argv)
+
+    store = BlobStore(args.store)
+    if args.command == "ingest":
+        totals = IngestStats()
+        for run_dir in _run_dirs(args.runs):
+            stats = store.ingest_run(run_dir, pointer=args.pointer)
+            for name in ("files", "bytes", "new_blobs", "new_bytes", "linked"):
+                setattr(totals, name, getattr(totals, name) + getattr(stats, name))
+        _print(totals.as_dict())
+    elif args.command == "snapshot":
+        _print({"files": store.snapshot_run(args.source, args.destination)})
+    elif args.command == "materialize":
+        _print({"restored": store.materialize(args.run)})
+    elif args.command == "gc":
+        _print(store.collect_garbage(runs_root=args.runs_path, dry_run=args.dry_run).as_dict())
+    else:
+        _print(store.usage())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Incremental, parallel sha256 checksums for artifact trees.
+
+Files are hashed on a thread pool (``hashlib`` releases the GIL on large
+buffers); files of 1 MiB and more are read through ``mmap`` so the digest
+runs over the page cache without a Python-level copy. Every digest is cached
+in a SQLite table (WAL mode) keyed by ``(device, inode)`` and validated
+against ``(size, mtime_ns)``, so re-validating an unchanged tree costs one
+``stat`` per file. Files modified within the last ``RACY_WINDOW_NS`` are
+hashed but not cached: a write landing in the same mtime tick could
+otherwise leave a stale digest behind.
+
+``tree_digest`` adds Merkle-style directory digests: a directory hashes the
+sorted ``"<kind> <digest> <name>"`` lines of its entries (``f`` file, ``d``
+directory, ``l`` symlink, hashed over its target), so two trees compare
+equal exactly when their contents and layout match, and a changed file
+changes the digest of every directory above it.
+
+Usage:
+
+    from pipelines.checksums import Checksummer
+
+    with Checksummer() as checksummer:
+        digests = checksummer.hash_paths(paths)
+        tree = checksummer.tree_digest(Path("artifacts/work/CH-002/run-03"))
+
+CLI (``sha256sum``-compatible output):
+
+    python3 pipelines/checksums.py artifacts/phase0/demo/2025-11-02/handoff.jsonl
+    python3 pipelines/checksums.py --tree artifacts/work/CH-002
+    python3 pipelines/checksums.py --check artifacts/work/CH-001/run-05/demo_checksum.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import mmap
+import os
+import sqlite3
+import stat
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "artifacts" / "cache" / "checksums.sqlite"
+MMAP_THRESHOLD = 1024 * 1024
+RACY_WINDOW_NS = 2_000_000_000
+_CHUNK_SIZE = 1024 * 1024
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (device, inode)
+) WITHOUT ROWID;
+"""
+
+
+def sha256_file(path: Path | str, *, size: Optional[int] = None) -> str:
+    """Hash ``path``; large files are mapped instead of read in chunks."""
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size if size is None else size
+        if size >= MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return hashlib.sha256(mapped).hexdigest()
+            except (OSError, ValueError):
+                handle.seek(0)
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+@dataclass
+class ChecksumStats:
+    files: int = 0
+    cache_hits: int = 0
+    hashed: int = 0
+    bytes_hashed: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "files": self.files,
+            "cache_hits": self.cache_hits,
+            "hashed": self.hashed,
+            "bytes_hashed": self.bytes_hashed,
+        }
+
+
+@dataclass(frozen=True)
+class TreeDigest:
+    root: str
+    digest: str
+    directories: Dict[str, str] = field(default_factory=dict)
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+class Checksummer:
+    """Parallel sha256 hashing backed by a persistent stat-keyed cache.
+
+    ``cache_path=None`` keeps the cache in memory for the lifetime of the
+    object.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path | str] = DEFAULT_CACHE_PATH,
+        *,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        if cache_path is None:
+            self._conn = sqlite3.connect(":memory:", isolation_level=None)
+        else:
+            cache_path = Path(cache_path)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(cache_path), timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 2)
+        self.stats = ChecksumStats()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "Checksummer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _cached(self, infos: Dict[str, os.stat_result]) -> Dict[str, str]:
+        by_key: Dict[tuple[int, int], List[str]] = {}
+        for path, info in infos.items():
+            by_key.setdefault((info.st_dev, info.st_ino), []).append(path)
+        keys = list(by_key)
+        found: Dict[str, str] = {}
+        for start in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[start : start + _LOOKUP_BATCH]
+            placeholders = ",".join("(?, ?)" for _ in batch)
+            rows = self._conn.execute(
+                f"SELECT device, inode, size, mtime_ns, sha256 FROM hashes WHERE (device, inode) IN (VALUES {placeholders})",
+                [value for key in batch for value in key],
+            )
+            for device, inode, size, mtime_ns, digest in rows:
+                for path in by_key[(device, inode)]:
+                    info = infos[path]
+                    if info.st_size == size and info.st_mtime_ns == mtime_ns:
+                        found[path] = digest
+        return found
+
+    def hash_stats(self, infos: Dict[str, os.stat_result]) -> Dict[str, str]:
+        """Digest every path in ``{path: stat}``; cache misses are hashed in parallel."""
+        digests = self._cached(infos)
+        missing = [path for path in infos if path not in digests]
+        self.stats.files += len(infos)
+        self.stats.cache_hits += len(digests)
+        if not missing:
+            return digests
+
+        def work(path: str) -> str:
+            return sha256_file(path, size=infos[path].st_size)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as pool:
+            fresh = dict(zip(missing, pool.map(work, missing)))
+        digests.update(fresh)
+        self.stats.hashed += len(fresh)
+        self.stats.bytes_hashed += sum(infos[path].st_size for path in fresh)
+
+        horizon = time.time_ns() - RACY_WINDOW_NS
+        rows = [
+            (infos[path].st_dev, infos[path].st_ino, infos[path].st_size, infos[path].st_mtime_ns, digest)
+            for path, digest in fresh.items()
+            if infos[path].st_mtime_ns < horizon
+        ]
+        if rows:
+            with self._transaction() as conn:
+                conn.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)", rows)
+        return digests
+
+    def hash_paths(self, paths: Iterable[Path | str]) -> Dict[str, str]:
+        """Return ``{path: sha256}`` for the regular files among ``paths``."""
+        infos: Dict[str, os.stat_result] = {}
+        for path in paths:
+            info = os.stat(path)
+            if stat.S_ISREG(info.st_mode):
+                infos[str(path)] = info
+        return self.hash_stats(infos)
+
+    def tree_digest(self, root: Path | str) -> TreeDigest:
+        """Hash every file under ``root`` and fold them into per-directory digests."""
+        root = str(root)
+        infos: Dict[str, os.stat_result] = {}
+        links: Dict[str, str] = {}
+        children: Dict[str, List[tuple[str, str, str]]] = {}  # dir -> [(name, kind, path)]
+        order: List[str] = []
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            order.append(directory)
+            entries = children.setdefault(directory, [])
+            with os.scandir(directory) as scan:
+                for entry in scan:
+                    if entry.is_symlink():
+                        links[entry.path] = hashlib.sha256(os.fsencode(os.readlink(entry.path))).hexdigest()
+                        entries.append((entry.name, "l", entry.path))
+                    elif entry.is_dir():
+                        stack.append(entry.path)
+                        entries.append((entry.name, "d", entry.path))
+                    elif entry.is_file():
+                        infos[entry.path] = entry.stat()
+                        entries.append((entry.name, "f", entry.path))
+
+        digests = self.hash_stats(infos)
+        digests.update(links)
+        directories: Dict[str, str] = {}
+        for directory in reversed(order):  # children are always visited after their parent
+            listing = "".join(
+                f"{kind} {digests[path]} {name}\n" for name, kind, path in sorted(children[directory])
+            )
+            digests[directory] = directories[directory] = hashlib.sha256(listing.encode("utf-8")).hexdigest()
+        files = {path: digests[path] for path in infos}
+        return TreeDigest(root=root, digest=directories[root], directories=directories, files=files)
+
+
+def _check(checksummer: Checksummer, manifest: Path) -> int:
+    expected: Dict[str, str] = {}
+    for line in manifest.read_text(encoding="utf-8").splitlines():
+        digest, _, name = line.partition("  ")
+        if digest and name:
+            expected[name.lstrip("*")] = digest.strip()
+    present = [name for name in expected if os.path.isfile(name)]
+    actual = checksummer.hash_paths(present)
+    failures = 0
+    for name, digest in expected.items():
+        ok = actual.get(name) == digest
+        failures += not ok
+        print(f"{name}: {'OK' if ok else ('FAILED' if name in actual else 'MISSING')}")
+    return 1 if failures else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Incremental sha256 checksums for artifacts.")
+    parser.add_argument("paths", nargs="*", type=Path, help="Files or directories to hash.")
+    parser.add_argument("--tree", action="store_true", help="Print Merkle digests of directories instead of files.")
+    parser.add_argument("--check", type=Path, help="Verify a sha256sum-format checksum file.")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE_PATH, help="Path to the checksum cache database.")
+    parser.add_argument("--no-cache", action="store_true", help="Hash everything and keep no cache.")
+    parser.add_argument("--workers", type=int, help="Hashing threads.")
+    parser.add_argument("--stats", action="store_true", help="Report cache hits on stderr.")
+    args = parser.parse_args(argv)
+    if not args.paths and not args.check:
+        parser.error("give paths to hash or --check FILE")
+
+    with Checksummer(None if args.no_cache else args.cache, max_workers=args.workers) as checksummer:
+        if args.check:
+            exit_code = _check(checksummer, args.check)
+        else:
+            exit_code = 0
+            for path in args.paths:
+                if path.is_dir():
+                    tree = checksummer.tree_digest(path)
+                    if args.tree:
+                        for directory, digest in sorted(tree.directories.items()):
+                            print(f"{digest}  {directory.rstrip(os.sep)}{os.sep}")
+                    else:
+                        for name, digest in sorted(tree.files.items()):
+                            print(f"{digest}  {name}")
+                else:
+                    for name, digest in checksummer.hash_paths([path]).items():
+                        print(f"{digest}  {name}")
+        if args.stats:
+            print(" ".join(f"{key}={value}" for key, value in checksummer.stats.as_dict().items()), file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,6 +16,7 @@ if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from audit import AuditLogger
+from pipelines.artifact_writer import write_artifact
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_AUDIT_ROOT = PROJECT_ROOT / "audit"
@@ -244,7 +245,7 @@ def sync_concerns(
     if not updated.endswith("\n"):
         updated += "\n"
 
-    project_detail_path.write_text(updated, encoding="utf-8")
+    write_artifact(project_detail_path, updated)
     return section
 
 
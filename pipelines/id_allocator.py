@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Process-safe allocation of change ids (``CH-###``) and run ids (``run-NN``).
+
+Counters live in a SQLite database (WAL mode). Each allocation runs in a
+``BEGIN IMMEDIATE`` transaction, which serialises allocators across threads
+and processes, bumps the counter for its scope and reserves the directory
+with an exclusive ``mkdir`` before committing, so two executors can never be
+handed the same id. A scope is the absolute path of the parent directory
+(``changes/`` for change ids, ``artifacts/work/CH-###/`` for run ids).
+
+The first allocation in a scope seeds the counter from the highest id
+still known anywhere, so neither hand-made ``run-07`` directories nor runs
+that retention has since removed are reused. Run ids are seeded from the
+run directories, the bundles ``run_archive.py`` wrote under
+``artifacts/archive/CH-###/`` and the runs recorded in the manifest index;
+change ids from the workspaces under ``changes/``, ``artifacts/work`` and
+the archive. If a directory appears later without going through the
+allocator, the ``mkdir`` collision simply moves the counter past it.
+
+The database is still the only record of runs that were purged without
+being archived and have dropped out of the manifest index: losing it may
+hand such ids out again, so keep it alongside the artifacts it numbers.
+
+Usage:
+
+    from pipelines.id_allocator import IdAllocator
+
+    with IdAllocator() as allocator:
+        change_id = allocator.allocate_change()             # "CH-003"
+        runs = allocator.allocate_runs("CH-002", count=4)   # ["run-07", ..., "run-10"]
+
+CLI:
+
+    python3 pipelines/id_allocator.py change
+    python3 pipelines/id_allocator.py run CH-002 [--count 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.manifest_index import DEFAULT_INDEX_PATH, ManifestIndex
+from pipelines.run_archive import BUNDLE_SUFFIX
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = PROJECT_ROOT / "artifacts" / "cache" / "ids.sqlite"
+DEFAULT_CHANGES_ROOT = Path("changes")
+DEFAULT_WORK_ROOT = Path("artifacts/work")
+CHANGE_PREFIX, CHANGE_WIDTH = "CH-", 3
+RUN_PREFIX, RUN_WIDTH = "run-", 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    scope TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def id_number(name: str, prefix: str) -> Optional[int]:
+    """Return the numeric part of ``<prefix><digits>``, or None."""
+    digits = name[len(prefix) :]
+    return int(digits) if name.startswith(prefix) and digits.isdigit() else None
+
+
+def sort_key(name: str) -> tuple[str, int, str]:
+    """Order ``run-9`` before ``run-10`` (plain sorting would not)."""
+    head = name.rstrip("0123456789")
+    digits = name[len(head) :]
+    return head, int(digits) if digits else -1, name
+
+
+def _highest(parent: Path, prefix: str) -> int:
+    if not parent.is_dir():
+        return 0
+    numbers = [id_number(entry.name, prefix) for entry in parent.iterdir()]
+    return max((number for number in numbers if number is not None), default=0)
+
+
+def _highest_archived(archive_dir: Path) -> int:
+    if not archive_dir.is_dir():
+        return 0
+    numbers = [
+        id_number(entry.name[: -len(BUNDLE_SUFFIX)], RUN_PREFIX)
+        for entry in archive_dir.iterdir()
+        if entry.name.endswith(BUNDLE_SUFFIX)
+    ]
+    return max((number for number in numbers if number is not None), default=0)
+
+
+def _highest_indexed(change_root: Path, index_path: Optional[Path]) -> int:
+    if index_path is None or not Path(index_path).exists():
+        return 0
+    change_root = change_root.resolve()
+    with ManifestIndex(index_path, work_root=change_root.parent) as index:
+        numbers = [
+            id_number(entry.run_id, RUN_PREFIX)
+            for entry in index.query(change_id=change_root.name)
+            if Path(entry.path).resolve().parent.parent == change_root
+        ]
+    return max((number for number in numbers if number is not None), default=0)
+
+
+def highest_run(
+    change_root: Path | str,
+    *,
+    archive_root: Optional[Path | str] = None,
+    index_path: Optional[Path | str] = DEFAULT_INDEX_PATH,
+) -> int:
+    """Highest run number ever used under ``change_root`` (``<work_root>/CH-###``).
+
+    Counts run directories, archived ``run-NN.tar.gz`` bundles (``archive_root``
+    defaults to the ``archive`` sibling of the work root) and manifest index rows.
+    """
+    change_root = Path(change_root)
+    if archive_root is None:
+        archive_root = change_root.parent.parent / "archive"
+    return max(
+        _highest(change_root, RUN_PREFIX),
+        _highest_archived(Path(archive_root) / change_root.name),
+        _highest_indexed(change_root, Path(index_path) if index_path is not None else None),
+    )
+
+
+class IdAllocator:
+    """SQLite-backed id counters that also reserve the matching directories."""
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_DB_PATH,
+        *,
+        changes_root: Path | str = DEFAULT_CHANGES_ROOT,
+        work_root: Path | str = DEFAULT_WORK_ROOT,
+        archive_root: Optional[Path | str] = None,
+        index_path: Optional[Path | str] = DEFAULT_INDEX_PATH,
+    ) -> None:
+        self.path = Path(path)
+        self.changes_root = Path(changes_root)
+        self.work_root = Path(work_root)
+        self.archive_root = Path(archive_root) if archive_root is not None else self.work_root.parent / "archive"
+        self.index_path = Path(index_path) if index_path is not None else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "IdAllocator":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _seed(self, parent: Path, prefix: str) -> int:
+        """Highest id already used in ``parent``'s scope, including purged and archived ones."""
+        if prefix == CHANGE_PREFIX and parent.resolve() == self.changes_root.resolve():
+            return max(_highest(root, prefix) for root in (self.changes_root, self.work_root, self.archive_root))
+        if prefix == RUN_PREFIX and parent.resolve().parent == self.work_root.resolve():
+            return highest_run(parent, archive_root=self.archive_root, index_path=self.index_path)
+        return _highest(parent, prefix)
+
+    def allocate(self, parent: Path | str, prefix: str, width: int, *, count: int = 1) -> List[str]:
+        """Reserve ``count`` consecutive-or-later ids as directories under ``parent``."""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        parent = Path(parent)
+        scope = str(parent.resolve())
+        parent.mkdir(parents=True, exist_ok=True)
+        allocated: List[str] = []
+        with self._transaction() as conn:
+            row = conn.execute("SELECT value FROM counters WHERE scope = ?", (scope,)).fetchone()
+            value = row[0] if row is not None else self._seed(parent, prefix)
+            while len(allocated) < count:
+                value += 1
+                name = f"{prefix}{value:0{width}d}"
+                try:
+                    (parent / name).mkdir()
+                except FileExistsError:
+                    continue
+                allocated.append(name)
+            conn.execute(
+                "INSERT INTO counters (scope, value) VALUES (?, ?) "
+                "ON CONFLICT (scope) DO UPDATE SET value = excluded.value",
+                (scope, value),
+            )
+        return allocated
+
+    def allocate_change(self) -> str:
+        """Reserve the next ``CH-###`` workspace under ``changes_root``."""
+        return self.allocate(self.changes_root, CHANGE_PREFIX, CHANGE_WIDTH)[0]
+
+    def allocate_runs(self, change_id: str, *, count: int = 1) -> List[str]:
+        """Reserve the next ``count`` ``run-NN`` directories for ``change_id``."""
+        return self.allocate(self.work_root / change_id, RUN_PREFIX, RUN_WIDTH, count=count)
+
+    def allocate_run(self, change_id: str) -> str:
+        return self.allocate_runs(change_id)[0]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Allocate change and run identifiers.")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="Path to the allocator SQLite database.")
+    parser.add_argument("--changes-root", default=str(DEFAULT_CHANGES_ROOT))
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT))
+    parser.add_argument("--archive-root", help="Run archive consulted when seeding (default: <work-root>/../archive).")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH), help="Manifest index consulted when seeding.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("change", help="Reserve the next CH-### workspace.")
+    run = sub.add_parser("run", help="Reserve run directories for a change.")
+    run.add_argument("change_id")
+    run.add_argument("--count", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with IdAllocator(
+        args.db,
+        changes_root=args.changes_root,
+        work_root=args.work_root,
+        archive_root=args.archive_root,
+        index_path=args.index,
+    ) as allocator:
+        if args.command == "change":
+            print(allocator.allocate_change())
+        else:
+            for run_id in allocator.allocate_runs(args.change_id, count=args.count):
+                print(run_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
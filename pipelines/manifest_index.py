@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Incrementally maintained index over run manifests under ``artifacts/work``.
+
+Every ``CH-*/run-*/manifest.json`` is recorded once in a SQLite database
+(WAL mode) with its change id, run id, stage, task, timestamp and output
+paths, so questions such as "which runs produced ``docs/PROJECT_DETAIL.md``"
+or "all Execute-stage runs for CH-002" are answered from indexed columns
+instead of opening every manifest.
+
+``refresh()`` walks the work root with ``os.scandir`` and compares each
+manifest's ``(mtime_ns, size)`` with the stored row: unchanged manifests are
+not read, changed ones are re-parsed, and rows for deleted runs (e.g. purged
+by ``retention.py``) are dropped, all in one transaction.
+
+CLI usage:
+
+    python3 pipelines/manifest_index.py refresh [--work-root artifacts/work]
+    python3 pipelines/manifest_index.py query --change CH-002 --stage Execute
+    python3 pipelines/manifest_index.py query --output docs/PROJECT_DETAIL.md
+    python3 pipelines/manifest_index.py query --output 'docs/*.md' --since 2025-11-02
+    python3 pipelines/manifest_index.py stats
+
+``query`` refreshes the index first unless ``--no-refresh`` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_INDEX_PATH = PROJECT_ROOT / "artifacts" / "cache" / "manifest_index.sqlite"
+DEFAULT_WORK_ROOT = PROJECT_ROOT / "artifacts" / "work"
+MANIFEST_NAME = "manifest.json"
+_GLOB_CHARS = frozenset("*?[")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifests (
+    path TEXT PRIMARY KEY,
+    change_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    stage TEXT COLLATE NOCASE,
+    task TEXT,
+    timestamp TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS manifests_change ON manifests (change_id, timestamp);
+CREATE INDEX IF NOT EXISTS manifests_stage ON manifests (stage, change_id, timestamp);
+CREATE INDEX IF NOT EXISTS manifests_task ON manifests (task, timestamp);
+CREATE INDEX IF NOT EXISTS manifests_time ON manifests (timestamp);
+CREATE TABLE IF NOT EXISTS outputs (
+    manifest TEXT NOT NULL REFERENCES manifests (path) ON DELETE CASCADE,
+    output TEXT NOT NULL,
+    PRIMARY KEY (output, manifest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS outputs_manifest ON outputs (manifest);
+"""
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    change_id: str
+    run_id: str
+    stage: Optional[str]
+    task: Optional[str]
+    timestamp: Optional[str]
+    path: str
+    outputs: tuple[str, ...] = ()
+    document: Mapping[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "change_id": self.change_id,
+            "run_id": self.run_id,
+            "stage": self.stage,
+            "task": self.task,
+            "timestamp": self.timestamp,
+            "path": self.path,
+            "outputs": list(self.outputs),
+        }
+
+
+@dataclass(frozen=True)
+class RefreshStats:
+    scanned: int
+    updated: int
+    removed: int
+    invalid: int
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"scanned": self.scanned, "updated": self.updated, "removed": self.removed, "invalid": self.invalid}
+
+
+def _scan(work_root: Path) -> Iterator[tuple[str, str, str, os.stat_result]]:
+    """Yield ``(change_id, run_id, manifest_path, stat)`` for every run manifest."""
+    try:
+        changes = os.scandir(work_root)
+    except FileNotFoundError:
+        return
+    with changes:
+        for change in changes:
+            if not change.name.startswith("CH-") or not change.is_dir():
+                continue
+            with os.scandir(change.path) as runs:
+                for run in runs:
+                    if not run.name.startswith("run-") or not run.is_dir():
+                        continue
+                    path = os.path.join(run.path, MANIFEST_NAME)
+                    try:
+                        info = os.stat(path)
+                    except OSError:
+                        continue
+                    yield change.name, run.name, path, info
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class ManifestIndex:
+    """SQLite-backed manifest index (WAL mode, safe for concurrent readers)."""
+
+    def __init__(self, path: Path | str = DEFAULT_INDEX_PATH, *, work_root: Path | str = DEFAULT_WORK_ROOT) -> None:
+        self.path = Path(path)
+        self.work_root = Path(work_root)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ManifestIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def refresh(self) -> RefreshStats:
+        """Bring the index in line with the manifests currently on disk."""
+        known = {
+            row["path"]: (row["mtime_ns"], row["size"])
+            for row in self._conn.execute("SELECT path, mtime_ns, size FROM manifests")
+        }
+        scanned = updated = invalid = 0
+        with self._transaction() as conn:
+            for change_id, run_id, path, info in _scan(self.work_root):
+                scanned += 1
+                signature = known.pop(path, None)
+                if signature == (info.st_mtime_ns, info.st_size):
+                    continue
+                try:
+                    with open(path, "r", encoding="utf-8") as handle:
+                        document = json.load(handle)
+                except (OSError, ValueError):
+                    document = None
+                if not isinstance(document, Mapping):
+                    invalid += 1
+                    document = {}
+                self._store(conn, path, change_id, run_id, document, info)
+                updated += 1
+            for path in known:
+                conn.execute("DELETE FROM manifests WHERE path = ?", (path,))
+        return RefreshStats(scanned=scanned, updated=updated, removed=len(known), invalid=invalid)
+
+    @staticmethod
+    def _store(
+        conn: sqlite3.Connection,
+        path: str,
+        change_id: str,
+        run_id: str,
+        document: Mapping[str, Any],
+        info: os.stat_result,
+    ) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO manifests "
+            "(path, change_id, run_id, stage, task, timestamp, mtime_ns, size, document) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                str(document.get("change_id") or change_id),
+                str(document.get("run_id") or run_id),
+                _text(document.get("stage")),
+                _text(document.get("task")),
+                _text(document.get("timestamp")),
+                info.st_mtime_ns,
+                info.st_size,
+                json.dumps(document, separators=(",", ":"), sort_keys=True),
+            ),
+        )
+        conn.execute("DELETE FROM outputs WHERE manifest = ?", (path,))
+        outputs = document.get("outputs") or []
+        if isinstance(outputs, list):
+            conn.executemany(
+                "INSERT OR IGNORE INTO outputs (manifest, output) VALUES (?, ?)",
+                [(path, str(output)) for output in outputs],
+            )
+
+    def query(
+        self,
+        *,
+        change_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        stage: Optional[str] = None,
+        task: Optional[str] = None,
+        output: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+        include_document: bool = False,
+    ) -> List[ManifestEntry]:
+        """Return matching runs ordered by timestamp.
+
+        ``output`` matches exactly, or as a SQLite ``GLOB`` when it contains
+        ``*``, ``?`` or ``[``. Stage comparisons ignore case.
+        """
+        query = "SELECT DISTINCT m.path, m.change_id, m.run_id, m.stage, m.task, m.timestamp, m.document FROM manifests m"
+        clauses: List[str] = []
+        params: List[Any] = []
+        if output is not None:
+            query += " JOIN outputs o ON o.manifest = m.path"
+            clauses.append("o.output GLOB ?" if _GLOB_CHARS & set(output) else "o.output = ?")
+            params.append(output)
+        for column, value in (("m.change_id", change_id), ("m.run_id", run_id), ("m.task", task)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if stage is not None:
+            clauses.append("m.stage = ?")
+            params.append(stage)
+        if since is not None:
+            clauses.append("m.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("m.timestamp <= ?")
+            params.append(until)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY m.timestamp, m.change_id, m.run_id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        rows = self._conn.execute(query, params).fetchall()
+        outputs: Dict[str, List[str]] = {row["path"]: [] for row in rows}
+        if outputs:
+            placeholders = ",".join("?" * len(outputs))
+            for row in self._conn.execute(
+                f"SELECT manifest, output FROM outputs WHERE manifest IN ({placeholders}) ORDER BY output",
+                list(outputs),
+            ):
+                outputs[row["manifest"]].append(row["output"])
+        return [
+            ManifestEntry(
+                change_id=row["change_id"],
+                run_id=row["run_id"],
+                stage=row["stage"],
+                task=row["task"],
+                timestamp=row["timestamp"],
+                path=row["path"],
+                outputs=tuple(outputs[row["path"]]),
+                document=json.loads(row["document"]) if include_document else {},
+            )
+            for row in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self._conn.execute(
+            "SELECT COUNT(*) AS runs, COUNT(DISTINCT change_id) AS changes FROM manifests"
+        ).fetchone()
+        stages = {
+            row["stage"] or "": row["runs"]
+            for row in self._conn.execute("SELECT stage, COUNT(*) AS runs FROM manifests GROUP BY stage ORDER BY stage")
+        }
+        outputs = self._conn.execute("SELECT COUNT(DISTINCT output) FROM outputs").fetchone()[0]
+        return {"runs": counts["runs"], "changes": counts["changes"], "outputs": outputs, "stages": stages}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Index and query run manifests under artifacts/work.")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH), help="Path to the manifest index SQLite database.")
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT), help="Root containing CH-*/run-* workspaces.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("refresh", help="Re-index changed manifests.")
+
+    query = sub.add_parser("query", help="List runs matching all given filters.")
+    query.add_argument("--change", dest="change_id")
+    query.add_argument("--run", dest="run_id")
+    query.add_argument("--stage")
+    query.add_argument("--task")
+    query.add_argument("--output", help="Output path produced by the run (glob patterns allowed).")
+    query.add_argument("--since", help="Inclusive lower bound on the manifest timestamp.")
+    query.add_argument("--until", help="Inclusive upper bound on the manifest timestamp.")
+    query.add_argument("--limit", type=int)
+    query.add_argument("--full", action="store_true", help="Print the full manifest documents.")
+    query.add_argument("--no-refresh", action="store_true", help="Query the index as-is.")
+
+    sub.add_parser("stats", help="Summarise the index.")
+
+    args = parser.parse_args(argv)
+    with ManifestIndex(args.index, work_root=args.work_root) as index:
+        if args.command == "refresh":
+            print(json.dumps(index.refresh().as_dict(), sort_keys=True))
+        elif args.command == "query":
+            if not args.no_refresh:
+                index.refresh()
+            entries = index.query(
+                change_id=args.change_id,
+                run_id=args.run_id,
+                stage=args.stage,
+                task=args.task,
+                output=args.output,
+                since=args.since,
+                until=args.until,
+                limit=args.limit,
+                include_document=args.full,
+            )
+            for entry in entries:
+                print(json.dumps(entry.document if args.full else entry.as_dict(), sort_keys=True))
+        else:
+            index.refresh()
+            print(json.dumps(index.stats(), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
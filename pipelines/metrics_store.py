@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Append-only QA metrics time series with daily rollups.
+
+Every enforced run can record its numeric metrics as samples keyed by
+``(change_id, run_id, metric)``. Samples are never updated; re-recording the
+same run is a no-op. A ``rollups`` table keeps per-metric daily count, sum,
+min and max, maintained in the same transaction as each insert, so trend
+queries over months of runs read one row per day instead of every sample.
+
+``baseline(metric, window)`` returns the median of the last ``window`` samples
+and backs the ``regression`` gate type in ``QA_POLICY.yaml``; ``recent`` feeds
+the aggregate functions of expression gates (see ``policy_expr``).
+
+CLI usage:
+
+    python3 pipelines/metrics_store.py record --change-id CH-002 --run-id run-03 --metrics qa_metrics.json
+    python3 pipelines/metrics_store.py import [--work-root artifacts/work]
+    python3 pipelines/metrics_store.py trend coverage [--since 2025-01-01] [--until 2025-12-31]
+    python3 pipelines/metrics_store.py history coverage [--limit 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STORE_PATH = PROJECT_ROOT / "artifacts" / "metrics" / "history.sqlite"
+DEFAULT_WORK_ROOT = PROJECT_ROOT / "artifacts" / "work"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    change_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    recorded_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    UNIQUE (change_id, run_id, metric)
+);
+CREATE INDEX IF NOT EXISTS samples_metric_time ON samples (metric, recorded_at, id);
+CREATE INDEX IF NOT EXISTS samples_change ON samples (change_id, metric, recorded_at);
+CREATE TABLE IF NOT EXISTS rollups (
+    metric TEXT NOT NULL,
+    day TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    minimum REAL NOT NULL,
+    maximum REAL NOT NULL,
+    PRIMARY KEY (metric, day)
+);
+"""
+
+
+def _format_timestamp(dt: datetime) -> str:
+    """Return timestamp consistent with audit logger formatting."""
+    return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _utc_now() -> str:
+    return _format_timestamp(datetime.now(timezone.utc))
+
+
+def numeric_metrics(metrics: Mapping[str, Any]) -> dict[str, float]:
+    """Keep the numeric (and boolean) top-level metrics as floats."""
+    return {
+        name: float(value)
+        for name, value in metrics.items()
+        if isinstance(value, (int, float)) and name != "timestamp"
+    }
+
+
+@dataclass(frozen=True)
+class Sample:
+    change_id: str
+    run_id: str
+    metric: str
+    value: float
+    recorded_at: str
+
+
+@dataclass(frozen=True)
+class TrendPoint:
+    day: str
+    count: int
+    mean: float
+    minimum: float
+    maximum: float
+
+
+class MetricsStore:
+    """SQLite-backed metrics history (WAL mode, safe for concurrent readers)."""
+
+    def __init__(self, path: Path | str = DEFAULT_STORE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "MetricsStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def record(
+        self,
+        change_id: str,
+        run_id: str,
+        metrics: Mapping[str, Any],
+        *,
+        recorded_at: Optional[str] = None,
+    ) -> int:
+        """Append the numeric ``metrics`` of one run; return the number of new samples."""
+        recorded_at = recorded_at or _utc_now()
+        day = recorded_at[:10]
+        inserted = 0
+        with self._transaction() as conn:
+            for metric, value in numeric_metrics(metrics).items():
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO samples (change_id, run_id, metric, value, recorded_at, day) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (change_id, run_id, metric, value, recorded_at, day),
+                )
+                if cursor.rowcount != 1:
+                    continue
+                inserted += 1
+                conn.execute(
+                    """
+                    INSERT INTO rollups (metric, day, count, total, minimum, maximum) VALUES (?, ?, 1, ?, ?, ?)
+                    ON CONFLICT (metric, day) DO UPDATE SET
+                        count = count + 1,
+                        total = total + excluded.total,
+                        minimum = MIN(minimum, excluded.minimum),
+                        maximum = MAX(maximum, excluded.maximum)
+                    """,
+                    (metric, day, value, value, value),
+                )
+        return inserted
+
+    def history(
+        self,
+        metric: str,
+        *,
+        limit: Optional[int] = None,
+        change_id: Optional[str] = None,
+    ) -> list[Sample]:
+        """Return the most recent samples of ``metric`` in chronological order."""
+        query = "SELECT change_id, run_id, metric, value, recorded_at FROM samples WHERE metric = ?"
+        params: list[Any] = [metric]
+        if change_id is not None:
+            query += " AND change_id = ?"
+            params.append(change_id)
+        query += " ORDER BY recorded_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self._conn.execute(query, params).fetchall()
+        return [Sample(**dict(row)) for row in reversed(rows)]
+
+    def recent(self, metric: str, window: int) -> list[float]:
+        """Values of the last ``window`` samples of ``metric`` in chronological order."""
+        return [sample.value for sample in self.history(metric, limit=window)]
+
+    def baseline(self, metric: str, window: int, *, change_id: Optional[str] = None) -> Optional[float]:
+        """Median of the last ``window`` samples of ``metric``; None when there is no history."""
+        values = [sample.value for sample in self.history(metric, limit=window, change_id=change_id)]
+        return statistics.median(values) if values else None
+
+    def trend(
+        self,
+        metric: str,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        change_id: Optional[str] = None,
+    ) -> list[TrendPoint]:
+        """Daily aggregates for ``metric`` between ``since`` and ``until`` (inclusive ISO dates)."""
+        if change_id is None:
+            query = "SELECT day, count, total, minimum, maximum FROM rollups WHERE metric = ?"
+            params: list[Any] = [metric]
+        else:
+            query = (
+                "SELECT day, COUNT(*) AS count, SUM(value) AS total, MIN(value) AS minimum, MAX(value) AS maximum "
+                "FROM samples WHERE metric = ? AND change_id = ?"
+            )
+            params = [metric, change_id]
+        if since is not None:
+            query += " AND day >= ?"
+            params.append(since[:10])
+        if until is not None:
+            query += " AND day <= ?"
+            params.append(until[:10])
+        if change_id is not None:
+            query += " GROUP BY day"
+        query += " ORDER BY day"
+        return [
+            TrendPoint(
+                day=row["day"],
+                count=row["count"],
+                mean=row["total"] / row["count"],
+                minimum=row["minimum"],
+                maximum=row["maximum"],
+            )
+            for row in self._conn.execute(query, params)
+        ]
+
+    def metrics(self) -> list[str]:
+        return [row[0] for row in self._conn.execute("SELECT DISTINCT metric FROM rollups ORDER BY metric")]
+
+
+def import_work(store: MetricsStore, work_root: Path = DEFAULT_WORK_ROOT) -> int:
+    """Backfill samples from ``CH-*/run-*/qa_metrics.json`` files; return new sample count."""
+    inserted = 0
+    for path in sorted(Path(work_root).glob("CH-*/run-*/qa_metrics.json")):
+        try:
+            metrics = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            continue
+        recorded_at = metrics.get("timestamp") or _format_timestamp(
+            datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
+        )
+        inserted += store.record(path.parent.parent.name, path.parent.name, metrics, recorded_at=str(recorded_at))
+    return inserted
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Query and update the QA metrics history.")
+    parser.add_argument("--store", default=str(DEFAULT_STORE_PATH), help="Path to the metrics SQLite database.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Append one run's metrics.")
+    record.add_argument("--change-id", required=True)
+    record.add_argument("--run-id", required=True)
+    record.add_argument("--metrics", required=True, help="Path to JSON metrics file.")
+
+    importer = sub.add_parser("import", help="Backfill from change workspaces.")
+    importer.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT))
+
+    trend = sub.add_parser("trend", help="Daily aggregates for a metric.")
+    trend.add_argument("metric")
+    trend.add_argument("--since")
+    trend.add_argument("--until")
+    trend.add_argument("--change-id")
+
+    history = sub.add_parser("history", help="Most recent samples for a metric.")
+    history.add_argument("metric")
+    history.add_argument("--limit", type=int, default=20)
+    history.add_argument("--change-id")
+
+    args = parser.parse_args(argv)
+    with MetricsStore(args.store) as store:
+        if args.command == "record":
+            metrics = json.loads(Path(args.metrics).read_text(encoding="utf-8"))
+            print(f"Recorded {store.record(args.change_id, args.run_id, metrics)} samples.")
+        elif args.command == "import":
+            print(f"Imported {import_work(store, Path(args.work_root))} samples.")
+        elif args.command == "trend":
+            for point in store.trend(args.metric, since=args.since, until=args.until, change_id=args.change_id):
+                print(json.dumps(asdict(point), sort_keys=True))
+        else:
+            for sample in store.history(args.metric, limit=args.limit, change_id=args.change_id):
+                print(json.dumps(asdict(sample), sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
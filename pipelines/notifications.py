@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""Asynchronous dispatcher for QA policy ``notifications.on_failure`` actions.
+
+``qa_enforcer`` turns each failing gate into a :class:`FailureEvent` and
+submits it once per configured action. ``submit`` never blocks: events go onto
+a bounded queue drained by a background thread, which groups them into batches
+per action and runs the action's handler. If a handler raises, the batch is
+retried with exponential backoff up to ``max_attempts`` times. An event is
+accepted only once per ``(action, change_id, gate_id)`` for the life of the
+dispatcher. A slow or unreachable target therefore delays only the final
+``close`` (bounded by its timeout), never gate evaluation.
+
+Built-in actions:
+
+- ``raise_concern``: a concern per failing gate via ``concern_tools``. A gate
+  that already has an open QA concern for the same change is skipped, so
+  repeated enforcement runs do not pile up duplicates.
+- ``notify_human``: one JSON ``POST`` per batch to a webhook (the policy's
+  ``notifications.webhook_url`` or ``qa_enforcer --notify-webhook``), tagged
+  with ``notifications.discord_channel``.
+
+A local stand-in for the webhook target, which prints each payload it receives:
+
+    python3 pipelines/notifications.py sink [--port 8765] [--fail-first 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines import concern_tools
+
+__all__ = [
+    "ConcernAction",
+    "DispatchStats",
+    "FailureEvent",
+    "NotificationDispatcher",
+    "WebhookAction",
+    "WebhookSink",
+    "build_actions",
+    "failure_events",
+]
+
+QA_CONCERN_SOURCE = "qa_enforcer"
+
+Handler = Callable[[Sequence["FailureEvent"]], None]
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+@dataclass(frozen=True)
+class FailureEvent:
+    """A failing gate for one change run."""
+
+    change_id: str
+    gate_id: str
+    phase: str
+    message: str
+    status: str = "fail"
+    run_id: str = ""
+    policy_digest: str = ""
+    timestamp: str = field(default_factory=_utc_now)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def failure_events(
+    evaluation: Mapping[str, Any],
+    *,
+    change_id: str,
+    phase: str,
+    run_id: str = "",
+    policy_digest: str = "",
+    passing_statuses: Sequence[str] = ("pass", "skipped"),
+) -> List[FailureEvent]:
+    """Build one event per gate in ``evaluation`` whose status is not passing."""
+    return [
+        FailureEvent(
+            change_id=change_id,
+            gate_id=gate["id"],
+            phase=phase,
+            message=gate.get("message", ""),
+            status=gate["status"],
+            run_id=run_id,
+            policy_digest=policy_digest,
+        )
+        for gate in evaluation.get("gates", [])
+        if gate["status"] not in passing_statuses
+    ]
+
+
+class ConcernAction:
+    """Raise one concern per failing gate unless an open QA concern already covers it."""
+
+    def __init__(
+        self,
+        *,
+        audit_root: Path = concern_tools.DEFAULT_AUDIT_ROOT,
+        raised_by: str = "tester",
+        severity: str = "high",
+    ) -> None:
+        self.audit_root = Path(audit_root)
+        self.raised_by = raised_by
+        self.severity = severity
+
+    def _open_gates(self) -> set[tuple[str, str]]:
+        open_gates = set()
+        for entry in concern_tools.load_concerns(audit_root=self.audit_root):
+            metadata = entry.get("metadata") or {}
+            if metadata.get("source") == QA_CONCERN_SOURCE and not entry.get("resolution"):
+                open_gates.add((metadata.get("change_id"), metadata.get("gate_id")))
+        return open_gates
+
+    def __call__(self, events: Sequence[FailureEvent]) -> None:
+        open_gates = self._open_gates()
+        for event in events:
+            if (event.change_id, event.gate_id) in open_gates:
+                continue
+            concern_tools.raise_concern(
+                phase=event.phase,
+                raised_by=self.raised_by,
+                severity=self.severity,
+                message=f"QA gate '{event.gate_id}' {event.status} for {event.change_id}: {event.message}",
+                metadata={
+                    "source": QA_CONCERN_SOURCE,
+                    "change_id": event.change_id,
+                    "gate_id": event.gate_id,
+                    "run_id": event.run_id,
+                    "policy_digest": event.policy_digest,
+                },
+                audit_root=self.audit_root,
+            )
+            open_gates.add((event.change_id, event.gate_id))
+
+
+class WebhookAction:
+    """POST each batch as ``{"channel": ..., "events": [...]}``; non-2xx responses raise."""
+
+    def __init__(self, url: str, *, channel: Optional[str] = None, timeout: float = 5.0) -> None:
+        self.url = url
+        self.channel = channel
+        self.timeout = timeout
+
+    def __call__(self, events: Sequence[FailureEvent]) -> None:
+        body = json.dumps({"channel": self.channel, "events": [event.as_dict() for event in events]}).encode("utf-8")
+        request = urllib.request.Request(
+            self.url, data=body, method="POST", headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def build_actions(
+    notifications: Mapping[str, Any],
+    *,
+    audit_root: Path = concern_tools.DEFAULT_AUDIT_ROOT,
+    webhook_url: Optional[str] = None,
+) -> Dict[str, Handler]:
+    """Map the policy's ``on_failure`` names to handlers; unknown or unconfigured names are left out."""
+    actions: Dict[str, Handler] = {}
+    url = webhook_url or notifications.get("webhook_url")
+    for name in notifications.get("on_failure", []):
+        if name == "raise_concern":
+            actions[name] = ConcernAction(audit_root=audit_root)
+        elif name == "notify_human" and url:
+            actions[name] = WebhookAction(url, channel=notifications.get("discord_channel"))
+    return actions
+
+
+@dataclass
+class DispatchStats:
+    submitted: int = 0
+    deduplicated: int = 0
+    dropped: int = 0
+    delivered: int = 0
+    retried: int = 0
+    failed: int = 0
+    pending: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class NotificationDispatcher:
+    """Background, batching, retrying executor for notification actions."""
+
+    def __init__(
+        self,
+        actions: Mapping[str, Handler],
+        *,
+        batch_size: int = 50,
+        flush_interval: float = 0.05,
+        max_attempts: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        maxsize: int = 4096,
+    ) -> None:
+        self.actions = dict(actions)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = DispatchStats()
+        self._queue: "queue.Queue[Optional[tuple[str, FailureEvent]]]" = queue.Queue(maxsize)
+        self._seen: set[tuple[str, str, str]] = set()
+        self._retries: List[tuple[float, int, str, List[FailureEvent], int]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._deadline: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="qa-notifications", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "NotificationDispatcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def submit(self, event: FailureEvent, actions: Optional[Sequence[str]] = None) -> int:
+        """Queue ``event`` for ``actions`` (default: all); returns how many were accepted."""
+        accepted = 0
+        for name in actions if actions is not None else list(self.actions):
+            if name not in self.actions:
+                continue
+            key = (name, event.change_id, event.gate_id)
+            with self._lock:
+                if key in self._seen:
+                    self.stats.deduplicated += 1
+                    continue
+                self._seen.add(key)
+            try:
+                self._queue.put_nowait((name, event))
+            except queue.Full:
+                with self._lock:
+                    self.stats.dropped += 1
+                    self._seen.discard(key)
+                continue
+            with self._lock:
+                self.stats.submitted += 1
+            accepted += 1
+        return accepted
+
+    def close(self, timeout: Optional[float] = None) -> DispatchStats:
+        """Deliver what is queued (waiting out backoff until ``timeout``) and stop the worker."""
+        if not self._closing.is_set():
+            self._deadline = None if timeout is None else time.monotonic() + timeout
+            self._closing.set()
+            self._queue.put(None)
+        self._thread.join(timeout)
+        with self._lock:
+            self.stats.pending = self._queue.qsize() + sum(len(entry[3]) for entry in self._retries)
+            return self.stats
+
+    # -- worker ----------------------------------------------------------
+    def _past_deadline(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _run(self) -> None:
+        stopping = False
+        while True:
+            batches: Dict[str, List[FailureEvent]] = {}
+            wait = self.flush_interval
+            if self._retries:
+                wait = max(0.0, min(wait, self._retries[0][0] - time.monotonic()))
+            stopping = self._collect(batches, wait) or stopping
+
+            for name, events in batches.items():
+                for start in range(0, len(events), self.batch_size):
+                    self._deliver(name, events[start : start + self.batch_size], attempt=1)
+
+            now = time.monotonic()
+            while self._retries and self._retries[0][0] <= now:
+                _, _, name, events, attempt = heapq.heappop(self._retries)
+                self._deliver(name, events, attempt=attempt)
+
+            if stopping and (not self._retries or self._past_deadline()):
+                return
+
+    def _collect(self, batches: Dict[str, List[FailureEvent]], wait: float) -> bool:
+        """Gather queued events into ``batches``; returns True once the close sentinel is seen."""
+        try:
+            item = self._queue.get(timeout=wait) if wait > 0 else self._queue.get_nowait()
+        except queue.Empty:
+            return False
+        collected = 0
+        while True:
+            if item is None:
+                return True
+            name, event = item
+            batches.setdefault(name, []).append(event)
+            collected += 1
+            if collected >= self.batch_size * max(1, len(self.actions)):
+                return False
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return False
+
+    def _deliver(self, name: str, events: List[FailureEvent], *, attempt: int) -> None:
+        try:
+            self.actions[name](events)
+        except Exception as exc:  # noqa: BLE001 - any handler failure is retried
+            with self._lock:
+                if attempt >= self.max_attempts:
+                    self.stats.failed += len(events)
+                    self.stats.errors.append(f"{name}: {exc}")
+                    return
+                self.stats.retried += len(events)
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+            heapq.heappush(self._retries, (time.monotonic() + delay, next(self._sequence), name, events, attempt + 1))
+            return
+        with self._lock:
+            self.stats.delivered += len(events)
+
+
+class WebhookSink:
+    """Local HTTP endpoint that records JSON payloads (optionally failing the first few)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, fail_first: int = 0, delay: float = 0.0) -> None:
+        self.payloads: List[Any] = []
+        self.requests = 0
+        self.fail_first = fail_first
+        self.delay = delay
+        self._lock = threading.Lock()
+        sink = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if sink.delay:
+                    time.sleep(sink.delay)
+                with sink._lock:
+                    sink.requests += 1
+                    failing = sink.requests <= sink.fail_first
+                    if not failing:
+                        sink.payloads.append(json.loads(body or b"null"))
+                self.send_response(503 if failing else 204)
+                self.end_headers()
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return
+
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.url = f"http://{host}:{self.server.server_address[1]}/"
+        self._thread = threading.Thread(target=self.server.serve_forever, name="webhook-sink", daemon=True)
+
+    def __enter__(self) -> "WebhookSink":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="QA notification utilities.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    sink = subparsers.add_parser("sink", help="Run a local webhook sink that prints received payloads.")
+    sink.add_argument("--host", default="127.0.0.1")
+    sink.add_argument("--port", type=int, default=8765)
+    sink.add_argument("--fail-first", type=int, default=0, help="Answer the first N requests with 503.")
+    args = parser.parse_args(argv)
+
+    with WebhookSink(args.host, args.port, fail_first=args.fail_first) as server:
+        print(f"Listening on {server.url}", file=sys.stderr, flush=True)
+        seen = 0
+        try:
+            while True:
+                time.sleep(0.2)
+                with server._lock:
+                    fresh = server.payloads[seen:]
+                seen += len(fresh)
+                for payload in fresh:
+                    print(json.dumps(payload, sort_keys=True), flush=True)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
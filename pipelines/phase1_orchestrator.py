@@ -5,11 +5,11 @@ from __future__ import annotations
 
 import argparse
 import datetime
-import hashlib
 import json
 import sys
+import time
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Mapping, MutableMapping, Optional
 
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -18,6 +18,8 @@ from agents.designer import Designer
 from agents.implementer import Implementer
 from agents.project_manager import ProjectManager
 from agents.tester import Tester
+from pipelines.artifact_writer import default_stats, write_artifact
+from pipelines.runs import RunStore, summary_digest
 
 SCENARIO: Mapping[str, Any] = {
     "phase": "1",
@@ -78,21 +80,35 @@ def ensure_approval(path: Path, pattern: str) -> None:
         )
 
 
-def orchestrate() -> dict[str, Any]:
-    """Run the phase 1 scenario across the core agents."""
+def orchestrate(timings: Optional[MutableMapping[str, float]] = None) -> dict[str, Any]:
+    """Run the phase 1 scenario across the core agents.
+
+    When ``timings`` is provided it is populated with per-stage wall-clock
+    seconds (plus ``total``) so callers can record them alongside the summary.
+    """
     ARTIFACT_ROOT.mkdir(parents=True, exist_ok=True)
+    stage_timings: MutableMapping[str, float] = timings if timings is not None else {}
+    started = time.perf_counter()
 
+    mark = time.perf_counter()
     pm = ProjectManager(phase="1")
     brief_path = pm.create_phase_brief(SCENARIO)
+    stage_timings["project_manager"] = time.perf_counter() - mark
 
+    mark = time.perf_counter()
     designer = Designer(phase="1")
     design_path = designer.create_design_spec(SCENARIO, brief_path=brief_path)
+    stage_timings["designer"] = time.perf_counter() - mark
 
+    mark = time.perf_counter()
     implementer = Implementer(phase="1")
     implementation_plan_path = implementer.create_execution_plan(SCENARIO, design_path=design_path)
+    stage_timings["implementer"] = time.perf_counter() - mark
 
+    mark = time.perf_counter()
     tester = Tester(phase="1")
     test_plan_path, test_results_path = tester.prepare_phase_test_assets(SCENARIO)
+    stage_timings["tester"] = time.perf_counter() - mark
 
     summary = {
         "scenario": dict(SCENARIO),
@@ -105,7 +121,8 @@ def orchestrate() -> dict[str, Any]:
         },
     }
 
-    SUMMARY_PATH.write_text(json.dumps(summary, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    write_artifact(SUMMARY_PATH, json.dumps(summary, indent=2, sort_keys=True) + "\n")
+    stage_timings["total"] = time.perf_counter() - started
     return summary
 
 
@@ -113,7 +130,7 @@ def append_run_log(summary: Mapping[str, Any], log_path: Path) -> None:
     log_path = log_path.expanduser()
     log_path.parent.mkdir(parents=True, exist_ok=True)
     payload = json.dumps(summary, indent=2, sort_keys=True)
-    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    digest = summary_digest(summary)
     timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ")
     with log_path.open("a", encoding="utf-8") as handle:
         handle.write(f"=== Run at {timestamp} ===\n")
@@ -129,6 +146,11 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Optional path to append run summaries (used for validation evidence).",
     )
+    parser.add_argument(
+        "--run-store",
+        type=Path,
+        help="Optional run-log store directory; records a compact, deduplicated entry per run.",
+    )
     parser.add_argument(
         "--approval-doc",
         type=Path,
@@ -155,10 +177,14 @@ def main(argv: list[str] | None = None) -> int:
     if not args.skip_approval:
         ensure_approval(args.approval_doc, args.approval_pattern)
 
-    summary = orchestrate()
+    timings: dict[str, float] = {}
+    summary = orchestrate(timings)
     if args.log:
         append_run_log(summary, args.log)
+    if args.run_store:
+        RunStore(args.run_store.expanduser()).record(summary, timings=timings)
     print(json.dumps(summary, indent=2, sort_keys=True))
+    print(f"Artifacts: {default_stats().describe()}", file=sys.stderr)
     return 0
 
 
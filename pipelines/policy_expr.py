@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""Gate expression language for ``QA_POLICY.yaml``.
+
+Expression gates replace ``metric operator target`` with a boolean expression:
+
+    coverage >= 0.8 and (reproducibility >= 0.95 or p95(reproducibility, 10) >= 0.97)
+
+Grammar (lowest to highest precedence)::
+
+    expr       := and_expr ("or" and_expr)*
+    and_expr   := not_expr ("and" not_expr)*
+    not_expr   := "not" not_expr | comparison
+    comparison := sum (("<" | "<=" | ">" | ">=" | "==" | "!=") sum)?
+    sum        := product (("+" | "-") product)*
+    product    := unary (("*" | "/") unary)*
+    unary      := "-" unary | primary
+    primary    := NUMBER | "true" | "false" | METRIC | FUNC "(" METRIC "," INTEGER ")" | "(" expr ")"
+
+``FUNC`` is one of ``min``, ``max``, ``mean``, ``median`` or ``p95`` and
+aggregates the last ``INTEGER`` recorded values of ``METRIC`` from the metrics
+history (see ``metrics_store``). Metrics are numbers, so a bare metric is not
+a valid gate (``coverage`` or ``coverage and reproducibility`` is rejected;
+write ``coverage > 0``).
+
+Sources are parsed and type-checked once (results are cached by source text).
+Nodes are hash-consed, so an identical sub-expression appearing in several
+gates is a single node. The intern table holds nodes weakly, so a node lives
+only as long as a cached parse or a compiled policy still uses it. An
+:class:`EvalContext` memoizes node values for one metric set, so shared
+sub-expressions are computed once per evaluation.
+``and``/``or`` short-circuit.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+import statistics
+import weakref
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Protocol, Sequence
+
+__all__ = [
+    "EvalContext",
+    "ExpressionError",
+    "HistoryProvider",
+    "MissingHistory",
+    "MissingMetric",
+    "Node",
+    "parse_expression",
+]
+
+NUMBER = "number"
+BOOL = "bool"
+ANY = "any"
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be parsed or fails type checking."""
+
+    def __init__(self, message: str, source: str = "", position: int = -1) -> None:
+        if position >= 0:
+            message = f"{message} at column {position + 1} in '{source}'"
+        super().__init__(message)
+        self.position = position
+
+
+class MissingMetric(LookupError):
+    """Raised during evaluation when a referenced metric is absent."""
+
+    def __init__(self, metric: str) -> None:
+        super().__init__(metric)
+        self.metric = metric
+
+
+class MissingHistory(LookupError):
+    """Raised during evaluation when an aggregate has no recorded values."""
+
+    def __init__(self, metric: str) -> None:
+        super().__init__(metric)
+        self.metric = metric
+
+
+class HistoryProvider(Protocol):
+    """Recent values of a metric in chronological order (implemented by ``MetricsStore``)."""
+
+    def recent(self, metric: str, window: int) -> Sequence[float]: ...
+
+
+class EvalContext:
+    """Per-metric-set evaluation state: inputs plus a memo of node values."""
+
+    __slots__ = ("metrics", "history", "memo")
+
+    def __init__(self, metrics: Mapping[str, Any], history: Optional[HistoryProvider] = None) -> None:
+        self.metrics = metrics
+        self.history = history
+        self.memo: Dict[int, Any] = {}
+
+    def value(self, node: "Node") -> Any:
+        key = id(node)
+        try:
+            return self.memo[key]
+        except KeyError:
+            result = self.memo[key] = node.compute(self)
+            return result
+
+
+class Node:
+    """Base class for interned expression nodes."""
+
+    type: str = ANY
+
+    def compute(self, ctx: EvalContext) -> Any:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def metrics(self) -> Iterator[str]:
+        return iter(())
+
+
+@dataclass(frozen=True, eq=False)
+class Literal(Node):
+    value: Any
+    type: str
+
+    def compute(self, ctx: EvalContext) -> Any:
+        return self.value
+
+
+@dataclass(frozen=True, eq=False)
+class Metric(Node):
+    name: str
+    type: str = NUMBER
+
+    def compute(self, ctx: EvalContext) -> Any:
+        value = ctx.metrics.get(self.name)
+        if value is None:
+            raise MissingMetric(self.name)
+        return value
+
+    def metrics(self) -> Iterator[str]:
+        yield self.name
+
+
+def _p95(values: Sequence[float]) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+AGGREGATES: Mapping[str, Callable[[Sequence[float]], float]] = {
+    "min": min,
+    "max": max,
+    "mean": statistics.fmean,
+    "median": statistics.median,
+    "p95": _p95,
+}
+
+
+@dataclass(frozen=True, eq=False)
+class Aggregate(Node):
+    function: str
+    metric: str
+    window: int
+    type: str = NUMBER
+
+    def compute(self, ctx: EvalContext) -> Any:
+        values = ctx.history.recent(self.metric, self.window) if ctx.history is not None else ()
+        if not values:
+            raise MissingHistory(self.metric)
+        return AGGREGATES[self.function](values)
+
+    def metrics(self) -> Iterator[str]:
+        yield self.metric
+
+
+@dataclass(frozen=True, eq=False)
+class Negate(Node):
+    operand: Node
+    type: str = NUMBER
+
+    def compute(self, ctx: EvalContext) -> Any:
+        return -ctx.value(self.operand)
+
+    def metrics(self) -> Iterator[str]:
+        return self.operand.metrics()
+
+
+_ARITHMETIC = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
+_COMPARISONS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@dataclass(frozen=True, eq=False)
+class Binary(Node):
+    op: str
+    left: Node
+    right: Node
+    type: str
+    function: Callable[[Any, Any], Any] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "function", _COMPARISONS.get(self.op) or _ARITHMETIC[self.op])
+
+    def compute(self, ctx: EvalContext) -> Any:
+        return self.function(ctx.value(self.left), ctx.value(self.right))
+
+    def metrics(self) -> Iterator[str]:
+        yield from self.left.metrics()
+        yield from self.right.metrics()
+
+
+@dataclass(frozen=True, eq=False)
+class Not(Node):
+    operand: Node
+    type: str = BOOL
+
+    def compute(self, ctx: EvalContext) -> Any:
+        return not ctx.value(self.operand)
+
+    def metrics(self) -> Iterator[str]:
+        return self.operand.metrics()
+
+
+@dataclass(frozen=True, eq=False)
+class Logical(Node):
+    """``and``/``or`` over two or more operands, evaluated left to right with short-circuiting."""
+
+    op: str
+    operands: tuple[Node, ...]
+    type: str = BOOL
+
+    def compute(self, ctx: EvalContext) -> Any:
+        value = ctx.value
+        if self.op == "and":
+            return all(value(operand) for operand in self.operands)
+        return any(value(operand) for operand in self.operands)
+
+    def metrics(self) -> Iterator[str]:
+        for operand in self.operands:
+            yield from operand.metrics()
+
+
+_INTERNED: "weakref.WeakValueDictionary[tuple, Node]" = weakref.WeakValueDictionary()
+
+
+def _intern_key(field: Any) -> Any:
+    if isinstance(field, Node):
+        return id(field)
+    if isinstance(field, tuple):
+        return tuple(_intern_key(item) for item in field)
+    return (type(field), field)
+
+
+def _intern(cls: type, *fields: Any) -> Any:
+    """Return the unique node for ``cls(*fields)``; children are already interned."""
+    key = (cls, *(_intern_key(field) for field in fields))
+    node = _INTERNED.get(key)
+    if node is None:
+        node = _INTERNED[key] = cls(*fields)
+    return node
+
+
+_SYMBOLS = ("<=", ">=", "==", "!=", "<", ">", "+", "-", "*", "/", "(", ")", ",")
+_KEYWORDS = {"and", "or", "not", "true", "false"}
+
+
+def _tokenize(source: str) -> list[tuple[str, str, int]]:
+    tokens: list[tuple[str, str, int]] = []
+    index = 0
+    length = len(source)
+    while index < length:
+        char = source[index]
+        if char.isspace():
+            index += 1
+            continue
+        start = index
+        if char.isdigit() or (char == "." and index + 1 < length and source[index + 1].isdigit()):
+            while index < length and (source[index].isdigit() or source[index] in ".eE" or (
+                source[index] in "+-" and source[index - 1] in "eE"
+            )):
+                index += 1
+            tokens.append(("number", source[start:index], start))
+            continue
+        if char.isalpha() or char == "_":
+            while index < length and (source[index].isalnum() or source[index] in "_."):
+                index += 1
+            word = source[start:index]
+            tokens.append(("keyword" if word in _KEYWORDS else "name", word, start))
+            continue
+        for symbol in _SYMBOLS:
+            if source.startswith(symbol, index):
+                tokens.append(("symbol", symbol, start))
+                index += len(symbol)
+                break
+        else:
+            raise ExpressionError(f"Unexpected character '{char}'", source, index)
+    tokens.append(("end", "", length))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens = _tokenize(source)
+        self.index = 0
+
+    def error(self, message: str, position: Optional[int] = None) -> ExpressionError:
+        return ExpressionError(message, self.source, self.tokens[self.index][2] if position is None else position)
+
+    def peek(self) -> tuple[str, str, int]:
+        return self.tokens[self.index]
+
+    def accept(self, kind: str, text: Optional[str] = None) -> Optional[tuple[str, str, int]]:
+        token = self.tokens[self.index]
+        if token[0] == kind and (text is None or token[1] == text):
+            self.index += 1
+            return token
+        return None
+
+    def expect(self, kind: str, text: Optional[str] = None) -> tuple[str, str, int]:
+        token = self.accept(kind, text)
+        if token is None:
+            found = self.peek()[1] or "end of expression"
+            raise self.error(f"Expected {text or kind} but found '{found}'")
+        return token
+
+    def require(self, node: Node, expected: str, position: int) -> Node:
+        if node.type != ANY and expected != ANY and node.type != expected:
+            raise self.error(f"Expected a {expected} operand, got {node.type}", position)
+        return node
+
+    def parse(self) -> Node:
+        node = self.parse_or()
+        if self.peek()[0] != "end":
+            raise self.error(f"Unexpected '{self.peek()[1]}'")
+        return node
+
+    def parse_logical(self, op: str, parse_operand: Callable[[], Node]) -> Node:
+        position = self.peek()[2]
+        operands = [parse_operand()]
+        while self.accept("keyword", op):
+            operands.append(parse_operand())
+        if len(operands) == 1:
+            return operands[0]
+        for operand in operands:
+            self.require(operand, BOOL, position)
+        return _intern(Logical, op, tuple(operands))
+
+    def parse_or(self) -> Node:
+        return self.parse_logical("or", self.parse_and)
+
+    def parse_and(self) -> Node:
+        return self.parse_logical("and", self.parse_not)
+
+    def parse_not(self) -> Node:
+        token = self.accept("keyword", "not")
+        if token is not None:
+            return _intern(Not, self.require(self.parse_not(), BOOL, token[2]))
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Node:
+        position = self.peek()[2]
+        left = self.parse_sum()
+        token = self.peek()
+        if token[0] == "symbol" and token[1] in _COMPARISONS:
+            self.index += 1
+            right = self.parse_sum()
+            if token[1] not in ("==", "!="):
+                self.require(left, NUMBER, position)
+                self.require(right, NUMBER, token[2])
+            elif ANY not in (left.type, right.type) and left.type != right.type:
+                raise self.error(f"Cannot compare {left.type} with {right.type}", token[2])
+            return _intern(Binary, token[1], left, right, BOOL)
+        return left
+
+    def parse_arithmetic(self, symbols: tuple[str, ...], parse_operand: Callable[[], Node]) -> Node:
+        position = self.peek()[2]
+        node = parse_operand()
+        while True:
+            token = self.peek()
+            if token[0] != "symbol" or token[1] not in symbols:
+                return node
+            self.index += 1
+            right = parse_operand()
+            self.require(node, NUMBER, position)
+            self.require(right, NUMBER, token[2])
+            node = _intern(Binary, token[1], node, right, NUMBER)
+
+    def parse_sum(self) -> Node:
+        return self.parse_arithmetic(("+", "-"), self.parse_product)
+
+    def parse_product(self) -> Node:
+        return self.parse_arithmetic(("*", "/"), self.parse_unary)
+
+    def parse_unary(self) -> Node:
+        token = self.accept("symbol", "-")
+        if token is not None:
+            operand = self.require(self.parse_unary(), NUMBER, token[2])
+            if isinstance(operand, Literal):
+                return _intern(Literal, -operand.value, NUMBER)
+            return _intern(Negate, operand)
+        return self.parse_primary()
+
+    def parse_primary(self) -> Node:
+        kind, text, position = self.peek()
+        if kind == "number":
+            self.index += 1
+            try:
+                value = float(text) if any(char in text for char in ".eE") else int(text)
+            except ValueError:
+                raise self.error(f"Invalid number '{text}'", position) from None
+            return _intern(Literal, value, NUMBER)
+        if kind == "keyword" and text in ("true", "false"):
+            self.index += 1
+            return _intern(Literal, text == "true", BOOL)
+        if kind == "name":
+            self.index += 1
+            if not self.accept("symbol", "("):
+                return _intern(Metric, text)
+            if text not in AGGREGATES:
+                raise self.error(f"Unknown function '{text}'", position)
+            metric = self.expect("name")[1]
+            self.expect("symbol", ",")
+            window_token = self.expect("number")
+            if not window_token[1].isdigit() or int(window_token[1]) < 1:
+                raise self.error("Aggregate window must be a positive integer", window_token[2])
+            self.expect("symbol", ")")
+            return _intern(Aggregate, text, metric, int(window_token[1]))
+        if self.accept("symbol", "("):
+            node = self.parse_or()
+            self.expect("symbol", ")")
+            return node
+        raise self.error(f"Unexpected '{text or 'end of expression'}'", position)
+
+
+@lru_cache(maxsize=1024)
+def parse_expression(source: str) -> Node:
+    """Parse and type-check a gate expression; the result must be boolean."""
+    parser = _Parser(source)
+    node = parser.parse()
+    if node.type != BOOL:
+        raise ExpressionError(f"Gate expression must be boolean: '{source}'")
+    return node
+
+
+def referenced_metrics(node: Node) -> tuple[str, ...]:
+    """Distinct metric names referenced by ``node`` in first-use order."""
+    return tuple(dict.fromkeys(node.metrics()))
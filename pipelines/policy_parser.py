@@ -1,52 +1,137 @@
 #!/usr/bin/env python3
-"""QA policy parser stub for Phase 0.
-
-The parser expects a JSON-compatible YAML document with the following structure:
-{
-  "policy": {
-    "phase": "0",
-    "coverage_threshold": 0.80,
-    "reproducibility_threshold": 0.95,
-    "gates": [
-      {"id": "coverage", "metric": "coverage", "operator": ">=", "target": 0.8}
-    ]
-  },
-  "notifications": {
-    "on_failure": ["raise_concern"],
-    "discord_channel": "#qa-alerts"
-  }
-}
+"""QA policy parser.
+
+The policy file is YAML (the subset described in ``policy_yaml``; JSON is also
+accepted) with the following structure:
+
+    policy:
+      phase: "0"
+      coverage_threshold: 0.80
+      reproducibility_threshold: 0.95
+      gates:
+        - {id: coverage, metric: coverage, operator: ">=", target: 0.8}
+        - id: coverage-regression
+          metric: coverage
+          type: regression
+          window: 5
+          max_drop: 0.02
+    notifications:
+      on_failure: [raise_concern]
+      discord_channel: "#qa-alerts"
 
-Only a subset of YAML is supported; JSON syntax is valid.
+Gates default to ``"type": "threshold"`` (``operator`` + ``target``). A
+``"type": "regression"`` gate instead fails when the metric drops more than
+``max_drop`` below the median of its last ``window`` recorded runs (see
+``metrics_store``). A gate with an ``"expr"`` (``"type": "expression"``) is a
+boolean expression over metrics and history aggregates (see ``policy_expr``).
+Any gate may carry ``"phases": {"<phase>": {...overrides}}``; ``resolve_gate``
+applies the override for the phase being enforced.
+
+``load_validated_policy`` caches validated policies by the sha256 of the file's
+bytes, in memory and on disk (``marshal`` under ``artifacts/cache/policy/``),
+so unchanged policy files are neither re-parsed nor re-validated.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import hashlib
+import io
+import marshal
 import sys
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from pipelines.artifact_writer import atomic_write_bytes
+from pipelines.policy_expr import ExpressionError, parse_expression
+from pipelines.policy_yaml import YamlSyntaxError, parse_yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_POLICY_PATH = Path("QA_POLICY.yaml")
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "artifacts" / "cache" / "policy"
+CACHE_VERSION = 3
+GATE_TYPES = ("threshold", "regression", "expression")
+_GATE_FIELDS = {
+    "threshold": ("id", "metric", "operator", "target"),
+    "regression": ("id", "metric", "window", "max_drop"),
+    "expression": ("id", "expr"),
+}
+
+_VALIDATED: Dict[str, Dict[str, Any]] = {}
 
 
 class PolicyValidationError(Exception):
     """Raised when the QA policy file is malformed."""
 
 
+class PolicySyntaxError(PolicyValidationError):
+    """Raised when the policy file is not valid YAML; ``line``/``column`` are 1-based."""
+
+    def __init__(self, message: str, *, line: int, column: int) -> None:
+        super().__init__(message)
+        self.line = line
+        self.column = column
+
+
+def _parse_policy(lines: Iterable[str], path: Path) -> Dict[str, Any]:
+    try:
+        data = parse_yaml(lines)
+    except YamlSyntaxError as exc:
+        raise PolicySyntaxError(
+            f"Policy file {path} is not valid YAML: {exc}", line=exc.line, column=exc.column
+        ) from exc
+    if not isinstance(data, dict):
+        raise PolicyValidationError("Policy root must be a mapping/object.")
+    return data
+
+
 def load_policy(path: Path) -> Dict[str, Any]:
-    """Load a policy file containing JSON-compatible YAML."""
+    """Parse a YAML (or JSON) policy file, streaming it line by line."""
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        with Path(path).open("r", encoding="utf-8") as handle:
+            return _parse_policy(handle, path)
     except FileNotFoundError as exc:
         raise PolicyValidationError(f"Policy file not found: {path}") from exc
-    except json.JSONDecodeError as exc:
-        raise PolicyValidationError(f"Policy file is not valid JSON/YAML: {exc}") from exc
 
-    if not isinstance(data, dict):
-        raise PolicyValidationError("Policy root must be a mapping/object.")
-    return data
+
+def gate_type(gate: Dict[str, Any]) -> str:
+    """Return the gate's type; gates with an ``expr`` default to ``expression``."""
+    return gate.get("type", "expression" if "expr" in gate else "threshold")
+
+
+def resolve_gate(gate: Dict[str, Any], phase: Any = None) -> Dict[str, Any]:
+    """Apply the ``phases`` override for ``phase`` (if any) and drop the overrides map."""
+    resolved = {key: value for key, value in gate.items() if key != "phases"}
+    if phase is not None:
+        overrides = gate.get("phases", {}).get(str(phase))
+        if overrides:
+            resolved.update(overrides)
+    return resolved
+
+
+def _validate_gate(gate: Dict[str, Any], label: str) -> None:
+    kind = gate_type(gate)
+    if kind not in GATE_TYPES:
+        raise PolicyValidationError(f"{label} has unknown type '{kind}'.")
+    for field in _GATE_FIELDS[kind]:
+        if field not in gate:
+            raise PolicyValidationError(f"{label} missing '{field}'.")
+    if kind == "regression":
+        window = gate["window"]
+        if isinstance(window, bool) or not isinstance(window, int) or window < 1:
+            raise PolicyValidationError(f"{label} 'window' must be a positive integer.")
+        if isinstance(gate["max_drop"], bool) or not isinstance(gate["max_drop"], (int, float)):
+            raise PolicyValidationError(f"{label} 'max_drop' must be a number.")
+    elif kind == "expression":
+        if not isinstance(gate["expr"], str):
+            raise PolicyValidationError(f"{label} 'expr' must be a string.")
+        try:
+            parse_expression(gate["expr"])
+        except ExpressionError as exc:
+            raise PolicyValidationError(f"{label} has an invalid expression: {exc}") from exc
 
 
 def validate_policy(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -70,9 +155,16 @@ def validate_policy(data: Dict[str, Any]) -> Dict[str, Any]:
     for index, gate in enumerate(policy["gates"], start=1):
         if not isinstance(gate, dict):
             raise PolicyValidationError(f"Gate #{index} is not an object.")
-        for field in ("id", "metric", "operator", "target"):
-            if field not in gate:
-                raise PolicyValidationError(f"Gate #{index} missing '{field}'.")
+        _validate_gate(gate, f"Gate #{index}")
+        phases = gate.get("phases", {})
+        if not isinstance(phases, dict):
+            raise PolicyValidationError(f"Gate #{index} 'phases' must map phase to overrides.")
+        for phase, overrides in phases.items():
+            if not isinstance(overrides, dict) or {"id", "phases"} & set(overrides):
+                raise PolicyValidationError(
+                    f"Gate #{index} phase '{phase}' overrides must be an object without 'id' or 'phases'."
+                )
+            _validate_gate(resolve_gate(gate, phase), f"Gate #{index} (phase {phase})")
 
     if "on_failure" not in notifications or not isinstance(notifications["on_failure"], list):
         raise PolicyValidationError("Notifications must include 'on_failure' list.")
@@ -80,9 +172,66 @@ def validate_policy(data: Dict[str, Any]) -> Dict[str, Any]:
     return {"policy": policy, "notifications": notifications}
 
 
+def _read_cached(cache_path: Path, digest: str) -> Optional[Dict[str, Any]]:
+    try:
+        version, cached_digest, validated = marshal.loads(cache_path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != CACHE_VERSION or cached_digest != digest:
+        return None
+    return validated
+
+
+def load_validated_policy(
+    path: Path | str, *, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR
+) -> Tuple[str, Dict[str, Any]]:
+    """Return ``(sha256, validated policy)`` for ``path``, reusing earlier results for identical bytes."""
+    path = Path(path)
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError as exc:
+        raise PolicyValidationError(f"Policy file not found: {path}") from exc
+    digest = hashlib.sha256(raw).hexdigest()
+
+    validated = _VALIDATED.get(digest)
+    if validated is not None:
+        return digest, validated
+
+    cache_path = Path(cache_dir) / f"{digest}.marshal" if cache_dir is not None else None
+    validated = _read_cached(cache_path, digest) if cache_path is not None else None
+    if validated is None:
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            raise PolicyValidationError(f"Policy file {path} is not UTF-8: {exc}") from exc
+        validated = validate_policy(_parse_policy(io.StringIO(text), path))
+        if cache_path is not None:
+            atomic_write_bytes(cache_path, marshal.dumps((CACHE_VERSION, digest, validated)))
+
+    _VALIDATED[digest] = validated
+    return digest, validated
+
+
+def clear_cache() -> None:
+    """Forget validated policies held in memory (the on-disk cache is untouched)."""
+    _VALIDATED.clear()
+
+
+def _describe_gate(gate: Dict[str, Any]) -> str:
+    kind = gate_type(gate)
+    if kind == "expression":
+        return f"- {gate['id']}: {gate['expr']}"
+    if kind == "regression":
+        return (
+            f"- {gate['id']}: {gate['metric']} drop <= {gate['max_drop']} "
+            f"vs median of last {gate['window']} runs"
+        )
+    return f"- {gate['id']}: {gate['metric']} {gate['operator']} {gate['target']}"
+
+
 def render_summary(policy: Dict[str, Any]) -> str:
     gates = policy["policy"]["gates"]
-    gate_lines: List[str] = [f"- {gate['id']}: {gate['metric']} {gate['operator']} {gate['target']}" for gate in gates]
+    gate_lines: List[str] = [_describe_gate(gate) for gate in gates]
     gate_section = "\n".join(gate_lines)
     notifications = ", ".join(policy["notifications"]["on_failure"])
     return (
@@ -96,19 +245,19 @@ def render_summary(policy: Dict[str, Any]) -> str:
 
 
 def main(argv: Iterable[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="QA Policy Parser Stub")
+    parser = argparse.ArgumentParser(description="Validate and summarise the QA policy.")
     parser.add_argument(
         "policy_path",
         nargs="?",
         default=str(DEFAULT_POLICY_PATH),
-        help="Path to QA policy file (JSON-compatible YAML).",
+        help="Path to QA policy file (YAML or JSON).",
     )
+    parser.add_argument("--no-cache", action="store_true", help="Skip the on-disk validated policy cache.")
     args = parser.parse_args(list(argv) if argv is not None else None)
 
     path = Path(args.policy_path)
     try:
-        data = load_policy(path)
-        validated = validate_policy(data)
+        _, validated = load_validated_policy(path, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
     except PolicyValidationError as exc:
         print(f"Policy validation error: {exc}", file=sys.stderr)
         return 1
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""Streaming parser for the YAML subset used by ``QA_POLICY.yaml``.
+
+Supported:
+
+- block mappings (``key: value``) and block sequences (``- item``), including
+  compact ``- key: value`` items and sequences indented level with their key;
+- flow collections (``[a, b]``, ``{a: 1}``), which may span lines, so JSON
+  documents parse unchanged;
+- plain scalars resolved to ``null``/``true``/``false``/int/float/str, and
+  single- or double-quoted strings;
+- ``#`` comments and a leading ``---`` document marker.
+
+Anchors, tags, block scalars (``|``/``>``) and multi-document streams are
+rejected. Input is consumed one line at a time, with a single line of
+lookahead, and every error carries a 1-based line and column.
+
+Usage:
+
+    from pipelines.policy_yaml import load_yaml
+
+    data = load_yaml(Path("QA_POLICY.yaml"))
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+__all__ = ["YamlSyntaxError", "load_yaml", "parse_yaml"]
+
+_INT = re.compile(r"^[-+]?[0-9]+$")
+_FLOAT = re.compile(r"^[-+]?(?:[0-9]+\.[0-9]*|\.[0-9]+|[0-9]+)(?:[eE][-+]?[0-9]+)?$")
+_NULLS = {"", "~", "null", "Null", "NULL"}
+_TRUE = {"true", "True", "TRUE"}
+_FALSE = {"false", "False", "FALSE"}
+_UNSUPPORTED = {"&": "anchors", "*": "aliases", "!": "tags", "|": "block scalars", ">": "block scalars"}
+_FLOW_END = ",]}"
+
+
+class YamlSyntaxError(ValueError):
+    """Raised when the input is not valid in the supported YAML subset."""
+
+    def __init__(self, message: str, line: int, column: int) -> None:
+        super().__init__(f"{message} (line {line}, column {column})")
+        self.line = line
+        self.column = column
+
+
+@dataclass(frozen=True)
+class _Line:
+    number: int
+    indent: int
+    text: str  # content with indentation and trailing comment removed
+
+    def error(self, message: str, offset: int = 0) -> YamlSyntaxError:
+        return YamlSyntaxError(message, self.number, self.indent + offset + 1)
+
+
+def _strip_comment(text: str) -> str:
+    """Drop a trailing ``# comment`` that is outside quotes."""
+    quote: Optional[str] = None
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if quote:
+            if char == "\\" and quote == '"':
+                index += 1
+            elif char == quote:
+                if quote == "'" and text[index + 1 : index + 2] == "'":
+                    index += 1
+                else:
+                    quote = None
+        elif char in "\"'" and (index == 0 or text[index - 1] in " \t[{,:-"):
+            quote = char
+        elif char == "#" and (index == 0 or text[index - 1] in " \t"):
+            return text[:index].rstrip()
+        index += 1
+    return text.rstrip()
+
+
+def _logical_lines(lines: Iterable[str]) -> Iterator[_Line]:
+    for number, raw in enumerate(lines, start=1):
+        raw = raw.rstrip("\r\n")
+        if number == 1 and raw.startswith("﻿"):
+            raw = raw[1:]
+        stripped = raw.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(raw) - len(stripped)
+        if stripped.startswith("\t"):
+            raise YamlSyntaxError("tabs are not allowed for indentation", number, indent + 1)
+        yield _Line(number, indent, _strip_comment(stripped))
+
+
+def _find_mapping_colon(text: str) -> int:
+    """Index of the ``:`` separating a block mapping key from its value, or -1."""
+    if not text or text[0] in "[{":
+        return -1
+    index = 0
+    if text[0] in "\"'":
+        index = _quoted_end(text, 0)
+        if index < 0:
+            return -1
+    while index < len(text):
+        char = text[index]
+        if char == ":" and (index + 1 == len(text) or text[index + 1] in " \t"):
+            return index
+        index += 1
+    return -1
+
+
+def _quoted_end(text: str, start: int) -> int:
+    """Index just past the quoted scalar starting at ``start`` (-1 if unterminated)."""
+    quote = text[start]
+    index = start + 1
+    while index < len(text):
+        char = text[index]
+        if quote == '"' and char == "\\":
+            index += 2
+            continue
+        if char == quote:
+            if quote == "'" and text[index + 1 : index + 2] == "'":
+                index += 2
+                continue
+            return index + 1
+        index += 1
+    return -1
+
+
+def _unquote(token: str, line: _Line, offset: int) -> str:
+    if token[0] == "'":
+        return token[1:-1].replace("''", "'")
+    try:
+        return json.loads(token)
+    except json.JSONDecodeError as exc:
+        raise line.error(f"invalid double-quoted string: {exc.msg}", offset + exc.pos) from exc
+
+
+def _plain(token: str) -> Any:
+    if token in _NULLS:
+        return None
+    if token in _TRUE:
+        return True
+    if token in _FALSE:
+        return False
+    if _INT.match(token):
+        return int(token)
+    if _FLOAT.match(token):
+        return float(token)
+    return token
+
+
+class _Parser:
+    def __init__(self, lines: Iterable[str]) -> None:
+        self._lines = _logical_lines(lines)
+        self._pending: List[_Line] = []
+
+    # -- line stream -----------------------------------------------------
+    def _peek(self) -> Optional[_Line]:
+        if not self._pending:
+            line = next(self._lines, None)
+            if line is None:
+                return None
+            self._pending.append(line)
+        return self._pending[-1]
+
+    def _next(self) -> _Line:
+        line = self._peek()
+        assert line is not None
+        self._pending.pop()
+        return line
+
+    def _push(self, line: _Line) -> None:
+        self._pending.append(line)
+
+    # -- documents -------------------------------------------------------
+    def document(self) -> Any:
+        first = self._peek()
+        if first is not None and first.text == "---":
+            self._next()
+            first = self._peek()
+        if first is None:
+            return None
+        value = self._block(first.indent)
+        extra = self._peek()
+        if extra is not None:
+            if extra.text in ("---", "..."):
+                raise extra.error("multiple documents are not supported")
+            raise extra.error("unexpected content; check the indentation")
+        return value
+
+    def _block(self, indent: int) -> Any:
+        line = self._peek()
+        assert line is not None
+        if line.indent != indent:
+            raise line.error("unexpected indentation")
+        if self._is_sequence_item(line.text):
+            return self._sequence(indent)
+        if _find_mapping_colon(line.text) >= 0:
+            return self._mapping(indent)
+        self._next()
+        return self._inline_value(line, 0)
+
+    @staticmethod
+    def _is_sequence_item(text: str) -> bool:
+        return text == "-" or text.startswith("- ")
+
+    def _nested(self, parent: _Line, *, allow_same_indent_sequence: bool) -> Any:
+        following = self._peek()
+        if following is None:
+            return None
+        if following.indent > parent.indent:
+            return self._block(following.indent)
+        if (
+            allow_same_indent_sequence
+            and following.indent == parent.indent
+            and self._is_sequence_item(following.text)
+        ):
+            return self._sequence(parent.indent)
+        return None
+
+    def _mapping(self, indent: int) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        while True:
+            line = self._peek()
+            if line is None or line.indent < indent:
+                return result
+            if line.indent > indent:
+                raise line.error("unexpected indentation")
+            if self._is_sequence_item(line.text):
+                raise line.error("sequence item where a mapping key was expected")
+            colon = _find_mapping_colon(line.text)
+            if colon < 0:
+                raise line.error("expected 'key: value'")
+            self._next()
+            key = self._key(line, line.text[:colon].rstrip())
+            if key in result:
+                raise line.error(f"duplicate key '{key}'")
+            rest = line.text[colon + 1 :].lstrip()
+            if rest:
+                result[key] = self._inline_value(line, len(line.text) - len(rest))
+            else:
+                result[key] = self._nested(line, allow_same_indent_sequence=True)
+
+    def _key(self, line: _Line, token: str) -> str:
+        if not token:
+            raise line.error("empty mapping key")
+        if token[0] in "\"'":
+            if _quoted_end(token, 0) != len(token):
+                raise line.error("unexpected characters after quoted key")
+            return _unquote(token, line, 0)
+        if token[0] in "[{?":
+            raise line.error("complex mapping keys are not supported")
+        return token
+
+    def _sequence(self, indent: int) -> List[Any]:
+        result: List[Any] = []
+        while True:
+            line = self._peek()
+            if line is None or line.indent < indent:
+                return result
+            if line.indent > indent:
+                raise line.error("unexpected indentation")
+            if not self._is_sequence_item(line.text):
+                return result
+            self._next()
+            rest = line.text[1:].lstrip()
+            if not rest:
+                result.append(self._nested(line, allow_same_indent_sequence=False))
+                continue
+            offset = len(line.text) - len(rest)
+            if self._is_sequence_item(rest) or _find_mapping_colon(rest) >= 0:
+                # Compact nested collection: re-read the rest of the line as if it
+                # started its own, more indented, block.
+                self._push(_Line(line.number, line.indent + offset, rest))
+                result.append(self._block(line.indent + offset))
+            else:
+                result.append(self._inline_value(line, offset))
+
+    # -- inline values ---------------------------------------------------
+    def _inline_value(self, line: _Line, offset: int) -> Any:
+        text = line.text[offset:]
+        head = text[0]
+        if head in "[{":
+            return _FlowParser(self, line, offset).parse()
+        if head in _UNSUPPORTED:
+            raise line.error(f"{_UNSUPPORTED[head]} are not supported", offset)
+        if head in "\"'":
+            end = _quoted_end(text, 0)
+            if end < 0:
+                raise line.error("unterminated quoted string", offset)
+            if text[end:].strip():
+                raise line.error("unexpected characters after quoted string", offset + end)
+            return _unquote(text, line, offset)
+        if text.startswith(("- ", "? ")):
+            raise line.error("unexpected block indicator", offset)
+        return _plain(text)
+
+
+class _FlowParser:
+    """Recursive-descent parser for ``[...]``/``{...}`` collections spanning lines."""
+
+    def __init__(self, owner: _Parser, line: _Line, offset: int) -> None:
+        self._owner = owner
+        self._line = line
+        self._text = line.text
+        self._pos = offset
+
+    def error(self, message: str) -> YamlSyntaxError:
+        return self._line.error(message, self._pos)
+
+    def parse(self) -> Any:
+        value = self._value()
+        self._skip_space(allow_newline=False)
+        if self._pos < len(self._text):
+            raise self.error("unexpected characters after flow collection")
+        return value
+
+    def _skip_space(self, allow_newline: bool = True) -> None:
+        while True:
+            while self._pos < len(self._text) and self._text[self._pos] in " \t":
+                self._pos += 1
+            if self._pos < len(self._text) or not allow_newline:
+                return
+            following = self._owner._peek()
+            if following is None:
+                raise self.error("unterminated flow collection")
+            self._line = self._owner._next()
+            self._text = self._line.text
+            self._pos = 0
+
+    def _char(self) -> str:
+        self._skip_space()
+        return self._text[self._pos]
+
+    def _expect(self, char: str) -> None:
+        if self._char() != char:
+            raise self.error(f"expected '{char}'")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        char = self._char()
+        if char == "[":
+            return self._sequence()
+        if char == "{":
+            return self._mapping()
+        return self._scalar(key=False)
+
+    def _sequence(self) -> List[Any]:
+        self._expect("[")
+        items: List[Any] = []
+        while self._char() != "]":
+            items.append(self._value())
+            if self._char() == ",":
+                self._pos += 1
+            elif self._char() != "]":
+                raise self.error("expected ',' or ']'")
+        self._pos += 1
+        return items
+
+    def _mapping(self) -> Dict[str, Any]:
+        self._expect("{")
+        items: Dict[str, Any] = {}
+        while self._char() != "}":
+            line, column = self._line, self._pos
+            key = self._scalar(key=True)
+            if not isinstance(key, str):
+                key = str(key) if key is not None else ""
+            if key in items:
+                raise line.error(f"duplicate key '{key}'", column)
+            self._expect(":")
+            if self._char() in ",}":
+                items[key] = None
+            else:
+                items[key] = self._value()
+            if self._char() == ",":
+                self._pos += 1
+            elif self._char() != "}":
+                raise self.error("expected ',' or '}'")
+        self._pos += 1
+        return items
+
+    def _scalar(self, *, key: bool) -> Any:
+        start = self._pos
+        char = self._text[start]
+        if char in "\"'":
+            end = _quoted_end(self._text, start)
+            if end < 0:
+                raise self.error("unterminated quoted string")
+            self._pos = end
+            return _unquote(self._text[start:end], self._line, start)
+        if char in _UNSUPPORTED and char not in "|>":
+            raise self.error(f"{_UNSUPPORTED[char]} are not supported")
+        if char in "[]{}," or char == ":":
+            raise self.error(f"unexpected '{char}'")
+        end = start
+        while end < len(self._text):
+            current = self._text[end]
+            if current in _FLOW_END or (key and current in "[{"):
+                break
+            if current == ":" and (end + 1 == len(self._text) or self._text[end + 1] in " \t" + _FLOW_END):
+                break
+            end += 1
+        self._pos = end
+        return _plain(self._text[start:end].rstrip())
+
+
+def parse_yaml(lines: Iterable[str]) -> Any:
+    """Parse one YAML-subset document from an iterable of lines (or a string)."""
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    return _Parser(lines).document()
+
+
+def load_yaml(path: Path | str) -> Any:
+    """Stream ``path`` through :func:`parse_yaml`."""
+    with Path(path).open("r", encoding="utf-8") as handle:
+        return parse_yaml(handle)
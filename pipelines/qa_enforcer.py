@@ -2,27 +2,57 @@
 """Minimal QA enforcement CLI for Phase 1 runs.
 
 Evaluates QA metrics against `QA_POLICY.yaml` and exits non-zero if a gate fails.
-Outputs a JSON summary so Validate stage can record the result.
+Outputs a JSON summary so Validate stage can record the result. The policy is
+compiled once per content hash (see ``qa_policy``) and reused across runs.
+
+Batch mode discovers ``artifacts/work/CH-*/run-*/qa_metrics.json``, evaluates
+every run in parallel against the same compiled policy, streams one NDJSON
+record per run to stdout, and writes a consolidated report with per-gate
+pass/fail counts:
+
+    python3 pipelines/qa_enforcer.py --batch [--work-root artifacts/work] [--jobs N] [--output report.json]
+
+``--history`` evaluates ``regression`` gates (against the runs of the same
+change) and expression aggregates (across all changes) against the metrics
+store (see ``metrics_store``); ``--record`` appends the evaluated
+metrics to it afterwards. ``--phase`` selects per-gate phase overrides.
+
+Failing gates trigger the policy's ``notifications.on_failure`` actions through
+the background ``notifications`` dispatcher (skipped with ``--dry-run`` or
+``--no-notify``). Results are written before waiting for delivery, and the
+wait is capped by ``--notify-timeout``. ``make qa-batch`` passes
+``--no-notify``: it re-evaluates every recorded run and must not raise
+concerns in the tracked ``audit/concerns.jsonl`` each time it is run.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import operator
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import write_artifact
+from pipelines.concern_tools import DEFAULT_AUDIT_ROOT
+from pipelines.notifications import NotificationDispatcher, build_actions, failure_events
+from pipelines.policy_parser import PolicyValidationError
+from pipelines.metrics_store import DEFAULT_STORE_PATH, MetricsStore
+from pipelines.qa_policy import OPERATORS, PASSING_STATUSES, CompiledPolicy, compile_policy, load_compiled_policy
 
-from policy_parser import load_policy, validate_policy, PolicyValidationError
+__all__ = ["OPERATORS", "discover_metrics", "evaluate", "evaluate_batch", "load_metrics", "load_results", "main"]
 
-OPERATORS = {
-    ">=": operator.ge,
-    "<=": operator.le,
-    ">": operator.gt,
-    "<": operator.lt,
-    "==": operator.eq,
-}
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_WORK_ROOT = PROJECT_ROOT / "artifacts" / "work"
+METRICS_PATTERN = "CH-*/run-*/qa_metrics.json"
+
+_BATCH_POLICY: Optional[CompiledPolicy] = None
+_BATCH_HISTORY: Optional[MetricsStore] = None
 
 
 def load_metrics(path: Path) -> Dict[str, Any]:
@@ -44,77 +74,266 @@ def load_results(path: Path) -> Dict[str, Any]:
 
 
 def evaluate(policy: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
-    gates = policy["policy"]["gates"]
-    evaluation = {"passed": True, "gates": []}
-
-    for gate in gates:
-        metric_name = gate["metric"]
-        metric_value = metrics.get(metric_name)
-        op_symbol = gate["operator"]
-        comparator = OPERATORS.get(op_symbol)
-        if comparator is None:
-            raise SystemExit(f"Unsupported operator '{op_symbol}' in policy gate '{gate['id']}'")
-        if metric_value is None:
-            gate_result = {
-                "id": gate["id"],
-                "metric": metric_name,
-                "expected": gate,
-                "actual": None,
-                "status": "missing",
-                "message": f"Metric '{metric_name}' not provided."
-            }
-            evaluation["passed"] = False
-            evaluation["gates"].append(gate_result)
-            continue
-
-        passed = comparator(metric_value, gate["target"])
-        gate_result = {
-            "id": gate["id"],
-            "metric": metric_name,
-            "expected": gate,
-            "actual": metric_value,
-            "status": "pass" if passed else "fail",
-            "message": "" if passed else f"Expected {metric_name} {op_symbol} {gate['target']} but got {metric_value}."
+    try:
+        compiled = compile_policy(policy)
+    except PolicyValidationError as exc:
+        raise SystemExit(str(exc)) from exc
+    return compiled.evaluate(metrics)
+
+
+def discover_metrics(work_root: Path, pattern: str = METRICS_PATTERN) -> List[Path]:
+    """Return metric files under ``work_root`` ordered by change and run."""
+    return sorted(path for path in Path(work_root).glob(pattern) if path.is_file())
+
+
+def _init_batch_worker(
+    validated: Dict[str, Any],
+    digest: str,
+    phase: Optional[str] = None,
+    history_path: Optional[str] = None,
+) -> None:
+    global _BATCH_POLICY, _BATCH_HISTORY
+    _BATCH_POLICY = compile_policy(validated, digest=digest, phase=phase)
+    _BATCH_HISTORY = MetricsStore(history_path) if history_path else None
+
+
+def _evaluate_run(metrics_path: Path) -> Dict[str, Any]:
+    assert _BATCH_POLICY is not None, "batch worker not initialised"
+    record: Dict[str, Any] = {
+        "record_type": "run",
+        "change_id": metrics_path.parent.parent.name,
+        "run_id": metrics_path.parent.name,
+        "metrics_path": str(metrics_path),
+    }
+    try:
+        metrics = load_metrics(metrics_path)
+    except SystemExit as exc:
+        record.update({"passed": False, "status": "error", "message": str(exc), "gates": []})
+        return record
+    evaluation = _BATCH_POLICY.evaluate(metrics, _BATCH_HISTORY, change_id=record["change_id"])
+    record.update(
+        {
+            "passed": evaluation["passed"],
+            "status": "pass" if evaluation["passed"] else "fail",
+            "gates": [
+                {key: gate[key] for key in ("id", "status", "actual", "message")} for gate in evaluation["gates"]
+            ],
         }
-        if not passed:
-            evaluation["passed"] = False
-        evaluation["gates"].append(gate_result)
-    return evaluation
+    )
+    return record
+
+
+def evaluate_batch(
+    compiled: CompiledPolicy,
+    metrics_paths: Sequence[Path],
+    *,
+    jobs: Optional[int] = None,
+    history_path: Optional[Path] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one run record per metrics file, in input order.
+
+    With ``jobs`` greater than one, runs are evaluated in a process pool whose
+    workers each compile the policy (and open the metrics history) once at
+    start-up.
+    """
+    validated = {"policy": compiled.policy, "notifications": compiled.notifications}
+    initargs = (validated, compiled.digest, compiled.phase, str(history_path) if history_path else None)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(metrics_paths) <= 1:
+        _init_batch_worker(*initargs)
+        yield from map(_evaluate_run, metrics_paths)
+        return
+
+    chunksize = max(1, len(metrics_paths) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_batch_worker,
+        initargs=initargs,
+    ) as executor:
+        yield from executor.map(_evaluate_run, metrics_paths, chunksize=chunksize)
+
 
+def summarize_batch(compiled: CompiledPolicy, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate run records into per-gate and overall pass/fail counts."""
+    gate_counts = {gate.id: {"pass": 0, "fail": 0, "missing": 0, "skipped": 0, "error": 0} for gate in compiled.gates}
+    totals = {"runs": 0, "passed": 0, "failed": 0, "errors": 0}
+    failing_runs: List[str] = []
+    for record in records:
+        totals["runs"] += 1
+        if record["status"] == "error":
+            totals["errors"] += 1
+        elif record["passed"]:
+            totals["passed"] += 1
+        else:
+            totals["failed"] += 1
+        if not record["passed"]:
+            failing_runs.append(f"{record['change_id']}/{record['run_id']}")
+        for gate in record["gates"]:
+            gate_counts[gate["id"]][gate["status"]] += 1
+    return {
+        "record_type": "summary",
+        "passed": totals["failed"] == 0 and totals["errors"] == 0,
+        "policy_digest": compiled.digest,
+        "totals": totals,
+        "gates": gate_counts,
+        "failing_runs": failing_runs,
+    }
 
-def main() -> int:
+
+def _start_notifications(args: argparse.Namespace, compiled: CompiledPolicy) -> Optional[NotificationDispatcher]:
+    if args.dry_run or args.no_notify:
+        return None
+    actions = build_actions(compiled.notifications, audit_root=Path(args.audit_root), webhook_url=args.notify_webhook)
+    return NotificationDispatcher(actions) if actions else None
+
+
+def _notify(
+    dispatcher: Optional[NotificationDispatcher],
+    compiled: CompiledPolicy,
+    evaluation: Dict[str, Any],
+    *,
+    change_id: str,
+    run_id: str = "",
+) -> None:
+    if dispatcher is None or evaluation["passed"]:
+        return
+    phase = str(compiled.phase if compiled.phase is not None else compiled.policy.get("phase", ""))
+    for event in failure_events(
+        evaluation,
+        change_id=change_id,
+        phase=phase,
+        run_id=run_id,
+        policy_digest=compiled.digest,
+        passing_statuses=tuple(PASSING_STATUSES),
+    ):
+        dispatcher.submit(event)
+
+
+def _finish_notifications(dispatcher: Optional[NotificationDispatcher], timeout: float) -> None:
+    if dispatcher is None:
+        return
+    stats = dispatcher.close(timeout)
+    if stats.submitted or stats.dropped:
+        print(
+            f"Notifications: {stats.delivered} delivered, {stats.failed} failed, "
+            f"{stats.pending} pending, {stats.deduplicated} deduplicated, {stats.dropped} dropped.",
+            file=sys.stderr,
+        )
+    for error in stats.errors:
+        print(f" - {error}", file=sys.stderr)
+
+
+def _run_batch(args: argparse.Namespace, compiled: CompiledPolicy) -> int:
+    metrics_paths = discover_metrics(Path(args.work_root))
+    dispatcher = _start_notifications(args, compiled)
+    records: List[Dict[str, Any]] = []
+    for record in evaluate_batch(compiled, metrics_paths, jobs=args.jobs, history_path=args.history):
+        records.append(record)
+        print(json.dumps(record, sort_keys=True), flush=True)
+        if record["status"] == "fail":
+            _notify(dispatcher, compiled, record, change_id=record["change_id"], run_id=record["run_id"])
+
+    if args.record:
+        with MetricsStore(args.history) as store:
+            for record in records:
+                if record["status"] != "error":
+                    metrics = load_metrics(Path(record["metrics_path"]))
+                    store.record(record["change_id"], record["run_id"], metrics)
+
+    summary = summarize_batch(compiled, records)
+    summary["policy_path"] = str(args.policy)
+    summary["work_root"] = str(args.work_root)
+    summary["dry_run"] = args.dry_run
+    print(json.dumps(summary, sort_keys=True), flush=True)
+
+    if args.output:
+        report = dict(summary, runs=records)
+        write_artifact(Path(args.output), json.dumps(report, indent=2, sort_keys=True))
+
+    totals = summary["totals"]
+    print(
+        f"QA batch: {totals['passed']}/{totals['runs']} runs passed "
+        f"({totals['failed']} failed, {totals['errors']} errors).",
+        file=sys.stderr,
+    )
+    _finish_notifications(dispatcher, args.notify_timeout)
+    return 0 if summary["passed"] or args.dry_run else 2
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Enforce QA policy gates for a change run.")
     parser.add_argument("--policy", default="QA_POLICY.yaml", help="Path to QA policy file.")
-    parser.add_argument("--metrics", required=True, help="Path to JSON metrics file (coverage, reproducibility, etc.)")
+    parser.add_argument("--metrics", help="Path to JSON metrics file (coverage, reproducibility, etc.)")
     parser.add_argument("--results", help="Optional path to tests results JSON for reference.")
-    parser.add_argument("--change-id", required=True, help="Change identifier (e.g., CH-002).")
-    parser.add_argument("--output", required=True, help="Path to write the enforcement summary JSON.")
+    parser.add_argument("--change-id", help="Change identifier (e.g., CH-002).")
+    parser.add_argument("--output", help="Path to write the enforcement summary JSON (batch: consolidated report).")
     parser.add_argument("--dry-run", action="store_true", help="Return 0 even if gates fail (for diagnostics).")
+    parser.add_argument("--phase", help="Apply per-gate overrides for this phase (default: the policy's phase).")
+    parser.add_argument("--batch", action="store_true", help="Evaluate every run under --work-root.")
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT), help="Change workspace root for --batch.")
+    parser.add_argument("--jobs", type=int, help="Worker processes for --batch (default: CPU count).")
+    parser.add_argument(
+        "--history",
+        nargs="?",
+        const=str(DEFAULT_STORE_PATH),
+        help="Metrics store used by regression gates (default path when given without a value).",
+    )
+    parser.add_argument("--record", action="store_true", help="Append evaluated metrics to --history.")
+    parser.add_argument("--run-id", help="Run identifier for --record (default: metrics file's directory name).")
+    parser.add_argument("--no-notify", action="store_true", help="Do not run notifications.on_failure actions.")
+    parser.add_argument("--notify-webhook", help="Webhook URL for notify_human (default: notifications.webhook_url).")
+    parser.add_argument(
+        "--notify-timeout",
+        type=float,
+        default=10.0,
+        help="Seconds to wait for pending notifications before exiting (default: 10).",
+    )
+    parser.add_argument("--audit-root", default=str(DEFAULT_AUDIT_ROOT), help="Audit directory for raised concerns.")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.record and not args.history:
+        parser.error("--record requires --history")
+    if not args.batch:
+        required = (("--metrics", args.metrics), ("--change-id", args.change_id), ("--output", args.output))
+        missing = [flag for flag, value in required if not value]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
 
     policy_path = Path(args.policy)
-    metrics_path = Path(args.metrics)
-    output_path = Path(args.output)
 
     try:
-        policy_data = validate_policy(load_policy(policy_path))
+        compiled = load_compiled_policy(policy_path, phase=args.phase)
     except PolicyValidationError as exc:
         print(f"Policy validation error: {exc}", file=sys.stderr)
         return 1
 
+    if args.batch:
+        return _run_batch(args, compiled)
+
+    metrics_path = Path(args.metrics)
+    output_path = Path(args.output)
+
     metrics = load_metrics(metrics_path)
     results = load_results(Path(args.results)) if args.results else {}
 
-    evaluation = evaluate(policy_data, metrics)
+    run_id = args.run_id or metrics_path.parent.name
+    history = MetricsStore(args.history) if args.history else None
+    try:
+        evaluation = compiled.evaluate(metrics, history, change_id=args.change_id)
+        if history is not None and args.record:
+            history.record(args.change_id, run_id, metrics)
+    finally:
+        if history is not None:
+            history.close()
+    dispatcher = None if evaluation["passed"] else _start_notifications(args, compiled)
+    _notify(dispatcher, compiled, evaluation, change_id=args.change_id, run_id=run_id)
     evaluation["change_id"] = args.change_id
     evaluation["policy_path"] = str(policy_path)
     evaluation["metrics_path"] = str(metrics_path)
     evaluation["results_path"] = args.results
     evaluation["dry_run"] = args.dry_run
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(evaluation, indent=2, sort_keys=True), encoding="utf-8")
+    write_artifact(output_path, json.dumps(evaluation, indent=2, sort_keys=True))
 
     if evaluation["passed"]:
         print("QA enforcement passed.")
@@ -122,8 +341,9 @@ def main() -> int:
 
     print("QA enforcement failed:")
     for gate in evaluation["gates"]:
-        if gate["status"] != "pass":
+        if gate["status"] not in PASSING_STATUSES:
             print(f" - {gate['id']}: {gate['message']}")
+    _finish_notifications(dispatcher, args.notify_timeout)
     return 0 if args.dry_run else 2
 
 
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""Compiled QA policy evaluator with content-hash caching.
+
+``compile_policy`` turns a validated policy (see ``policy_parser``) into an
+immutable :class:`CompiledPolicy` whose gates carry pre-resolved comparator
+functions and pre-formatted metadata, so evaluating a metric set only performs
+the lookups and comparisons themselves. ``regression`` gates compare against a
+rolling baseline of the same change's runs, supplied by a history provider
+such as ``MetricsStore`` (portfolio-wide when no ``change_id`` is given);
+``expression`` gates evaluate a pre-parsed ``policy_expr`` AST. Per-phase gate
+overrides are applied at compile time. A gate whose inputs cannot be compared
+or computed (a non-numeric metric, a division by zero) reports ``error`` and
+fails the policy instead of raising.
+
+``load_compiled_policy`` caches compiled policies in memory by the sha256 of
+the policy file's bytes and phase; parsing and validation are cached (in
+memory and on disk) by ``policy_parser.load_validated_policy``, so repeated
+CLI runs skip both.
+
+CLI usage:
+
+    python3 pipelines/qa_policy.py [QA_POLICY.yaml] --metrics metrics.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import operator
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Mapping, Optional, Protocol, Union
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.policy_expr import (
+    EvalContext,
+    MissingHistory,
+    MissingMetric,
+    Node,
+    parse_expression,
+    referenced_metrics,
+)
+from pipelines import policy_parser
+from pipelines.policy_parser import (
+    DEFAULT_CACHE_DIR,
+    PolicyValidationError,
+    gate_type,
+    load_validated_policy,
+    resolve_gate,
+)
+
+OPERATORS: Mapping[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+}
+
+_COMPILED: Dict[tuple[str, Optional[str]], "CompiledPolicy"] = {}
+
+
+class BaselineProvider(Protocol):
+    """History source for regression and expression gates (implemented by ``MetricsStore``)."""
+
+    def baseline(self, metric: str, window: int, *, change_id: Optional[str] = None) -> Optional[float]: ...
+
+    def recent(self, metric: str, window: int) -> list[float]: ...
+
+
+def _missing(gate: Any) -> Dict[str, Any]:
+    return {
+        "id": gate.id,
+        "metric": gate.metric,
+        "expected": gate.expected,
+        "actual": None,
+        "status": "missing",
+        "message": f"Metric '{gate.metric}' not provided.",
+    }
+
+
+def _error(gate: Any, actual: Any, exc: Exception) -> Dict[str, Any]:
+    return {
+        "id": gate.id,
+        "metric": gate.metric,
+        "expected": gate.expected,
+        "actual": actual,
+        "status": "error",
+        "message": f"Could not evaluate gate: {type(exc).__name__}: {exc}.",
+    }
+
+
+@dataclass(frozen=True)
+class CompiledGate:
+    """A threshold gate with its comparator resolved ahead of time."""
+
+    id: str
+    metric: str
+    operator: str
+    target: Any
+    comparator: Callable[[Any, Any], bool]
+    expected: Mapping[str, Any]
+    kind: ClassVar[str] = "threshold"
+
+    def check(self, value: Any, history: Optional[BaselineProvider] = None, *, change_id: Optional[str] = None) -> bool:
+        return self.comparator(value, self.target)
+
+    def evaluate(
+        self,
+        metrics: Mapping[str, Any],
+        history: Optional[BaselineProvider] = None,
+        context: Optional[EvalContext] = None,
+        *,
+        change_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        value = metrics.get(self.metric)
+        if value is None:
+            return _missing(self)
+        try:
+            passed = self.comparator(value, self.target)
+        except TypeError as exc:
+            return _error(self, value, exc)
+        return {
+            "id": self.id,
+            "metric": self.metric,
+            "expected": self.expected,
+            "actual": value,
+            "status": "pass" if passed else "fail",
+            "message": "" if passed else f"Expected {self.metric} {self.operator} {self.target} but got {value}.",
+        }
+
+
+@dataclass(frozen=True)
+class RegressionGate:
+    """Fail when a metric drops more than ``max_drop`` below its rolling median.
+
+    The median covers the last ``window`` samples recorded for ``change_id``,
+    so one change is never judged against another's runs. Without history
+    (no provider, or no recorded runs yet) the gate reports ``skipped`` and
+    does not fail the policy; a value that cannot be compared reports ``error``.
+    """
+
+    id: str
+    metric: str
+    window: int
+    max_drop: float
+    expected: Mapping[str, Any]
+    kind: ClassVar[str] = "regression"
+
+    def _baseline(self, history: Optional[BaselineProvider], change_id: Optional[str]) -> Optional[float]:
+        return history.baseline(self.metric, self.window, change_id=change_id) if history is not None else None
+
+    def check(self, value: Any, history: Optional[BaselineProvider] = None, *, change_id: Optional[str] = None) -> bool:
+        baseline = self._baseline(history, change_id)
+        return baseline is None or baseline - value <= self.max_drop
+
+    def evaluate(
+        self,
+        metrics: Mapping[str, Any],
+        history: Optional[BaselineProvider] = None,
+        context: Optional[EvalContext] = None,
+        *,
+        change_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        value = metrics.get(self.metric)
+        if value is None:
+            return _missing(self)
+        baseline = self._baseline(history, change_id)
+        result = {
+            "id": self.id,
+            "metric": self.metric,
+            "expected": self.expected,
+            "actual": value,
+            "baseline": baseline,
+        }
+        if baseline is None:
+            scope = f" in {change_id}" if change_id else ""
+            result.update(status="skipped", message=f"No recorded history for '{self.metric}'{scope}.")
+            return result
+        try:
+            passed = baseline - value <= self.max_drop
+        except TypeError as exc:
+            return _error(self, value, exc)
+        if passed:
+            result.update(status="pass", message="")
+        else:
+            result.update(
+                status="fail",
+                message=(
+                    f"Expected {self.metric} to stay within {self.max_drop} of the median of the last "
+                    f"{self.window} runs ({baseline}) but got {value}."
+                ),
+            )
+        return result
+
+
+@dataclass(frozen=True)
+class ExpressionGate:
+    """A boolean gate expression parsed once into a shared, hash-consed AST."""
+
+    id: str
+    expr: str
+    node: Node
+    metrics: tuple[str, ...]
+    expected: Mapping[str, Any]
+    kind: ClassVar[str] = "expression"
+
+    @property
+    def metric(self) -> str:
+        return ", ".join(self.metrics)
+
+    def evaluate(
+        self,
+        metrics: Mapping[str, Any],
+        history: Optional[BaselineProvider] = None,
+        context: Optional[EvalContext] = None,
+        *,
+        change_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        context = context if context is not None else EvalContext(metrics, history)
+        result = {
+            "id": self.id,
+            "metric": self.metric,
+            "expected": self.expected,
+            "actual": {name: metrics.get(name) for name in self.metrics},
+        }
+        try:
+            passed = bool(context.value(self.node))
+        except MissingMetric as exc:
+            result.update(status="missing", message=f"Metric '{exc.metric}' not provided.")
+        except MissingHistory as exc:
+            result.update(status="skipped", message=f"No recorded history for '{exc.metric}'.")
+        except (ArithmeticError, TypeError, ValueError) as exc:
+            return _error(self, result["actual"], exc)
+        else:
+            result.update(
+                status="pass" if passed else "fail",
+                message="" if passed else f"Expected {self.expr} but it evaluated to false.",
+            )
+        return result
+
+
+Gate = Union[CompiledGate, RegressionGate, ExpressionGate]
+PASSING_STATUSES = frozenset({"pass", "skipped"})
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """Immutable evaluator for a validated QA policy."""
+
+    digest: str
+    gates: tuple[Gate, ...]
+    policy: Mapping[str, Any]
+    notifications: Mapping[str, Any]
+    phase: Optional[str] = None
+
+    def evaluate(
+        self,
+        metrics: Mapping[str, Any],
+        history: Optional[BaselineProvider] = None,
+        *,
+        change_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return the same structure as ``qa_enforcer.evaluate``.
+
+        Expression gates share one evaluation context, so sub-expressions common
+        to several gates are computed once per metric set. ``change_id`` scopes
+        regression baselines to that change's history.
+        """
+        context = EvalContext(metrics, history)
+        results = [gate.evaluate(metrics, history, context, change_id=change_id) for gate in self.gates]
+        return {"passed": all(result["status"] in PASSING_STATUSES for result in results), "gates": results}
+
+    def passes(
+        self,
+        metrics: Mapping[str, Any],
+        history: Optional[BaselineProvider] = None,
+        *,
+        change_id: Optional[str] = None,
+    ) -> bool:
+        """Return whether ``metrics`` satisfy every gate, without building result records."""
+        get = metrics.get
+        context: Optional[EvalContext] = None
+        for gate in self.gates:
+            if gate.kind == "expression":
+                context = context or EvalContext(metrics, history)
+                if gate.evaluate(metrics, history, context)["status"] not in PASSING_STATUSES:
+                    return False
+                continue
+            value = get(gate.metric)
+            try:
+                if value is None or not gate.check(value, history, change_id=change_id):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+
+def compile_policy(validated: Mapping[str, Any], *, digest: str = "", phase: Optional[str] = None) -> CompiledPolicy:
+    """Compile a policy already returned by ``validate_policy``.
+
+    ``phase`` selects per-gate ``phases`` overrides; by default the policy's own
+    ``phase`` is used.
+    """
+    phase = str(phase if phase is not None else validated["policy"].get("phase", ""))
+    gates: list[Gate] = []
+    for raw_gate in validated["policy"]["gates"]:
+        gate = resolve_gate(raw_gate, phase)
+        kind = gate_type(gate)
+        if kind == "expression":
+            node = parse_expression(gate["expr"])
+            gates.append(
+                ExpressionGate(
+                    id=gate["id"],
+                    expr=gate["expr"],
+                    node=node,
+                    metrics=referenced_metrics(node),
+                    expected=gate,
+                )
+            )
+            continue
+        if kind == "regression":
+            gates.append(
+                RegressionGate(
+                    id=gate["id"],
+                    metric=gate["metric"],
+                    window=int(gate["window"]),
+                    max_drop=float(gate["max_drop"]),
+                    expected=gate,
+                )
+            )
+            continue
+        comparator = OPERATORS.get(gate["operator"])
+        if comparator is None:
+            raise PolicyValidationError(f"Unsupported operator '{gate['operator']}' in policy gate '{gate['id']}'")
+        gates.append(
+            CompiledGate(
+                id=gate["id"],
+                metric=gate["metric"],
+                operator=gate["operator"],
+                target=gate["target"],
+                comparator=comparator,
+                expected=gate,
+            )
+        )
+    return CompiledPolicy(
+        digest=digest,
+        gates=tuple(gates),
+        policy=validated["policy"],
+        notifications=validated["notifications"],
+        phase=phase,
+    )
+
+
+def load_compiled_policy(
+    path: Path | str,
+    *,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    phase: Optional[str] = None,
+) -> CompiledPolicy:
+    """Load, validate, and compile ``path`` for ``phase``, reusing earlier results for identical content."""
+    digest, validated = load_validated_policy(path, cache_dir=cache_dir)
+    key = (digest, None if phase is None else str(phase))
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        compiled = compile_policy(validated, digest=digest, phase=phase)
+        _COMPILED[key] = compiled
+    return compiled
+
+
+def clear_cache() -> None:
+    """Forget compiled and validated policies held in memory (the on-disk cache is untouched)."""
+    _COMPILED.clear()
+    policy_parser.clear_cache()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate metrics against a compiled QA policy.")
+    parser.add_argument("policy_path", nargs="?", default="QA_POLICY.yaml", help="Path to QA policy file.")
+    parser.add_argument("--metrics", required=True, help="Path to JSON metrics file.")
+    parser.add_argument("--no-cache", action="store_true", help="Skip the on-disk validated policy cache.")
+    args = parser.parse_args(argv)
+
+    try:
+        compiled = load_compiled_policy(args.policy_path, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+    except PolicyValidationError as exc:
+        print(f"Policy validation error: {exc}", file=sys.stderr)
+        return 1
+
+    metrics = json.loads(Path(args.metrics).read_text(encoding="utf-8"))
+    evaluation = compiled.evaluate(metrics)
+    print(json.dumps(evaluation, indent=2, sort_keys=True))
+    return 0 if evaluation["passed"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
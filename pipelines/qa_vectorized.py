@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""Vectorized QA gate evaluation over many metric snapshots.
+
+Historical analysis re-evaluates the policy gates over thousands of past
+``qa_metrics.json`` snapshots. Instead of looping over dicts, snapshots are
+loaded into a :class:`MetricMatrix` (one float column per metric plus a
+presence mask) and every threshold gate becomes a single NumPy comparison.
+Statuses match ``qa_enforcer.evaluate`` so switching to the vectorized path
+never changes a verdict: only absent (or null) metrics are missing, NaN fails
+its comparison, and non-numeric values are checked through the compiled gate
+(usually an error). Regression and expression gates have no columnar
+form; they are evaluated row by row through the compiled gate (with the
+metrics history, when given), so the overall pass rate still covers every gate.
+
+NumPy is optional for the rest of the pipelines and only imported when this
+module is used.
+
+CLI usage:
+
+    python3 pipelines/qa_vectorized.py [--work-root artifacts/work] [--history] [--sweep coverage=0.7:0.95:0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.metrics_store import DEFAULT_STORE_PATH, MetricsStore
+from pipelines.policy_expr import EvalContext
+from pipelines.policy_parser import PolicyValidationError
+from pipelines.qa_enforcer import DEFAULT_WORK_ROOT, discover_metrics, load_metrics
+from pipelines.qa_policy import PASSING_STATUSES, BaselineProvider, CompiledPolicy, Gate, load_compiled_policy
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+_UFUNCS = {
+    ">=": "greater_equal",
+    "<=": "less_equal",
+    ">": "greater",
+    "<": "less",
+    "==": "equal",
+}
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover - exercised only without numpy
+        raise RuntimeError("Vectorized QA evaluation requires numpy (pip install numpy).") from exc
+    return numpy
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+@dataclass(frozen=True)
+class MetricMatrix:
+    """Columnar metric snapshots.
+
+    ``values[name]`` is float64, NaN where the metric is absent or not a
+    number; ``present[name]`` marks rows that provide the metric at all, and
+    ``other[name]`` keeps the non-numeric values by row index.
+    """
+
+    values: Mapping[str, "np.ndarray"]
+    present: Mapping[str, "np.ndarray"]
+    labels: tuple[str, ...]
+    change_ids: tuple[Optional[str], ...] = ()
+    other: Mapping[str, Mapping[int, Any]] = field(default_factory=dict)
+
+    @property
+    def rows(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def from_snapshots(
+        cls,
+        snapshots: Sequence[Mapping[str, Any]],
+        *,
+        metrics: Optional[Iterable[str]] = None,
+        labels: Optional[Sequence[str]] = None,
+        change_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> "MetricMatrix":
+        np = _numpy()
+        if metrics is None:
+            metrics = sorted({name for snapshot in snapshots for name in snapshot})
+        values: Dict[str, Any] = {}
+        present: Dict[str, Any] = {}
+        other: Dict[str, Dict[int, Any]] = {}
+        for name in metrics:
+            column = np.full(len(snapshots), np.nan)
+            provided = np.zeros(len(snapshots), dtype=bool)
+            for index, snapshot in enumerate(snapshots):
+                value = snapshot.get(name)
+                if value is None:
+                    continue
+                provided[index] = True
+                converted = _as_float(value)
+                if converted is None:
+                    other.setdefault(name, {})[index] = value
+                else:
+                    column[index] = converted
+            values[name] = column
+            present[name] = provided
+        row_labels = tuple(labels) if labels is not None else tuple(str(index) for index in range(len(snapshots)))
+        if len(row_labels) != len(snapshots):
+            raise ValueError("labels must have one entry per snapshot.")
+        row_changes = tuple(change_ids) if change_ids is not None else ()
+        if row_changes and len(row_changes) != len(snapshots):
+            raise ValueError("change_ids must have one entry per snapshot.")
+        return cls(values=values, present=present, labels=row_labels, change_ids=row_changes, other=other)
+
+    @classmethod
+    def from_paths(cls, paths: Sequence[Path], *, metrics: Optional[Iterable[str]] = None) -> "MetricMatrix":
+        """Load ``qa_metrics.json`` files; unreadable files become rows with every metric missing."""
+        snapshots: List[Mapping[str, Any]] = []
+        for path in paths:
+            try:
+                snapshots.append(load_metrics(Path(path)))
+            except SystemExit:
+                snapshots.append({})
+        return cls.from_snapshots(
+            snapshots,
+            metrics=metrics,
+            labels=[str(path) for path in paths],
+            change_ids=[Path(path).parent.parent.name for path in paths],
+        )
+
+    def column(self, name: str) -> tuple["np.ndarray", "np.ndarray"]:
+        np = _numpy()
+        if name not in self.values:
+            return np.full(self.rows, np.nan), np.zeros(self.rows, dtype=bool)
+        return self.values[name], self.present[name]
+
+    def row(self, index: int, names: Iterable[str]) -> Dict[str, Any]:
+        """Metrics of one snapshot as a dict (provided values only, non-numeric ones as given)."""
+        row: Dict[str, Any] = {}
+        for name in names:
+            values, present = self.column(name)
+            if present[index]:
+                other = self.other.get(name, {})
+                row[name] = other[index] if index in other else float(values[index])
+        return row
+
+
+@dataclass(frozen=True)
+class GateOutcome:
+    """Per-row result of one gate over a :class:`MetricMatrix`."""
+
+    id: str
+    metric: str
+    operator: Optional[str]
+    target: Optional[float]
+    passed: "np.ndarray"
+    missing: "np.ndarray"
+    errors: "np.ndarray"
+    kind: str = "threshold"
+
+    @property
+    def pass_rate(self) -> float:
+        return float(self.passed.mean()) if self.passed.size else 0.0
+
+    @property
+    def failing_rows(self) -> "np.ndarray":
+        return _numpy().flatnonzero(~self.passed)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "metric": self.metric,
+            "operator": self.operator,
+            "target": self.target,
+            "pass_rate": self.pass_rate,
+            "passed": int(self.passed.sum()),
+            "missing": int(self.missing.sum()),
+            "errors": int(self.errors.sum()),
+            "failing_rows": self.failing_rows.tolist(),
+        }
+
+
+def _compare(operator: str, values: "np.ndarray", target: Any) -> "np.ndarray":
+    np = _numpy()
+    name = _UFUNCS.get(operator)
+    if name is None:
+        raise ValueError(f"Unsupported operator '{operator}'.")
+    return getattr(np, name)(values, target)
+
+
+def gate_metrics(gate: Gate) -> tuple[str, ...]:
+    """Metric names ``gate`` reads (expression gates may read several)."""
+    return gate.metrics if gate.kind == "expression" else (gate.metric,)
+
+
+def policy_metrics(compiled: CompiledPolicy) -> List[str]:
+    return sorted({name for gate in compiled.gates for name in gate_metrics(gate)})
+
+
+def _evaluate_rows(
+    gates: Sequence[Gate],
+    matrix: MetricMatrix,
+    history: Optional[BaselineProvider],
+) -> List[List[str]]:
+    """Per-gate lists of row statuses, evaluated through the compiled gates."""
+    names = sorted({name for gate in gates for name in gate_metrics(gate)})
+    statuses: List[List[str]] = [[] for _ in gates]
+    for index in range(matrix.rows):
+        row = matrix.row(index, names)
+        context = EvalContext(row, history)
+        change_id = matrix.change_ids[index] if matrix.change_ids else None
+        for gate, column in zip(gates, statuses):
+            column.append(gate.evaluate(row, history, context, change_id=change_id)["status"])
+    return statuses
+
+
+def evaluate_gates(
+    compiled: CompiledPolicy,
+    matrix: MetricMatrix,
+    history: Optional[BaselineProvider] = None,
+) -> List[GateOutcome]:
+    """Evaluate every gate of ``compiled`` over ``matrix``, in policy order.
+
+    Threshold gates are one vectorized comparison each; regression and
+    expression gates are evaluated per row (regression baselines are scoped to
+    each row's change when the matrix knows it).
+    """
+    np = _numpy()
+    scalar_gates = [gate for gate in compiled.gates if gate.kind != "threshold"]
+    scalar = dict(zip(map(id, scalar_gates), _evaluate_rows(scalar_gates, matrix, history))) if scalar_gates else {}
+    outcomes = []
+    for gate in compiled.gates:
+        if gate.kind != "threshold":
+            statuses = scalar[id(gate)]
+            outcomes.append(
+                GateOutcome(
+                    id=gate.id,
+                    metric=gate.metric,
+                    operator=None,
+                    target=None,
+                    passed=np.fromiter((status in PASSING_STATUSES for status in statuses), bool, count=matrix.rows),
+                    missing=np.fromiter((status == "missing" for status in statuses), bool, count=matrix.rows),
+                    errors=np.fromiter((status == "error" for status in statuses), bool, count=matrix.rows),
+                    kind=gate.kind,
+                )
+            )
+            continue
+        target = _as_float(gate.target)
+        if target is None:
+            raise ValueError(f"Gate '{gate.id}' has a non-numeric target; vectorized evaluation needs numbers.")
+        values, present = matrix.column(gate.metric)
+        passed = _compare(gate.operator, values, target) & present
+        errors = np.zeros(matrix.rows, dtype=bool)
+        for index, value in matrix.other.get(gate.metric, {}).items():
+            status = gate.evaluate({gate.metric: value})["status"]
+            passed[index] = status in PASSING_STATUSES
+            errors[index] = status == "error"
+        outcomes.append(
+            GateOutcome(
+                id=gate.id,
+                metric=gate.metric,
+                operator=gate.operator,
+                target=target,
+                passed=passed,
+                missing=~present,
+                errors=errors,
+            )
+        )
+    return outcomes
+
+
+def evaluate_matrix(
+    compiled: CompiledPolicy,
+    matrix: MetricMatrix,
+    history: Optional[BaselineProvider] = None,
+) -> Dict[str, Any]:
+    """Return overall and per-gate pass rates plus failing row indices."""
+    np = _numpy()
+    outcomes = evaluate_gates(compiled, matrix, history)
+    overall = np.logical_and.reduce([outcome.passed for outcome in outcomes]) if outcomes else np.ones(matrix.rows, bool)
+    return {
+        "rows": matrix.rows,
+        "pass_rate": float(overall.mean()) if matrix.rows else 0.0,
+        "failing_rows": np.flatnonzero(~overall).tolist(),
+        "gates": [outcome.as_dict() for outcome in outcomes],
+    }
+
+
+def sweep_gate(
+    compiled: CompiledPolicy,
+    matrix: MetricMatrix,
+    gate_id: str,
+    thresholds: Sequence[float],
+    history: Optional[BaselineProvider] = None,
+) -> List[Dict[str, float]]:
+    """Re-evaluate threshold gate ``gate_id`` at each threshold with the other gates unchanged.
+
+    All thresholds are compared in one broadcast operation; the result lists the
+    gate's pass rate and the resulting overall pass rate per threshold.
+    """
+    np = _numpy()
+    outcomes = evaluate_gates(compiled, matrix, history)
+    try:
+        swept = next(outcome for outcome in outcomes if outcome.id == gate_id)
+    except StopIteration:
+        raise KeyError(f"Unknown gate '{gate_id}'.") from None
+    if swept.kind != "threshold":
+        raise ValueError(f"Gate '{gate_id}' is a {swept.kind} gate; only threshold gates can be swept.")
+    others = [outcome.passed for outcome in outcomes if outcome is not swept]
+    others_passed = np.logical_and.reduce(others) if others else np.ones(matrix.rows, bool)
+
+    values, present = matrix.column(swept.metric)
+    grid = np.asarray(thresholds, dtype=np.float64)
+    passed = _compare(swept.operator, values[np.newaxis, :], grid[:, np.newaxis]) & present
+    gate_rates = passed.mean(axis=1) if matrix.rows else np.zeros(len(grid))
+    overall_rates = (passed & others_passed).mean(axis=1) if matrix.rows else np.zeros(len(grid))
+    return [
+        {"threshold": float(threshold), "gate_pass_rate": float(gate_rate), "pass_rate": float(overall_rate)}
+        for threshold, gate_rate, overall_rate in zip(grid, gate_rates, overall_rates)
+    ]
+
+
+def _parse_sweep(spec: str) -> tuple[str, List[float]]:
+    gate_id, _, bounds = spec.partition("=")
+    try:
+        start, stop, step = (float(part) for part in bounds.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected GATE=start:stop:step, got '{spec}'.") from None
+    if step <= 0:
+        raise argparse.ArgumentTypeError("Sweep step must be positive.")
+    count = int(round((stop - start) / step)) + 1
+    return gate_id, [round(start + index * step, 10) for index in range(max(count, 0))]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate QA gates over historical metric snapshots.")
+    parser.add_argument("--policy", default="QA_POLICY.yaml", help="Path to QA policy file.")
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT), help="Change workspace root to scan.")
+    parser.add_argument("--sweep", type=_parse_sweep, action="append", default=[], help="GATE=start:stop:step")
+    parser.add_argument(
+        "--history",
+        nargs="?",
+        const=str(DEFAULT_STORE_PATH),
+        help="Metrics store used by regression gates and expression aggregates.",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        compiled = load_compiled_policy(args.policy)
+    except PolicyValidationError as exc:
+        print(f"Policy validation error: {exc}", file=sys.stderr)
+        return 1
+    paths = discover_metrics(Path(args.work_root))
+    matrix = MetricMatrix.from_paths(paths, metrics=policy_metrics(compiled))
+    history = MetricsStore(args.history) if args.history else None
+    try:
+        report = evaluate_matrix(compiled, matrix, history)
+        report["sweeps"] = {
+            gate_id: sweep_gate(compiled, matrix, gate_id, grid, history) for gate_id, grid in args.sweep
+        }
+    finally:
+        if history is not None:
+            history.close()
+    report["labels"] = list(matrix.labels)
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark agent template rendering (compile, string render, streamed render)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from agents.templating import Template, TemplateEngine
+
+
+def sample_context(template: Template, *, items: int) -> dict[str, Any]:
+    """Build a synthetic context that fills every field of ``template``."""
+    context: dict[str, Any] = {}
+    for name in template.fields:
+        if name in template.sequence_fields:
+            context[name] = [f"{name} entry {index} with representative prose." for index in range(items)]
+        else:
+            context[name] = f"{name} value"
+    return context
+
+
+def _per_call_us(elapsed: float, iterations: int) -> float:
+    return round(elapsed / iterations * 1_000_000, 2)
+
+
+def benchmark_template(engine: TemplateEngine, name: str, *, iterations: int, items: int) -> dict[str, Any]:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        engine.clear()
+        engine.get(name)
+    compile_elapsed = time.perf_counter() - started
+
+    template = engine.get(name)
+    context = sample_context(template, items=items)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        template.render(context)
+    render_elapsed = time.perf_counter() - started
+
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            template.render_to(sink, context)
+        stream_elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        template.render(context)
+        _, render_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        template.render_to(sink, context)
+        _, stream_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "template": name,
+        "iterations": iterations,
+        "items": items,
+        "compile_us": _per_call_us(compile_elapsed, iterations),
+        "render_us": _per_call_us(render_elapsed, iterations),
+        "stream_us": _per_call_us(stream_elapsed, iterations),
+        "render_peak_kib": round(render_peak / 1024, 1),
+        "stream_peak_kib": round(stream_peak / 1024, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark agent Markdown template rendering.")
+    parser.add_argument("--iterations", type=int, default=1000, help="Renders per template (default: 1000).")
+    parser.add_argument("--items", type=int, default=10, help="Entries per list field (default: 10).")
+    parser.add_argument("--template", action="append", help="Limit to specific template names (repeatable).")
+    args = parser.parse_args(argv)
+
+    engine = TemplateEngine()
+    names = args.template or engine.names()
+    for name in names:
+        result = benchmark_template(engine, name, iterations=args.iterations, items=args.items)
+        print(json.dumps(result, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""Stream test and coverage reports into the metrics file read by ``qa_enforcer``.
+
+Supported inputs:
+
+- Cobertura XML (``coverage xml``, JaCoCo/Istanbul converters) -> ``coverage``,
+  ``branch_coverage``, ``lines_valid``, ``lines_covered``.
+- JUnit XML -> ``tests_total``, ``tests_failed``, ``tests_errors``,
+  ``tests_skipped``, ``tests_passed``. Two or more JUnit reports of the same
+  suite additionally yield ``reproducibility``: the share of test cases whose
+  outcome was identical in every report.
+- coverage.py JSON (``coverage json``) -> the same coverage metrics. Parsed
+  incrementally with ``ijson`` when installed, otherwise with a small built-in
+  streaming tokenizer (slower, but the document is never loaded whole).
+
+XML is read with ``iterparse`` and every element is detached from its parent
+and cleared once its end tag has been handled, so memory stays bounded by the
+nesting depth rather than the report size (JUnit reproducibility keeps one
+small status code per test case).
+
+CLI usage:
+
+    python3 pipelines/report_ingest.py --cobertura coverage.xml --junit run1.xml --junit run2.xml \\
+        --output artifacts/work/CH-002/run-03/qa_metrics.json [--merge]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import write_artifact
+
+try:  # Optional: incremental JSON parsing for very large coverage.py reports.
+    import ijson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on environment
+    ijson = None
+
+
+class ReportError(Exception):
+    """Raised when a report cannot be parsed."""
+
+
+@dataclass
+class CoverageTotals:
+    lines_valid: int = 0
+    lines_covered: int = 0
+    branches_valid: int = 0
+    branches_covered: int = 0
+
+    def add(self, other: "CoverageTotals") -> None:
+        self.lines_valid += other.lines_valid
+        self.lines_covered += other.lines_covered
+        self.branches_valid += other.branches_valid
+        self.branches_covered += other.branches_covered
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {
+            "lines_valid": self.lines_valid,
+            "lines_covered": self.lines_covered,
+            "coverage": round(self.lines_covered / self.lines_valid, 6) if self.lines_valid else 0.0,
+        }
+        if self.branches_valid:
+            metrics["branch_coverage"] = round(self.branches_covered / self.branches_valid, 6)
+        return metrics
+
+
+@dataclass
+class JUnitTotals:
+    total: int = 0
+    failed: int = 0
+    errors: int = 0
+    skipped: int = 0
+
+    def add(self, other: "JUnitTotals") -> None:
+        self.total += other.total
+        self.failed += other.failed
+        self.errors += other.errors
+        self.skipped += other.skipped
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "tests_total": self.total,
+            "tests_failed": self.failed,
+            "tests_errors": self.errors,
+            "tests_skipped": self.skipped,
+            "tests_passed": self.total > 0 and self.failed == 0 and self.errors == 0,
+        }
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _iterparse(path: Path) -> Iterable[tuple[str, ET.Element]]:
+    """Yield ``start``/``end`` events; after an ``end`` the element is detached and cleared."""
+    open_elements: List[ET.Element] = []
+    try:
+        for event, elem in ET.iterparse(str(path), events=("start", "end")):
+            if event == "start":
+                open_elements.append(elem)
+                yield event, elem
+                continue
+            yield event, elem
+            open_elements.pop()
+            if open_elements:
+                open_elements[-1].remove(elem)
+            elem.clear()
+    except ET.ParseError as exc:
+        raise ReportError(f"{path}: {exc}") from exc
+
+
+def _condition_counts(value: Optional[str]) -> tuple[int, int]:
+    """Parse Cobertura ``condition-coverage="50% (1/2)"`` into (covered, total)."""
+    if not value or "(" not in value:
+        return 0, 0
+    covered, _, total = value[value.index("(") + 1 : value.rindex(")")].partition("/")
+    try:
+        return int(covered), int(total)
+    except ValueError:
+        return 0, 0
+
+
+def parse_cobertura(path: Path) -> CoverageTotals:
+    """Count class-level ``<line>`` entries (method-level duplicates are ignored)."""
+    totals = CoverageTotals()
+    stack: List[str] = []
+    root_attrib: Dict[str, str] = {}
+    for event, elem in _iterparse(path):
+        tag = _local(elem.tag)
+        if event == "start":
+            if not stack:
+                if tag != "coverage":
+                    raise ReportError(f"{path}: expected a Cobertura <coverage> root, found <{tag}>.")
+                root_attrib = dict(elem.attrib)
+            stack.append(tag)
+            continue
+        stack.pop()
+        if tag == "line" and len(stack) >= 2 and stack[-1] == "lines" and stack[-2] == "class":
+            totals.lines_valid += 1
+            if int(elem.get("hits", "0") or 0) > 0:
+                totals.lines_covered += 1
+            if elem.get("branch") == "true":
+                covered, total = _condition_counts(elem.get("condition-coverage"))
+                totals.branches_covered += covered
+                totals.branches_valid += total
+
+    if totals.lines_valid == 0 and "lines-valid" in root_attrib:
+        # Summary-only reports: fall back to the root counters.
+        totals.lines_valid = int(root_attrib.get("lines-valid", 0))
+        totals.lines_covered = int(root_attrib.get("lines-covered", 0))
+        totals.branches_valid = int(root_attrib.get("branches-valid", 0))
+        totals.branches_covered = int(root_attrib.get("branches-covered", 0))
+    return totals
+
+
+_STATUS_CODES = {"pass": 0, "failure": 1, "error": 2, "skipped": 3}
+
+
+def parse_junit(path: Path, outcomes: Optional[MutableMapping[str, int]] = None) -> JUnitTotals:
+    """Count ``<testcase>`` outcomes; optionally record a status code per case id."""
+    totals = JUnitTotals()
+    status = "pass"
+    depth = 0
+    for event, elem in _iterparse(path):
+        tag = _local(elem.tag)
+        if event == "start":
+            if depth == 0 and tag not in ("testsuites", "testsuite"):
+                raise ReportError(f"{path}: expected a JUnit <testsuites>/<testsuite> root, found <{tag}>.")
+            depth += 1
+            if tag == "testcase":
+                status = "pass"
+            continue
+        depth -= 1
+        if tag in ("failure", "error", "skipped") and status == "pass":
+            status = tag
+        elif tag == "testcase":
+            totals.total += 1
+            if status == "failure":
+                totals.failed += 1
+            elif status == "error":
+                totals.errors += 1
+            elif status == "skipped":
+                totals.skipped += 1
+            if outcomes is not None:
+                outcomes[f"{elem.get('classname', '')}::{elem.get('name', '')}"] = _STATUS_CODES[status]
+    return totals
+
+
+def _coverage_json_totals(totals: Mapping[str, Any]) -> CoverageTotals:
+    return CoverageTotals(
+        lines_valid=int(totals.get("num_statements", 0)),
+        lines_covered=int(totals.get("covered_lines", 0)),
+        branches_valid=int(totals.get("num_branches", 0)),
+        branches_covered=int(totals.get("covered_branches", 0)),
+    )
+
+
+_JSON_TOKEN = re.compile(
+    r'\s*(?:(\[[-+0-9.eE,\s]*\])|([{}\[\]:,])|"((?:[^"\\]|\\.)*)"|([-+0-9.eE]+)|(true|false|null))'
+)
+_JSON_TOKEN_STARTS = frozenset('"-+0123456789.eEtfn')
+_JSON_CHUNK = 64 * 1024
+
+
+def _json_numbers(handle: IO[str]) -> Iterator[tuple[tuple[str, ...], Any]]:
+    """Yield ``(key path, number)`` for every numeric object member of a JSON document.
+
+    The document is read in chunks; numbers inside arrays are skipped (flat
+    numeric arrays such as coverage.py line lists in a single regex match).
+    Memory is bounded by the nesting depth and the longest token.
+    """
+    buffer, pos, eof = "", 0, False
+    containers: List[str] = []
+    path: List[str] = []
+    expect_key = False
+    while True:
+        match = _JSON_TOKEN.match(buffer, pos)
+        if match is None or (match.end() == len(buffer) and not eof):
+            rest = buffer[pos:].lstrip()
+            if match is None and rest and rest[0] not in _JSON_TOKEN_STARTS:
+                raise ValueError(f"Unexpected JSON at '{rest[:20]}'")
+            if eof:
+                if rest:
+                    raise ValueError(f"Unexpected JSON at '{rest[:20]}'")
+                if containers:
+                    raise ValueError("Unexpected end of JSON document")
+                return
+            chunk = handle.read(_JSON_CHUNK)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        pos = match.end()
+        flat_array, punct, string, number, _ = match.groups()
+        if flat_array is not None:
+            continue
+        if punct in ("{", "["):
+            containers.append(punct)
+            path.append("" if punct == "{" else "item")
+            expect_key = punct == "{"
+        elif punct in ("}", "]"):
+            if not containers or containers.pop() != ("{" if punct == "}" else "["):
+                raise ValueError(f"Unbalanced '{punct}'")
+            path.pop()
+            expect_key = False
+        elif punct == ",":
+            expect_key = bool(containers) and containers[-1] == "{"
+        elif punct == ":":
+            expect_key = False
+        elif string is not None and expect_key:
+            path[-1] = json.loads(f'"{string}"') if "\\" in string else string
+            expect_key = False
+        elif number is not None and containers[-1:] == ["{"]:
+            yield tuple(path), json.loads(number)
+
+
+def _coverage_numbers(path: Path) -> Iterator[tuple[str, str, Any]]:
+    """Yield ``("totals" | "summary", field, value)`` from a coverage.py JSON report."""
+    if ijson is not None:
+        with path.open("rb") as handle:
+            try:
+                for prefix, event, value in ijson.parse(handle):
+                    if event != "number":
+                        continue
+                    if prefix.startswith("totals."):
+                        yield "totals", prefix[len("totals.") :], value
+                    elif prefix.startswith("files.") and ".summary." in prefix:
+                        yield "summary", prefix.rsplit(".", 1)[-1], value
+            except ijson.JSONError as exc:
+                raise ReportError(f"{path}: {exc}") from exc
+        return
+
+    with path.open(encoding="utf-8") as handle:
+        try:
+            for keys, value in _json_numbers(handle):
+                if len(keys) == 2 and keys[0] == "totals":
+                    yield "totals", keys[1], value
+                elif len(keys) == 4 and keys[0] == "files" and keys[2] == "summary":
+                    yield "summary", keys[3], value
+        except ValueError as exc:
+            raise ReportError(f"{path}: {exc}") from exc
+
+
+def parse_coverage_json(path: Path) -> CoverageTotals:
+    """Read coverage.py JSON, preferring ``totals`` and summing per-file summaries otherwise."""
+    totals: Dict[str, Any] = {}
+    summed = CoverageTotals()
+    for section, name, value in _coverage_numbers(path):
+        if section == "totals":
+            totals[name] = value
+        else:
+            summed.add(_coverage_json_totals({name: value}))
+    return _coverage_json_totals(totals) if totals else summed
+
+
+def reproducibility(outcomes: Sequence[Mapping[str, int]]) -> Optional[float]:
+    """Share of test cases with the same outcome in every run (None for fewer than two runs)."""
+    if len(outcomes) < 2:
+        return None
+    first, *rest = outcomes
+    case_ids = set(first)
+    for run in rest:
+        case_ids.update(run)
+    if not case_ids:
+        return None
+    stable = sum(
+        1
+        for case_id in case_ids
+        if case_id in first and all(run.get(case_id) == first[case_id] for run in rest)
+    )
+    return round(stable / len(case_ids), 6)
+
+
+def ingest(
+    *,
+    cobertura: Sequence[Path] = (),
+    junit: Sequence[Path] = (),
+    coverage_json: Sequence[Path] = (),
+) -> Dict[str, Any]:
+    """Parse every report and return the gate metrics they imply."""
+    metrics: Dict[str, Any] = {}
+    if cobertura or coverage_json:
+        coverage = CoverageTotals()
+        for path in cobertura:
+            coverage.add(parse_cobertura(Path(path)))
+        for path in coverage_json:
+            coverage.add(parse_coverage_json(Path(path)))
+        metrics.update(coverage.metrics())
+
+    if junit:
+        outcomes: List[Dict[str, int]] = []
+        per_run: List[JUnitTotals] = []
+        for path in junit:
+            run_outcomes: Dict[str, int] = {}
+            per_run.append(parse_junit(Path(path), run_outcomes if len(junit) > 1 else None))
+            outcomes.append(run_outcomes)
+        # Test counts describe the latest run; earlier reports feed reproducibility.
+        metrics.update(per_run[-1].metrics())
+        ratio = reproducibility(outcomes)
+        if ratio is not None:
+            metrics["reproducibility"] = ratio
+            metrics["reproducibility_runs"] = len(junit)
+    return metrics
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def write_metrics(output: Path, metrics: Mapping[str, Any], *, merge: bool = False) -> Dict[str, Any]:
+    """Write ``metrics`` (optionally merged over the existing file) with a timestamp."""
+    payload: Dict[str, Any] = {}
+    if merge and output.exists():
+        try:
+            payload = json.loads(output.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            raise ReportError(f"{output}: existing metrics file is not valid JSON: {exc}") from exc
+    payload.update(metrics)
+    payload["timestamp"] = _utc_now()
+    write_artifact(output, json.dumps(payload, indent=2, sort_keys=True))
+    return payload
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Derive QA metrics from coverage and test reports.")
+    parser.add_argument("--cobertura", action="append", default=[], type=Path, help="Cobertura XML report.")
+    parser.add_argument("--junit", action="append", default=[], type=Path, help="JUnit XML report (repeat for reruns).")
+    parser.add_argument("--coverage-json", action="append", default=[], type=Path, help="coverage.py JSON report.")
+    parser.add_argument("--output", required=True, type=Path, help="Metrics JSON to write.")
+    parser.add_argument("--merge", action="store_true", help="Update an existing metrics file instead of replacing it.")
+    args = parser.parse_args(argv)
+
+    if not (args.cobertura or args.junit or args.coverage_json):
+        parser.error("at least one of --cobertura, --junit or --coverage-json is required")
+
+    try:
+        metrics = ingest(cobertura=args.cobertura, junit=args.junit, coverage_json=args.coverage_json)
+        payload = write_metrics(args.output, metrics, merge=args.merge)
+    except (OSError, ReportError) as exc:
+        print(f"Report ingestion failed: {exc}", file=sys.stderr)
+        return 1
+    print(json.dumps(payload, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Measure pipeline reproducibility by running it repeatedly in isolated workspaces.
+
+Each run gets a private copy of the repository (``.git``, caches and the
+metrics store are left out), so the runs can execute concurrently without
+sharing output paths. Declared artifacts are removed from the copy before the
+run, which forces the pipeline to produce them afresh instead of leaving an
+unchanged file in place. Afterwards every declared artifact, plus any new file
+outside ``audit/``, is hashed with volatile stamp lines dropped (the same
+``VOLATILE_PATTERNS`` the artifact writer ignores).
+
+``reproducibility`` is the share of artifacts whose normalised digest is
+identical in every run; artifacts that differ or are missing from some run are
+listed in the divergence report with the runs behind each variant and the
+first differing line.
+
+CLI usage:
+
+    python3 pipelines/reproducibility.py --runs 4 \\
+        --metrics artifacts/work/CH-002/run-03/qa_metrics.json \\
+        [--report artifacts/work/CH-002/run-03/reproducibility.json] \\
+        [--command "{python} pipelines/phase1_orchestrator.py"] [--artifact GLOB ...]
+
+The metrics file is updated in place (other keys are kept), so it can be passed
+straight to ``qa_enforcer.py --metrics``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import VOLATILE_PATTERNS, write_artifact
+from pipelines.report_ingest import write_metrics
+
+__all__ = [
+    "DEFAULT_ARTIFACTS",
+    "DEFAULT_COMMAND",
+    "ReproducibilityReport",
+    "RunResult",
+    "compare_runs",
+    "normalized_digest",
+    "run_reproducibility",
+]
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_COMMAND = "{python} pipelines/phase1_orchestrator.py"
+DEFAULT_ARTIFACTS: tuple[str, ...] = (
+    "artifacts/phase1/orchestration/summary.json",
+    "docs/PHASE1_BRIEF.md",
+    "docs/IMPLEMENTATION_PLAN.md",
+    "design/DESIGN_SPEC.md",
+    "tests/TEST_PLAN.md",
+    "tests/TEST_RESULTS.md",
+)
+# Relative paths never copied into a workspace.
+WORKSPACE_EXCLUDES: tuple[str, ...] = (
+    ".git",
+    "artifacts/cache",
+    "artifacts/queue",
+    "artifacts/metrics",
+)
+WORKSPACE_EXCLUDED_NAMES = {"__pycache__", ".pytest_cache", ".mypy_cache", ".ruff_cache", ".venv", "venv"}
+# Append-only logs are timestamped per entry and never reproducible byte-for-byte.
+UNTRACKED_PREFIXES: tuple[str, ...] = ("audit/",)
+
+
+@dataclass(frozen=True)
+class RunResult:
+    """Outcome of one isolated run."""
+
+    index: int
+    returncode: int
+    duration: float
+    digests: Mapping[str, str]
+    stderr_tail: str = ""
+
+
+@dataclass
+class ReproducibilityReport:
+    runs: List[RunResult]
+    artifacts: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+    first_differences: Dict[str, int] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+    @property
+    def divergent(self) -> List[str]:
+        return sorted(path for path, variants in self.artifacts.items() if not self._stable(variants))
+
+    def _stable(self, variants: Mapping[str, List[int]]) -> bool:
+        return len(variants) == 1 and "missing" not in variants
+
+    @property
+    def ratio(self) -> float:
+        if not self.artifacts:
+            return 0.0
+        stable = len(self.artifacts) - len(self.divergent)
+        return round(stable / len(self.artifacts), 6)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "reproducibility": self.ratio,
+            "reproducibility_runs": len(self.runs),
+            "reproducibility_artifacts": len(self.artifacts),
+            "reproducibility_divergent": len(self.divergent),
+            "reproducibility_failed_runs": sum(1 for run in self.runs if run.returncode != 0),
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **self.metrics(),
+            "wall_time": round(self.wall_time, 3),
+            "runs": [
+                {
+                    "index": run.index,
+                    "returncode": run.returncode,
+                    "duration": round(run.duration, 3),
+                    **({"stderr_tail": run.stderr_tail} if run.returncode != 0 else {}),
+                }
+                for run in self.runs
+            ],
+            "divergence": [
+                {
+                    "artifact": path,
+                    "variants": self.artifacts[path],
+                    **({"first_difference_line": self.first_differences[path]}
+                       if path in self.first_differences else {}),
+                }
+                for path in self.divergent
+            ],
+        }
+
+
+def _normalized_lines(path: Path) -> List[bytes]:
+    data = path.read_bytes()
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return [data]
+    return [
+        line.encode("utf-8")
+        for line in text.splitlines()
+        if not any(pattern.match(line) for pattern in VOLATILE_PATTERNS)
+    ]
+
+
+def normalized_digest(path: Path) -> str:
+    """sha256 of ``path`` with volatile stamp lines removed (binary files are hashed as-is)."""
+    digest = hashlib.sha256()
+    for line in _normalized_lines(path):
+        digest.update(line)
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _excluded(relative: str, name: str) -> bool:
+    return name in WORKSPACE_EXCLUDED_NAMES or relative in WORKSPACE_EXCLUDES
+
+
+def _copy_workspace(source: Path, target: Path) -> None:
+    def ignore(directory: str, names: List[str]) -> List[str]:
+        relative_dir = Path(directory).relative_to(source)
+        return [name for name in names if _excluded((relative_dir / name).as_posix(), name)]
+
+    shutil.copytree(source, target, ignore=ignore, symlinks=True)
+
+
+def _walk(root: Path) -> Iterable[str]:
+    for directory, dirnames, filenames in os.walk(root):
+        relative_dir = Path(directory).relative_to(root)
+        dirnames[:] = [name for name in dirnames if not _excluded((relative_dir / name).as_posix(), name)]
+        for name in filenames:
+            yield (relative_dir / name).as_posix()
+
+
+def _matches(relative: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatchcase(relative, pattern) for pattern in patterns)
+
+
+def _run_once(
+    index: int,
+    command: Sequence[str],
+    source: Path,
+    workspace_root: Path,
+    artifacts: Sequence[str],
+    timeout: Optional[float],
+) -> RunResult:
+    workspace = workspace_root / f"run-{index:02d}"
+    _copy_workspace(source, workspace)
+    seeded = set()
+    for relative in _walk(workspace):
+        if _matches(relative, artifacts):
+            (workspace / relative).unlink()
+        else:
+            seeded.add(relative)
+
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            list(command), cwd=workspace, env=env, capture_output=True, text=True, timeout=timeout
+        )
+        returncode, stderr = completed.returncode, completed.stderr
+    except subprocess.TimeoutExpired as exc:
+        returncode, stderr = -1, f"timed out after {exc.timeout}s"
+    duration = time.perf_counter() - started
+
+    digests: Dict[str, str] = {}
+    for relative in _walk(workspace):
+        if relative.startswith(UNTRACKED_PREFIXES):
+            continue
+        if _matches(relative, artifacts) or relative not in seeded:
+            digests[relative] = normalized_digest(workspace / relative)
+
+    return RunResult(
+        index=index,
+        returncode=returncode,
+        duration=duration,
+        digests=digests,
+        stderr_tail="\n".join(stderr.strip().splitlines()[-5:]),
+    )
+
+
+def compare_runs(runs: Sequence[RunResult]) -> ReproducibilityReport:
+    """Group each artifact's digests across runs (``missing`` marks runs that did not produce it)."""
+    report = ReproducibilityReport(runs=list(runs))
+    paths = sorted({path for run in runs for path in run.digests})
+    for path in paths:
+        variants: Dict[str, List[int]] = {}
+        for run in runs:
+            variants.setdefault(run.digests.get(path, "missing"), []).append(run.index)
+        report.artifacts[path] = variants
+    return report
+
+
+def _first_difference(left: Path, right: Path) -> Optional[int]:
+    left_lines, right_lines = _normalized_lines(left), _normalized_lines(right)
+    for number, (a, b) in enumerate(zip(left_lines, right_lines), start=1):
+        if a != b:
+            return number
+    if len(left_lines) != len(right_lines):
+        return min(len(left_lines), len(right_lines)) + 1
+    return None
+
+
+def _locate_differences(report: ReproducibilityReport, workspace_root: Path) -> None:
+    for path in report.divergent:
+        present = [runs[0] for digest, runs in report.artifacts[path].items() if digest != "missing"]
+        if len(present) < 2:
+            continue
+        line = _first_difference(
+            workspace_root / f"run-{present[0]:02d}" / path,
+            workspace_root / f"run-{present[1]:02d}" / path,
+        )
+        if line is not None:
+            report.first_differences[path] = line
+
+
+def run_reproducibility(
+    *,
+    runs: int = 3,
+    command: Optional[Sequence[str]] = None,
+    artifacts: Sequence[str] = DEFAULT_ARTIFACTS,
+    source: Path = PROJECT_ROOT,
+    jobs: Optional[int] = None,
+    timeout: Optional[float] = None,
+    workspace_root: Optional[Path] = None,
+    keep: bool = False,
+) -> ReproducibilityReport:
+    """Run ``command`` ``runs`` times concurrently and compare the artifacts it produced."""
+    if runs < 2:
+        raise ValueError("reproducibility needs at least two runs")
+    command = list(command) if command is not None else shlex.split(DEFAULT_COMMAND)
+    command = [part.replace("{python}", sys.executable) for part in command]
+    jobs = jobs or min(runs, os.cpu_count() or 1)
+
+    root = Path(tempfile.mkdtemp(prefix="repro-", dir=workspace_root))
+    started = time.perf_counter()
+    try:
+        # Subprocesses do the work, so threads are enough to keep every core busy.
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_run_once, index, command, Path(source), root, artifacts, timeout)
+                for index in range(1, runs + 1)
+            ]
+            results = [future.result() for future in futures]
+        report = compare_runs(results)
+        _locate_differences(report, root)
+    finally:
+        if keep:
+            print(f"Workspaces kept under {root}", file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    report.wall_time = time.perf_counter() - started
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure artifact reproducibility across repeated pipeline runs.")
+    parser.add_argument("--runs", type=int, default=3, help="Number of isolated runs (default: 3).")
+    parser.add_argument("--jobs", type=int, help="Concurrent runs (default: min(runs, CPU count)).")
+    parser.add_argument(
+        "--command",
+        default=DEFAULT_COMMAND,
+        help=f"Pipeline command run in each workspace; '{{python}}' expands to this interpreter (default: '{DEFAULT_COMMAND}').",
+    )
+    parser.add_argument(
+        "--artifact",
+        action="append",
+        dest="artifacts",
+        help="Glob (relative to the workspace) of an expected artifact; repeatable. Defaults to the phase 1 outputs.",
+    )
+    parser.add_argument("--source", type=Path, default=PROJECT_ROOT, help="Tree copied into each workspace.")
+    parser.add_argument("--timeout", type=float, help="Per-run timeout in seconds.")
+    parser.add_argument("--workspace-root", type=Path, help="Directory for temporary workspaces.")
+    parser.add_argument("--keep", action="store_true", help="Keep the workspaces for inspection.")
+    parser.add_argument("--metrics", type=Path, help="QA metrics JSON to update with the reproducibility metrics.")
+    parser.add_argument("--report", type=Path, help="Write the full divergence report to this path.")
+    args = parser.parse_args(argv)
+
+    if args.runs < 2:
+        parser.error("--runs must be at least 2")
+
+    report = run_reproducibility(
+        runs=args.runs,
+        command=shlex.split(args.command),
+        artifacts=tuple(args.artifacts or DEFAULT_ARTIFACTS),
+        source=args.source,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        workspace_root=args.workspace_root,
+        keep=args.keep,
+    )
+    payload = report.as_dict()
+    if args.report:
+        write_artifact(args.report, json.dumps(payload, indent=2, sort_keys=True))
+    if args.metrics:
+        write_metrics(args.metrics, report.metrics(), merge=True)
+    print(json.dumps(payload, indent=2, sort_keys=True))
+    return 0 if payload["reproducibility_failed_runs"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""Measure, plan and enforce retention for Implementer run workspaces (FR-27).
+
+Runs live under ``artifacts/work/CH-###/run-*``; loose files named
+``run-NN_*`` next to a run directory belong to that run. Each run is sized by
+an ``os.scandir`` walk and the walks run in parallel on a thread pool (the
+work is syscall-bound, so threads scale until the disk does).
+
+Policy, applied per run in this order:
+
+1. a ``.retain`` marker anywhere in the run keeps it, unconditionally;
+2. successful runs older than ``success_max_age_hours`` are purged;
+3. failed runs (or runs without a readable manifest) are kept for
+   ``failure_max_age_days`` and then purged;
+4. if the remaining total still exceeds ``max_storage_bytes``, the oldest
+   successful runs are purged until the budget is met.
+
+A run's age is measured from its newest file, so a run that is still being
+written to is never considered stale.
+
+Usage:
+
+    from pipelines.retention import plan_retention, execute_plan, scan_runs
+
+    plan = plan_retention(scan_runs(Path("artifacts/work")))
+    result = execute_plan(plan, dry_run=True)
+
+CLI:
+
+    python3 pipelines/retention.py --dry-run
+    python3 pipelines/retention.py --change CH-002 --max-storage-gb 0.5
+
+Purges are logged to ``audit/retention.jsonl`` (one record per change); a
+dry run logs nothing. With ``--store`` the content-addressed blob store is
+garbage-collected against the runs actually purged (see ``pipelines/blob_store.py``);
+with ``--archive-root`` expiring runs are packed into indexed tar bundles
+before removal (see ``pipelines/run_archive.py``). The CLI exits 1 if a
+purge failed and 2 if the budget cannot be met because the remaining runs
+are retained or failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import stat
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from audit import AuditLogger
+from pipelines.artifact_writer import write_artifact
+from pipelines.blob_store import BlobStore, GcStats
+from pipelines.run_archive import RunArchiver
+
+__all__ = [
+    "DEFAULT_POLICY",
+    "DEFAULT_RUNS_ROOT",
+    "RetentionPlan",
+    "RetentionPolicy",
+    "RetentionResult",
+    "RunUsage",
+    "disk_usage",
+    "execute_plan",
+    "plan_retention",
+    "scan_runs",
+]
+
+DEFAULT_RUNS_ROOT = Path("artifacts/work")
+RETAIN_MARKER = ".retain"
+MANIFEST_NAME = "manifest.json"
+_GB = 1024 ** 3
+_FAILED_STATUSES = {"failed", "failure", "error", "errored"}
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    success_max_age_hours: float = 48.0
+    failure_max_age_days: float = 30.0
+    max_storage_bytes: int = 2 * _GB
+
+    def describe(self) -> str:
+        gigabytes = self.max_storage_bytes / _GB
+        return (
+            f"purge_successful_runs_after_{self.success_max_age_hours:g}h_or_above_{gigabytes:g}gb;"
+            f"failed_runs_after_{self.failure_max_age_days:g}d"
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "auto_purge_after_hours": self.success_max_age_hours,
+            "failed_purge_after_days": self.failure_max_age_days,
+            "max_storage_gb": self.max_storage_bytes / _GB,
+        }
+
+
+DEFAULT_POLICY = RetentionPolicy()
+
+
+@dataclass(frozen=True)
+class RunUsage:
+    change_id: str
+    run_id: str
+    path: str
+    size_bytes: int
+    file_count: int
+    newest_mtime: float
+    status: str  # "success", "failed" or "unknown"
+    retained: bool
+    extra_paths: tuple[str, ...] = ()
+
+    @property
+    def paths(self) -> tuple[str, ...]:
+        return (self.path, *self.extra_paths)
+
+    def age_hours(self, now: float) -> float:
+        return max(0.0, now - self.newest_mtime) / 3600.0
+
+
+@dataclass(frozen=True)
+class Decision:
+    run: RunUsage
+    action: str  # "purge" or "keep"
+    reason: str
+
+
+@dataclass
+class RetentionPlan:
+    policy: RetentionPolicy
+    decisions: List[Decision]
+    generated_at: float
+    total_bytes: int = 0
+    remaining_bytes: int = 0
+
+    @property
+    def purges(self) -> List[Decision]:
+        return [decision for decision in self.decisions if decision.action == "purge"]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.remaining_bytes > self.policy.max_storage_bytes
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy.as_dict(),
+            "total_bytes": self.total_bytes,
+            "remaining_bytes": self.remaining_bytes,
+            "bytes_to_free": self.total_bytes - self.remaining_bytes,
+            "over_budget": self.over_budget,
+            "runs": [
+                {
+                    "change_id": decision.run.change_id,
+                    "run_id": decision.run.run_id,
+                    "path": decision.run.path,
+                    "size_bytes": decision.run.size_bytes,
+                    "file_count": decision.run.file_count,
+                    "age_hours": round(decision.run.age_hours(self.generated_at), 2),
+                    "status": decision.run.status,
+                    "retained": decision.run.retained,
+                    "action": decision.action,
+                    "reason": decision.reason,
+                }
+                for decision in self.decisions
+            ],
+        }
+
+
+@dataclass
+class RetentionResult:
+    plan: RetentionPlan
+    dry_run: bool
+    purged: List[str] = field(default_factory=list)
+    freed_bytes: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    records: List[Mapping[str, Any]] = field(default_factory=list)
+    store_gc: Optional[GcStats] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        payload = self.plan.as_dict()
+        payload.update(
+            {
+                "dry_run": self.dry_run,
+                "purged": list(self.purged),
+                "freed_bytes": self.freed_bytes,
+                "errors": dict(self.errors),
+            }
+        )
+        if self.store_gc is not None:
+            payload["store_gc"] = self.store_gc.as_dict()
+        return payload
+
+
+def disk_usage(paths: Iterable[Path | str]) -> tuple[int, int, float, bool]:
+    """Return ``(bytes, files, newest_mtime, has_retain_marker)`` for ``paths``.
+
+    Directories are walked iteratively with ``os.scandir`` without following
+    symlinks; hard-linked files are counted once.
+    """
+    total = 0
+    files = 0
+    newest = 0.0
+    retained = False
+    seen: set[tuple[int, int]] = set()
+    stack: List[str] = []
+    for path in paths:
+        try:
+            info = os.stat(path, follow_symlinks=False)
+        except OSError:
+            continue
+        newest = max(newest, info.st_mtime)
+        if stat.S_ISDIR(info.st_mode):
+            stack.append(os.fspath(path))
+        else:
+            total += info.st_size
+            files += 1
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        info = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    newest = max(newest, info.st_mtime)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if entry.name == RETAIN_MARKER:
+                        retained = True
+                    if info.st_nlink > 1:
+                        key = (info.st_dev, info.st_ino)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    total += info.st_size
+                    files += 1
+        except OSError:
+            continue
+    return total, files, newest, retained
+
+
+def _run_status(run_dir: Path) -> str:
+    try:
+        manifest = json.loads((run_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return "unknown"
+    if not isinstance(manifest, Mapping):
+        return "unknown"
+    status = str(manifest.get("status", "")).strip().lower()
+    for key in ("returncode", "exit_code"):
+        if isinstance(manifest.get(key), int) and manifest[key] != 0:
+            return "failed"
+    return "failed" if status in _FAILED_STATUSES else "success"
+
+
+def _discover(runs_root: Path, change_ids: Optional[Sequence[str]]) -> List[tuple[str, Path, List[Path]]]:
+    if not runs_root.is_dir():
+        return []
+    wanted = set(change_ids or ())
+    found: List[tuple[str, Path, List[Path]]] = []
+    for change_dir in sorted(runs_root.iterdir()):
+        if not change_dir.is_dir() or (wanted and change_dir.name not in wanted):
+            continue
+        children = sorted(change_dir.iterdir())
+        run_dirs = [child for child in children if child.is_dir() and child.name.startswith("run-")]
+        for run_dir in run_dirs:
+            prefix = f"{run_dir.name}_"
+            extras = [child for child in children if child.is_file() and child.name.startswith(prefix)]
+            found.append((change_dir.name, run_dir, extras))
+    return found
+
+
+def _measure(change_id: str, run_dir: Path, extras: List[Path]) -> RunUsage:
+    size, files, newest, retained = disk_usage([run_dir, *extras])
+    return RunUsage(
+        change_id=change_id,
+        run_id=run_dir.name,
+        path=str(run_dir),
+        size_bytes=size,
+        file_count=files,
+        newest_mtime=newest,
+        status=_run_status(run_dir),
+        retained=retained,
+        extra_paths=tuple(str(extra) for extra in extras),
+    )
+
+
+def scan_runs(
+    runs_root: Path | str = DEFAULT_RUNS_ROOT,
+    *,
+    change_ids: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+) -> List[RunUsage]:
+    """Measure every run under ``runs_root``, walking runs in parallel."""
+    targets = _discover(Path(runs_root), change_ids)
+    if not targets:
+        return []
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=min(workers, len(targets))) as pool:
+        return list(pool.map(lambda target: _measure(*target), targets))
+
+
+def plan_retention(
+    runs: Sequence[RunUsage],
+    policy: RetentionPolicy = DEFAULT_POLICY,
+    *,
+    now: Optional[float] = None,
+) -> RetentionPlan:
+    """Decide which runs to purge so both the age and size budgets hold."""
+    now = time.time() if now is None else now
+    ranked = sorted(runs, key=lambda run: (run.newest_mtime, run.change_id, run.run_id))
+    decisions: Dict[str, Decision] = {}
+    remaining = 0
+    for run in ranked:
+        age = run.age_hours(now)
+        if run.retained:
+            decisions[run.path] = Decision(run, "keep", "retain-marker")
+        elif run.status == "success" and age > policy.success_max_age_hours:
+            decisions[run.path] = Decision(run, "purge", "age")
+            continue
+        elif run.status != "success" and age > policy.failure_max_age_days * 24:
+            decisions[run.path] = Decision(run, "purge", "age")
+            continue
+        else:
+            decisions[run.path] = Decision(run, "keep", "within-policy")
+        remaining += run.size_bytes
+
+    total = sum(run.size_bytes for run in ranked)
+    for run in ranked:
+        if remaining <= policy.max_storage_bytes:
+            break
+        decision = decisions[run.path]
+        if decision.action == "keep" and not run.retained and run.status == "success":
+            decisions[run.path] = Decision(run, "purge", "size")
+            remaining -= run.size_bytes
+
+    return RetentionPlan(
+        policy=policy,
+        decisions=[decisions[run.path] for run in ranked],
+        generated_at=now,
+        total_bytes=total,
+        remaining_bytes=remaining,
+    )
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    elif path.exists() or path.is_symlink():
+        path.unlink()
+
+
+def execute_plan(
+    plan: RetentionPlan,
+    *,
+    dry_run: bool = False,
+    logger: Optional[AuditLogger] = None,
+    phase: str = "1",
+    store: Optional[BlobStore] = None,
+    runs_root: Path | str = DEFAULT_RUNS_ROOT,
+    archiver: Optional[RunArchiver] = None,
+) -> RetentionResult:
+    """Apply ``plan``; on a real run, log one retention record per change.
+
+    With an ``archiver`` each expiring run is packed into an indexed bundle
+    first and only removed once its bundle is written; pointer-run files are
+    read from ``store`` unless the archiver has its own. When ``store`` is
+    given, blobs only the removed runs referenced are collected afterwards
+    (or just counted on a dry run); runs whose archive or removal failed
+    keep theirs.
+    """
+    result = RetentionResult(plan=plan, dry_run=dry_run)
+    by_change: Dict[str, List[Decision]] = {}
+    for decision in plan.decisions:
+        by_change.setdefault(decision.run.change_id, []).append(decision)
+    archives: Dict[str, Any] = {}
+    if archiver is not None and not dry_run:
+        if archiver.store is None and store is not None:
+            archiver = RunArchiver(archiver.archive_root, store=store, max_workers=archiver.max_workers)
+        archives = archiver.pack_many([(d.run.path, d.run.extra_paths) for d in plan.purges])
+
+    for change_id, decisions in by_change.items():
+        purged: List[str] = []
+        reasons: Dict[str, str] = {}
+        bundles: Dict[str, str] = {}
+        freed = 0
+        for decision in decisions:
+            if decision.action != "purge":
+                continue
+            archive = archives.get(decision.run.path)
+            if isinstance(archive, BaseException):
+                result.errors[decision.run.path] = f"archive failed: {archive}"
+                continue
+            if archive is not None:
+                bundles[decision.run.run_id] = str(archive.bundle)
+            if not dry_run:
+                try:
+                    for path in decision.run.paths:
+                        _remove(Path(path))
+                except OSError as exc:
+                    result.errors[decision.run.path] = str(exc)
+                    continue
+            purged.append(decision.run.path)
+            reasons[decision.run.run_id] = decision.reason
+            freed += decision.run.size_bytes
+        result.purged.extend(purged)
+        result.freed_bytes += freed
+        if dry_run or not purged:
+            continue
+        metadata: Dict[str, Any] = {"bytes_freed": freed, "reasons": reasons}
+        if bundles:
+            metadata["archives"] = bundles
+        logger = logger or AuditLogger()
+        result.records.append(
+            logger.log_retention(
+                phase=phase,
+                change_id=change_id,
+                action="auto_archive" if bundles else "auto_purge",
+                artifacts_purged=purged,
+                artifacts_retained=[d.run.path for d in decisions if d.action == "keep"],
+                retention_policy=plan.policy.describe(),
+                metadata=metadata,
+            )
+        )
+    if store is not None:
+        result.store_gc = store.collect_garbage(purged=result.purged, runs_root=runs_root, dry_run=dry_run)
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure and enforce retention for Implementer runs.")
+    parser.add_argument("--runs-path", type=Path, default=DEFAULT_RUNS_ROOT, help="Root containing CH-###/run-* workspaces.")
+    parser.add_argument("--change", action="append", dest="changes", help="Limit to a change id (repeatable).")
+    parser.add_argument("--max-age-hours", type=float, default=DEFAULT_POLICY.success_max_age_hours, help="Purge successful runs older than this.")
+    parser.add_argument("--failed-max-age-days", type=float, default=DEFAULT_POLICY.failure_max_age_days, help="Purge failed runs older than this.")
+    parser.add_argument("--max-storage-gb", type=float, default=DEFAULT_POLICY.max_storage_bytes / _GB, help="Storage budget for all runs.")
+    parser.add_argument("--workers", type=int, default=None, help="Threads used for the disk-usage walk.")
+    parser.add_argument("--dry-run", action="store_true", help="Report the plan without deleting anything.")
+    parser.add_argument("--phase", default="1", help="Phase recorded on retention audit entries.")
+    parser.add_argument("--audit-root", type=Path, default=Path("audit"), help="Directory holding retention.jsonl.")
+    parser.add_argument("--store", type=Path, help="Blob store to garbage-collect against the plan.")
+    parser.add_argument("--archive-root", type=Path, help="Pack expiring runs into indexed bundles here before removal.")
+    parser.add_argument("--output", type=Path, help="Optional path for the JSON result.")
+    args = parser.parse_args(argv)
+
+    policy = RetentionPolicy(
+        success_max_age_hours=args.max_age_hours,
+        failure_max_age_days=args.failed_max_age_days,
+        max_storage_bytes=int(args.max_storage_gb * _GB),
+    )
+    runs = scan_runs(args.runs_path, change_ids=args.changes, max_workers=args.workers)
+    plan = plan_retention(runs, policy)
+    logger = None if args.dry_run else AuditLogger(root=args.audit_root)
+    store = BlobStore(args.store) if args.store else None
+    result = execute_plan(
+        plan,
+        dry_run=args.dry_run,
+        logger=logger,
+        phase=args.phase,
+        store=store,
+        runs_root=args.runs_path,
+        archiver=RunArchiver(args.archive_root, store=store) if args.archive_root else None,
+    )
+
+    payload = json.dumps(result.as_dict(), indent=2, sort_keys=True)
+    if args.output:
+        write_artifact(args.output, payload)
+    print(payload)
+    if result.errors:
+        return 1
+    return 2 if plan.over_budget else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,15 +5,23 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List
 
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import write_artifact
+from pipelines.id_allocator import sort_key
+from pipelines.retention import DEFAULT_POLICY, plan_retention, scan_runs
+
 
 def list_runs(path: Path) -> List[str]:
     if not path.exists():
         return []
-    return sorted(str(p) for p in path.iterdir() if p.is_dir())
+    return [str(p) for p in sorted((p for p in path.iterdir() if p.is_dir()), key=lambda p: sort_key(p.name))]
 
 
 def main() -> int:
@@ -25,20 +33,18 @@ def main() -> int:
 
     runs_root = Path(args.runs_path) / args.change_id
     runs = list_runs(runs_root)
+    usage = plan_retention(scan_runs(args.runs_path, change_ids=[args.change_id]), DEFAULT_POLICY)
     plan = {
         "change_id": args.change_id,
         "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         "runs": runs,
-        "policy": {
-            "auto_purge_after_hours": 48,
-            "max_storage_gb": 2,
-        },
+        "policy": DEFAULT_POLICY.as_dict(),
         "retain_flags": [str(p) for p in runs_root.glob("**/.retain")],
+        "usage": usage.as_dict(),
     }
 
     output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(plan, indent=2, sort_keys=True), encoding="utf-8")
+    write_artifact(output_path, json.dumps(plan, indent=2, sort_keys=True))
     print(json.dumps(plan, indent=2))
     return 0
 
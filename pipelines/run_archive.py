@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Pack expired run directories into indexed, randomly accessible tar bundles.
+
+A run ``artifacts/work/CH-002/run-01`` (plus its ``run-01_*`` sibling files)
+becomes ``artifacts/archive/CH-002/run-01.tar.gz`` and a sidecar
+``run-01.index.json``. The bundle is an ordinary ``.tar.gz`` that
+``tar -xzf`` can unpack, but every tar member is compressed as its own gzip
+member, and the index records each one's compressed offset and length:
+
+    {"version": 1, "change_id": "CH-002", "run_id": "run-01", "created": "...",
+     "members": [{"name": "run-01/manifest.json", "offset": 0, "length": 412,
+                  "size": 1050, "sha256": "...", "mtime": 1730556000.0, "mode": 420}]}
+
+Reading one file therefore seeks to its offset and inflates only that member,
+independent of bundle size. Bundles and indexes are written via a temporary
+file, and the index is written before the bundle is linked into place, so a
+crash never leaves a bundle without its index (an index without a bundle is
+simply rewritten by the next ``pack``). An existing bundle is never
+overwritten: packing a run id twice raises ``FileExistsError``.
+
+Files of a pointer-ingested run (``blob_store.py ingest --pointer``) exist
+only in the blob store; ``pack`` reads them from the ``store`` given to the
+archiver and refuses to archive such a run without one.
+
+``retention.py --archive-root artifacts/archive`` archives runs the retention
+plan expires before removing them.
+
+CLI usage:
+
+    python3 pipelines/run_archive.py pack artifacts/work/CH-002/run-01 [--archive-root artifacts/archive]
+    python3 pipelines/run_archive.py list artifacts/archive/CH-002/run-01.tar.gz
+    python3 pipelines/run_archive.py cat artifacts/archive/CH-002/run-01.tar.gz run-01/manifest.json
+    python3 pipelines/run_archive.py extract artifacts/archive/CH-002/run-01.tar.gz --dest artifacts/work/CH-002
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tarfile
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import atomic_write_bytes
+from pipelines.blob_store import DEFAULT_STORE_ROOT, BlobStore, read_manifest
+
+__all__ = [
+    "DEFAULT_ARCHIVE_ROOT",
+    "ArchiveResult",
+    "RunArchive",
+    "RunArchiver",
+]
+
+DEFAULT_ARCHIVE_ROOT = Path("artifacts/archive")
+INDEX_VERSION = 1
+BUNDLE_SUFFIX = ".tar.gz"
+INDEX_SUFFIX = ".index.json"
+_COMPRESS_LEVEL = 6
+_CHUNK_SIZE = 64 * 1024
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _gzip_member(data: bytes) -> bytes:
+    compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, 31)  # 31 -> gzip framing
+    return compressor.compress(data) + compressor.flush()
+
+
+def _tar_member(info: tarfile.TarInfo, data: bytes) -> bytes:
+    padding = (-len(data)) % tarfile.BLOCKSIZE
+    return info.tobuf(format=tarfile.PAX_FORMAT) + data + b"\0" * padding
+
+
+@dataclass(frozen=True)
+class ArchiveResult:
+    bundle: Path
+    index: Path
+    members: int
+    size_bytes: int
+    compressed_bytes: int
+
+
+class RunArchive:
+    """Random-access reader for one bundle via its sidecar index."""
+
+    def __init__(self, bundle: Path | str) -> None:
+        self.bundle = Path(bundle)
+        index_path = self.bundle.with_name(self.bundle.name[: -len(BUNDLE_SUFFIX)] + INDEX_SUFFIX)
+        payload = json.loads(index_path.read_text(encoding="utf-8"))
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported archive index version in {index_path}")
+        self.change_id: str = payload["change_id"]
+        self.run_id: str = payload["run_id"]
+        self.created: str = payload["created"]
+        self.members: Dict[str, Dict[str, Any]] = {member["name"]: member for member in payload["members"]}
+
+    def names(self) -> List[str]:
+        return list(self.members)
+
+    def _member(self, name: str) -> Dict[str, Any]:
+        try:
+            return self.members[name]
+        except KeyError:
+            raise KeyError(f"{name} is not in {self.bundle}") from None
+
+    def stream(self, name: str, *, chunk_size: int = _CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the content of ``name``, inflating only its own gzip member."""
+        member = self._member(name)
+        decompressor = zlib.decompressobj(31)
+        header = b""
+        remaining = member["size"]
+        skipped = False
+        with self.bundle.open("rb") as handle:
+            handle.seek(member["offset"])
+            left = member["length"]
+            while left and remaining:
+                raw = handle.read(min(chunk_size, left))
+                if not raw:
+                    break
+                left -= len(raw)
+                data = decompressor.decompress(raw)
+                if not skipped:
+                    header += data
+                    offset = self._data_offset(header)
+                    if offset is None:
+                        continue
+                    data, skipped = header[offset:], True
+                chunk = data[:remaining]
+                remaining -= len(chunk)
+                if chunk:
+                    yield chunk
+
+    @staticmethod
+    def _data_offset(header: bytes) -> Optional[int]:
+        """Offset of file data after the (possibly PAX-extended) tar header, once known."""
+        position = 0
+        while len(header) >= position + tarfile.BLOCKSIZE:
+            info = tarfile.TarInfo.frombuf(header[position : position + tarfile.BLOCKSIZE], "utf-8", "surrogateescape")
+            position += tarfile.BLOCKSIZE
+            if info.type in (tarfile.XHDTYPE, tarfile.XGLTYPE, tarfile.GNUTYPE_LONGNAME):
+                position += info.size + (-info.size) % tarfile.BLOCKSIZE
+                continue
+            return position
+        return None
+
+    def read(self, name: str) -> bytes:
+        data = b"".join(self.stream(name))
+        if hashlib.sha256(data).hexdigest() != self.members[name]["sha256"]:
+            raise ValueError(f"Checksum mismatch for {name} in {self.bundle}")
+        return data
+
+    def extract(self, destination: Path | str, names: Optional[Sequence[str]] = None) -> List[Path]:
+        destination = Path(destination)
+        written: List[Path] = []
+        for name in names or self.names():
+            member = self._member(name)
+            target = destination / name
+            if destination.resolve() not in target.resolve().parents:
+                raise ValueError(f"Refusing to extract {name} outside {destination}")
+            atomic_write_bytes(target, self.read(name))
+            os.chmod(target, member["mode"])
+            os.utime(target, (member["mtime"], member["mtime"]))
+            written.append(target)
+        return written
+
+
+class RunArchiver:
+    """Write per-run bundles under ``archive_root/<change_id>/``."""
+
+    def __init__(
+        self,
+        archive_root: Path | str = DEFAULT_ARCHIVE_ROOT,
+        *,
+        store: Optional[BlobStore] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.archive_root = Path(archive_root)
+        self.store = store
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+
+    def bundle_path(self, change_id: str, run_id: str) -> Path:
+        return self.archive_root / change_id / f"{run_id}{BUNDLE_SUFFIX}"
+
+    def _pointer_files(self, run_dir: Path) -> List[tuple[str, Path]]:
+        """Blob-store sources for files the run's ``.blobs.json`` lists but no longer holds."""
+        missing = {
+            relative: digest for relative, digest in read_manifest(run_dir).items() if not (run_dir / relative).is_file()
+        }
+        if not missing:
+            return []
+        if self.store is None:
+            raise ValueError(f"{run_dir} has {len(missing)} files only in the blob store; archive it with a store")
+        sources: List[tuple[str, Path]] = []
+        for relative, digest in missing.items():
+            blob = self.store.path_for(digest)
+            if not blob.is_file():
+                raise FileNotFoundError(f"Blob {digest} for {run_dir / relative} is missing from {self.store.root}")
+            sources.append((f"{run_dir.name}/{relative}", blob))
+        return sources
+
+    def pack(self, run_dir: Path | str, extras: Sequence[Path | str] = ()) -> ArchiveResult:
+        """Archive ``run_dir`` and its sibling ``extras``; names are relative to the change directory."""
+        run_dir = Path(run_dir)
+        change_dir = run_dir.parent
+        entries: List[tuple[str, Path]] = [
+            (path.relative_to(change_dir).as_posix(), path)
+            for path in run_dir.rglob("*")
+            if path.is_file() and not path.is_symlink()
+        ]
+        entries.extend(self._pointer_files(run_dir))
+        entries.sort()
+        entries.extend((Path(extra).relative_to(change_dir).as_posix(), Path(extra)) for extra in extras)
+
+        bundle = self.bundle_path(change_dir.name, run_dir.name)
+        if bundle.exists():
+            raise FileExistsError(f"{bundle} already exists; refusing to overwrite an archived run")
+        bundle.parent.mkdir(parents=True, exist_ok=True)
+        members: List[Dict[str, Any]] = []
+        size_total = 0
+        fd, tmp_name = tempfile.mkstemp(dir=bundle.parent, prefix=f".{bundle.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                offset = 0
+                for name, path in entries:
+                    data = path.read_bytes()
+                    info = path.stat()
+                    tar_info = tarfile.TarInfo(name)
+                    tar_info.size = len(data)
+                    tar_info.mtime = info.st_mtime
+                    tar_info.mode = info.st_mode & 0o7777
+                    compressed = _gzip_member(_tar_member(tar_info, data))
+                    handle.write(compressed)
+                    members.append(
+                        {
+                            "name": name,
+                            "offset": offset,
+                            "length": len(compressed),
+                            "size": len(data),
+                            "sha256": hashlib.sha256(data).hexdigest(),
+                            "mtime": info.st_mtime,
+                            "mode": tar_info.mode,
+                        }
+                    )
+                    offset += len(compressed)
+                    size_total += len(data)
+                handle.write(_gzip_member(b"\0" * (2 * tarfile.BLOCKSIZE)))
+            # The index goes first: the bundle appearing is what makes the archive complete.
+            index = bundle.with_name(f"{run_dir.name}{INDEX_SUFFIX}")
+            payload = {
+                "version": INDEX_VERSION,
+                "change_id": change_dir.name,
+                "run_id": run_dir.name,
+                "created": _utc_now(),
+                "members": members,
+            }
+            atomic_write_bytes(index, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+            os.link(tmp_name, bundle)  # fails if a concurrent pack got there first
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+
+        return ArchiveResult(
+            bundle=bundle,
+            index=index,
+            members=len(members),
+            size_bytes=size_total,
+            compressed_bytes=bundle.stat().st_size,
+        )
+
+    def pack_many(self, runs: Sequence[tuple[Path | str, Sequence[Path | str]]]) -> Dict[str, ArchiveResult | BaseException]:
+        """Pack several runs in parallel; failures are returned, not raised."""
+
+        def work(item: tuple[Path | str, Sequence[Path | str]]) -> ArchiveResult | BaseException:
+            try:
+                return self.pack(*item)
+            except Exception as exc:  # reported per run so the others still complete
+                return exc
+
+        if not runs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(runs))) as pool:
+            return dict(zip((str(run_dir) for run_dir, _ in runs), pool.map(work, runs)))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pack and read archived Implementer runs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pack = sub.add_parser("pack", help="Archive run directories (the originals are kept).")
+    pack.add_argument("runs", nargs="+", type=Path)
+    pack.add_argument("--archive-root", type=Path, default=DEFAULT_ARCHIVE_ROOT)
+    pack.add_argument("--store", type=Path, default=DEFAULT_STORE_ROOT, help="Blob store holding pointer-run files.")
+
+    listing = sub.add_parser("list", help="List bundle members.")
+    listing.add_argument("bundle", type=Path)
+
+    cat = sub.add_parser("cat", help="Stream one member to stdout.")
+    cat.add_argument("bundle", type=Path)
+    cat.add_argument("member")
+
+    extract = sub.add_parser("extract", help="Extract members (all by default).")
+    extract.add_argument("bundle", type=Path)
+    extract.add_argument("members", nargs="*")
+    extract.add_argument("--dest", type=Path, default=Path("."))
+
+    args = parser.parse_args(argv)
+    if args.command == "pack":
+        archiver = RunArchiver(args.archive_root, store=BlobStore(args.store))
+        for run_dir in args.runs:
+            prefix = f"{run_dir.name}_"
+            extras = sorted(path for path in run_dir.parent.iterdir() if path.is_file() and path.name.startswith(prefix))
+            result = archiver.pack(run_dir, extras)
+            print(f"{result.bundle}: {result.members} members, {result.size_bytes} -> {result.compressed_bytes} bytes")
+    elif args.command == "list":
+        for name, member in RunArchive(args.bundle).members.items():
+            print(f"{member['size']:>10}  {member['sha256'][:12]}  {name}")
+    elif args.command == "cat":
+        out: BinaryIO = sys.stdout.buffer
+        for chunk in RunArchive(args.bundle).stream(args.member):
+            out.write(chunk)
+        out.flush()
+    else:
+        for path in RunArchive(args.bundle).extract(args.dest, args.members or None):
+            print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""Record Implementer runs: execute commands and write ``manifest.json``.
+
+``RunRecorder`` allocates the next ``artifacts/work/CH-###/run-NN`` directory
+(through ``pipelines/id_allocator.py`` when given an allocator, as the CLI does;
+otherwise past the highest run on disk, in the archive or in the manifest index),
+runs each command with its combined stdout/stderr streamed to the console and
+captured under ``logs/NN.log``, and measures wall time plus, from the child's
+``wait4`` resource usage, user/system CPU time and peak RSS. On exit it hashes
+the declared outputs in parallel (through the stat-keyed cache of
+``pipelines/checksums.py``) and writes the manifest atomically:
+
+    {
+      "change_id": "CH-002", "run_id": "run-07", "stage": "Execute", "task": "T-007",
+      "timestamp": "2025-11-02T14:30:00Z", "status": "success", "duration_seconds": 1.92,
+      "commands": [{"cmd": "make qa-batch", "returncode": 0, "wall_seconds": 1.9,
+                    "cpu_user_seconds": 1.4, "cpu_system_seconds": 0.2,
+                    "max_rss_kb": 48211, "log": "logs/01.log"}],
+      "outputs": ["artifacts/work/qa_batch_report.json"],
+      "output_checksums": {"artifacts/work/qa_batch_report.json": {"sha256": "...", "size": 5120}},
+      "notes": "..."
+    }
+
+``status`` is ``failed`` when a command exits non-zero, a declared output is
+missing or the ``with`` block raises; ``retention.py`` keeps failed runs
+longer. String commands run through ``/bin/sh`` (manifests have always held
+shell lines); sequences are executed directly.
+
+Usage:
+
+    from pipelines.run_recorder import RunRecorder
+
+    with RunRecorder("CH-002", stage="Execute", task="T-007") as run:
+        run.run("python3 pipelines/qa_enforcer.py --batch --output out.json")
+        run.add_output("out.json")
+
+CLI:
+
+    python3 pipelines/run_recorder.py --change CH-002 --stage Execute --task T-007 \\
+        --output out.json -- python3 pipelines/qa_enforcer.py --batch --output out.json
+    python3 pipelines/run_recorder.py --change CH-002 --task T-007 -c "make runs" -c "make audit"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TextIO
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import write_artifact
+from pipelines.checksums import DEFAULT_CACHE_PATH, Checksummer
+from pipelines.id_allocator import DEFAULT_DB_PATH, RUN_PREFIX, RUN_WIDTH, IdAllocator, highest_run
+
+__all__ = ["CommandResult", "RunRecorder", "next_run_dir"]
+
+DEFAULT_WORK_ROOT = Path("artifacts/work")
+MANIFEST_NAME = "manifest.json"
+LOG_DIR = "logs"
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def next_run_dir(change_root: Path, *, archive_root: Optional[Path] = None) -> Path:
+    """Create and return the next ``run-NN`` directory under ``change_root``.
+
+    Numbering continues after runs that were archived or purged (see
+    ``id_allocator.highest_run``), so their ids are never handed out again.
+    """
+    change_root.mkdir(parents=True, exist_ok=True)
+    number = highest_run(change_root, archive_root=archive_root) + 1
+    while True:
+        candidate = change_root / f"{RUN_PREFIX}{number:0{RUN_WIDTH}d}"
+        try:
+            candidate.mkdir()
+        except FileExistsError:
+            number += 1
+            continue
+        return candidate
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    cmd: str
+    returncode: int
+    wall_seconds: float
+    cpu_user_seconds: Optional[float]
+    cpu_system_seconds: Optional[float]
+    max_rss_kb: Optional[int]
+    log: str
+    output_bytes: int
+    env: Mapping[str, str] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "cmd": self.cmd,
+            "returncode": self.returncode,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_user_seconds": None if self.cpu_user_seconds is None else round(self.cpu_user_seconds, 4),
+            "cpu_system_seconds": None if self.cpu_system_seconds is None else round(self.cpu_system_seconds, 4),
+            "max_rss_kb": self.max_rss_kb,
+            "log": self.log,
+            "output_bytes": self.output_bytes,
+        }
+        if self.env:
+            entry["env"] = dict(self.env)
+        return entry
+
+
+def _wait(process: subprocess.Popen) -> tuple[int, Optional[Any]]:
+    """Reap ``process`` and return ``(returncode, rusage)``; rusage is None without ``wait4``."""
+    if not hasattr(os, "wait4"):
+        return process.wait(), None
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, usage
+
+
+class RunRecorder:
+    """Context manager that executes and records the commands of one run."""
+
+    def __init__(
+        self,
+        change_id: str,
+        *,
+        stage: str = "Execute",
+        task: Optional[str] = None,
+        notes: Optional[str] = None,
+        seed: Optional[str] = None,
+        work_root: Path | str = DEFAULT_WORK_ROOT,
+        run_id: Optional[str] = None,
+        echo: Optional[TextIO] = sys.stdout,
+        max_workers: Optional[int] = None,
+        checksum_cache: Optional[Path | str] = DEFAULT_CACHE_PATH,
+        allocator: Optional[IdAllocator] = None,
+    ) -> None:
+        self.change_id = change_id
+        self.stage = stage
+        self.task = task
+        self.notes = notes
+        self.seed = seed
+        self.work_root = Path(work_root)
+        self.run_id = run_id
+        self.echo = echo
+        self.max_workers = max_workers
+        self.checksum_cache = checksum_cache
+        self.allocator = allocator
+        self.run_dir: Optional[Path] = None
+        self.commands: List[CommandResult] = []
+        self.outputs: List[str] = []
+        self.manifest: Dict[str, Any] = {}
+        self._timestamp = ""
+        self._started = 0.0
+
+    def __enter__(self) -> "RunRecorder":
+        change_root = self.work_root / self.change_id
+        if self.run_id:
+            self.run_dir = change_root / self.run_id
+            self.run_dir.mkdir(parents=True, exist_ok=False)
+        elif self.allocator is not None:
+            self.run_id = self.allocator.allocate(change_root, RUN_PREFIX, RUN_WIDTH)[0]
+            self.run_dir = change_root / self.run_id
+        else:
+            self.run_dir = next_run_dir(change_root)
+            self.run_id = self.run_dir.name
+        self._timestamp = _utc_now()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.write_manifest(failed=exc is not None)
+
+    @property
+    def failed(self) -> bool:
+        return any(result.returncode != 0 for result in self.commands)
+
+    def add_output(self, *paths: Path | str) -> None:
+        for path in paths:
+            text = str(path)
+            if text not in self.outputs:
+                self.outputs.append(text)
+
+    def run(
+        self,
+        command: str | Sequence[str],
+        *,
+        env: Optional[Mapping[str, str]] = None,
+        cwd: Optional[Path | str] = None,
+        check: bool = False,
+    ) -> CommandResult:
+        """Execute ``command``, streaming and capturing its output."""
+        if self.run_dir is None:
+            raise RuntimeError("RunRecorder.run() called outside the 'with' block")
+        shell = isinstance(command, str)
+        display = command if shell else subprocess.list2cmdline(list(command))
+        log_relative = f"{LOG_DIR}/{len(self.commands) + 1:02d}.log"
+        log_path = self.run_dir / log_relative
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        child_env = {**os.environ, **env} if env else None
+
+        output_bytes = 0
+        started = time.perf_counter()
+        with log_path.open("wb") as log:
+            process = subprocess.Popen(
+                command,
+                shell=shell,
+                cwd=cwd,
+                env=child_env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+            assert process.stdout is not None
+            with process.stdout:
+                for line in iter(process.stdout.readline, b""):
+                    log.write(line)
+                    output_bytes += len(line)
+                    if self.echo is not None:
+                        self.echo.write(line.decode("utf-8", errors="replace"))
+            returncode, usage = _wait(process)
+        wall = time.perf_counter() - started
+
+        result = CommandResult(
+            cmd=display,
+            returncode=returncode,
+            wall_seconds=wall,
+            cpu_user_seconds=usage.ru_utime if usage is not None else None,
+            cpu_system_seconds=usage.ru_stime if usage is not None else None,
+            max_rss_kb=usage.ru_maxrss if usage is not None else None,
+            log=log_relative,
+            output_bytes=output_bytes,
+            env=dict(env or {}),
+        )
+        self.commands.append(result)
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, display)
+        return result
+
+    def _checksums(self) -> Dict[str, Dict[str, Any]]:
+        infos: Dict[str, os.stat_result] = {}
+        checksums: Dict[str, Dict[str, Any]] = {}
+        for path in self.outputs:
+            try:
+                infos[path] = os.stat(path)
+            except OSError:
+                checksums[path] = {"sha256": None, "size": None, "missing": True}
+        if infos:
+            with Checksummer(self.checksum_cache, max_workers=self.max_workers) as checksummer:
+                digests = checksummer.hash_stats(infos)
+            for path, info in infos.items():
+                checksums[path] = {"sha256": digests[path], "size": info.st_size}
+        return {path: checksums[path] for path in self.outputs}
+
+    def write_manifest(self, *, failed: bool = False) -> Dict[str, Any]:
+        """Hash outputs and atomically write ``manifest.json``; return it."""
+        if self.run_dir is None:
+            raise RuntimeError("RunRecorder.write_manifest() called before the run started")
+        checksums = self._checksums()
+        missing = any(entry.get("missing") for entry in checksums.values())
+        manifest: Dict[str, Any] = {
+            "change_id": self.change_id,
+            "run_id": self.run_id,
+            "stage": self.stage,
+            "task": self.task,
+            "timestamp": self._timestamp,
+            "status": "failed" if failed or missing or self.failed else "success",
+            "duration_seconds": round(time.perf_counter() - self._started, 4),
+        }
+        if self.seed:
+            manifest["seed"] = self.seed
+        manifest["commands"] = [result.as_dict() for result in self.commands]
+        manifest["outputs"] = list(self.outputs)
+        manifest["output_checksums"] = checksums
+        if self.notes:
+            manifest["notes"] = self.notes
+        write_artifact(self.run_dir / MANIFEST_NAME, json.dumps(manifest, indent=2) + "\n")
+        self.manifest = manifest
+        return manifest
+
+
+def _parse_env(values: Sequence[str]) -> Dict[str, str]:
+    env: Dict[str, str] = {}
+    for value in values:
+        key, sep, rest = value.partition("=")
+        if not sep or not key:
+            raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got '{value}'")
+        env[key] = rest
+    return env
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Execute commands and record them as an Implementer run.")
+    parser.add_argument("--change", required=True, dest="change_id", help="Change identifier (e.g., CH-002).")
+    parser.add_argument("--stage", default="Execute")
+    parser.add_argument("--task")
+    parser.add_argument("--notes")
+    parser.add_argument("--seed")
+    parser.add_argument("--run-id", help="Explicit run id; defaults to the next free run-NN.")
+    parser.add_argument("--work-root", type=Path, default=DEFAULT_WORK_ROOT)
+    parser.add_argument("--id-db", type=Path, default=DEFAULT_DB_PATH, help="Run id allocator database.")
+    parser.add_argument("-c", "--command", action="append", default=[], dest="commands", help="Shell command (repeatable).")
+    parser.add_argument("--output", action="append", default=[], dest="outputs", help="Output path to checksum (repeatable).")
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE added to each command's environment.")
+    parser.add_argument("--keep-going", action="store_true", help="Run remaining commands after a failure.")
+    parser.add_argument("--quiet", action="store_true", help="Do not echo command output.")
+    parser.add_argument("argv", nargs=argparse.REMAINDER, help="A command to run, after '--'.")
+    args = parser.parse_args(argv)
+
+    commands: List[str | Sequence[str]] = list(args.commands)
+    remainder = args.argv[1:] if args.argv[:1] == ["--"] else args.argv
+    if remainder:
+        commands.append(remainder)
+    if not commands:
+        parser.error("no command given; use -c CMD or '-- CMD ARGS...'")
+    try:
+        env = _parse_env(args.env)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    allocator = IdAllocator(args.id_db, work_root=args.work_root)
+    recorder = RunRecorder(
+        args.change_id,
+        stage=args.stage,
+        task=args.task,
+        notes=args.notes,
+        seed=args.seed,
+        work_root=args.work_root,
+        run_id=args.run_id,
+        echo=None if args.quiet else sys.stdout,
+        allocator=allocator,
+    )
+    with allocator, recorder:
+        recorder.add_output(*args.outputs)
+        for command in commands:
+            result = recorder.run(command, env=env)
+            if result.returncode != 0 and not args.keep_going:
+                break
+    manifest_path = recorder.run_dir / MANIFEST_NAME
+    print(f"Recorded {recorder.run_id} ({recorder.manifest['status']}) -> {manifest_path}", file=sys.stderr)
+    return 0 if recorder.manifest["status"] == "success" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Indexed run-log store for Phase 1 orchestration runs.
+
+Each orchestrator run is recorded as one compact JSON Lines entry in
+``index.jsonl``:
+
+    {"artifacts": {...}, "digest": "<sha256>", "duplicate_of": null,
+     "run_id": "run-0001", "timestamp": "2025-11-02T14:08:00.000Z",
+     "timings": {"designer": 0.002, ...}}
+
+The full summary is stored once per digest under ``summaries/<digest>.json``;
+runs that reproduce an earlier summary only reference it via ``duplicate_of``.
+The index is loaded into memory on first use and kept keyed by run id and
+digest, with records ordered by timestamp so time-window queries can bisect.
+
+Recording holds an exclusive lock on ``index.jsonl`` (``flock`` where
+available) while it reads the entries other stores or processes appended
+since the last load and numbers the new run after the highest id in the file,
+so concurrent recorders never hand out the same run id.
+
+CLI usage (``runs``):
+
+    python3 pipelines/runs.py list [--since TS] [--digest PREFIX] [--limit N]
+    python3 pipelines/runs.py show <run_id|digest-prefix> [--summary]
+    python3 pipelines/runs.py diff <run_a> <run_b>
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Mapping, MutableMapping, Optional
+
+try:  # POSIX only; elsewhere concurrent recorders in one directory are unsupported.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STORE_ROOT = PROJECT_ROOT / "artifacts" / "phase1" / "orchestration" / "runs"
+INDEX_FILE = "index.jsonl"
+SUMMARY_DIR = "summaries"
+RUN_PREFIX = "run-"
+
+
+def _utc_now() -> str:
+    """Return timestamp consistent with audit logger formatting."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def summary_digest(summary: Mapping[str, Any]) -> str:
+    """Return the sha256 digest used to identify an orchestrator summary."""
+    payload = json.dumps(summary, indent=2, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class RunRecord:
+    """Compact index entry describing a single orchestrator run."""
+
+    run_id: str
+    timestamp: str
+    digest: str
+    timings: Mapping[str, float] = field(default_factory=dict)
+    artifacts: Mapping[str, str] = field(default_factory=dict)
+    duplicate_of: Optional[str] = None
+
+    def to_entry(self) -> MutableMapping[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "timestamp": self.timestamp,
+            "digest": self.digest,
+            "timings": dict(self.timings),
+            "artifacts": dict(self.artifacts),
+            "duplicate_of": self.duplicate_of,
+        }
+
+    @classmethod
+    def from_entry(cls, entry: Mapping[str, Any]) -> "RunRecord":
+        return cls(
+            run_id=str(entry["run_id"]),
+            timestamp=str(entry["timestamp"]),
+            digest=str(entry["digest"]),
+            timings={str(key): float(value) for key, value in (entry.get("timings") or {}).items()},
+            artifacts={str(key): str(value) for key, value in (entry.get("artifacts") or {}).items()},
+            duplicate_of=entry.get("duplicate_of"),
+        )
+
+
+def _flatten(value: Any, prefix: str = "") -> dict[str, Any]:
+    if isinstance(value, Mapping):
+        flat: dict[str, Any] = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    return {prefix: value}
+
+
+class RunStore:
+    """Append-only run index with digest-level summary deduplication."""
+
+    def __init__(self, root: Path | str = DEFAULT_STORE_ROOT) -> None:
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_FILE
+        self.summary_root = self.root / SUMMARY_DIR
+        self._records: list[RunRecord] | None = None
+        self._timestamps: list[str] = []
+        self._by_id: dict[str, RunRecord] = {}
+        self._by_digest: dict[str, list[RunRecord]] = {}
+        self._offset = 0
+        self._last_number = 0
+
+    def _load(self) -> list[RunRecord]:
+        if self._records is not None:
+            return self._records
+        self._records = []
+        if self.index_path.exists():
+            with self.index_path.open("rb") as handle:
+                self._catch_up(handle)
+        return self._records
+
+    def _catch_up(self, handle: BinaryIO) -> None:
+        """Index the complete lines appended to the index since the last read."""
+        handle.seek(self._offset)
+        data = handle.read()
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            if line.strip():
+                self._index(RunRecord.from_entry(json.loads(line)))
+        self._offset += complete
+
+    @contextmanager
+    def _locked_index(self) -> Iterator[BinaryIO]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self.index_path.open("a+b") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            yield handle  # closing the file releases the lock
+
+    def _index(self, record: RunRecord) -> None:
+        assert self._records is not None
+        position = bisect.bisect_right(self._timestamps, record.timestamp)
+        self._timestamps.insert(position, record.timestamp)
+        self._records.insert(position, record)
+        self._by_id[record.run_id] = record
+        self._by_digest.setdefault(record.digest, []).append(record)
+        number = record.run_id[len(RUN_PREFIX) :]
+        if record.run_id.startswith(RUN_PREFIX) and number.isdigit():
+            self._last_number = max(self._last_number, int(number))
+
+    def _summary_path(self, digest: str) -> Path:
+        return self.summary_root / f"{digest}.json"
+
+    def record(
+        self,
+        summary: Mapping[str, Any],
+        *,
+        timings: Optional[Mapping[str, float]] = None,
+        timestamp: Optional[str] = None,
+    ) -> RunRecord:
+        """Append a run to the index, storing its summary only if the digest is new."""
+        self._load()
+        digest = summary_digest(summary)
+        artifacts = summary.get("artifacts") or {}
+        with self._locked_index() as handle:
+            self._catch_up(handle)
+            previous = self._by_digest.get(digest)
+            if not previous:
+                self.summary_root.mkdir(parents=True, exist_ok=True)
+                summary_path = self._summary_path(digest)
+                if not summary_path.exists():
+                    summary_path.write_text(
+                        json.dumps(summary, sort_keys=True, separators=(",", ":")) + "\n",
+                        encoding="utf-8",
+                    )
+
+            record = RunRecord(
+                run_id=f"{RUN_PREFIX}{self._last_number + 1:04d}",
+                timestamp=timestamp or _utc_now(),
+                digest=digest,
+                timings={stage: round(float(seconds), 6) for stage, seconds in (timings or {}).items()},
+                artifacts={str(key): str(value) for key, value in artifacts.items()},
+                duplicate_of=previous[0].run_id if previous else None,
+            )
+            line = json.dumps(record.to_entry(), sort_keys=True, separators=(",", ":")).encode("utf-8") + b"\n"
+            handle.write(line)
+            handle.flush()
+            self._offset += len(line)
+        self._index(record)
+        return record
+
+    def runs(
+        self,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        digest: Optional[str] = None,
+    ) -> Iterator[RunRecord]:
+        """Yield runs in timestamp order, optionally bounded by time and digest prefix."""
+        records = self._load()
+        if digest and len(digest) == 64:
+            for record in self._by_digest.get(digest, []):
+                if (since and record.timestamp < since) or (until and record.timestamp > until):
+                    continue
+                yield record
+            return
+        start = bisect.bisect_left(self._timestamps, since) if since else 0
+        stop = bisect.bisect_right(self._timestamps, until) if until else len(records)
+        for record in records[start:stop]:
+            if digest and not record.digest.startswith(digest):
+                continue
+            yield record
+
+    def get(self, ref: str) -> RunRecord:
+        """Resolve a run id or a unique digest prefix (latest run wins) to a record."""
+        self._load()
+        if ref in self._by_id:
+            return self._by_id[ref]
+        matches = [key for key in self._by_digest if key.startswith(ref)]
+        if len(matches) == 1:
+            return self._by_digest[matches[0]][-1]
+        if not matches:
+            raise KeyError(f"No run matches '{ref}'.")
+        raise KeyError(f"Digest prefix '{ref}' is ambiguous ({len(matches)} matches).")
+
+    def fetch_summary(self, ref: str | RunRecord) -> dict[str, Any]:
+        """Return the stored summary for a run."""
+        record = ref if isinstance(ref, RunRecord) else self.get(ref)
+        return json.loads(self._summary_path(record.digest).read_text(encoding="utf-8"))
+
+    def diff(self, ref_a: str, ref_b: str) -> dict[str, Any]:
+        """Compare two runs' summaries and per-stage timings."""
+        record_a = self.get(ref_a)
+        record_b = self.get(ref_b)
+        result: dict[str, Any] = {
+            "runs": [record_a.run_id, record_b.run_id],
+            "identical": record_a.digest == record_b.digest,
+            "added": {},
+            "removed": {},
+            "changed": {},
+            "timings": {},
+        }
+        if not result["identical"]:
+            flat_a = _flatten(self.fetch_summary(record_a))
+            flat_b = _flatten(self.fetch_summary(record_b))
+            for key in sorted(flat_a.keys() | flat_b.keys()):
+                if key not in flat_a:
+                    result["added"][key] = flat_b[key]
+                elif key not in flat_b:
+                    result["removed"][key] = flat_a[key]
+                elif flat_a[key] != flat_b[key]:
+                    result["changed"][key] = [flat_a[key], flat_b[key]]
+        for stage in sorted(record_a.timings.keys() | record_b.timings.keys()):
+            before = record_a.timings.get(stage)
+            after = record_b.timings.get(stage)
+            delta = round(after - before, 6) if before is not None and after is not None else None
+            result["timings"][stage] = {"a": before, "b": after, "delta": delta}
+        return result
+
+
+def _format_record(record: RunRecord) -> str:
+    total = record.timings.get("total")
+    total_display = f"{total:.3f}s" if total is not None else "n/a"
+    line = f"{record.run_id}  {record.timestamp}  {record.digest[:12]}  total={total_display}"
+    if record.duplicate_of:
+        line += f"  (same as {record.duplicate_of})"
+    return line
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="runs", description="Query the orchestrator run-log store.")
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=DEFAULT_STORE_ROOT,
+        help=f"Run store directory (default: {DEFAULT_STORE_ROOT}).",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List recorded runs in timestamp order.")
+    list_parser.add_argument("--since", help="Only include runs at or after this ISO timestamp.")
+    list_parser.add_argument("--until", help="Only include runs at or before this ISO timestamp.")
+    list_parser.add_argument("--digest", help="Only include runs whose digest starts with this prefix.")
+    list_parser.add_argument("--limit", type=int, help="Show only the most recent N matching runs.")
+    list_parser.add_argument("--json", action="store_true", help="Emit NDJSON records instead of text.")
+
+    show_parser = subparsers.add_parser("show", help="Show a run record.")
+    show_parser.add_argument("ref", help="Run id or digest prefix.")
+    show_parser.add_argument("--summary", action="store_true", help="Include the stored orchestrator summary.")
+
+    diff_parser = subparsers.add_parser("diff", help="Diff two runs.")
+    diff_parser.add_argument("ref_a", help="Run id or digest prefix.")
+    diff_parser.add_argument("ref_b", help="Run id or digest prefix.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    store = RunStore(args.root)
+
+    try:
+        if args.command == "list":
+            records = list(store.runs(since=args.since, until=args.until, digest=args.digest))
+            if args.limit is not None:
+                records = records[-args.limit :] if args.limit > 0 else []
+            for record in records:
+                if args.json:
+                    print(json.dumps(record.to_entry(), sort_keys=True))
+                else:
+                    print(_format_record(record))
+            return 0
+
+        if args.command == "show":
+            record = store.get(args.ref)
+            payload = record.to_entry()
+            if args.summary:
+                payload["summary"] = store.fetch_summary(record)
+            print(json.dumps(payload, indent=2, sort_keys=True))
+            return 0
+
+        if args.command == "diff":
+            print(json.dumps(store.diff(args.ref_a, args.ref_b), indent=2, sort_keys=True))
+            return 0
+    except KeyError as exc:
+        print(f"runs: {exc.args[0]}", file=sys.stderr)
+        return 1
+
+    parser.error("Unknown command.")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
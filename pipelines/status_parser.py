@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Single-pass parser for ``changes/*/status.md`` documents.
+
+The document is scanned once, line by line, using only prefix checks and
+string splits (no regular expressions). Each ``##`` heading opens a
+:class:`Section` collecting its paragraphs, bullet/numbered list items
+(indented continuation lines are folded into the item) and pipe tables.
+:class:`StatusDocument` then exposes the well-known sections in typed form:
+
+- ``metadata``: ``- Key: Value`` items under *Metadata*;
+- ``summary``: items under *Summary* (plus free-form items under *Metadata*);
+- ``approvals``: rows of the *Approvals* table;
+- ``next_actions``: numbered items under *Next Actions* (``**Owner**: text``);
+- ``handoffs``: ``- YYYY-MM-DD — From → To: summary`` items in any section;
+- ``concerns``: items under *Risks / Concerns*.
+
+Usage:
+
+    from pipelines.status_parser import load_status
+
+    document = load_status(Path("changes/CH-002/status.md"))
+    document.metadata["Current Stage"], document.approvals[0].status
+
+CLI (prints the parsed document as JSON):
+
+    python3 pipelines/status_parser.py changes/CH-002/status.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+__all__ = [
+    "Approval",
+    "HandoffNote",
+    "ListItem",
+    "NextAction",
+    "Section",
+    "StatusDocument",
+    "Table",
+    "load_status",
+    "parse_status_document",
+]
+
+_DASH = " — "
+_ARROW = " → "
+_MAX_METADATA_KEY = 40
+
+
+@dataclass(frozen=True)
+class Table:
+    header: tuple[str, ...]
+    rows: tuple[tuple[str, ...], ...]
+
+    def records(self) -> List[Dict[str, str]]:
+        """Rows as dicts keyed by the lower-cased header cells."""
+        keys = [cell.lower() for cell in self.header]
+        return [dict(zip(keys, row)) for row in self.rows]
+
+
+@dataclass(frozen=True)
+class ListItem:
+    text: str
+    ordinal: Optional[int] = None  # None for ``-``/``*`` bullets
+
+
+@dataclass(frozen=True)
+class Section:
+    title: str
+    level: int
+    paragraphs: tuple[str, ...] = ()
+    items: tuple[ListItem, ...] = ()
+    tables: tuple[Table, ...] = ()
+
+
+@dataclass(frozen=True)
+class Approval:
+    stage: str
+    reviewer: str
+    status: str
+    notes: str
+
+    def as_dict(self) -> Dict[str, str]:
+        return {"stage": self.stage, "reviewer": self.reviewer, "status": self.status, "notes": self.notes}
+
+
+@dataclass(frozen=True)
+class NextAction:
+    owner: str
+    text: str
+    ordinal: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class HandoffNote:
+    date: str
+    from_agent: str
+    to_agent: str
+    summary: str
+
+
+@dataclass(frozen=True)
+class StatusDocument:
+    change_id: str
+    title: str
+    sections: tuple[Section, ...]
+    metadata: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    summary: tuple[str, ...] = ()
+    approvals: tuple[Approval, ...] = ()
+    next_actions: tuple[NextAction, ...] = ()
+    handoffs: tuple[HandoffNote, ...] = ()
+    concerns: tuple[str, ...] = ()
+
+    def section(self, title: str) -> Optional[Section]:
+        wanted = title.casefold()
+        for section in self.sections:
+            if section.title.casefold() == wanted:
+                return section
+        return None
+
+    @property
+    def current_stage(self) -> Optional[str]:
+        return self.metadata.get("Current Stage")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "change_id": self.change_id,
+            "title": self.title,
+            "metadata": dict(self.metadata),
+            "summary": list(self.summary),
+            "approvals": [approval.as_dict() for approval in self.approvals],
+            "next_actions": [
+                {"ordinal": action.ordinal, "owner": action.owner, "text": action.text}
+                for action in self.next_actions
+            ],
+            "handoffs": [
+                {"date": note.date, "from": note.from_agent, "to": note.to_agent, "summary": note.summary}
+                for note in self.handoffs
+            ],
+            "concerns": list(self.concerns),
+        }
+
+
+class _SectionBuilder:
+    def __init__(self, title: str, level: int) -> None:
+        self.title = title
+        self.level = level
+        self.paragraphs: List[str] = []
+        self.items: List[ListItem] = []
+        self.tables: List[Table] = []
+        self.table_rows: List[tuple[str, ...]] = []
+        self.paragraph: List[str] = []
+
+    def close_block(self) -> None:
+        if self.table_rows:
+            header, *rows = self.table_rows
+            self.tables.append(Table(header=header, rows=tuple(rows)))
+            self.table_rows = []
+        if self.paragraph:
+            self.paragraphs.append(" ".join(self.paragraph))
+            self.paragraph = []
+
+    def build(self) -> Section:
+        self.close_block()
+        return Section(
+            title=self.title,
+            level=self.level,
+            paragraphs=tuple(self.paragraphs),
+            items=tuple(self.items),
+            tables=tuple(self.tables),
+        )
+
+
+def _table_cells(line: str) -> tuple[str, ...]:
+    inner = line.strip()
+    inner = inner[1:] if inner.startswith("|") else inner
+    inner = inner[:-1] if inner.endswith("|") else inner
+    return tuple(cell.strip() for cell in inner.split("|"))
+
+
+def _is_separator_row(cells: Sequence[str]) -> bool:
+    return all(cell and set(cell) <= set(":- ") for cell in cells)
+
+
+def _list_item(stripped: str) -> Optional[ListItem]:
+    if stripped[:2] in ("- ", "* ", "+ "):
+        return ListItem(text=stripped[2:].strip())
+    digits, dot, rest = stripped.partition(". ")
+    if dot and digits.isdigit():
+        return ListItem(text=rest.strip(), ordinal=int(digits))
+    return None
+
+
+def _sections(lines: Iterable[str]) -> tuple[str, List[Section]]:
+    title = ""
+    sections: List[Section] = []
+    current = _SectionBuilder("", 0)
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped:
+            current.close_block()
+            continue
+        if stripped.startswith("#"):
+            level = len(stripped) - len(stripped.lstrip("#"))
+            heading = stripped[level:].strip()
+            if level == 1 and not title:
+                title = heading
+                continue
+            sections.append(current.build())
+            current = _SectionBuilder(heading, level)
+            continue
+        if stripped.startswith("|"):
+            if current.paragraph:
+                current.close_block()
+            cells = _table_cells(stripped)
+            if not _is_separator_row(cells):
+                current.table_rows.append(cells)
+            continue
+        if current.table_rows:
+            current.close_block()
+        item = _list_item(stripped)
+        if item is not None:
+            current.close_block()
+            current.items.append(item)
+            continue
+        if current.items and line[:1] in (" ", "\t") and not current.paragraph:
+            previous = current.items[-1]
+            current.items[-1] = ListItem(text=f"{previous.text} {stripped}", ordinal=previous.ordinal)
+            continue
+        current.paragraph.append(stripped)
+    sections.append(current.build())
+    return title, [section for section in sections if section.title or section.items or section.paragraphs or section.tables]
+
+
+def _metadata_pair(text: str) -> Optional[tuple[str, str]]:
+    key, colon, value = text.partition(": ")
+    if not colon or not key or len(key) > _MAX_METADATA_KEY or "`" in key:
+        return None
+    return key.strip(), value.strip()
+
+
+def _handoff(text: str) -> Optional[HandoffNote]:
+    date, dash, rest = text.partition(_DASH)
+    if not dash or len(date) != 10 or date[4] != "-" or date[7] != "-":
+        return None
+    route, colon, summary = rest.partition(": ")
+    source, arrow, target = route.partition(_ARROW)
+    if not colon or not arrow:
+        return None
+    return HandoffNote(date=date, from_agent=source.strip(), to_agent=target.strip(), summary=summary.strip())
+
+
+def _next_action(item: ListItem) -> NextAction:
+    text = item.text
+    if text.startswith("**"):
+        owner, closing, rest = text[2:].partition("**")
+        if closing:
+            return NextAction(owner=owner.strip(), text=rest.lstrip(":").strip(), ordinal=item.ordinal)
+    return NextAction(owner="", text=text, ordinal=item.ordinal)
+
+
+def _approvals(section: Section) -> List[Approval]:
+    approvals: List[Approval] = []
+    for table in section.tables:
+        keys = [cell.lower() for cell in table.header]
+        if "stage" not in keys or "status" not in keys:
+            continue
+        for record in table.records():
+            approvals.append(
+                Approval(
+                    stage=record.get("stage", ""),
+                    reviewer=record.get("reviewer", ""),
+                    status=record.get("status", ""),
+                    notes=record.get("notes", ""),
+                )
+            )
+    return approvals
+
+
+def parse_status_document(lines: Iterable[str], *, change_id: str = "") -> StatusDocument:
+    """Parse a status document from an iterable of lines (or a string)."""
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    title, sections = _sections(lines)
+    if not change_id and _DASH in title:
+        change_id = title.rpartition(_DASH)[2].strip()
+
+    metadata: Dict[str, str] = {}
+    summary: List[str] = []
+    approvals: List[Approval] = []
+    next_actions: List[NextAction] = []
+    handoffs: List[HandoffNote] = []
+    concerns: List[str] = []
+    for section in sections:
+        name = section.title.casefold()
+        for item in section.items:
+            note = _handoff(item.text) if item.ordinal is None else None
+            if note is not None:
+                handoffs.append(note)
+            elif name == "metadata":
+                pair = _metadata_pair(item.text)
+                if pair is not None and pair[0] not in metadata:
+                    metadata[pair[0]] = pair[1]
+                else:
+                    summary.append(item.text)
+            elif name == "summary":
+                summary.append(item.text)
+            elif name == "next actions" and item.ordinal is not None:
+                next_actions.append(_next_action(item))
+            elif name in ("risks / concerns", "concerns", "risks"):
+                concerns.append(item.text)
+        if name == "approvals":
+            approvals.extend(_approvals(section))
+        elif name == "summary":
+            summary.extend(section.paragraphs)
+
+    return StatusDocument(
+        change_id=change_id,
+        title=title,
+        sections=tuple(sections),
+        metadata=MappingProxyType(metadata),
+        summary=tuple(summary),
+        approvals=tuple(approvals),
+        next_actions=tuple(next_actions),
+        handoffs=tuple(handoffs),
+        concerns=tuple(concerns),
+    )
+
+
+def load_status(path: Path | str) -> StatusDocument:
+    """Parse ``path``; the change id is the workspace directory name."""
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as handle:
+        return parse_status_document(handle, change_id=path.parent.name)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Parse a change status.md into structured JSON.")
+    parser.add_argument("status_path", type=Path, help="Path to changes/CH-xxx/status.md.")
+    args = parser.parse_args(argv)
+    if not args.status_path.exists():
+        parser.error(f"Status file not found: {args.status_path}")
+    print(json.dumps(load_status(args.status_path).as_dict(), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,49 +1,410 @@
 #!/usr/bin/env python3
-"""Generate status snapshot JSON for a change workspace."""
+"""Generate status snapshot JSON for a change workspace.
+
+``--all`` builds one portfolio snapshot across every ``changes/*/status.md``:
+per-change entries, per-stage status counts and current-stage counts (all
+read through ``status_parser``). Parsed results are cached
+(``artifacts/cache/status_snapshot.json``) by file path with the mtime, size
+and sha256 of each file; files whose mtime and size are unchanged are not read,
+files whose content hash is unchanged are not re-parsed, and the rest are
+parsed concurrently. A refresh therefore costs time proportional to the
+number of changed workspaces.
+
+``--feed`` compares the portfolio with the state recorded by the previous
+feed run and appends only the differences to ``artifacts/status/feed.ndjson``,
+one compact JSON event per line with a monotonically increasing ``seq``:
+``approval`` events when a stage's status changes (``from``/``to``, ``null``
+for rows that appear or disappear) and ``current_stage`` events when a
+workspace's current stage changes. ``--replay SEQ`` prints stored events after
+``SEQ`` so consumers can resume where they stopped. An update holds an
+exclusive lock on the feed (``flock`` where available) from reading the last
+state to writing the new one, so concurrent ``--feed`` runs never emit the
+same ``seq`` twice; a line left incomplete by a crash mid-append is dropped.
+
+    python3 pipelines/status_snapshot.py changes/CH-002/status.md --output snapshot.json
+    python3 pipelines/status_snapshot.py --all [--changes-root changes] --output portfolio.json
+    python3 pipelines/status_snapshot.py --feed [--feed-path artifacts/status/feed.ndjson]
+    python3 pipelines/status_snapshot.py --replay 0
+"""
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
-import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Sequence
+
+try:  # POSIX only; elsewhere concurrent feed updates are unsupported.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pipelines.artifact_writer import write_artifact
+from pipelines.status_parser import load_status, parse_status_document
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CHANGES_ROOT = PROJECT_ROOT / "changes"
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "artifacts" / "cache" / "status_snapshot.json"
+CACHE_VERSION = 2
+DEFAULT_FEED_PATH = PROJECT_ROOT / "artifacts" / "status" / "feed.ndjson"
+FEED_STATE_VERSION = 1
+STATUS_PATTERN = "*/status.md"
 
-TABLE_PATTERN = re.compile(r"\|\s*(?P<stage>[A-Za-z ]+)\s*\|\s*(?P<reviewer>[^|]+)\|\s*(?P<status>[^|]+)\|\s*(?P<notes>[^|]+)\|")
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
 
 def parse_status(md_path: Path) -> dict:
-    content = md_path.read_text(encoding="utf-8")
-    lines = content.splitlines()
-    table_started = False
-    entries = []
-    for line in lines:
-        if line.strip().startswith("| Stage"):
-            table_started = True
-            continue
-        if table_started:
-            if not line.strip() or line.strip().startswith("##"):
-                break
-            match = TABLE_PATTERN.match(line)
-            if match:
-                entries.append({
-                    "stage": match.group("stage").strip(),
-                    "reviewer": match.group("reviewer").strip(),
-                    "status": match.group("status").strip(),
-                    "notes": match.group("notes").strip(),
-                })
+    document = load_status(md_path)
     return {
-        "change_id": md_path.parent.name,
-        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-        "entries": entries,
+        "change_id": document.change_id,
+        "timestamp": _utc_now(),
+        "current_stage": document.current_stage,
+        "metadata": dict(document.metadata),
+        "entries": [approval.as_dict() for approval in document.approvals],
+        "next_actions": document.as_dict()["next_actions"],
     }
 
 
-def main() -> int:
+def discover_status_files(changes_root: Path) -> List[Path]:
+    return sorted(path for path in Path(changes_root).glob(STATUS_PATTERN) if path.is_file())
+
+
+def _read_file(path: Path, cached_digest: Optional[str]) -> tuple[str, Optional[Dict[str, Any]]]:
+    """Hash ``path`` and parse it only when the digest differs from ``cached_digest``."""
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest == cached_digest:
+        return digest, None
+    document = parse_status_document(data.decode("utf-8"), change_id=path.parent.name)
+    parsed = {
+        "current_stage": document.current_stage,
+        "entries": [approval.as_dict() for approval in document.approvals],
+    }
+    return digest, parsed
+
+
+class StatusPortfolio:
+    """Status entries for every change workspace, refreshed incrementally."""
+
+    def __init__(
+        self,
+        changes_root: Path = DEFAULT_CHANGES_ROOT,
+        *,
+        cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.changes_root = Path(changes_root)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.max_workers = max_workers
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._loaded_cache = False
+        self.last_read: List[str] = []
+        self.last_reparsed: List[str] = []
+
+    def _load_cache(self) -> None:
+        self._loaded_cache = True
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        if data.get("version") == CACHE_VERSION:
+            self._files = dict(data.get("files", {}))
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        payload = {"version": CACHE_VERSION, "files": self._files}
+        write_artifact(self.cache_path, json.dumps(payload, sort_keys=True, separators=(",", ":")))
+
+    def refresh(self) -> "StatusPortfolio":
+        """Re-read files whose stat signature changed and re-parse those whose content changed."""
+        if not self._loaded_cache:
+            self._load_cache()
+
+        files = discover_status_files(self.changes_root)
+        current: Dict[str, Dict[str, Any]] = {}
+        stale: List[tuple[str, Path, int, int]] = []
+        for path in files:
+            key = str(path)
+            stat = path.stat()
+            cached = self._files.get(key)
+            if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                current[key] = cached
+            else:
+                stale.append((key, path, stat.st_mtime_ns, stat.st_size))
+
+        reparsed: List[str] = []
+        if stale:
+
+            def read(item: tuple[str, Path, int, int]) -> tuple[str, Optional[Dict[str, Any]]]:
+                cached = self._files.get(item[0])
+                return _read_file(item[1], cached["sha256"] if cached else None)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for (key, path, mtime_ns, size), (digest, parsed) in zip(stale, executor.map(read, stale)):
+                    if parsed is None:
+                        cached = self._files[key]
+                        parsed = {"current_stage": cached["current_stage"], "entries": cached["entries"]}
+                    else:
+                        reparsed.append(key)
+                    current[key] = {
+                        "change_id": path.parent.name,
+                        "mtime_ns": mtime_ns,
+                        "size": size,
+                        "sha256": digest,
+                        **parsed,
+                    }
+
+        changed = bool(stale) or list(current) != list(self._files)
+        self._files = current
+        self.last_read = [key for key, *_ in stale]
+        self.last_reparsed = reparsed
+        if changed:
+            self._save_cache()
+        return self
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Aggregate the current entries into one portfolio snapshot."""
+        changes: Dict[str, Any] = {}
+        stages: Dict[str, Dict[str, int]] = {}
+        current_stages: Dict[str, int] = {}
+        for record in self._files.values():
+            changes[record["change_id"]] = {"current_stage": record["current_stage"], "entries": record["entries"]}
+            if record["current_stage"]:
+                current_stages[record["current_stage"]] = current_stages.get(record["current_stage"], 0) + 1
+            for entry in record["entries"]:
+                counts = stages.setdefault(entry["stage"], {})
+                counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return {
+            "timestamp": _utc_now(),
+            "changes_root": str(self.changes_root),
+            "workspaces": len(changes),
+            "stages": stages,
+            "current_stages": current_stages,
+            "changes": changes,
+        }
+
+
+def build_portfolio(
+    changes_root: Path = DEFAULT_CHANGES_ROOT,
+    *,
+    cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+) -> Dict[str, Any]:
+    portfolio = StatusPortfolio(changes_root, cache_path=cache_path).refresh()
+    snapshot = portfolio.snapshot()
+    snapshot["refresh"] = {"read": len(portfolio.last_read), "reparsed": len(portfolio.last_reparsed)}
+    return snapshot
+
+
+def _workspace_state(snapshot: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {
+        change_id: {
+            "current_stage": change["current_stage"],
+            "stages": {entry["stage"]: entry["status"] for entry in change["entries"]},
+        }
+        for change_id, change in snapshot["changes"].items()
+    }
+
+
+def diff_states(
+    previous: Mapping[str, Mapping[str, Any]], current: Mapping[str, Mapping[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Transition events (without ``seq``/``timestamp``) turning ``previous`` into ``current``."""
+    events: List[Dict[str, Any]] = []
+    empty: Mapping[str, Any] = {"current_stage": None, "stages": {}}
+    for change_id in sorted(set(previous) | set(current)):
+        before = previous.get(change_id, empty)
+        after = current.get(change_id, empty)
+        if before["current_stage"] != after["current_stage"]:
+            events.append(
+                {
+                    "kind": "current_stage",
+                    "change_id": change_id,
+                    "stage": None,
+                    "from": before["current_stage"],
+                    "to": after["current_stage"],
+                }
+            )
+        stages = list(after["stages"]) + [stage for stage in before["stages"] if stage not in after["stages"]]
+        for stage in stages:
+            old, new = before["stages"].get(stage), after["stages"].get(stage)
+            if old != new:
+                events.append({"kind": "approval", "change_id": change_id, "stage": stage, "from": old, "to": new})
+    return events
+
+
+def _encode_event(event: Mapping[str, Any]) -> str:
+    return json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def read_feed(feed_path: Path, since: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield stored events with ``seq`` greater than ``since``."""
+    if not Path(feed_path).exists():
+        return
+    with Path(feed_path).open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip() and line.endswith("\n"):  # an unterminated last line is a torn append
+                event = json.loads(line)
+                if event["seq"] > since:
+                    yield event
+
+
+def _last_sequence(feed_path: Path) -> int:
+    """``seq`` of the final event, reading only the tail of the feed."""
+    try:
+        with Path(feed_path).open("rb") as handle:
+            handle.seek(0, 2)
+            end = handle.tell()
+            block = b""
+            position = end
+            while position > 0 and block.count(b"\n") < 2:
+                step = min(4096, position)
+                position -= step
+                handle.seek(position)
+                block = handle.read(step) + block
+    except FileNotFoundError:
+        return 0
+    complete = block[: block.rfind(b"\n") + 1]  # ignore a torn final line
+    lines = [line for line in complete.splitlines() if line.strip()]
+    return json.loads(lines[-1])["seq"] if lines else 0
+
+
+def _drop_torn_tail(handle: BinaryIO) -> None:
+    """Truncate ``handle`` after its last newline, removing a partially appended event."""
+    end = handle.seek(0, 2)
+    position = end
+    while position > 0:
+        step = min(4096, position)
+        position -= step
+        handle.seek(position)
+        block = handle.read(step)
+        newline = block.rfind(b"\n")
+        if newline != -1:
+            position += newline + 1
+            break
+    if position != end:
+        handle.truncate(position)
+
+
+class StatusFeed:
+    """Append-only NDJSON feed of status transitions, with its last-known state beside it."""
+
+    def __init__(self, feed_path: Path = DEFAULT_FEED_PATH, *, state_path: Optional[Path] = None) -> None:
+        self.feed_path = Path(feed_path)
+        self.state_path = Path(state_path) if state_path is not None else self.feed_path.with_suffix(".state.json")
+
+    def _load_state(self) -> tuple[int, Dict[str, Dict[str, Any]]]:
+        sequence, workspaces = 0, {}
+        if self.state_path.exists():
+            try:
+                data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                data = {}
+            if data.get("version") == FEED_STATE_VERSION:
+                sequence, workspaces = data["sequence"], data["workspaces"]
+        if _last_sequence(self.feed_path) != sequence:
+            # The state file is missing or behind the feed: rebuild it from the events.
+            sequence, workspaces = self._replay()
+        return sequence, workspaces
+
+    def _replay(self) -> tuple[int, Dict[str, Dict[str, Any]]]:
+        sequence = 0
+        workspaces: Dict[str, Dict[str, Any]] = {}
+        for event in read_feed(self.feed_path):
+            sequence = event["seq"]
+            workspace = workspaces.setdefault(event["change_id"], {"current_stage": None, "stages": {}})
+            if event["kind"] == "current_stage":
+                workspace["current_stage"] = event["to"]
+            elif event["to"] is None:
+                workspace["stages"].pop(event["stage"], None)
+            else:
+                workspace["stages"][event["stage"]] = event["to"]
+        return sequence, {
+            change_id: workspace
+            for change_id, workspace in workspaces.items()
+            if workspace["current_stage"] is not None or workspace["stages"]
+        }
+
+    @contextmanager
+    def _locked_feed(self) -> Iterator[BinaryIO]:
+        self.feed_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.feed_path.open("a+b") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            yield handle  # closing the file releases the lock
+
+    def update(self, snapshot: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        """Append events for everything that changed since the last update and return them."""
+        with self._locked_feed() as handle:
+            _drop_torn_tail(handle)
+            sequence, previous = self._load_state()
+            current = _workspace_state(snapshot)
+            events = diff_states(previous, current)
+            if not events:
+                return []
+            timestamp = snapshot.get("timestamp") or _utc_now()
+            for event in events:
+                sequence += 1
+                event["seq"] = sequence
+                event["timestamp"] = timestamp
+            handle.write("".join(_encode_event(event) + "\n" for event in events).encode("utf-8"))
+            handle.flush()
+            payload = {"version": FEED_STATE_VERSION, "sequence": sequence, "workspaces": current}
+            # Not key-sorted: stage order is the table order, which keeps event order stable.
+            write_artifact(self.state_path, json.dumps(payload, separators=(",", ":")))
+        return events
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Generate status snapshot for CH workspace.")
-    parser.add_argument("workspace", help="Path to change status Markdown file (e.g., changes/CH-002/status.md)")
-    parser.add_argument("--output", required=True, help="Path to output snapshot JSON.")
-    args = parser.parse_args()
+    parser.add_argument(
+        "workspace",
+        nargs="?",
+        help="Path to change status Markdown file (e.g., changes/CH-002/status.md)",
+    )
+    parser.add_argument("--output", help="Path to output snapshot JSON (required unless --feed/--replay).")
+    parser.add_argument("--all", action="store_true", help="Snapshot every changes/*/status.md into one portfolio.")
+    parser.add_argument("--changes-root", type=Path, default=DEFAULT_CHANGES_ROOT, help="Workspace root for --all.")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the --all parse cache.")
+    parser.add_argument("--feed", action="store_true", help="Append status transitions since the last run as NDJSON.")
+    parser.add_argument("--replay", type=int, metavar="SEQ", help="Print stored feed events after SEQ.")
+    parser.add_argument("--feed-path", type=Path, default=DEFAULT_FEED_PATH, help="NDJSON feed for --feed/--replay.")
+    args = parser.parse_args(argv)
+
+    if args.replay is not None:
+        for event in read_feed(args.feed_path, since=args.replay):
+            print(_encode_event(event))
+        return 0
+    if args.feed:
+        snapshot = build_portfolio(args.changes_root, cache_path=None if args.no_cache else DEFAULT_CACHE_PATH)
+        for event in StatusFeed(args.feed_path).update(snapshot):
+            print(_encode_event(event))
+        if args.output:
+            write_artifact(Path(args.output), json.dumps(snapshot, indent=2, sort_keys=True))
+        return 0
+    if not args.output:
+        parser.error("--output is required unless --feed or --replay is given")
+
+    if args.all:
+        if args.workspace:
+            parser.error("--all does not take a workspace path")
+        snapshot = build_portfolio(args.changes_root, cache_path=None if args.no_cache else DEFAULT_CACHE_PATH)
+        write_artifact(Path(args.output), json.dumps(snapshot, indent=2, sort_keys=True))
+        print(json.dumps(snapshot, indent=2))
+        return 0
+    if not args.workspace:
+        parser.error("a workspace status file is required unless --all is given")
 
     md_path = Path(args.workspace)
     if not md_path.exists():
@@ -51,8 +412,7 @@ def main() -> int:
 
     snapshot = parse_status(md_path)
     output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(snapshot, indent=2, sort_keys=True), encoding="utf-8")
+    write_artifact(output_path, json.dumps(snapshot, indent=2, sort_keys=True))
     print(json.dumps(snapshot, indent=2))
     return 0
 
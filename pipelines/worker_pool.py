@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""Persistent agent worker pool backed by a durable SQLite job queue.
+
+Each submitted scenario becomes four jobs, one per agent stage
+(project_manager → designer → implementer → tester). Worker processes are
+started per stage with configurable concurrency, keep their agent instances
+warm between jobs, and only claim a job once every earlier stage of the same
+scenario has completed. Results (artifact paths plus the handoff records the
+agent emitted) are written back to the queue.
+
+CLI usage:
+
+    python3 pipelines/worker_pool.py submit [--scenario scenario.json] [--scenario-id ID]
+    python3 pipelines/worker_pool.py run [--concurrency designer=2 ...] [--serve]
+    python3 pipelines/worker_pool.py status [--scenario-id ID]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import sqlite3
+import sys
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, MutableMapping, Optional, Sequence
+from uuid import uuid4
+
+try:  # POSIX only; elsewhere running two pools on one queue is unsupported.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from audit import Subscription, subscribe_handoffs
+from agents.designer import Designer
+from agents.implementer import Implementer
+from agents.project_manager import ProjectManager
+from agents.tester import Tester
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_QUEUE_PATH = PROJECT_ROOT / "artifacts" / "queue" / "jobs.sqlite"
+DEFAULT_OUTPUT_ROOT = PROJECT_ROOT / "artifacts" / "queue" / "outputs"
+
+STAGES = ("project_manager", "designer", "implementer", "tester")
+OUTPUT_FILES = {
+    "brief": "PHASE_BRIEF.md",
+    "design_spec": "DESIGN_SPEC.md",
+    "implementation_plan": "IMPLEMENTATION_PLAN.md",
+    "test_plan": "TEST_PLAN.md",
+    "test_results": "TEST_RESULTS.md",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scenario_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    enqueued_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_stage_status ON jobs (stage, status, id);
+CREATE INDEX IF NOT EXISTS jobs_scenario ON jobs (scenario_id, position);
+"""
+
+
+def _utc_now() -> str:
+    """Return timestamp consistent with audit logger formatting."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+@dataclass(frozen=True)
+class Job:
+    """A claimed stage job plus the results of its completed upstream stages."""
+
+    id: int
+    scenario_id: str
+    stage: str
+    payload: Mapping[str, Any]
+    upstream: Mapping[str, Mapping[str, Any]]
+
+
+class JobQueue:
+    """Durable, multi-process job queue stored in SQLite (WAL mode)."""
+
+    def __init__(self, path: Path | str = DEFAULT_QUEUE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def submit(
+        self,
+        scenario: Mapping[str, Any],
+        *,
+        scenario_id: Optional[str] = None,
+        output_dir: Optional[Path | str] = None,
+    ) -> str:
+        """Enqueue one job per stage for ``scenario`` and return its scenario id."""
+        scenario_id = scenario_id or uuid4().hex[:12]
+        target_dir = Path(output_dir) if output_dir is not None else DEFAULT_OUTPUT_ROOT / scenario_id
+        payload = json.dumps({"scenario": dict(scenario), "output_dir": str(target_dir)}, sort_keys=True)
+        now = _utc_now()
+        with self._transaction():
+            self._conn.executemany(
+                "INSERT INTO jobs (scenario_id, stage, position, payload, enqueued_at) VALUES (?, ?, ?, ?, ?)",
+                [(scenario_id, stage, position, payload, now) for position, stage in enumerate(STAGES)],
+            )
+        return scenario_id
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def claim(self, stage: str, worker: str) -> Optional[Job]:
+        """Atomically claim the oldest runnable job for ``stage``."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                """
+                SELECT j.id, j.scenario_id, j.payload FROM jobs j
+                WHERE j.stage = ? AND j.status = 'pending'
+                  AND NOT EXISTS (
+                      SELECT 1 FROM jobs p
+                      WHERE p.scenario_id = j.scenario_id AND p.position < j.position AND p.status != 'done'
+                  )
+                ORDER BY j.id LIMIT 1
+                """,
+                (stage,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started_at = ? WHERE id = ?",
+                (worker, _utc_now(), row["id"]),
+            )
+            upstream = {
+                item["stage"]: json.loads(item["result"])
+                for item in conn.execute(
+                    "SELECT stage, result FROM jobs WHERE scenario_id = ? AND status = 'done' ORDER BY position",
+                    (row["scenario_id"],),
+                )
+            }
+        return Job(
+            id=row["id"],
+            scenario_id=row["scenario_id"],
+            stage=stage,
+            payload=json.loads(row["payload"]),
+            upstream=upstream,
+        )
+
+    def complete(self, job_id: int, result: Mapping[str, Any]) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, finished_at = ? WHERE id = ?",
+                (json.dumps(result, sort_keys=True), _utc_now(), job_id),
+            )
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Mark a job failed and cancel the downstream stages of its scenario."""
+        now = _utc_now()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT scenario_id, position FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                (error, now, job_id),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                "WHERE scenario_id = ? AND position > ? AND status = 'pending'",
+                (now, row["scenario_id"], row["position"]),
+            )
+
+    def requeue_running(self) -> int:
+        """Return jobs left 'running' by a previous, interrupted pool to 'pending'."""
+        with self._transaction() as conn:
+            cursor = conn.execute("UPDATE jobs SET status = 'pending', worker = NULL, started_at = NULL WHERE status = 'running'")
+        return cursor.rowcount
+
+    def running(self, worker: str) -> list[int]:
+        """Ids of the jobs ``worker`` has claimed but not yet finished."""
+        rows = self._conn.execute("SELECT id FROM jobs WHERE worker = ? AND status = 'running' ORDER BY id", (worker,))
+        return [row[0] for row in rows]
+
+    def requeue(self, job_id: int) -> None:
+        """Return a 'running' job to 'pending' so another worker can claim it."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', worker = NULL, started_at = NULL WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    def fail_pending(self, stage: str, error: str) -> int:
+        """Fail every pending ``stage`` job (cancelling its downstream stages); return how many."""
+        rows = self._conn.execute("SELECT id FROM jobs WHERE stage = ? AND status = 'pending' ORDER BY id", (stage,))
+        job_ids = [row[0] for row in rows]
+        for job_id in job_ids:
+            self.fail(job_id, error)
+        return len(job_ids)
+
+    def counts(self) -> dict[str, int]:
+        rows = self._conn.execute("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status")
+        return {row["status"]: row["total"] for row in rows}
+
+    def outstanding(self) -> int:
+        row = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'running')").fetchone()
+        return int(row[0])
+
+    def scenario(self, scenario_id: str) -> list[dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT stage, status, result, error, worker, started_at, finished_at FROM jobs "
+            "WHERE scenario_id = ? ORDER BY position",
+            (scenario_id,),
+        )
+        return [
+            {
+                "stage": row["stage"],
+                "status": row["status"],
+                "result": json.loads(row["result"]) if row["result"] else None,
+                "error": row["error"],
+                "worker": row["worker"],
+                "started_at": row["started_at"],
+                "finished_at": row["finished_at"],
+            }
+            for row in rows
+        ]
+
+    def scenario_ids(self) -> list[str]:
+        rows = self._conn.execute("SELECT scenario_id FROM jobs GROUP BY scenario_id ORDER BY MIN(id)")
+        return [row[0] for row in rows]
+
+
+def _outputs(payload: Mapping[str, Any]) -> dict[str, Path]:
+    output_dir = Path(payload["output_dir"])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return {key: output_dir / name for key, name in OUTPUT_FILES.items()}
+
+
+def _run_project_manager(agent: ProjectManager, job: Job) -> dict[str, str]:
+    outputs = _outputs(job.payload)
+    brief = agent.create_phase_brief(job.payload["scenario"], output_path=outputs["brief"])
+    return {"brief": str(brief)}
+
+
+def _run_designer(agent: Designer, job: Job) -> dict[str, str]:
+    outputs = _outputs(job.payload)
+    brief_path = Path(job.upstream["project_manager"]["artifacts"]["brief"])
+    design = agent.create_design_spec(job.payload["scenario"], brief_path=brief_path, output_path=outputs["design_spec"])
+    return {"design_spec": str(design)}
+
+
+def _run_implementer(agent: Implementer, job: Job) -> dict[str, str]:
+    outputs = _outputs(job.payload)
+    design_path = Path(job.upstream["designer"]["artifacts"]["design_spec"])
+    plan = agent.create_execution_plan(
+        job.payload["scenario"],
+        design_path=design_path,
+        output_path=outputs["implementation_plan"],
+    )
+    return {"implementation_plan": str(plan)}
+
+
+def _run_tester(agent: Tester, job: Job) -> dict[str, str]:
+    outputs = _outputs(job.payload)
+    plan, results = agent.prepare_phase_test_assets(
+        job.payload["scenario"],
+        plan_path=outputs["test_plan"],
+        results_path=outputs["test_results"],
+    )
+    return {"test_plan": str(plan), "test_results": str(results)}
+
+
+STAGE_AGENTS: Mapping[str, tuple[Callable[[str], Any], Callable[[Any, Job], dict[str, str]]]] = {
+    "project_manager": (lambda phase: ProjectManager(phase=phase), _run_project_manager),
+    "designer": (lambda phase: Designer(phase=phase), _run_designer),
+    "implementer": (lambda phase: Implementer(phase=phase), _run_implementer),
+    "tester": (lambda phase: Tester(phase=phase), _run_tester),
+}
+
+
+def process_job(job: Job, agents: MutableMapping[str, Any], handoffs: Subscription) -> dict[str, Any]:
+    """Run ``job`` with a warm agent instance and return its queue result."""
+    factory, runner = STAGE_AGENTS[job.stage]
+    phase = str(job.payload["scenario"].get("phase") or "1")
+    agent = agents.get(phase)
+    if agent is None:
+        agent = agents[phase] = factory(phase)
+    handoffs.drain()
+    started = time.perf_counter()
+    artifacts = runner(agent, job)
+    return {
+        "artifacts": artifacts,
+        "handoffs": [event.to_entry() for event in handoffs.drain()],
+        "duration_s": round(time.perf_counter() - started, 6),
+    }
+
+
+def worker_loop(
+    stage: str,
+    queue_path: Path | str,
+    *,
+    worker: str,
+    stop: Optional[Any] = None,
+    poll_interval: float = 0.05,
+) -> int:
+    """Claim and process ``stage`` jobs until ``stop`` is set (or the queue is drained when ``stop`` is None)."""
+    queue = JobQueue(queue_path)
+    handoffs = subscribe_handoffs(from_agent=stage)
+    agents: dict[str, Any] = {}
+    processed = 0
+    try:
+        while True:
+            job = queue.claim(stage, worker)
+            if job is None:
+                if stop is None or stop.is_set():
+                    return processed
+                time.sleep(poll_interval)
+                continue
+            try:
+                result = process_job(job, agents, handoffs)
+            except Exception:
+                queue.fail(job.id, traceback.format_exc())
+            else:
+                queue.complete(job.id, result)
+            processed += 1
+    finally:
+        handoffs.close()
+        queue.close()
+
+
+class WorkerPool:
+    """Start per-stage worker processes and run them until the queue drains.
+
+    A worker process that exits while the pool is running is replaced, and the
+    job it held is returned to the queue. A job whose worker has died
+    ``max_crashes`` times is marked failed instead, so one poisonous scenario
+    cannot keep the pool busy forever. Once every worker of a stage has been
+    given up on, that stage's pending jobs are failed as well.
+
+    Only one pool may run per queue: ``run`` holds an exclusive lock on
+    ``<queue>.lock`` (inherited by its workers), because it returns jobs left
+    'running' by an earlier pool to the queue when it starts.
+    """
+
+    def __init__(
+        self,
+        queue_path: Path | str = DEFAULT_QUEUE_PATH,
+        *,
+        concurrency: Optional[Mapping[str, int]] = None,
+        poll_interval: float = 0.05,
+        max_crashes: int = 3,
+    ) -> None:
+        self.queue_path = Path(queue_path)
+        self.lock_path = self.queue_path.with_name(self.queue_path.name + ".lock")
+        self.concurrency = {stage: 1 for stage in STAGES}
+        for stage, count in (concurrency or {}).items():
+            if stage not in self.concurrency:
+                raise ValueError(f"Unknown stage '{stage}'. Expected one of {STAGES}.")
+            if count < 1:
+                raise ValueError(f"Concurrency for '{stage}' must be at least 1.")
+            self.concurrency[stage] = count
+        self.poll_interval = poll_interval
+        if max_crashes < 1:
+            raise ValueError("max_crashes must be at least 1.")
+        self.max_crashes = max_crashes
+
+    def _spawn(self, context: Any, stop: Any, stage: str, worker: str) -> Any:
+        process = context.Process(
+            target=worker_loop,
+            args=(stage, str(self.queue_path)),
+            kwargs={"worker": worker, "stop": stop, "poll_interval": self.poll_interval},
+            name=worker,
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def _recover(self, queue: JobQueue, worker: str, exitcode: Optional[int], crashes: Counter[Any]) -> bool:
+        """Requeue (or, past ``max_crashes``, fail) the jobs a dead ``worker`` left 'running'.
+
+        Returns whether the worker should be restarted: one that keeps dying
+        without holding a job (e.g. it cannot start) is given up on.
+        """
+        job_ids = queue.running(worker)
+        for job_id in job_ids:
+            crashes[job_id] += 1
+            if crashes[job_id] >= self.max_crashes:
+                queue.fail(job_id, f"Worker {worker} exited with code {exitcode} {crashes[job_id]} times.")
+            else:
+                queue.requeue(job_id)
+        if job_ids:
+            return True
+        crashes[worker] += 1
+        return crashes[worker] < self.max_crashes
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a") as handle:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    raise RuntimeError(f"Another worker pool is already running on {self.queue_path}.") from None
+            yield  # closing the file releases the lock
+
+    def run(self, *, serve: bool = False) -> dict[str, int]:
+        """Process queued jobs; return final status counts. ``serve`` keeps workers up until interrupted.
+
+        Raises ``RuntimeError`` when another pool is already running on the queue.
+        """
+        with self._exclusive():
+            return self._run(serve)
+
+    def _run(self, serve: bool) -> dict[str, int]:
+        queue = JobQueue(self.queue_path)
+        queue.requeue_running()
+        context = multiprocessing.get_context()
+        stop = context.Event()
+        workers = {
+            f"{stage}-{index}": stage for stage, count in self.concurrency.items() for index in range(count)
+        }
+        processes = {worker: self._spawn(context, stop, stage, worker) for worker, stage in workers.items()}
+        crashes: Counter[Any] = Counter()
+        abandoned: set[str] = set()
+        try:
+            while True:
+                for worker, process in list(processes.items()):
+                    if process.is_alive():
+                        continue
+                    process.join()
+                    if self._recover(queue, worker, process.exitcode, crashes):
+                        processes[worker] = self._spawn(context, stop, workers[worker], worker)
+                    else:
+                        del processes[worker]
+                abandoned.update(set(self.concurrency) - {workers[worker] for worker in processes})
+                for stage in abandoned:
+                    queue.fail_pending(stage, f"No '{stage}' worker could be kept running.")
+                if not processes or not (serve or queue.outstanding()):
+                    break
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
+            for process in processes.values():
+                process.join()
+        counts = queue.counts()
+        queue.close()
+        return counts
+
+
+def _parse_concurrency(values: Sequence[str]) -> dict[str, int]:
+    concurrency: dict[str, int] = {}
+    for value in values:
+        stage, _, count = value.partition("=")
+        if not count.isdigit():
+            raise argparse.ArgumentTypeError(f"Invalid concurrency '{value}'. Use <stage>=<workers>.")
+        concurrency[stage] = int(count)
+    return concurrency
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Agent worker pool with a durable scenario job queue.")
+    parser.add_argument("--queue", type=Path, default=DEFAULT_QUEUE_PATH, help=f"Queue database (default: {DEFAULT_QUEUE_PATH}).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit = subparsers.add_parser("submit", help="Enqueue a scenario for all agent stages.")
+    submit.add_argument("--scenario", type=Path, help="Scenario JSON file (default: Phase 1 orchestrator scenario).")
+    submit.add_argument("--scenario-id", help="Explicit scenario identifier.")
+    submit.add_argument("--output-dir", type=Path, help="Directory for generated documents (must sit inside the project).")
+
+    run = subparsers.add_parser("run", help="Start workers and process queued jobs.")
+    run.add_argument(
+        "--concurrency",
+        action="append",
+        default=[],
+        help="Per-stage worker count, e.g. designer=2 (repeatable; default 1 per stage).",
+    )
+    run.add_argument("--serve", action="store_true", help="Keep workers running until interrupted.")
+
+    status = subparsers.add_parser("status", help="Show queue counts or a scenario's stage results.")
+    status.add_argument("--scenario-id", help="Scenario to show in detail.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "submit":
+        if args.scenario:
+            scenario = json.loads(args.scenario.read_text(encoding="utf-8"))
+        else:
+            from pipelines.phase1_orchestrator import SCENARIO
+
+            scenario = dict(SCENARIO)
+        queue = JobQueue(args.queue)
+        scenario_id = queue.submit(scenario, scenario_id=args.scenario_id, output_dir=args.output_dir)
+        queue.close()
+        print(scenario_id)
+        return 0
+
+    if args.command == "run":
+        try:
+            concurrency = _parse_concurrency(args.concurrency)
+            counts = WorkerPool(args.queue, concurrency=concurrency).run(serve=args.serve)
+        except (argparse.ArgumentTypeError, ValueError) as exc:
+            parser.error(str(exc))
+        except RuntimeError as exc:
+            print(f"worker_pool: {exc}", file=sys.stderr)
+            return 1
+        print(json.dumps(counts, indent=2, sort_keys=True))
+        return 0 if not counts.get("failed") else 2
+
+    if args.command == "status":
+        queue = JobQueue(args.queue)
+        payload: Any = queue.scenario(args.scenario_id) if args.scenario_id else queue.counts()
+        queue.close()
+        print(json.dumps(payload, indent=2, sort_keys=True))
+        return 0
+
+    parser.error("Unknown command.")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
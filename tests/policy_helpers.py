@@ -0,0 +1,37 @@
+"""Shared fixtures for the QA policy tests (not collected as a test module)."""
+
+from typing import Mapping, Optional, Sequence
+
+
+def make_policy(*gates: dict) -> dict:
+    """A minimal phase 1 policy document holding ``gates``."""
+    return {
+        "policy": {
+            "phase": "1",
+            "coverage_threshold": 0.8,
+            "reproducibility_threshold": 0.95,
+            "gates": list(gates),
+        },
+        "notifications": {"on_failure": ["raise_concern"]},
+    }
+
+
+class History:
+    """In-memory ``BaselineProvider``: recent samples per metric, baselines per change."""
+
+    def __init__(
+        self,
+        recent: Optional[Mapping[str, Sequence[float]]] = None,
+        *,
+        baselines: Optional[Mapping[Optional[str], float]] = None,
+    ) -> None:
+        self.values = dict(recent or {})
+        self.baselines = dict(baselines or {})
+        self.calls = 0
+
+    def recent(self, metric: str, window: int) -> list:
+        self.calls += 1
+        return list(self.values.get(metric, []))[-window:]
+
+    def baseline(self, metric: str, window: int, *, change_id: Optional[str] = None) -> Optional[float]:
+        return self.baselines.get(change_id)
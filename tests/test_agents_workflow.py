@@ -77,7 +77,6 @@ class ProjectManagerIntegrationTest(_BaseAgentTest):
             pm_module,
             PROJECT_ROOT=self.root,
             DOCS_DIR=self.docs_dir,
-            REQUIREMENTS_PATH=requirements_path,
             OVERVIEW_PATH=self.docs_dir / "PROJECT_OVERVIEW.md",
             DETAIL_PATH=self.docs_dir / "PROJECT_DETAIL.md",
         )
@@ -92,6 +91,7 @@ class ProjectManagerIntegrationTest(_BaseAgentTest):
         self.assertIn("# Project Overview", overview_content)
         self.assertIn("Phase:", overview_content)
         self.assertIn("FR-01", detail_content)
+        self.assertIn("Status docs", detail_content)  # read from the patched PROJECT_ROOT/docs
 
         entries = self._load_handoff_entries()
         self.assertEqual(len(entries), 1)
@@ -229,7 +229,6 @@ class Phase1OrchestratorIntegrationTest(_BaseAgentTest):
             pm_module,
             PROJECT_ROOT=self.root,
             DOCS_DIR=self.docs_dir,
-            REQUIREMENTS_PATH=requirements_path,
             OVERVIEW_PATH=self.docs_dir / "PROJECT_OVERVIEW.md",
             DETAIL_PATH=self.docs_dir / "PROJECT_DETAIL.md",
         )
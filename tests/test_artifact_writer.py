@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from pipelines import artifact_writer
+
+
+class ArtifactWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.writer = artifact_writer.ArtifactWriter()
+
+    def test_stamp_only_changes_are_skipped(self) -> None:
+        """TC-FR06-003: Rewrites differing only in auto-generated stamps leave files untouched."""
+        target = self.root / "docs" / "PLAN.md"
+        first = "# Plan\n\n_Auto-generated by Implementer.create_execution_plan at 2025-11-02 10:00:00Z._\n"
+        second = first.replace("10:00:00Z", "11:30:00Z")
+
+        self.assertTrue(self.writer.write_text(target, first).written)
+        result = self.writer.write_text(target, second)
+
+        self.assertFalse(result.written)
+        self.assertEqual(target.read_text(encoding="utf-8"), first)
+        self.assertEqual(self.writer.stats.written, 1)
+        self.assertEqual(self.writer.stats.skipped, 1)
+        self.assertEqual(self.writer.stats.bytes_skipped, len(second.encode("utf-8")))
+
+    def test_json_timestamp_fields_are_volatile(self) -> None:
+        """TC-FR06-003: JSON timestamp fields do not force rewrites."""
+        target = self.root / "snapshot.json"
+        self.writer.write_text(target, '{\n  "entries": [],\n  "timestamp": "2025-11-02T00:00:00+00:00"\n}')
+        result = self.writer.write_text(target, '{\n  "entries": [],\n  "timestamp": "2025-11-03T00:00:00+00:00"\n}')
+        self.assertFalse(result.written)
+
+    def test_nested_timestamp_changes_are_written(self) -> None:
+        """TC-FR06-003: Only the top-level stamp is volatile; nested record timestamps are content."""
+        target = self.root / "snapshot.json"
+        template = '{\n  "entries": [\n    {\n      "timestamp": "%s"\n    }\n  ],\n  "timestamp": "%s"\n}'
+        self.writer.write_text(target, template % ("2025-11-02T00:00:00Z", "2025-11-02T00:00:00Z"))
+        self.assertFalse(self.writer.write_text(target, template % ("2025-11-02T00:00:00Z", "2025-11-03T00:00:00Z")).written)
+        self.assertTrue(self.writer.write_text(target, template % ("2025-11-04T00:00:00Z", "2025-11-03T00:00:00Z")).written)
+
+    def test_content_changes_replace_file_atomically(self) -> None:
+        """TC-FR06-003: Real changes are written via temp file and rename without leftovers."""
+        target = self.root / "PLAN.md"
+        self.writer.write_text(target, "# Plan\n- a\n")
+        with self.writer.open(target) as handle:
+            handle.write("# Plan\n- b\n")
+
+        self.assertEqual(target.read_text(encoding="utf-8"), "# Plan\n- b\n")
+        self.assertEqual(self.writer.stats.written, 2)
+        self.assertEqual(sorted(path.name for path in self.root.iterdir()), ["PLAN.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import blob_store, retention
+
+TEST_PLAN = "# Test Plan\n\n- TC-FR27-001\n" * 50
+
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.runs_root = self.root / "work"
+        self.store = blob_store.BlobStore(self.root / "store")
+
+    def make_run(self, run_id: str, unique: str) -> Path:
+        run_dir = self.runs_root / "CH-002" / run_id
+        (run_dir / "docs").mkdir(parents=True)
+        (run_dir / "docs" / "TEST_PLAN.md").write_text(TEST_PLAN, encoding="utf-8")
+        (run_dir / "manifest.json").write_text(json.dumps({"run_id": run_id, "notes": unique}), encoding="utf-8")
+        return run_dir
+
+    def expire(self, run_dir: Path) -> None:
+        stamp = time.time() - 72 * 3600
+        for path in sorted(run_dir.rglob("*"), reverse=True):
+            os.utime(path, (stamp, stamp))
+        os.utime(run_dir, (stamp, stamp))
+
+    def test_ingest_deduplicates_across_runs_with_hard_links(self) -> None:
+        """TC-FR27-002: Identical files across runs are stored once."""
+        first = self.make_run("run-01", "a")
+        second = self.make_run("run-02", "b")
+
+        stats_first = self.store.ingest_run(first)
+        stats_second = self.store.ingest_run(second)
+
+        self.assertEqual(stats_first.new_blobs, 2)
+        self.assertEqual(stats_second.new_blobs, 1)
+        self.assertEqual(stats_second.deduplicated_bytes, len(TEST_PLAN))
+        self.assertEqual(self.store.usage()["blobs"], 3)
+
+        plan_a, plan_b = first / "docs" / "TEST_PLAN.md", second / "docs" / "TEST_PLAN.md"
+        self.assertTrue(os.path.samefile(plan_a, plan_b))
+        manifest = blob_store.read_manifest(second)
+        self.assertEqual(set(manifest), {"docs/TEST_PLAN.md", "manifest.json"})
+        self.assertTrue(os.path.samefile(self.store.path_for(manifest["docs/TEST_PLAN.md"]), plan_b))
+        self.assertEqual(plan_b.read_text(encoding="utf-8"), TEST_PLAN)
+
+        # Re-ingesting is a no-op.
+        self.assertEqual(self.store.ingest_run(second).new_blobs, 0)
+
+    def test_snapshot_and_pointer_runs_are_metadata_operations(self) -> None:
+        """TC-FR27-002: Snapshots and pointer runs link blobs instead of copying."""
+        run_dir = self.make_run("run-01", "a")
+        self.store.ingest_run(run_dir, pointer=True)
+        self.assertFalse((run_dir / "docs" / "TEST_PLAN.md").exists())
+        self.assertTrue((run_dir / "manifest.json").exists())
+
+        copy = self.root / "snapshot"
+        self.assertEqual(self.store.snapshot_run(run_dir, copy), 2)
+        digest = blob_store.read_manifest(copy)["docs/TEST_PLAN.md"]
+        self.assertTrue(os.path.samefile(copy / "docs" / "TEST_PLAN.md", self.store.path_for(digest)))
+
+        self.assertEqual(self.store.materialize(run_dir), 1)
+        self.assertEqual((run_dir / "docs" / "TEST_PLAN.md").read_text(encoding="utf-8"), TEST_PLAN)
+
+    def test_gc_follows_retention_plan(self) -> None:
+        """TC-FR27-002: Blobs referenced only by purged runs are collected."""
+        old = self.make_run("run-01", "old")
+        fresh = self.make_run("run-02", "fresh")
+        self.store.ingest_run(old)
+        self.store.ingest_run(fresh)
+        self.expire(old)
+        old_manifest_blob = self.store.path_for(blob_store.read_manifest(old)["manifest.json"])
+        plan = retention.plan_retention(retention.scan_runs(self.runs_root), now=time.time())
+        self.assertEqual([d.run.run_id for d in plan.purges], ["run-01"])
+
+        dry = retention.execute_plan(plan, dry_run=True, store=self.store, runs_root=self.runs_root)
+        self.assertEqual(dry.store_gc.removed, 1)
+        self.assertTrue(old_manifest_blob.exists())
+
+        result = retention.execute_plan(
+            plan,
+            logger=retention.AuditLogger(root=self.root / "audit"),
+            store=self.store,
+            runs_root=self.runs_root,
+        )
+        self.assertEqual(result.store_gc.removed, 1)
+        self.assertFalse(old_manifest_blob.exists())
+        self.assertEqual((fresh / "docs" / "TEST_PLAN.md").read_text(encoding="utf-8"), TEST_PLAN)
+        self.assertEqual(self.store.usage()["blobs"], 2)
+
+    def test_gc_keeps_blobs_of_runs_that_survive_the_purge(self) -> None:
+        """TC-FR27-002: A pointer run whose archive fails keeps its status and blobs."""
+        run_dir = self.make_run("run-01", "a")
+        manifest = json.loads((run_dir / "manifest.json").read_text(encoding="utf-8"))
+        (run_dir / "manifest.json").write_text(json.dumps({**manifest, "status": "success"}), encoding="utf-8")
+        self.store.ingest_run(run_dir, pointer=True)
+        self.expire(run_dir)
+        runs = retention.scan_runs(self.runs_root)
+        self.assertEqual([run.status for run in runs], ["success"])
+        plan = retention.plan_retention(runs, now=time.time())
+        self.assertEqual([d.reason for d in plan.purges], ["age"])
+
+        blocked = self.root / "archive"
+        blocked.write_text("not a directory", encoding="utf-8")
+        result = retention.execute_plan(
+            plan,
+            logger=retention.AuditLogger(root=self.root / "audit"),
+            store=self.store,
+            runs_root=self.runs_root,
+            archiver=retention.RunArchiver(blocked),
+        )
+        self.assertIn(str(run_dir), result.errors)
+        self.assertEqual(result.purged, [])
+        self.assertEqual(result.store_gc.removed, 0)
+        self.assertEqual(self.store.materialize(run_dir), 1)
+        self.assertEqual((run_dir / "docs" / "TEST_PLAN.md").read_text(encoding="utf-8"), TEST_PLAN)
+
+    def test_cli_ingest_and_stats(self) -> None:
+        """TC-FR27-002: CLI reports deduplicated bytes."""
+        runs = [self.make_run("run-01", "a"), self.make_run("run-02", "b")]
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            exit_code = blob_store.main(["--store", str(self.store.root), "ingest", *map(str, runs)])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(json.loads(buffer.getvalue())["deduplicated_bytes"], len(TEST_PLAN))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import checksums
+
+OLD = time.time() - 3600
+
+
+def write(path: Path, content: bytes, *, mtime: float = OLD) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestChecksums(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.cache = self.root / "cache.sqlite"
+
+    def test_cache_skips_unchanged_files_and_detects_changes(self) -> None:
+        """TC-FR06-001: Re-validating unchanged files reuses cached digests."""
+        a = write(self.root / "tree" / "a.txt", b"alpha")
+        b = write(self.root / "tree" / "b.txt", b"beta")
+        with checksums.Checksummer(self.cache) as checksummer:
+            first = checksummer.hash_paths([a, b])
+        self.assertEqual(first[str(a)], hashlib.sha256(b"alpha").hexdigest())
+
+        write(b, b"BETA", mtime=OLD + 5)
+        with checksums.Checksummer(self.cache) as checksummer:
+            second = checksummer.hash_paths([a, b])
+            self.assertEqual((checksummer.stats.cache_hits, checksummer.stats.hashed), (1, 1))
+        self.assertEqual(second[str(b)], hashlib.sha256(b"BETA").hexdigest())
+
+    def test_recently_modified_files_are_not_cached(self) -> None:
+        """TC-FR06-001: Files inside the racy window are always re-hashed."""
+        fresh = write(self.root / "fresh.txt", b"now", mtime=time.time())
+        with checksums.Checksummer(self.cache) as checksummer:
+            checksummer.hash_paths([fresh])
+            checksummer.hash_paths([fresh])
+            self.assertEqual(checksummer.stats.cache_hits, 0)
+
+    def test_large_files_hash_via_mmap(self) -> None:
+        """TC-FR06-001: mmap and chunked reads produce identical digests."""
+        data = os.urandom(4096) * 8
+        path = write(self.root / "big.bin", data)
+        with mock.patch.object(checksums, "MMAP_THRESHOLD", 1024):
+            self.assertEqual(checksums.sha256_file(path), hashlib.sha256(data).hexdigest())
+
+    def test_tree_digest_is_merkle_style(self) -> None:
+        """TC-FR06-001: Directory digests depend on contents and propagate changes upward."""
+        for tree in ("one", "two"):
+            write(self.root / tree / "run-01" / "manifest.json", b"{}")
+            write(self.root / tree / "run-01" / "logs" / "01.log", b"ok\n")
+            write(self.root / tree / "run-02" / "manifest.json", b"{}")
+
+        with checksums.Checksummer(None) as checksummer:
+            one = checksummer.tree_digest(self.root / "one")
+            two = checksummer.tree_digest(self.root / "two")
+            self.assertEqual(one.digest, two.digest)
+            self.assertEqual(len(one.directories), 4)
+
+            write(self.root / "two" / "run-01" / "logs" / "01.log", b"changed\n")
+            changed = checksummer.tree_digest(self.root / "two")
+        self.assertNotEqual(changed.digest, one.digest)
+        self.assertNotEqual(changed.directories[str(self.root / "two" / "run-01")], one.directories[str(self.root / "one" / "run-01")])
+        self.assertEqual(changed.directories[str(self.root / "two" / "run-02")], one.directories[str(self.root / "one" / "run-02")])
+
+    def test_cli_checks_sha256sum_files(self) -> None:
+        """TC-FR06-001: --check verifies sha256sum-format evidence files."""
+        content = b"{}\n"
+        target = write(self.root / "handoff.jsonl", content)
+        listing = self.root / "demo_checksum.txt"
+        listing.write_text(f"{hashlib.sha256(content).hexdigest()}  {target}\n", encoding="utf-8")
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            self.assertEqual(checksums.main(["--check", str(listing), "--cache", str(self.cache)]), 0)
+        self.assertEqual(buffer.getvalue(), f"{target}: OK\n")
+
+        write(target, b"tampered\n")
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(checksums.main(["--check", str(listing), "--no-cache"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
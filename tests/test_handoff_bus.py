@@ -0,0 +1,60 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from audit import AuditLogger, HandoffBus
+
+
+class TestHandoffBus(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.bus = HandoffBus()
+        self.logger = AuditLogger(root=Path(self.tmp_dir.name), bus=self.bus)
+
+    def _handoff(self, from_agent: str, to_agent: str, phase: str = "1") -> dict:
+        return self.logger.log_handoff(
+            phase=phase,
+            from_agent=from_agent,
+            to_agent=to_agent,
+            summary=f"{from_agent} -> {to_agent}",
+            artifacts=["docs/PHASE_BRIEF.md"],
+            metadata={"scenario": "bus-test"},
+        )
+
+    def test_subscribers_receive_matching_events_after_durable_write(self) -> None:
+        """TC-FR06-004: Subscribers see handoff events only after they are logged."""
+        to_designer = self.bus.subscribe(to_agent="designer")
+        from_designer = self.bus.subscribe(from_agent="designer", phase="1")
+        everything = self.bus.subscribe()
+
+        first = self._handoff("project_manager", "designer")
+        self._handoff("designer", "implementer")
+        self._handoff("designer", "implementer", phase="2")
+
+        events = to_designer.drain()
+        self.assertEqual([event.to_entry() for event in events], [first])
+        self.assertEqual([(e.from_agent, e.phase) for e in from_designer.drain()], [("designer", "1")])
+        self.assertEqual(len(everything.drain()), 3)
+
+        logged = [json.loads(line) for line in self.logger.handoff_path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(len(logged), 3)
+        self.assertEqual(logged[0], first)
+
+    def test_full_queue_drops_without_blocking_and_close_unsubscribes(self) -> None:
+        """TC-FR06-004: Slow subscribers drop events instead of blocking the logger."""
+        subscription = self.bus.subscribe(to_agent="tester", maxsize=1)
+        self._handoff("implementer", "tester")
+        self._handoff("implementer", "tester")
+        self.assertEqual(subscription.pending(), 1)
+        self.assertEqual(subscription.dropped, 1)
+
+        subscription.close()
+        self.assertFalse(self.bus.has_subscribers)
+        self._handoff("implementer", "tester")
+        self.assertEqual(subscription.pending(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
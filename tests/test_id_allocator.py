@@ -0,0 +1,116 @@
+import io
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import id_allocator
+from pipelines.id_allocator import IdAllocator
+from pipelines.manifest_index import ManifestIndex
+
+
+def _allocate_runs(args: tuple[str, str, int]) -> list[str]:
+    db_path, work_root, rounds = args
+    with IdAllocator(db_path, work_root=work_root) as allocator:
+        return [allocator.allocate_run("CH-002") for _ in range(rounds)]
+
+
+class TestIdAllocator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.db_path = self.root / "ids.sqlite"
+        self.changes_root = self.root / "changes"
+        self.work_root = self.root / "work"
+
+    def allocator(self) -> IdAllocator:
+        allocator = IdAllocator(self.db_path, changes_root=self.changes_root, work_root=self.work_root)
+        self.addCleanup(allocator.close)
+        return allocator
+
+    def test_seeds_from_existing_directories_and_reserves(self) -> None:
+        """TC-FR27-004: Allocation continues after hand-made ids and reserves the directories."""
+        for name in ("CH-001", "CH-002"):
+            (self.changes_root / name).mkdir(parents=True)
+        (self.work_root / "CH-002" / "run-07").mkdir(parents=True)
+        allocator = self.allocator()
+
+        self.assertEqual(allocator.allocate_change(), "CH-003")
+        self.assertTrue((self.changes_root / "CH-003").is_dir())
+        self.assertEqual(allocator.allocate_runs("CH-002", count=3), ["run-08", "run-09", "run-10"])
+        self.assertEqual(allocator.allocate_run("CH-004"), "run-01")
+
+    def test_skips_directories_created_outside_the_allocator(self) -> None:
+        """TC-FR27-004: A directory made by hand after seeding is never handed out."""
+        allocator = self.allocator()
+        self.assertEqual(allocator.allocate_run("CH-002"), "run-01")
+        (self.work_root / "CH-002" / "run-02").mkdir()
+        self.assertEqual(allocator.allocate_run("CH-002"), "run-03")
+
+    def test_seeds_past_archived_and_indexed_runs(self) -> None:
+        """TC-FR27-004: A lost database never re-issues ids of runs that retention removed."""
+        index_path = self.root / "manifest_index.sqlite"
+        (self.root / "archive" / "CH-002").mkdir(parents=True)
+        (self.root / "archive" / "CH-002" / "run-05.tar.gz").write_bytes(b"")
+        (self.root / "archive" / "CH-009").mkdir()
+        run_dir = self.work_root / "CH-003" / "run-04"
+        run_dir.mkdir(parents=True)
+        (run_dir / "manifest.json").write_text('{"change_id": "CH-003", "run_id": "run-04"}', encoding="utf-8")
+        with ManifestIndex(index_path, work_root=self.work_root) as index:
+            index.refresh()
+        shutil.rmtree(run_dir)
+
+        allocator = IdAllocator(self.db_path, changes_root=self.changes_root, work_root=self.work_root, index_path=index_path)
+        self.addCleanup(allocator.close)
+        self.assertEqual(allocator.allocate_run("CH-002"), "run-06")
+        self.assertEqual(allocator.allocate_run("CH-003"), "run-05")
+        self.assertEqual(allocator.allocate_change(), "CH-010")
+
+    def test_counter_survives_reopen_and_rejects_bad_count(self) -> None:
+        """TC-FR27-004: Counters persist across allocator instances."""
+        self.allocator().allocate_runs("CH-002", count=2)
+        self.assertEqual(self.allocator().allocate_run("CH-002"), "run-03")
+        with self.assertRaises(ValueError):
+            self.allocator().allocate_runs("CH-002", count=0)
+
+    def test_concurrent_threads_and_processes_never_collide(self) -> None:
+        """TC-FR27-004: Parallel executors receive unique, gap-free run ids."""
+        shared = self.allocator()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            threaded = list(pool.map(lambda _: shared.allocate_run("CH-002"), range(80)))
+        with multiprocessing.get_context("spawn").Pool(4) as pool:
+            batches = pool.map(_allocate_runs, [(str(self.db_path), str(self.work_root), 30)] * 4)
+        allocated = threaded + [run_id for batch in batches for run_id in batch]
+
+        self.assertEqual(len(allocated), len(set(allocated)))
+        self.assertEqual(sorted(allocated, key=id_allocator.sort_key)[-1], "run-200")
+        self.assertEqual(len(list((self.work_root / "CH-002").iterdir())), 200)
+
+    def test_sort_key_orders_numerically(self) -> None:
+        """TC-FR27-004: Run listings order run-99 before run-100."""
+        names = ["run-100", "run-9", "run-10", "CH-002"]
+        self.assertEqual(sorted(names, key=id_allocator.sort_key), ["CH-002", "run-9", "run-10", "run-100"])
+        self.assertEqual(id_allocator.id_number("run-07", "run-"), 7)
+        self.assertIsNone(id_allocator.id_number("run-07.tar.gz", "run-"))
+
+    def test_cli_prints_allocated_ids(self) -> None:
+        """TC-FR27-004: CLI reserves change and run ids."""
+        common = ["--db", str(self.db_path), "--changes-root", str(self.changes_root), "--work-root", str(self.work_root)]
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            id_allocator.main([*common, "change"])
+            id_allocator.main([*common, "run", "CH-001", "--count", "2"])
+        self.assertEqual(buffer.getvalue().split(), ["CH-001", "run-01", "run-02"])
+
+
+if __name__ == "__main__":
+    unittest.main()
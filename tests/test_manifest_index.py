@@ -0,0 +1,85 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import manifest_index
+
+
+class TestManifestIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.work_root = self.root / "work"
+        self.index_path = self.root / "index.sqlite"
+
+    def write_manifest(self, change_id: str, run_id: str, **fields: object) -> Path:
+        path = self.work_root / change_id / run_id / "manifest.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = {"change_id": change_id, "run_id": run_id, **fields}
+        path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        return path
+
+    def test_queries_by_change_stage_output_and_time(self) -> None:
+        """TC-FR06-002: Manifest index answers run lookups without opening manifests."""
+        self.write_manifest("CH-001", "run-01", stage="Execute", task="T-001", timestamp="2025-11-01T10:00:00Z", outputs=["docs/PROJECT_DETAIL.md"])
+        self.write_manifest("CH-002", "run-01", stage="Execute", task="T-001", timestamp="2025-11-02T10:00:00Z", outputs=["docs/PROJECT_DETAIL.md", "tests/TEST_PLAN.md"])
+        self.write_manifest("CH-002", "run-02", stage="Validate", task="T-006", timestamp="2025-11-03T10:00:00Z", outputs=["tests/TEST_RESULTS.md"])
+
+        with manifest_index.ManifestIndex(self.index_path, work_root=self.work_root) as index:
+            self.assertEqual(index.refresh().updated, 3)
+
+            producers = index.query(output="docs/PROJECT_DETAIL.md")
+            self.assertEqual([(e.change_id, e.run_id) for e in producers], [("CH-001", "run-01"), ("CH-002", "run-01")])
+            self.assertEqual(producers[1].outputs, ("docs/PROJECT_DETAIL.md", "tests/TEST_PLAN.md"))
+
+            execute = index.query(change_id="CH-002", stage="execute")
+            self.assertEqual([e.run_id for e in execute], ["run-01"])
+            self.assertEqual([e.run_id for e in index.query(output="tests/*.md")], ["run-01", "run-02"])
+            self.assertEqual([e.change_id for e in index.query(since="2025-11-02", until="2025-11-02T23:59:59Z")], ["CH-002"])
+            self.assertEqual(index.query(task="T-006", include_document=True)[0].document["stage"], "Validate")
+            self.assertEqual(index.stats()["stages"], {"Execute": 2, "Validate": 1})
+
+    def test_refresh_is_incremental_and_drops_deleted_runs(self) -> None:
+        """TC-FR06-002: Only changed manifests are re-read; purged runs disappear."""
+        first = self.write_manifest("CH-002", "run-01", stage="Execute", outputs=["a.md"])
+        second = self.write_manifest("CH-002", "run-02", stage="Execute", outputs=["b.md"])
+
+        with manifest_index.ManifestIndex(self.index_path, work_root=self.work_root) as index:
+            index.refresh()
+            self.assertEqual(index.refresh().as_dict(), {"scanned": 2, "updated": 0, "removed": 0, "invalid": 0})
+
+            self.write_manifest("CH-002", "run-01", stage="Validate", outputs=["c.md", "d.md"])
+            os.utime(first, ns=(0, 10**18))
+            second.unlink()
+            second.parent.rmdir()
+            stats = index.refresh()
+            self.assertEqual((stats.updated, stats.removed), (1, 1))
+            self.assertEqual(index.query(output="a.md"), [])
+            self.assertEqual([e.stage for e in index.query(output="d.md")], ["Validate"])
+            self.assertEqual(index.query(output="b.md"), [])
+
+    def test_cli_query_refreshes_first(self) -> None:
+        """TC-FR06-002: CLI query prints one JSON line per matching run."""
+        self.write_manifest("CH-003", "run-01", stage="Execute", outputs=["docs/X.md"])
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            exit_code = manifest_index.main(
+                ["--index", str(self.index_path), "--work-root", str(self.work_root), "query", "--output", "docs/X.md"]
+            )
+        self.assertEqual(exit_code, 0)
+        [line] = buffer.getvalue().splitlines()
+        self.assertEqual(json.loads(line)["run_id"], "run-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
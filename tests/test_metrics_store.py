@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import policy_parser, qa_policy
+from pipelines.metrics_store import MetricsStore
+from tests.policy_helpers import make_policy
+
+REGRESSION_GATE = {"id": "coverage-regression", "metric": "coverage", "type": "regression", "window": 3, "max_drop": 0.05}
+
+
+class TestMetricsStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.store = MetricsStore(Path(self.tmp_dir.name) / "history.sqlite")
+        self.addCleanup(self.store.close)
+
+    def test_record_is_append_only_and_rolls_up_by_day(self) -> None:
+        """TC-FR11-004: Metric samples are append-only and roll up per day."""
+        self.assertEqual(self.store.record("CH-001", "run-01", {"coverage": 0.8, "tests_passed": True, "note": "x"},
+                                           recorded_at="2025-01-01T10:00:00.000Z"), 2)
+        self.store.record("CH-001", "run-02", {"coverage": 0.9}, recorded_at="2025-01-01T12:00:00.000Z")
+        self.store.record("CH-002", "run-01", {"coverage": 0.7}, recorded_at="2025-01-02T09:00:00.000Z")
+        self.assertEqual(self.store.record("CH-001", "run-01", {"coverage": 0.1}), 0)
+
+        trend = self.store.trend("coverage")
+        self.assertEqual([(point.day, point.count) for point in trend], [("2025-01-01", 2), ("2025-01-02", 1)])
+        self.assertAlmostEqual(trend[0].mean, 0.85)
+        self.assertEqual((trend[0].minimum, trend[0].maximum), (0.8, 0.9))
+        self.assertEqual([point.day for point in self.store.trend("coverage", since="2025-01-02")], ["2025-01-02"])
+        self.assertEqual([point.count for point in self.store.trend("coverage", change_id="CH-001")], [2])
+
+        history = self.store.history("coverage", limit=2)
+        self.assertEqual([sample.run_id for sample in history], ["run-02", "run-01"])
+        self.assertEqual(history[-1].change_id, "CH-002")
+
+    def test_regression_gate_uses_rolling_median(self) -> None:
+        """TC-FR11-004: Regression gates compare against the rolling median."""
+        validated = policy_parser.validate_policy(make_policy(REGRESSION_GATE))
+        compiled = qa_policy.compile_policy(validated)
+
+        skipped = compiled.evaluate({"coverage": 0.5}, self.store)
+        self.assertTrue(skipped["passed"])
+        self.assertEqual(skipped["gates"][0]["status"], "skipped")
+
+        for index, value in enumerate((0.9, 0.6, 0.92, 0.88), start=1):
+            self.store.record("CH-001", f"run-{index:02d}", {"coverage": value},
+                              recorded_at=f"2025-01-0{index}T00:00:00.000Z")
+        self.assertEqual(self.store.baseline("coverage", 3), 0.88)
+
+        result = compiled.evaluate({"coverage": 0.80}, self.store)
+        self.assertFalse(result["passed"])
+        self.assertEqual(result["gates"][0]["baseline"], 0.88)
+        self.assertTrue(compiled.passes({"coverage": 0.85}, self.store))
+
+        invalid = compiled.evaluate({"coverage": "0.8"}, self.store)
+        self.assertFalse(invalid["passed"])
+        self.assertEqual(invalid["gates"][0]["status"], "error")
+        self.assertIn("TypeError", invalid["gates"][0]["message"])
+        self.assertFalse(compiled.passes({"coverage": "0.8"}, self.store))
+
+    def test_regression_baseline_is_scoped_to_the_change(self) -> None:
+        """TC-FR11-004: Regression baselines only use the change's own history."""
+        compiled = qa_policy.compile_policy(policy_parser.validate_policy(make_policy(REGRESSION_GATE)))
+        for index, value in enumerate((0.95, 0.96, 0.97), start=1):
+            self.store.record("CH-001", f"run-{index:02d}", {"coverage": value})
+        for index, value in enumerate((0.70, 0.72), start=1):
+            self.store.record("CH-002", f"run-{index:02d}", {"coverage": value})
+
+        own = compiled.evaluate({"coverage": 0.71}, self.store, change_id="CH-002")
+        self.assertTrue(own["passed"])
+        self.assertEqual(own["gates"][0]["baseline"], 0.71)
+        self.assertFalse(compiled.passes({"coverage": 0.71}, self.store, change_id="CH-001"))
+        fresh = compiled.evaluate({"coverage": 0.5}, self.store, change_id="CH-003")
+        self.assertEqual(fresh["gates"][0]["status"], "skipped")
+
+    def test_validate_policy_checks_regression_fields(self) -> None:
+        """TC-FR11-004: Policy validation checks regression gate fields."""
+        with self.assertRaises(policy_parser.PolicyValidationError):
+            policy_parser.validate_policy(make_policy(dict(REGRESSION_GATE, window=0)))
+        with self.assertRaises(policy_parser.PolicyValidationError):
+            policy_parser.validate_policy(make_policy({"id": "x", "metric": "coverage", "type": "trend"}))
+        summary = policy_parser.render_summary(policy_parser.validate_policy(make_policy(REGRESSION_GATE)))
+        self.assertIn("coverage drop <= 0.05 vs median of last 3 runs", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import concern_tools, qa_enforcer
+from pipelines.notifications import FailureEvent, NotificationDispatcher, WebhookSink
+
+
+def _event(change_id: str = "CH-001", gate_id: str = "coverage") -> FailureEvent:
+    return FailureEvent(change_id=change_id, gate_id=gate_id, phase="1", message="too low")
+
+
+class TestNotificationDispatcher(unittest.TestCase):
+    def test_batches_retries_and_deduplicates_without_blocking_submit(self) -> None:
+        """TC-FR11-007: Notifications are batched, retried and deduplicated in the background."""
+        calls = []
+        release = threading.Event()
+
+        def flaky(events):
+            release.wait(5)
+            calls.append([event.gate_id for event in events])
+            if len(calls) < 3:
+                raise ConnectionError("target unavailable")
+
+        dispatcher = NotificationDispatcher({"notify_human": flaky}, backoff=0.01, flush_interval=0.01)
+        started = time.perf_counter()
+        for gate_id in ("a", "b", "c"):
+            self.assertEqual(dispatcher.submit(_event(gate_id=gate_id)), 1)
+        self.assertEqual(dispatcher.submit(_event(gate_id="a")), 0)
+        self.assertEqual(dispatcher.submit(_event(gate_id="a"), ["unknown"]), 0)
+        self.assertLess(time.perf_counter() - started, 0.5)  # the handler is still blocked
+
+        release.set()
+        stats = dispatcher.close(timeout=5)
+        self.assertEqual(stats.delivered, 3)
+        self.assertEqual(stats.deduplicated, 1)
+        self.assertEqual(stats.pending, 0)
+        self.assertGreaterEqual(stats.retried, 3)
+        self.assertEqual(calls[-1], ["a", "b", "c"])
+
+        def broken(events):
+            raise RuntimeError("boom")
+
+        failing = NotificationDispatcher({"raise_concern": broken}, backoff=0.01, max_attempts=2)
+        failing.submit(_event())
+        stats = failing.close(timeout=5)
+        self.assertEqual((stats.delivered, stats.failed), (0, 1))
+        self.assertEqual(stats.errors, ["raise_concern: boom"])
+
+
+class TestEnforcerNotifications(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.policy = self.root / "QA_POLICY.yaml"
+        self.policy.write_text(
+            "policy:\n"
+            "  phase: \"1\"\n"
+            "  coverage_threshold: 0.8\n"
+            "  reproducibility_threshold: 0.95\n"
+            "  gates:\n"
+            "    - {id: coverage, metric: coverage, operator: \">=\", target: 0.8}\n"
+            "notifications:\n"
+            "  on_failure: [raise_concern, notify_human]\n"
+            "  discord_channel: \"#qa-alerts\"\n",
+            encoding="utf-8",
+        )
+        self.metrics = self.root / "CH-009" / "run-01" / "qa_metrics.json"
+        self.metrics.parent.mkdir(parents=True)
+        self.metrics.write_text(json.dumps({"coverage": 0.5}), encoding="utf-8")
+        self.audit_root = self.root / "audit"
+
+    def enforce(self, sink: WebhookSink, *extra: str) -> int:
+        argv = [
+            "--policy", str(self.policy),
+            "--metrics", str(self.metrics),
+            "--change-id", "CH-009",
+            "--output", str(self.root / "qa_report.json"),
+            "--audit-root", str(self.audit_root),
+            "--notify-webhook", sink.url,
+            *extra,
+        ]
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            return qa_enforcer.main(argv)
+
+    def test_failures_raise_one_concern_and_post_to_webhook(self) -> None:
+        """TC-FR11-007: A failed QA run raises one concern and posts to the webhook."""
+        with WebhookSink(fail_first=1) as sink:
+            self.assertEqual(self.enforce(sink), 2)
+            self.assertEqual(self.enforce(sink), 2)
+            self.assertEqual(self.enforce(sink, "--dry-run"), 0)
+
+        concerns = concern_tools.load_concerns(audit_root=self.audit_root)
+        self.assertEqual(len(concerns), 1)
+        self.assertEqual(concerns[0]["metadata"]["gate_id"], "coverage")
+        self.assertEqual(concerns[0]["metadata"]["run_id"], "run-01")
+
+        self.assertEqual(sink.requests, 3)  # one 503 + retry, then the second run
+        self.assertEqual(len(sink.payloads), 2)
+        self.assertEqual(sink.payloads[0]["channel"], "#qa-alerts")
+        self.assertEqual([event["gate_id"] for event in sink.payloads[0]["events"]], ["coverage"])
+
+
+if __name__ == "__main__":
+    unittest.main()
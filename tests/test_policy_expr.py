@@ -0,0 +1,119 @@
+import gc
+import unittest
+import weakref
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import policy_parser, qa_enforcer, qa_policy
+from pipelines.policy_expr import EvalContext, ExpressionError, parse_expression
+from tests.policy_helpers import History, make_policy
+
+
+class TestPolicyExpressions(unittest.TestCase):
+    def test_parse_type_checks_and_short_circuits(self) -> None:
+        """TC-FR11-005: Gate expressions are type-checked and short-circuit."""
+        node = parse_expression("coverage >= 0.8 or missing_metric > 1")
+        self.assertTrue(EvalContext({"coverage": 0.9}).value(node))
+
+        invalid = (
+            "coverage + 1",
+            "coverage >= true",
+            "a and 1",
+            "mean(coverage, 0) > 1",
+            "p99(x, 3) > 1",
+            "a < b < c",
+            "coverage",
+            "not coverage",
+            "coverage and reproducibility",
+            "coverage == true",
+        )
+        for source in invalid:
+            with self.subTest(source=source):
+                with self.assertRaises(ExpressionError):
+                    parse_expression(source)
+
+    def test_shared_subexpressions_are_evaluated_once(self) -> None:
+        """TC-FR11-005: Shared subexpressions are evaluated once per run."""
+        first = parse_expression("mean(coverage, 3) >= 0.8 and coverage >= 0.7")
+        second = parse_expression("mean(coverage, 3) >= 0.8 or reproducibility >= 0.99")
+        self.assertIs(first.operands[0], second.operands[0])
+
+        validated = policy_parser.validate_policy(
+            make_policy(
+                {"id": "trend", "expr": "mean(coverage, 3) >= 0.8 and coverage >= 0.7"},
+                {"id": "trend-or-repro", "expr": "mean(coverage, 3) >= 0.8 or reproducibility >= 0.99"},
+                {"id": "p95", "expr": "p95(coverage, 10) - coverage < 0.2"},
+            )
+        )
+        compiled = qa_policy.compile_policy(validated)
+        history = History({"coverage": [0.7, 0.85, 0.9, 0.95]})
+
+        evaluation = compiled.evaluate({"coverage": 0.75}, history)
+        self.assertTrue(evaluation["passed"], evaluation)
+        self.assertEqual(history.calls, 2)  # mean(coverage, 3) once, p95(coverage, 10) once
+        self.assertEqual(evaluation["gates"][0]["actual"], {"coverage": 0.75})
+
+        skipped = compiled.evaluate({"coverage": 0.75})
+        self.assertEqual([gate["status"] for gate in skipped["gates"]], ["skipped", "skipped", "skipped"])
+        missing = compiled.evaluate({}, history)
+        self.assertEqual(missing["gates"][0]["status"], "missing")
+
+    def test_interned_nodes_are_released_when_unused(self) -> None:
+        """TC-FR11-005: Interned nodes are dropped once no parsed expression uses them."""
+        kept = parse_expression("mean(latency_ms, 5) <= 250 and errors == 0")
+        released = weakref.ref(parse_expression("mean(latency_ms, 5) <= 250 or errors > 1"))
+        parse_expression.cache_clear()
+        gc.collect()
+
+        self.assertIsNone(released())
+        reparsed = parse_expression("mean(latency_ms, 5) <= 250 or errors > 1")
+        self.assertIs(reparsed.operands[0], kept.operands[0])
+
+    def test_runtime_errors_fail_the_gate_instead_of_raising(self) -> None:
+        """TC-FR11-005: Expression runtime errors mark the gate as errored."""
+        validated = policy_parser.validate_policy(
+            make_policy(
+                {"id": "failure-rate", "expr": "tests_failed / tests_total <= 0.1"},
+                {"id": "coverage", "metric": "coverage", "operator": ">=", "target": 0.8},
+            )
+        )
+        compiled = qa_policy.compile_policy(validated)
+
+        evaluation = compiled.evaluate({"tests_failed": 0, "tests_total": 0, "coverage": "high"})
+        self.assertFalse(evaluation["passed"])
+        self.assertEqual([gate["status"] for gate in evaluation["gates"]], ["error", "error"])
+        self.assertIn("ZeroDivisionError", evaluation["gates"][0]["message"])
+        self.assertFalse(compiled.passes({"tests_failed": 0, "tests_total": 0, "coverage": 0.9}))
+        self.assertFalse(compiled.passes({"tests_failed": 0, "tests_total": 5, "coverage": "high"}))
+
+        record = {"change_id": "CH-001", "run_id": "run-01", "status": "fail", "passed": False, **evaluation}
+        summary = qa_enforcer.summarize_batch(compiled, [record])
+        self.assertEqual(summary["gates"]["failure-rate"]["error"], 1)
+
+    def test_phase_overrides_apply_at_compile_time(self) -> None:
+        """TC-FR11-005: Phase overrides are resolved when the policy compiles."""
+        gate = {
+            "id": "coverage",
+            "metric": "coverage",
+            "operator": ">=",
+            "target": 0.8,
+            "phases": {"2": {"target": 0.9}, "3": {"expr": "coverage >= 0.95 and reproducibility >= 0.99"}},
+        }
+        validated = policy_parser.validate_policy(make_policy(gate))
+
+        self.assertTrue(qa_policy.compile_policy(validated).passes({"coverage": 0.85}))
+        self.assertFalse(qa_policy.compile_policy(validated, phase="2").passes({"coverage": 0.85}))
+        phase3 = qa_policy.compile_policy(validated, phase="3")
+        self.assertEqual(phase3.gates[0].kind, "expression")
+        self.assertTrue(phase3.passes({"coverage": 0.96, "reproducibility": 1.0}))
+
+        with self.assertRaises(policy_parser.PolicyValidationError):
+            policy_parser.validate_policy(make_policy(dict(gate, phases={"2": {"expr": "coverage >="}})))
+
+
+if __name__ == "__main__":
+    unittest.main()
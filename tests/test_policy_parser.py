@@ -1,6 +1,7 @@
 import json
 import tempfile
 import unittest
+from unittest import mock
 from pathlib import Path
 import sys
 
@@ -50,6 +51,67 @@ class TestPolicyParser(unittest.TestCase):
         with self.assertRaises(policy_parser.PolicyValidationError):
             policy_parser.validate_policy(loaded)
 
+    def test_block_yaml_matches_json_and_errors_carry_positions(self) -> None:
+        self.policy_path.write_text(
+            "# comment\n"
+            "policy:\n"
+            "  phase: \"0\"\n"
+            "  coverage_threshold: 0.8  # inline comment\n"
+            "  reproducibility_threshold: 0.95\n"
+            "  gates:\n"
+            "    - id: coverage\n"
+            "      metric: coverage\n"
+            "      operator: \">=\"\n"
+            "      target: 0.8\n"
+            "    - {id: trend, expr: \"mean(coverage, 3) >= 0.8\",\n"
+            "       phases: {\"2\": {expr: \"coverage >= 0.9\"}}}\n"
+            "notifications:\n"
+            "  on_failure:\n"
+            "  - raise_concern\n"
+            "  discord_channel: '#qa-alerts'\n",
+            encoding="utf-8",
+        )
+        loaded = policy_parser.load_policy(self.policy_path)
+        self.assertEqual(loaded["policy"]["phase"], "0")
+        self.assertEqual(loaded["policy"]["gates"][0], {"id": "coverage", "metric": "coverage", "operator": ">=", "target": 0.8})
+        self.assertEqual(loaded["policy"]["gates"][1]["phases"], {"2": {"expr": "coverage >= 0.9"}})
+        self.assertEqual(loaded["notifications"], {"on_failure": ["raise_concern"], "discord_channel": "#qa-alerts"})
+        policy_parser.validate_policy(loaded)
+
+        for content, position in (
+            ("policy:\n  phase: 0\n   gates: []\n", (3, 4)),
+            ("policy:\n  phase: 0\n  phase: 1\n", (3, 3)),
+            ("policy: {phase: 0, gates: [1, 2}\n", (1, 32)),
+            ("policy:\n  expr: |\n    x\n", (2, 9)),
+        ):
+            with self.subTest(content=content):
+                self.policy_path.write_text(content, encoding="utf-8")
+                with self.assertRaises(policy_parser.PolicySyntaxError) as ctx:
+                    policy_parser.load_policy(self.policy_path)
+                self.assertEqual((ctx.exception.line, ctx.exception.column), position)
+
+    def test_validated_policy_is_cached_by_content_hash(self) -> None:
+        cache_dir = Path(self.tmp_dir.name) / "cache"
+        self.addCleanup(policy_parser.clear_cache)
+        path = self.write_policy(
+            {
+                "policy": {
+                    "phase": "0",
+                    "coverage_threshold": 0.8,
+                    "reproducibility_threshold": 0.95,
+                    "gates": [{"id": "coverage", "metric": "coverage", "operator": ">=", "target": 0.8}],
+                },
+                "notifications": {"on_failure": ["raise_concern"]},
+            }
+        )
+        digest, validated = policy_parser.load_validated_policy(path, cache_dir=cache_dir)
+        self.assertTrue((cache_dir / f"{digest}.marshal").exists())
+        self.assertIs(policy_parser.load_validated_policy(path, cache_dir=cache_dir)[1], validated)
+
+        policy_parser.clear_cache()
+        with mock.patch.object(policy_parser, "parse_yaml", side_effect=AssertionError("re-parsed")):
+            self.assertEqual(policy_parser.load_validated_policy(path, cache_dir=cache_dir), (digest, validated))
+
 
 if __name__ == "__main__":
     unittest.main()
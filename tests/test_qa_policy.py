@@ -0,0 +1,113 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import qa_enforcer, qa_policy
+from pipelines.policy_parser import PolicyValidationError
+from tests.policy_helpers import make_policy
+
+COVERAGE_GATE = {"id": "coverage", "metric": "coverage", "operator": ">=", "target": 0.8}
+REPRO_GATE = {"id": "reproducibility", "metric": "reproducibility", "operator": ">=", "target": 0.95}
+
+
+class TestCompiledPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.cache_dir = self.root / "cache"
+        qa_policy.clear_cache()
+        self.addCleanup(qa_policy.clear_cache)
+
+    def test_compiled_evaluation_matches_enforcer_shape(self) -> None:
+        """TC-FR11-002: Compiled policies evaluate to the enforcer's result shape."""
+        compiled = qa_policy.compile_policy(make_policy(COVERAGE_GATE, REPRO_GATE))
+        evaluation = compiled.evaluate({"coverage": 0.7})
+
+        self.assertFalse(evaluation["passed"])
+        coverage, reproducibility = evaluation["gates"]
+        self.assertEqual(coverage["status"], "fail")
+        self.assertEqual(coverage["message"], "Expected coverage >= 0.8 but got 0.7.")
+        self.assertEqual(coverage["expected"], COVERAGE_GATE)
+        self.assertEqual(reproducibility["status"], "missing")
+        self.assertEqual(evaluation, qa_enforcer.evaluate(make_policy(COVERAGE_GATE, REPRO_GATE), {"coverage": 0.7}))
+
+        self.assertTrue(compiled.passes({"coverage": 0.9, "reproducibility": 1.0}))
+        self.assertFalse(compiled.passes({"coverage": 0.9}))
+
+    def test_load_reuses_compiled_policy_by_content_hash(self) -> None:
+        """TC-FR11-002: Compiled policies are reused until the policy file changes."""
+        path = self.root / "QA_POLICY.yaml"
+        path.write_text(json.dumps(make_policy(COVERAGE_GATE)), encoding="utf-8")
+
+        first = qa_policy.load_compiled_policy(path, cache_dir=self.cache_dir)
+        self.assertIs(qa_policy.load_compiled_policy(path, cache_dir=self.cache_dir), first)
+        self.assertTrue((self.cache_dir / f"{first.digest}.marshal").exists())
+
+        qa_policy.clear_cache()
+        path.write_text("not json", encoding="utf-8")
+        with self.assertRaises(PolicyValidationError):
+            qa_policy.load_compiled_policy(path, cache_dir=self.cache_dir)
+
+        path.write_text(json.dumps(make_policy(COVERAGE_GATE)), encoding="utf-8")
+        reloaded = qa_policy.load_compiled_policy(path, cache_dir=self.cache_dir)
+        self.assertEqual(reloaded.digest, first.digest)
+        self.assertEqual(reloaded.gates[0].id, "coverage")
+
+    def test_unsupported_operator_is_rejected(self) -> None:
+        """TC-FR11-002: Unknown gate operators are rejected at compile time."""
+        bad_gate = dict(COVERAGE_GATE, operator="~=")
+        with self.assertRaises(PolicyValidationError):
+            qa_policy.compile_policy(make_policy(bad_gate))
+        with self.assertRaises(SystemExit):
+            qa_enforcer.evaluate(make_policy(bad_gate), {"coverage": 1.0})
+
+
+class TestBatchEnforcement(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.work_root = self.root / "work"
+        runs = {
+            ("CH-001", "run-01"): {"coverage": 0.9, "reproducibility": 0.99},
+            ("CH-001", "run-02"): {"coverage": 0.5, "reproducibility": 0.99},
+            ("CH-002", "run-01"): {"coverage": 0.85},
+        }
+        for (change_id, run_id), metrics in runs.items():
+            run_dir = self.work_root / change_id / run_id
+            run_dir.mkdir(parents=True)
+            (run_dir / "qa_metrics.json").write_text(json.dumps(metrics), encoding="utf-8")
+        (self.work_root / "CH-002" / "run-02").mkdir(parents=True)
+        (self.work_root / "CH-002" / "run-02" / "qa_metrics.json").write_text("{", encoding="utf-8")
+        self.compiled = qa_policy.compile_policy(make_policy(COVERAGE_GATE, REPRO_GATE), digest="test")
+
+    def test_batch_counts_gates_across_runs_in_parallel(self) -> None:
+        """TC-FR11-002: Batch evaluation tallies gate outcomes across runs."""
+        paths = qa_enforcer.discover_metrics(self.work_root)
+        self.assertEqual(len(paths), 4)
+
+        records = list(qa_enforcer.evaluate_batch(self.compiled, paths, jobs=2))
+        self.assertEqual([(r["change_id"], r["run_id"], r["status"]) for r in records], [
+            ("CH-001", "run-01", "pass"),
+            ("CH-001", "run-02", "fail"),
+            ("CH-002", "run-01", "fail"),
+            ("CH-002", "run-02", "error"),
+        ])
+
+        summary = qa_enforcer.summarize_batch(self.compiled, records)
+        self.assertFalse(summary["passed"])
+        self.assertEqual(summary["totals"], {"runs": 4, "passed": 1, "failed": 2, "errors": 1})
+        self.assertEqual(summary["gates"]["coverage"], {"pass": 2, "fail": 1, "missing": 0, "skipped": 0, "error": 0})
+        self.assertEqual(summary["gates"]["reproducibility"], {"pass": 2, "fail": 0, "missing": 1, "skipped": 0, "error": 0})
+        self.assertEqual(summary["failing_runs"], ["CH-001/run-02", "CH-002/run-01", "CH-002/run-02"])
+
+
+if __name__ == "__main__":
+    unittest.main()
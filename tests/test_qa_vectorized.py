@@ -0,0 +1,139 @@
+import importlib.util
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import policy_parser, qa_enforcer, qa_policy
+from tests.policy_helpers import History, make_policy
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+POLICY = make_policy(
+    {"id": "coverage", "metric": "coverage", "operator": ">=", "target": 0.8},
+    {"id": "reproducibility", "metric": "reproducibility", "operator": ">=", "target": 0.95},
+)
+
+SNAPSHOTS = [
+    {"coverage": 0.9, "reproducibility": 0.99},
+    {"coverage": 0.75, "reproducibility": 0.99},
+    {"coverage": 0.85},
+    {"coverage": "n/a", "reproducibility": 0.96},
+]
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestVectorizedEvaluation(unittest.TestCase):
+    def setUp(self) -> None:
+        from pipelines import qa_vectorized
+
+        self.qa_vectorized = qa_vectorized
+        self.compiled = qa_policy.compile_policy(POLICY)
+        self.matrix = qa_vectorized.MetricMatrix.from_snapshots(SNAPSHOTS)
+
+    def test_matches_scalar_evaluation_with_missing_masks(self) -> None:
+        """TC-FR11-006: Vectorized verdicts match scalar evaluation, including missing metrics."""
+        report = self.qa_vectorized.evaluate_matrix(self.compiled, self.matrix)
+
+        scalar = [qa_enforcer.evaluate(POLICY, snapshot)["passed"] for snapshot in SNAPSHOTS[:3]]
+        self.assertEqual(scalar, [True, False, False])
+        self.assertEqual(report["failing_rows"], [1, 2, 3])
+        self.assertEqual(report["pass_rate"], 0.25)
+
+        coverage, reproducibility = report["gates"]
+        self.assertEqual(coverage["failing_rows"], [1, 3])
+        self.assertEqual((coverage["missing"], coverage["errors"]), (0, 1))
+        self.assertEqual(reproducibility["missing"], 1)
+        self.assertEqual(reproducibility["failing_rows"], [2])
+        self.assertEqual(reproducibility["pass_rate"], 0.75)
+
+    def test_threshold_sweep_reports_gate_and_overall_rates(self) -> None:
+        """TC-FR11-006: Threshold sweeps report per-gate and overall pass rates."""
+        sweep = self.qa_vectorized.sweep_gate(self.compiled, self.matrix, "coverage", [0.7, 0.8, 0.95])
+
+        self.assertEqual([row["threshold"] for row in sweep], [0.7, 0.8, 0.95])
+        self.assertEqual([row["gate_pass_rate"] for row in sweep], [0.75, 0.5, 0.0])
+        self.assertEqual([row["pass_rate"] for row in sweep], [0.5, 0.25, 0.0])
+
+    def test_expression_and_regression_gates_count_towards_overall(self) -> None:
+        """TC-FR11-006: Expression and regression gates count towards the overall verdict."""
+        policy = make_policy(
+            {"id": "coverage", "metric": "coverage", "operator": ">=", "target": 0.8},
+            {"id": "balanced", "expr": "coverage >= 0.8 and reproducibility >= 0.97"},
+            {"id": "drop", "metric": "coverage", "type": "regression", "window": 3, "max_drop": 0.05},
+        )
+        compiled = qa_policy.compile_policy(policy_parser.validate_policy(policy))
+        matrix = self.qa_vectorized.MetricMatrix.from_snapshots(
+            SNAPSHOTS,
+            metrics=self.qa_vectorized.policy_metrics(compiled),
+            change_ids=["CH-001", "CH-001", "CH-002", "CH-002"],
+        )
+        self.assertEqual(self.qa_vectorized.policy_metrics(compiled), ["coverage", "reproducibility"])
+        history = History(baselines={"CH-001": 0.78, "CH-002": 0.95})
+
+        report = self.qa_vectorized.evaluate_matrix(compiled, matrix, history)
+
+        scalar = [
+            compiled.evaluate(matrix.row(index, ["coverage", "reproducibility"]), history, change_id=change_id)["passed"]
+            for index, change_id in enumerate(matrix.change_ids)
+        ]
+        self.assertEqual(scalar, [True, False, False, False])
+        self.assertEqual(report["failing_rows"], [1, 2, 3])
+        coverage, balanced, drop = report["gates"]
+        self.assertEqual((balanced["kind"], balanced["failing_rows"]), ("expression", [1, 2, 3]))
+        self.assertEqual((balanced["missing"], balanced["errors"]), (1, 1))
+        self.assertEqual((drop["kind"], drop["failing_rows"]), ("regression", [2, 3]))
+        with self.assertRaises(ValueError):
+            self.qa_vectorized.sweep_gate(compiled, matrix, "balanced", [0.5])
+
+
+    def test_nan_and_non_numeric_metrics_keep_scalar_statuses(self) -> None:
+        """TC-FR11-006: NaN and non-numeric metrics get the same statuses as scalar evaluation."""
+        policy = make_policy(
+            {"id": "coverage", "metric": "coverage", "operator": ">=", "target": 0.8},
+            {"id": "exact", "metric": "reproducibility", "operator": "==", "target": 1.0},
+        )
+        compiled = qa_policy.compile_policy(policy_parser.validate_policy(policy))
+        snapshots = [
+            {"coverage": float("nan"), "reproducibility": float("nan")},
+            {"coverage": "n/a", "reproducibility": "n/a"},
+            {"coverage": None},
+        ]
+        metrics = self.qa_vectorized.policy_metrics(compiled)
+        matrix = self.qa_vectorized.MetricMatrix.from_snapshots(snapshots, metrics=metrics)
+
+        outcomes = self.qa_vectorized.evaluate_gates(compiled, matrix)
+
+        def status(outcome, index: int) -> str:
+            if outcome.passed[index]:
+                return "pass"
+            return "missing" if outcome.missing[index] else "error" if outcome.errors[index] else "fail"
+
+        for index, snapshot in enumerate(snapshots):
+            with self.subTest(row=index):
+                self.assertEqual(
+                    [status(outcome, index) for outcome in outcomes],
+                    [gate["status"] for gate in compiled.evaluate(snapshot)["gates"]],
+                )
+        self.assertEqual([gate["status"] for gate in compiled.evaluate(snapshots[1])["gates"]], ["error", "fail"])
+
+    def test_cli_reports_invalid_policy(self) -> None:
+        """TC-FR11-006: An invalid policy is reported and exits 1 instead of raising."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        policy_path = Path(tmp_dir.name) / "QA_POLICY.yaml"
+        policy_path.write_text("not json", encoding="utf-8")
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            self.assertEqual(self.qa_vectorized.main(["--policy", str(policy_path), "--work-root", tmp_dir.name]), 1)
+        self.assertIn("Policy validation error", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
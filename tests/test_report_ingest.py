@@ -0,0 +1,131 @@
+import json
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import report_ingest
+
+COBERTURA = """<?xml version="1.0" ?>
+<coverage line-rate="0.5" lines-valid="4" lines-covered="2" version="7.0">
+  <packages>
+    <package name="pkg">
+      <classes>
+        <class name="mod.py" filename="pkg/mod.py">
+          <methods>
+            <method name="f"><lines><line number="1" hits="1"/></lines></method>
+          </methods>
+          <lines>
+            <line number="1" hits="1"/>
+            <line number="2" hits="0"/>
+            <line number="3" hits="4" branch="true" condition-coverage="50% (1/2)"/>
+            <line number="4" hits="0"/>
+          </lines>
+        </class>
+      </classes>
+    </package>
+  </packages>
+</coverage>
+"""
+
+JUNIT_TEMPLATE = """<?xml version="1.0" ?>
+<testsuites>
+  <testsuite name="suite">
+    <testcase classname="tests.a" name="test_ok"/>
+    <testcase classname="tests.a" name="test_flaky">{flaky}</testcase>
+    <testcase classname="tests.b" name="test_skip"><skipped/></testcase>
+  </testsuite>
+</testsuites>
+"""
+
+
+class TestReportIngest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+
+    def write(self, name: str, content: str) -> Path:
+        path = self.root / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_cobertura_counts_class_lines_and_branches(self) -> None:
+        """TC-FR11-008: Cobertura reports yield line and branch coverage."""
+        totals = report_ingest.parse_cobertura(self.write("coverage.xml", COBERTURA))
+        self.assertEqual((totals.lines_valid, totals.lines_covered), (4, 2))
+        self.assertEqual((totals.branches_valid, totals.branches_covered), (2, 1))
+
+        with self.assertRaises(report_ingest.ReportError):
+            report_ingest.parse_cobertura(self.write("bad.xml", JUNIT_TEMPLATE.format(flaky="")))
+
+    def test_junit_reruns_produce_reproducibility_and_merge_metrics(self) -> None:
+        """TC-FR11-008: JUnit reruns produce reproducibility metrics for the QA gates."""
+        run1 = self.write("run1.xml", JUNIT_TEMPLATE.format(flaky=""))
+        run2 = self.write("run2.xml", JUNIT_TEMPLATE.format(flaky='<failure message="boom"/>'))
+        coverage_json = self.write(
+            "coverage.json",
+            json.dumps({"totals": {"num_statements": 10, "covered_lines": 9, "num_branches": 0, "covered_branches": 0}}),
+        )
+        metrics = report_ingest.ingest(junit=[run1, run2], coverage_json=[coverage_json])
+
+        self.assertEqual(metrics["tests_total"], 3)
+        self.assertEqual(metrics["tests_failed"], 1)
+        self.assertEqual(metrics["tests_skipped"], 1)
+        self.assertFalse(metrics["tests_passed"])
+        self.assertAlmostEqual(metrics["reproducibility"], 2 / 3, places=5)
+        self.assertEqual(metrics["coverage"], 0.9)
+
+        output = self.write("qa_metrics.json", json.dumps({"coverage": 0.1, "owner": "qa"}))
+        payload = report_ingest.write_metrics(output, metrics, merge=True)
+        stored = json.loads(output.read_text(encoding="utf-8"))
+        self.assertEqual(stored, payload)
+        self.assertEqual(stored["owner"], "qa")
+        self.assertEqual(stored["coverage"], 0.9)
+
+    def test_junit_memory_does_not_grow_with_case_count(self) -> None:
+        """TC-FR11-008: JUnit ingestion memory stays flat as the case count grows."""
+        path = self.root / "large.xml"
+        with path.open("w", encoding="utf-8") as handle:
+            handle.write('<testsuites><testsuite name="suite">')
+            for index in range(30_000):
+                handle.write(f'<testcase classname="tests.c{index % 50}" name="test_{index}"/>')
+            handle.write("</testsuite></testsuites>")
+
+        tracemalloc.start()
+        try:
+            totals = report_ingest.parse_junit(path)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(totals.total, 30_000)
+        self.assertLess(peak, 1024 * 1024)
+
+    def test_coverage_json_streams_without_ijson(self) -> None:
+        """TC-FR11-008: coverage.json is streamed without the optional ijson dependency."""
+        document = {
+            "meta": {"version": "7.4", "note": "escaped \"quote\""},
+            "files": {
+                "pkg/a.py": {"executed_lines": list(range(1, 500)), "summary": {"num_statements": 600, "covered_lines": 499}},
+                "pkg/b.py": {"executed_lines": [], "summary": {"num_statements": 400, "covered_lines": 1, "percent": 0.25}},
+            },
+        }
+        summed = self.write("summary.json", json.dumps(document, indent=2))
+        with_totals = self.write("totals.json", json.dumps({**document, "totals": {"num_statements": 9, "covered_lines": 3}}))
+        with mock.patch.object(report_ingest, "ijson", None), mock.patch.object(report_ingest, "_JSON_CHUNK", 7):
+            totals = report_ingest.parse_coverage_json(summed)
+            self.assertEqual((totals.lines_valid, totals.lines_covered), (1000, 500))
+            totals = report_ingest.parse_coverage_json(with_totals)
+            self.assertEqual((totals.lines_valid, totals.lines_covered), (9, 3))
+            with self.assertRaises(report_ingest.ReportError):
+                report_ingest.parse_coverage_json(self.write("truncated.json", '{"totals": {"num_statements": 9'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import reproducibility
+
+PIPELINE = """import os, sys
+from datetime import datetime
+from pathlib import Path
+
+out = Path("out")
+out.mkdir(exist_ok=True)
+(out / "stable.md").write_text("# Report\\n\\n_Auto-generated by test at %sZ._\\n" % datetime.utcnow().isoformat())
+(out / "stable.json").write_text('{\\n  "timestamp": "%s",\\n  "value": 1\\n}\\n' % datetime.utcnow().isoformat())
+(out / "noisy.txt").write_text("header\\n%s\\n" % os.urandom(8).hex())
+Path("audit").mkdir(exist_ok=True)
+Path("audit", "log.jsonl").write_text(os.urandom(4).hex())
+"""
+
+
+class TestReproducibility(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.source = Path(self.tmp_dir.name) / "source"
+        self.source.mkdir()
+        (self.source / "pipeline.py").write_text(PIPELINE, encoding="utf-8")
+        # A stale copy of a declared artifact must not count as the run's output.
+        (self.source / "out").mkdir()
+        (self.source / "out" / "declared.md").write_text("stale\n", encoding="utf-8")
+
+    def run_pipeline(self, runs: int = 3) -> reproducibility.ReproducibilityReport:
+        return reproducibility.run_reproducibility(
+            runs=runs,
+            command=["{python}", "pipeline.py"],
+            artifacts=("out/*.md", "out/declared.md"),
+            source=self.source,
+            workspace_root=Path(self.tmp_dir.name),
+        )
+
+    def test_volatile_lines_are_ignored_and_divergence_is_reported(self) -> None:
+        """TC-FR11-009: Volatile lines are ignored and real divergence is reported."""
+        report = self.run_pipeline()
+
+        self.assertEqual(sorted(report.artifacts), ["out/noisy.txt", "out/stable.json", "out/stable.md"])
+        self.assertEqual(report.divergent, ["out/noisy.txt"])
+        self.assertAlmostEqual(report.ratio, 2 / 3, places=5)
+
+        payload = report.as_dict()
+        divergence = payload["divergence"][0]
+        self.assertEqual(divergence["first_difference_line"], 2)
+        self.assertEqual(sorted(run for runs in divergence["variants"].values() for run in runs), [1, 2, 3])
+        self.assertEqual(payload["reproducibility_failed_runs"], 0)
+        self.assertEqual([path.name for path in Path(self.tmp_dir.name).iterdir()], ["source"])
+
+    def test_only_top_level_timestamps_are_normalised(self) -> None:
+        """TC-FR11-009: Only top-level timestamps are normalised in JSON artifacts."""
+        root = Path(self.tmp_dir.name)
+        template = '{\n  "runs": [\n    {\n      "timestamp": "%s"\n    }\n  ],\n  "timestamp": "%s"\n}\n'
+        digests = []
+        for index, stamps in enumerate([("a", "x"), ("a", "y"), ("b", "y")]):
+            path = root / f"summary-{index}.json"
+            path.write_text(template % stamps, encoding="utf-8")
+            digests.append(reproducibility.normalized_digest(path))
+        self.assertEqual(digests[0], digests[1])
+        self.assertNotEqual(digests[1], digests[2])
+
+    def test_missing_artifacts_diverge_and_metrics_merge_for_qa_enforcer(self) -> None:
+        """TC-FR11-009: Missing artifacts count as divergence in the QA metrics."""
+        runs = [
+            reproducibility.RunResult(index=1, returncode=0, duration=0.1, digests={"a": "x", "b": "y"}),
+            reproducibility.RunResult(index=2, returncode=1, duration=0.1, digests={"a": "x"}),
+        ]
+        report = reproducibility.compare_runs(runs)
+        self.assertEqual(report.artifacts["b"], {"y": [1], "missing": [2]})
+        self.assertEqual(report.metrics()["reproducibility"], 0.5)
+        self.assertEqual(report.metrics()["reproducibility_failed_runs"], 1)
+
+        metrics_path = Path(self.tmp_dir.name) / "qa_metrics.json"
+        metrics_path.write_text(json.dumps({"coverage": 0.9}), encoding="utf-8")
+        with redirect_stdout(io.StringIO()):
+            exit_code = reproducibility.main(
+                [
+                    "--runs", "2",
+                    "--command", "{python} pipeline.py",
+                    "--artifact", "out/stable.*",
+                    "--source", str(self.source),
+                    "--workspace-root", self.tmp_dir.name,
+                    "--metrics", str(metrics_path),
+                ]
+            )
+        self.assertEqual(exit_code, 0)
+        stored = json.loads(metrics_path.read_text(encoding="utf-8"))
+        self.assertEqual(stored["coverage"], 0.9)
+        self.assertEqual(stored["reproducibility_runs"], 2)
+        self.assertLess(stored["reproducibility"], 1.0)  # noisy.txt is a new, undeclared output
+
+
+if __name__ == "__main__":
+    unittest.main()
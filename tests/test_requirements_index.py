@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from agents import requirements_index
+
+
+class RequirementsIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.current = self.root / "REQUIREMENTS_1_2.md"
+        self.current.write_text(
+            "\n".join(
+                [
+                    "| ID | Requirement | Notes |",
+                    "| -- | ----------- | ----- |",
+                    "| FR-01 Project Manager | Orchestrate the loop. | PM agent |",
+                    "",
+                    "Intervening prose.",
+                    "",
+                    "| FR-15 (proposed) | Requirements Analyst agent. | Confirmed. |",
+                    "",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        self.elaborations = self.root / "elaborations"
+        self.elaborations.mkdir()
+        (self.elaborations / "FR-07_elaboration.md").write_text(
+            "---\nfr_id: FR-07\nstatus: Draft\n---\n\n# Elaboration\n\n## 1. Summary\nAutomate concern lifecycle.\n\n## 2. Context\nMore.\n",
+            encoding="utf-8",
+        )
+        self.archive = self.root / "archive"
+        self.archive.mkdir()
+        (self.archive / "REQUIREMENTS_1_0.md").write_text(
+            "| FR-01 | Provide a Project Manager agent. | Legacy wording. |\n",
+            encoding="utf-8",
+        )
+        self.cache_path = self.root / "cache" / "index.json"
+
+    def _index(self) -> requirements_index.RequirementsIndex:
+        return requirements_index.RequirementsIndex(
+            (self.root / "REQUIREMENTS.md", self.current, self.elaborations, self.archive),
+            cache_path=self.cache_path,
+            root=self.root,
+        )
+
+    def test_index_merges_sources_in_priority_order(self) -> None:
+        """TC-FR01-003: Requirements index reads tables past blank lines, elaborations, and archive."""
+        index = self._index().refresh()
+
+        self.assertEqual(index.ids(), ["FR-01", "FR-07", "FR-15"])
+        self.assertEqual(index.primary("fr-01").summary(), "FR-01: Project Manager — Orchestrate the loop.")
+        self.assertEqual([entry.source for entry in index.get("FR-01")], ["REQUIREMENTS_1_2.md", "archive/REQUIREMENTS_1_0.md"])
+        self.assertEqual(index.primary("FR-07").requirement, "Automate concern lifecycle.")
+        self.assertEqual(index.primary("FR-15").requirement, "Requirements Analyst agent.")
+
+    def test_refresh_reparses_only_changed_files(self) -> None:
+        """TC-FR01-003: Cached rows are reused until a file's mtime/size changes."""
+        self._index().refresh()
+
+        index = self._index().refresh()
+        self.assertEqual(index.last_reparsed, [])
+
+        self.current.write_text("| FR-02 | Status docs. | Updated. |\n", encoding="utf-8")
+        stat = self.current.stat()
+        os.utime(self.current, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        index.refresh()
+        self.assertEqual(index.last_reparsed, [str(self.current)])
+        self.assertEqual(index.primary("FR-01").source, "archive/REQUIREMENTS_1_0.md")
+        self.assertIsNotNone(index.primary("FR-02"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from audit import AuditLogger
+from pipelines import retention
+
+NOW = time.time()
+HOUR = 3600.0
+
+
+class TestRetention(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.runs_root = self.root / "work"
+
+    def make_run(self, change_id: str, run_id: str, *, size: int, age_hours: float, status: str = "ok", retain: bool = False) -> Path:
+        run_dir = self.runs_root / change_id / run_id
+        (run_dir / "nested").mkdir(parents=True)
+        manifest = {"run_id": run_id}
+        if status != "ok":
+            manifest["status"] = status
+        files = [run_dir / "manifest.json", run_dir / "nested" / "blob.bin", run_dir.parent / f"{run_id}_sync.txt"]
+        files[0].write_text(json.dumps(manifest), encoding="utf-8")
+        files[1].write_bytes(b"x" * size)
+        files[2].write_text("sync\n", encoding="utf-8")
+        if retain:
+            files.append(run_dir / ".retain")
+            files[-1].write_text("", encoding="utf-8")
+        stamp = NOW - age_hours * HOUR
+        for path in files + [run_dir / "nested", run_dir]:
+            os.utime(path, (stamp, stamp))
+        return run_dir
+
+    def test_scan_measures_runs_including_sibling_files(self) -> None:
+        """TC-FR27-001: Disk usage covers nested files and run-NN_* siblings."""
+        run_dir = self.make_run("CH-001", "run-01", size=1000, age_hours=1)
+        os.link(run_dir / "nested" / "blob.bin", run_dir / "blob-link.bin")
+
+        [usage] = retention.scan_runs(self.runs_root, max_workers=2)
+
+        manifest_size = (run_dir / "manifest.json").stat().st_size
+        self.assertEqual(usage.size_bytes, 1000 + manifest_size + len("sync\n"))
+        self.assertEqual(usage.file_count, 3)
+        self.assertEqual(usage.status, "success")
+        self.assertEqual(usage.extra_paths, (str(run_dir.parent / "run-01_sync.txt"),))
+
+    def test_plan_honours_retain_markers_age_and_size_budget(self) -> None:
+        """TC-FR27-001: Old successes purge, failures persist, .retain opts out, size purges oldest first."""
+        self.make_run("CH-001", "run-01", size=4000, age_hours=72)
+        self.make_run("CH-001", "run-02", size=4000, age_hours=96, retain=True)
+        self.make_run("CH-002", "run-01", size=4000, age_hours=72, status="failed")
+        self.make_run("CH-002", "run-02", size=4000, age_hours=10)
+        self.make_run("CH-002", "run-03", size=4000, age_hours=5)
+        self.make_run("CH-002", "run-04", size=4000, age_hours=1)
+
+        runs = retention.scan_runs(self.runs_root)
+        policy = retention.RetentionPolicy(max_storage_bytes=17000)
+        plan = retention.plan_retention(runs, policy, now=NOW)
+
+        actions = {(d.run.change_id, d.run.run_id): (d.action, d.reason) for d in plan.decisions}
+        self.assertEqual(actions[("CH-001", "run-01")], ("purge", "age"))
+        self.assertEqual(actions[("CH-001", "run-02")], ("keep", "retain-marker"))
+        self.assertEqual(actions[("CH-002", "run-01")], ("keep", "within-policy"))
+        self.assertEqual(actions[("CH-002", "run-02")], ("purge", "size"))
+        self.assertEqual(actions[("CH-002", "run-03")], ("keep", "within-policy"))
+        self.assertLessEqual(plan.remaining_bytes, policy.max_storage_bytes)
+        self.assertFalse(plan.over_budget)
+
+        tight = retention.plan_retention(runs, retention.RetentionPolicy(max_storage_bytes=1), now=NOW)
+        self.assertTrue(tight.over_budget)
+        kept = {(d.run.change_id, d.run.run_id) for d in tight.decisions if d.action == "keep"}
+        self.assertEqual(kept, {("CH-001", "run-02"), ("CH-002", "run-01")})
+
+    def test_execute_purges_and_logs_unless_dry_run(self) -> None:
+        """TC-FR27-001: Purges remove run artifacts and log retention records."""
+        old = self.make_run("CH-002", "run-01", size=10, age_hours=72)
+        fresh = self.make_run("CH-002", "run-02", size=10, age_hours=1)
+        plan = retention.plan_retention(retention.scan_runs(self.runs_root), now=NOW)
+        logger = AuditLogger(root=self.root / "audit")
+
+        dry = retention.execute_plan(plan, dry_run=True, logger=logger)
+        self.assertEqual(dry.purged, [str(old)])
+        self.assertTrue(old.exists())
+        self.assertFalse(logger.retention_path.exists())
+
+        result = retention.execute_plan(plan, logger=logger)
+        self.assertFalse(old.exists())
+        self.assertFalse((old.parent / "run-01_sync.txt").exists())
+        self.assertTrue(fresh.exists())
+        [record] = [json.loads(line) for line in logger.retention_path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(record, result.records[0])
+        self.assertEqual(record["record_type"], "retention")
+        self.assertEqual(record["action"], "auto_purge")
+        self.assertEqual(record["artifacts_purged"], [str(old)])
+        self.assertEqual(record["artifacts_retained"], [str(fresh)])
+        self.assertEqual(record["metadata"]["reasons"], {"run-01": "age"})
+
+    def test_cli_dry_run_reports_plan(self) -> None:
+        """TC-FR27-001: CLI dry run leaves runs and audit log untouched."""
+        old = self.make_run("CH-003", "run-01", size=10, age_hours=72)
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            exit_code = retention.main(
+                ["--runs-path", str(self.runs_root), "--dry-run", "--audit-root", str(self.root / "audit")]
+            )
+        self.assertEqual(exit_code, 0)
+        payload = json.loads(buffer.getvalue())
+        self.assertTrue(payload["dry_run"])
+        self.assertEqual(payload["purged"], [str(old)])
+        self.assertTrue(old.exists())
+        self.assertFalse((self.root / "audit" / "retention.jsonl").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
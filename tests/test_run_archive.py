@@ -0,0 +1,131 @@
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from audit import AuditLogger
+from pipelines import blob_store, retention, run_archive
+
+
+class TestRunArchive(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.change_dir = self.root / "work" / "CH-002"
+        self.run_dir = self.change_dir / "run-02"
+        (self.run_dir / "logs").mkdir(parents=True)
+        (self.run_dir / "manifest.json").write_text(json.dumps({"run_id": "run-02"}), encoding="utf-8")
+        self.big = os.urandom(200_000) + b"tail"
+        (self.run_dir / "logs" / ("x" * 120 + ".log")).write_bytes(self.big)
+        (self.change_dir / "run-02_sync.txt").write_text("synced\n", encoding="utf-8")
+        self.archiver = run_archive.RunArchiver(self.root / "archive")
+
+    def test_members_are_randomly_accessible_and_bundle_is_plain_tar_gz(self) -> None:
+        """TC-FR27-003: Archived evidence is retrievable per file and by standard tools."""
+        result = self.archiver.pack(self.run_dir, [self.change_dir / "run-02_sync.txt"])
+        self.assertEqual(result.members, 3)
+
+        archive = run_archive.RunArchive(result.bundle)
+        long_name = "run-02/logs/" + "x" * 120 + ".log"
+        self.assertEqual(sorted(archive.names()), sorted(["run-02/manifest.json", long_name, "run-02_sync.txt"]))
+        self.assertEqual(archive.read("run-02_sync.txt"), b"synced\n")
+        self.assertEqual(b"".join(archive.stream(long_name, chunk_size=1024)), self.big)
+
+        with tarfile.open(result.bundle, "r:gz") as bundle:
+            self.assertEqual(bundle.extractfile(long_name).read(), self.big)
+
+        restored = archive.extract(self.root / "restore", ["run-02/manifest.json"])
+        self.assertEqual(json.loads(restored[0].read_text(encoding="utf-8")), {"run_id": "run-02"})
+        with self.assertRaises(KeyError):
+            archive.read("run-02/missing.txt")
+
+    def expire(self) -> None:
+        stamp = time.time() - 72 * 3600
+        for path in [*self.run_dir.rglob("*"), self.run_dir, self.change_dir / "run-02_sync.txt"]:
+            os.utime(path, (stamp, stamp))
+
+    def test_retention_archives_expired_runs_before_removal(self) -> None:
+        """TC-FR27-003: Expired runs are packed, removed and logged as archived."""
+        self.expire()
+        plan = retention.plan_retention(retention.scan_runs(self.root / "work"))
+        logger = AuditLogger(root=self.root / "audit")
+
+        result = retention.execute_plan(plan, logger=logger, archiver=self.archiver)
+
+        self.assertFalse(self.run_dir.exists())
+        self.assertFalse((self.change_dir / "run-02_sync.txt").exists())
+        [record] = result.records
+        self.assertEqual(record["action"], "auto_archive")
+        bundle = Path(record["metadata"]["archives"]["run-02"])
+        self.assertEqual(run_archive.RunArchive(bundle).read("run-02_sync.txt"), b"synced\n")
+
+    def test_pointer_runs_are_archived_from_the_blob_store(self) -> None:
+        """TC-FR27-003: Archiving resolves pointer files before GC drops their blobs."""
+        store = blob_store.BlobStore(self.root / "store")
+        store.ingest_run(self.run_dir, pointer=True)
+        long_name = "run-02/logs/" + "x" * 120 + ".log"
+        with self.assertRaises(ValueError):
+            self.archiver.pack(self.run_dir)
+        self.expire()
+        plan = retention.plan_retention(retention.scan_runs(self.root / "work"))
+
+        result = retention.execute_plan(
+            plan,
+            logger=AuditLogger(root=self.root / "audit"),
+            store=store,
+            runs_root=self.root / "work",
+            archiver=self.archiver,
+        )
+
+        self.assertEqual(result.errors, {})
+        self.assertFalse(self.run_dir.exists())
+        self.assertEqual(store.usage()["blobs"], 0)
+        archive = run_archive.RunArchive(self.archiver.bundle_path("CH-002", "run-02"))
+        self.assertEqual(archive.read(long_name), self.big)
+        self.assertEqual(json.loads(archive.read("run-02/manifest.json")), {"run_id": "run-02"})
+
+    def test_existing_bundle_is_never_overwritten(self) -> None:
+        """TC-FR27-003: A reused run id cannot replace an archived bundle."""
+        first = self.archiver.pack(self.run_dir)
+        (self.run_dir / "manifest.json").write_text(json.dumps({"run_id": "run-02", "reused": True}), encoding="utf-8")
+        with self.assertRaises(FileExistsError):
+            self.archiver.pack(self.run_dir)
+        self.assertEqual(json.loads(run_archive.RunArchive(first.bundle).read("run-02/manifest.json")), {"run_id": "run-02"})
+        self.assertEqual(sorted(path.name for path in first.bundle.parent.iterdir()), ["run-02.index.json", "run-02.tar.gz"])
+
+    def test_interrupted_pack_is_redone(self) -> None:
+        """TC-FR27-003: A crash before the bundle is published leaves nothing that blocks the next pack."""
+        with mock.patch.object(run_archive.os, "link", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                self.archiver.pack(self.run_dir)
+        bundle = self.archiver.bundle_path("CH-002", "run-02")
+        self.assertFalse(bundle.exists())
+
+        result = self.archiver.pack(self.run_dir)
+        self.assertEqual(run_archive.RunArchive(result.bundle).read("run-02/logs/" + "x" * 120 + ".log"), self.big)
+        self.assertEqual(sorted(path.name for path in bundle.parent.iterdir()), ["run-02.index.json", "run-02.tar.gz"])
+
+    def test_cli_cat_streams_member(self) -> None:
+        """TC-FR27-003: CLI cat prints a single archived file."""
+        result = self.archiver.pack(self.run_dir)
+        output = subprocess.run(
+            [sys.executable, str(ROOT / "pipelines" / "run_archive.py"), "cat", str(result.bundle), "run-02/manifest.json"],
+            check=True,
+            capture_output=True,
+        )
+        self.assertEqual(json.loads(output.stdout), {"run_id": "run-02"})
+
+
+if __name__ == "__main__":
+    unittest.main()
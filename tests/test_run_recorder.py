@@ -0,0 +1,87 @@
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import run_recorder
+from pipelines.checksums import sha256_file
+
+
+class TestRunRecorder(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.work_root = self.root / "work"
+
+    def test_records_commands_timings_and_checksums(self) -> None:
+        """TC-FR27-005: Recorded runs capture exit status, resource usage and output digests."""
+        output = self.root / "out.txt"
+        echo = io.StringIO()
+        script = f"from pathlib import Path; Path({str(output)!r}).write_text('done'); print('hello')"
+        with run_recorder.RunRecorder("CH-002", task="T-007", work_root=self.work_root, echo=echo, checksum_cache=None) as run:
+            result = run.run([sys.executable, "-c", script], env={"Codexa_PHASE": "1"})
+            run.add_output(output)
+
+        self.assertEqual(run.run_id, "run-01")
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(echo.getvalue(), "hello\n")
+        manifest = json.loads((self.work_root / "CH-002" / "run-01" / "manifest.json").read_text(encoding="utf-8"))
+        self.assertEqual(manifest["status"], "success")
+        self.assertEqual(manifest["task"], "T-007")
+        [command] = manifest["commands"]
+        self.assertEqual(command["env"], {"Codexa_PHASE": "1"})
+        self.assertGreater(command["wall_seconds"], 0)
+        if command["max_rss_kb"] is not None:
+            self.assertGreater(command["max_rss_kb"], 0)
+            self.assertGreaterEqual(command["cpu_user_seconds"], 0)
+        self.assertEqual((run.run_dir / command["log"]).read_text(encoding="utf-8"), "hello\n")
+        self.assertEqual(manifest["outputs"], [str(output)])
+        self.assertEqual(manifest["output_checksums"][str(output)], {"sha256": sha256_file(output), "size": 4})
+
+    def test_failures_and_missing_outputs_mark_run_failed(self) -> None:
+        """TC-FR27-005: Non-zero exits and missing outputs produce a failed manifest."""
+        (self.work_root / "CH-002" / "run-04").mkdir(parents=True)
+        with run_recorder.RunRecorder("CH-002", work_root=self.work_root, echo=None, checksum_cache=None) as run:
+            result = run.run("echo partial; exit 3")
+        self.assertEqual(run.run_id, "run-05")
+        self.assertEqual(result.returncode, 3)
+        self.assertEqual(run.manifest["status"], "failed")
+
+        with run_recorder.RunRecorder("CH-002", work_root=self.work_root, echo=None, checksum_cache=None) as run:
+            run.run("true")
+            run.add_output(self.root / "never-written.txt")
+        self.assertEqual(run.manifest["status"], "failed")
+        self.assertTrue(run.manifest["output_checksums"][str(self.root / "never-written.txt")]["missing"])
+
+    def test_run_ids_continue_after_archived_runs(self) -> None:
+        """TC-FR27-005: Runs archived and purged by retention keep their ids."""
+        (self.root / "archive" / "CH-002").mkdir(parents=True)
+        (self.root / "archive" / "CH-002" / "run-03.tar.gz").write_bytes(b"")
+        (self.root / "archive" / "CH-002" / "run-03.index.json").write_text("{}", encoding="utf-8")
+        self.assertEqual(run_recorder.next_run_dir(self.work_root / "CH-002").name, "run-04")
+        self.assertEqual(run_recorder.next_run_dir(self.work_root / "CH-005").name, "run-01")
+
+    def test_cli_stops_at_first_failure(self) -> None:
+        """TC-FR27-005: CLI wrapper records each command and returns non-zero on failure."""
+        with redirect_stderr(io.StringIO()):
+            exit_code = run_recorder.main(
+                [
+                    "--change", "CH-003", "--work-root", str(self.work_root), "--id-db", str(self.root / "ids.sqlite"),
+                    "--quiet", "-c", "exit 1", "-c", "echo skipped",
+                ]
+            )
+        self.assertEqual(exit_code, 1)
+        manifest = json.loads((self.work_root / "CH-003" / "run-01" / "manifest.json").read_text(encoding="utf-8"))
+        self.assertEqual([command["cmd"] for command in manifest["commands"]], ["exit 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
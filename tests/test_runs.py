@@ -0,0 +1,84 @@
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+
+from pipelines import runs
+
+
+def _summary(title: str) -> dict:
+    return {
+        "scenario": {"phase": "1", "title": title},
+        "artifacts": {"brief": "docs/PHASE1_BRIEF.md", "design_spec": "design/DESIGN_SPEC.md"},
+    }
+
+
+def _record_runs(args: tuple[str, str, int]) -> list[str]:
+    root, title, count = args
+    store = runs.RunStore(root)
+    return [store.record(_summary(title)).run_id for _ in range(count)]
+
+
+class RunStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name) / "runs"
+
+    def test_identical_summaries_are_stored_once(self) -> None:
+        """TC-FR06-002: Repeated runs reference the first summary by digest."""
+        store = runs.RunStore(self.root)
+        first = store.record(_summary("Loop"), timings={"designer": 0.5, "total": 1.0})
+        second = store.record(_summary("Loop"), timings={"designer": 0.25, "total": 0.75})
+
+        self.assertEqual(first.digest, second.digest)
+        self.assertIsNone(first.duplicate_of)
+        self.assertEqual(second.duplicate_of, first.run_id)
+        self.assertEqual(len(list((self.root / runs.SUMMARY_DIR).iterdir())), 1)
+
+        reloaded = runs.RunStore(self.root)
+        self.assertEqual([record.run_id for record in reloaded.runs(digest=first.digest)], ["run-0001", "run-0002"])
+        self.assertEqual(reloaded.fetch_summary("run-0002"), _summary("Loop"))
+
+    def test_concurrent_stores_never_reuse_run_ids(self) -> None:
+        """TC-FR06-002: Separate stores and processes recording into one index get unique run ids."""
+        store_a = runs.RunStore(self.root)
+        store_b = runs.RunStore(self.root)
+        self.assertEqual(list(store_b.runs()), [])
+        first = store_a.record(_summary("Loop"))
+        second = store_b.record(_summary("Loop"))
+        self.assertEqual((first.run_id, second.run_id), ("run-0001", "run-0002"))
+        self.assertEqual(second.duplicate_of, "run-0001")
+        self.assertEqual(store_a.record(_summary("Other")).run_id, "run-0003")
+
+        with multiprocessing.get_context("spawn").Pool(4) as pool:
+            batches = pool.map(_record_runs, [(str(self.root), f"Scenario {index}", 15) for index in range(4)])
+        allocated = [run_id for batch in batches for run_id in batch]
+        self.assertEqual(len(set(allocated)), 60)
+        self.assertEqual(len(list(runs.RunStore(self.root).runs())), 63)
+        self.assertEqual(store_a.record(_summary("Loop")).run_id, "run-0064")
+
+    def test_runs_filters_by_time_window(self) -> None:
+        """TC-FR06-002: Run index supports time-bounded listing."""
+        store = runs.RunStore(self.root)
+        store.record(_summary("A"), timestamp="2025-11-01T00:00:00.000Z")
+        store.record(_summary("B"), timestamp="2025-11-02T00:00:00.000Z")
+        store.record(_summary("C"), timestamp="2025-11-03T00:00:00.000Z")
+
+        selected = list(store.runs(since="2025-11-02T00:00:00.000Z", until="2025-11-02T23:59:59.999Z"))
+        self.assertEqual([record.run_id for record in selected], ["run-0002"])
+
+    def test_diff_reports_changed_fields_and_timing_deltas(self) -> None:
+        """TC-FR06-002: Diff surfaces summary changes between runs."""
+        store = runs.RunStore(self.root)
+        store.record(_summary("Before"), timings={"total": 1.0})
+        store.record(_summary("After"), timings={"total": 1.5})
+
+        result = store.diff("run-0001", "run-0002")
+        self.assertFalse(result["identical"])
+        self.assertEqual(result["changed"]["scenario.title"], ["Before", "After"])
+        self.assertEqual(result["timings"]["total"]["delta"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
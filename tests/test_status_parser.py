@@ -0,0 +1,77 @@
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines.status_parser import load_status, parse_status_document
+
+STATUS = """# Change Status — CH-042
+
+## Metadata
+- Milestone: MS-02 — Beta
+- Current Stage: Validate
+- Change Owner: PM agent
+
+- Free-form note that wraps
+  onto a second line.
+
+## Approvals
+| Stage | Reviewer | Status | Notes |
+| --- | --- | --- | --- |
+| Frame | Human PM | ✅ Approved | Scope: reviewed. |
+| Validate | Governance / QA | ⏳ Pending | |
+
+## Next Actions
+1. **Tester**: Run T-006.
+2. Follow up with governance.
+
+## Handoff Log
+- 2025-11-02 — PM → Human PM: Outlined scope: phase 2.
+- Not a handoff entry.
+
+## Risks / Concerns
+- None raised.
+"""
+
+
+class TestStatusParser(unittest.TestCase):
+    def test_sections_are_parsed_into_typed_fields(self) -> None:
+        """TC-FR25-001: Change status sections parse into typed fields."""
+        document = parse_status_document(STATUS)
+
+        self.assertEqual(document.change_id, "CH-042")
+        self.assertEqual(dict(document.metadata), {
+            "Milestone": "MS-02 — Beta",
+            "Current Stage": "Validate",
+            "Change Owner": "PM agent",
+        })
+        self.assertEqual(document.current_stage, "Validate")
+        self.assertEqual(document.summary, ("Free-form note that wraps onto a second line.",))
+        self.assertEqual([(a.stage, a.status, a.notes) for a in document.approvals],
+                         [("Frame", "✅ Approved", "Scope: reviewed."), ("Validate", "⏳ Pending", "")])
+        self.assertEqual([(a.ordinal, a.owner, a.text) for a in document.next_actions],
+                         [(1, "Tester", "Run T-006."), (2, "", "Follow up with governance.")])
+        self.assertEqual(len(document.handoffs), 1)
+        handoff = document.handoffs[0]
+        self.assertEqual((handoff.from_agent, handoff.to_agent, handoff.summary),
+                         ("PM", "Human PM", "Outlined scope: phase 2."))
+        self.assertEqual(document.concerns, ("None raised.",))
+        self.assertEqual([item.text for item in document.section("handoff log").items][1], "Not a handoff entry.")
+
+    def test_repository_status_documents_parse(self) -> None:
+        """TC-FR25-001: Every status.md in the repository parses."""
+        for path in sorted((ROOT / "changes").glob("*/status.md")):
+            with self.subTest(path=path.parent.name):
+                document = load_status(path)
+                self.assertEqual(document.change_id, path.parent.name)
+                self.assertIn("Current Stage", document.metadata)
+                self.assertEqual([a.stage for a in document.approvals][:2], ["Frame", "Spec"])
+                self.assertTrue(document.next_actions)
+                self.assertTrue(document.handoffs)
+
+
+if __name__ == "__main__":
+    unittest.main()
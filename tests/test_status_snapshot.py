@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines import status_snapshot
+
+STATUS_TEMPLATE = """# Change Status — {change_id}
+
+## Approvals
+| Stage | Reviewer | Status | Notes |
+| --- | --- | --- | --- |
+| Frame | Human PM | ✅ Approved | Scope reviewed. |
+| Execute | Human PM | {execute} | Evidence pending. |
+
+## Next Actions
+1. Review.
+"""
+
+
+class TestStatusPortfolio(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.changes = self.root / "changes"
+        self.cache_path = self.root / "cache.json"
+        for index, execute in enumerate(("⏳ Pending", "✅ Approved", "⏳ Pending"), start=1):
+            self.write(f"CH-00{index}", execute)
+
+    def write(self, change_id: str, execute: str) -> Path:
+        path = self.changes / change_id / "status.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(STATUS_TEMPLATE.format(change_id=change_id, execute=execute), encoding="utf-8")
+        return path
+
+    def test_portfolio_counts_stages_and_refreshes_incrementally(self) -> None:
+        """TC-FR13-001: Snapshots count changes per stage and refresh only edited files."""
+        snapshot = status_snapshot.build_portfolio(self.changes, cache_path=self.cache_path)
+        self.assertEqual(snapshot["workspaces"], 3)
+        self.assertEqual(snapshot["stages"]["Frame"], {"✅ Approved": 3})
+        self.assertEqual(snapshot["stages"]["Execute"], {"⏳ Pending": 2, "✅ Approved": 1})
+        self.assertEqual(snapshot["refresh"], {"read": 3, "reparsed": 3})
+
+        # A fresh process reuses the persisted cache without reading unchanged files.
+        self.assertEqual(status_snapshot.build_portfolio(self.changes, cache_path=self.cache_path)["refresh"],
+                         {"read": 0, "reparsed": 0})
+
+        self.write("CH-001", "✅ Approved")
+        touched = self.changes / "CH-002" / "status.md"
+        stat = touched.stat()
+        os.utime(touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.write("CH-004", "⏳ Pending")
+        (self.changes / "CH-003" / "status.md").unlink()
+
+        parser = status_snapshot.parse_status_document
+        with mock.patch.object(status_snapshot, "parse_status_document", wraps=parser) as parse:
+            portfolio = status_snapshot.StatusPortfolio(self.changes, cache_path=self.cache_path).refresh()
+        # CH-002 was only touched: it is hashed but never handed to the parser.
+        self.assertEqual(sorted(call.kwargs["change_id"] for call in parse.call_args_list), ["CH-001", "CH-004"])
+        self.assertEqual(sorted(Path(key).parent.name for key in portfolio.last_read), ["CH-001", "CH-002", "CH-004"])
+        self.assertEqual(sorted(Path(key).parent.name for key in portfolio.last_reparsed), ["CH-001", "CH-004"])
+        snapshot = portfolio.snapshot()
+        self.assertEqual(sorted(snapshot["changes"]), ["CH-001", "CH-002", "CH-004"])
+        self.assertEqual(snapshot["stages"]["Execute"], {"✅ Approved": 2, "⏳ Pending": 1})
+
+    def test_feed_emits_only_transitions_with_sequence_numbers(self) -> None:
+        """TC-FR13-001: The status feed records stage transitions with sequence numbers."""
+        feed = status_snapshot.StatusFeed(self.root / "feed.ndjson")
+
+        def update() -> list:
+            return feed.update(status_snapshot.build_portfolio(self.changes, cache_path=self.cache_path))
+
+        initial = update()
+        self.assertEqual([event["seq"] for event in initial], list(range(1, 7)))
+        self.assertEqual(update(), [])
+
+        self.write("CH-001", "✅ Approved")
+        (self.changes / "CH-003" / "status.md").unlink()
+        events = update()
+        self.assertEqual(
+            [(e["seq"], e["change_id"], e["stage"], e["from"], e["to"]) for e in events],
+            [
+                (7, "CH-001", "Execute", "⏳ Pending", "✅ Approved"),
+                (8, "CH-003", "Frame", "✅ Approved", None),
+                (9, "CH-003", "Execute", "⏳ Pending", None),
+            ],
+        )
+        self.assertEqual([e["seq"] for e in status_snapshot.read_feed(feed.feed_path, since=7)], [8, 9])
+
+        # Losing the state file rebuilds it from the feed instead of re-emitting everything.
+        feed.state_path.unlink()
+        self.assertEqual(update(), [])
+        self.write("CH-002", "⏳ Pending")
+        self.assertEqual([(e["seq"], e["change_id"]) for e in update()], [(10, "CH-002")])
+
+    def test_feed_updates_are_serialised_and_survive_a_torn_line(self) -> None:
+        """TC-FR13-001: Concurrent feed updates are serialised and a torn line is dropped."""
+        feed_path = self.root / "feed.ndjson"
+        snapshot = status_snapshot.build_portfolio(self.changes, cache_path=self.cache_path)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            batches = list(pool.map(lambda _: status_snapshot.StatusFeed(feed_path).update(snapshot), range(4)))
+        self.assertEqual(sorted(event["seq"] for batch in batches for event in batch), list(range(1, 7)))
+
+        with feed_path.open("a", encoding="utf-8") as handle:
+            handle.write('{"change_id":"CH-001","kind":"appr')
+        self.assertEqual(status_snapshot._last_sequence(feed_path), 6)
+        self.assertEqual([event["seq"] for event in status_snapshot.read_feed(feed_path)], list(range(1, 7)))
+
+        self.write("CH-001", "✅ Approved")
+        feed = status_snapshot.StatusFeed(feed_path)
+        events = feed.update(status_snapshot.build_portfolio(self.changes, cache_path=self.cache_path))
+        self.assertEqual([event["seq"] for event in events], [7])
+        self.assertTrue(feed_path.read_text(encoding="utf-8").endswith("\n"))
+        self.assertEqual([event["seq"] for event in status_snapshot.read_feed(feed_path)], list(range(1, 8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from agents import templating
+
+
+class TemplateEngineTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.defaults = self.root / "defaults"
+        self.overrides = self.root / "overrides"
+        (self.defaults / "designer").mkdir(parents=True)
+        (self.defaults / "designer" / "spec.md").write_text(
+            "# Spec — {{ title }}\n{{ items|bullets }}\n{{ tasks|checklist }}\n",
+            encoding="utf-8",
+        )
+        self.engine = templating.TemplateEngine(template_dir=self.defaults, override_dir=self.overrides)
+
+    def test_render_and_stream_produce_identical_markdown(self) -> None:
+        """TC-FR03-002: Templates render filters and stream the same bytes as string rendering."""
+        context = {"title": "Loop", "items": ["a", "b"], "tasks": ["ship"]}
+        expected = "# Spec — Loop\n- a\n- b\n- [ ] ship\n"
+        self.assertEqual(self.engine.render("designer/spec", context), expected)
+
+        handle = io.StringIO()
+        self.engine.render_to(handle, "designer/spec", context)
+        self.assertEqual(handle.getvalue(), expected)
+
+    def test_templates_are_cached_until_cleared_and_overrides_win(self) -> None:
+        """TC-FR03-002: Parsed templates are reused; on-disk overrides replace defaults."""
+        first = self.engine.get("designer/spec")
+        self.assertIs(self.engine.get("designer/spec"), first)
+
+        (self.overrides / "designer").mkdir(parents=True)
+        (self.overrides / "designer" / "spec.md").write_text("Custom {{ title }}\n", encoding="utf-8")
+        self.assertIs(self.engine.get("designer/spec"), first)
+
+        self.engine.clear()
+        self.assertEqual(self.engine.render("designer/spec", {"title": "Loop"}), "Custom Loop\n")
+
+    def test_missing_field_and_unknown_filter_raise_template_error(self) -> None:
+        """TC-FR03-002: Template errors name the offending field or filter."""
+        with self.assertRaisesRegex(templating.TemplateError, "requires field 'items'"):
+            self.engine.render("designer/spec", {"title": "Loop"})
+        with self.assertRaisesRegex(templating.TemplateError, "unknown filter 'shout'"):
+            templating.Template("bad", "{{ title|shout }}")
+
+    def test_bundled_agent_templates_compile(self) -> None:
+        """TC-FR03-002: Every bundled agent template parses."""
+        engine = templating.TemplateEngine(override_dir=None)
+        names = engine.names()
+        self.assertIn("designer/design_spec", names)
+        for name in names:
+            self.assertTrue(engine.get(name).fields)
+
+
+if __name__ == "__main__":
+    unittest.main()
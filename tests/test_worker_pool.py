@@ -0,0 +1,145 @@
+import fcntl
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+import audit.logger as audit_logger
+import agents.designer as designer_module
+import agents.implementer as implementer_module
+import agents.project_manager as pm_module
+import agents.tester as tester_module
+from pipelines import worker_pool
+
+SCENARIO = {"phase": "1", "title": "Queue Scenario", "objective": "Exercise the worker pool."}
+
+
+class WorkerPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.root = Path(self._tmpdir.name)
+        self.queue_path = self.root / "queue" / "jobs.sqlite"
+
+        original_logger = audit_logger._DEFAULT_LOGGER
+        audit_logger._DEFAULT_LOGGER = audit_logger.AuditLogger(root=self.root / "audit")
+        self.addCleanup(setattr, audit_logger, "_DEFAULT_LOGGER", original_logger)
+        for module in (pm_module, designer_module, implementer_module, tester_module):
+            original_root = module.PROJECT_ROOT
+            module.PROJECT_ROOT = self.root
+            self.addCleanup(setattr, module, "PROJECT_ROOT", original_root)
+
+    def _submit(self, queue: worker_pool.JobQueue, scenario_id: str) -> None:
+        queue.submit(SCENARIO, scenario_id=scenario_id, output_dir=self.root / "out" / scenario_id)
+
+    def test_claim_respects_stage_order(self) -> None:
+        """TC-FR01-004: Downstream stages are not claimable until upstream stages finish."""
+        queue = worker_pool.JobQueue(self.queue_path)
+        self.addCleanup(queue.close)
+        self._submit(queue, "s1")
+
+        self.assertIsNone(queue.claim("designer", "designer-0"))
+        job = queue.claim("project_manager", "pm-0")
+        self.assertEqual(job.stage, "project_manager")
+        queue.complete(job.id, {"artifacts": {"brief": "brief.md"}, "handoffs": []})
+
+        designer_job = queue.claim("designer", "designer-0")
+        self.assertEqual(designer_job.upstream["project_manager"]["artifacts"]["brief"], "brief.md")
+
+        queue.fail(designer_job.id, "boom")
+        self.assertEqual([row["status"] for row in queue.scenario("s1")], ["done", "failed", "cancelled", "cancelled"])
+
+    def test_worker_loop_processes_scenario_and_returns_handoffs(self) -> None:
+        """TC-FR01-004: In-process workers drain the queue stage by stage with handoff records."""
+        queue = worker_pool.JobQueue(self.queue_path)
+        self.addCleanup(queue.close)
+        self._submit(queue, "s1")
+
+        for stage in worker_pool.STAGES:
+            worker_pool.worker_loop(stage, self.queue_path, worker=f"{stage}-0")
+
+        rows = queue.scenario("s1")
+        self.assertEqual([row["status"] for row in rows], ["done"] * 4)
+        designer = rows[1]["result"]
+        self.assertTrue(Path(designer["artifacts"]["design_spec"]).exists())
+        self.assertEqual([entry["from_agent"] for entry in designer["handoffs"]], ["designer"])
+
+    def test_pool_runs_workers_in_separate_processes(self) -> None:
+        """TC-FR01-004: Worker pool processes several scenarios across processes."""
+        queue = worker_pool.JobQueue(self.queue_path)
+        self.addCleanup(queue.close)
+        for scenario_id in ("a", "b", "c"):
+            self._submit(queue, scenario_id)
+
+        counts = worker_pool.WorkerPool(self.queue_path, concurrency={"designer": 2}, poll_interval=0.01).run()
+
+        self.assertEqual(counts, {"done": 12})
+        tester = queue.scenario("c")[3]
+        self.assertTrue(tester["worker"].startswith("tester-"))
+        self.assertTrue(Path(tester["result"]["artifacts"]["test_plan"]).exists())
+        handoffs = (self.root / "audit" / "handoff.jsonl").read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(handoffs), 12)
+        self.assertTrue(all(json.loads(line)["record_type"] == "handoff" for line in handoffs))
+
+    def test_pool_requeues_jobs_of_dead_workers(self) -> None:
+        """TC-FR01-004: A crashed worker is replaced and its job retried, then failed once it keeps crashing."""
+        queue = worker_pool.JobQueue(self.queue_path)
+        self.addCleanup(queue.close)
+        for scenario_id in ("flaky", "poison"):
+            self._submit(queue, scenario_id)
+        marker = self.root / "crashed-once"
+        factory, runner = worker_pool.STAGE_AGENTS["designer"]
+
+        def crashing_runner(agent, job):
+            if job.scenario_id == "poison" or not marker.exists():
+                marker.touch()
+                os._exit(3)
+            return runner(agent, job)
+
+        with mock.patch.dict(worker_pool.STAGE_AGENTS, {"designer": (factory, crashing_runner)}):
+            counts = worker_pool.WorkerPool(self.queue_path, poll_interval=0.01, max_crashes=2).run()
+
+        self.assertEqual(counts, {"done": 5, "failed": 1, "cancelled": 2})
+        self.assertEqual([row["status"] for row in queue.scenario("flaky")], ["done"] * 4)
+        poison = queue.scenario("poison")[1]
+        self.assertEqual(poison["status"], "failed")
+        self.assertIn("exited with code 3 2 times", poison["error"])
+
+    def test_pool_fails_jobs_of_a_stage_whose_workers_cannot_start(self) -> None:
+        """TC-FR01-004: A stage without live workers fails its jobs instead of hanging the pool."""
+        queue = worker_pool.JobQueue(self.queue_path)
+        self.addCleanup(queue.close)
+        self._submit(queue, "s1")
+        worker_loop = worker_pool.worker_loop
+
+        def broken_designer(stage, queue_path, **kwargs):
+            if stage == "designer":
+                os._exit(1)
+            return worker_loop(stage, queue_path, **kwargs)
+
+        with mock.patch.object(worker_pool, "worker_loop", broken_designer):
+            counts = worker_pool.WorkerPool(self.queue_path, poll_interval=0.01, max_crashes=2).run()
+
+        self.assertEqual(counts, {"done": 1, "failed": 1, "cancelled": 2})
+        designer = queue.scenario("s1")[1]
+        self.assertIn("No 'designer' worker", designer["error"])
+
+    def test_second_pool_on_the_same_queue_is_refused(self) -> None:
+        """TC-FR01-004: Only one pool runs per queue, so running jobs are never requeued under it."""
+        pool = worker_pool.WorkerPool(self.queue_path)
+        self.queue_path.parent.mkdir(parents=True)
+        with pool.lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            with self.assertRaises(RuntimeError):
+                pool.run()
+
+
+if __name__ == "__main__":
+    unittest.main()